@@ -0,0 +1,122 @@
+# Path: API/api_status.py
+# Status enable/disable API yang di-cache di memori.
+#
+# Status tetap disimpan di api_status.txt supaya bertahan saat restart dan
+# terbaca oleh semua worker, tetapi file hanya di-stat paling sering sekali
+# per TTL dan hanya dibaca ulang jika mtime berubah. /admin/enable dan
+# /admin/disable memperbarui cache secara langsung lewat set().
+
+import os
+import threading
+import time
+from flask import jsonify
+
+API_STATUS_FILE = 'api_status.txt'
+
+
+class ApiStatus:
+    """Status API bersama untuk seluruh proses (thread-safe)"""
+
+    def __init__(self, path=API_STATUS_FILE, ttl=2.0):
+        self.path = path
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._enabled = True
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def is_enabled(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.ttl:
+            return self._enabled
+
+        with self._lock:
+            if now - self._checked_at < self.ttl:
+                return self._enabled
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                # Belum pernah di-set: default aktif, buat file seperti sebelumnya
+                self._write_locked(True)
+                return self._enabled
+            except OSError as e:
+                print(f"Error reading API status: {e}")
+                return self._enabled
+
+            if mtime != self._mtime:
+                try:
+                    with open(self.path, 'r') as f:
+                        self._enabled = f.read().strip() == 'enabled'
+                    self._mtime = mtime
+                except Exception as e:
+                    print(f"Error reading API status: {e}")
+            return self._enabled
+
+    def set(self, enabled):
+        """Simpan status ke file dan perbarui cache. Return False jika gagal menulis."""
+        with self._lock:
+            return self._write_locked(enabled)
+
+    def _write_locked(self, enabled):
+        try:
+            with open(self.path, 'w') as f:
+                f.write('enabled' if enabled else 'disabled')
+            self._mtime = os.stat(self.path).st_mtime
+        except Exception as e:
+            print(f"Error writing API status: {e}")
+            return False
+        self._enabled = bool(enabled)
+        self._checked_at = time.monotonic()
+        return True
+
+
+api_status = ApiStatus(ttl=float(os.getenv('API_STATUS_TTL', '2')))
+
+# Blueprint dan endpoint yang tetap bisa diakses saat API dinonaktifkan
+# (sama dengan route yang sebelumnya tidak memanggil check_api_enabled)
+ALWAYS_ALLOWED_BLUEPRINTS = {
+    'binaan',
+    'broadcast',
+    'buku_kronik',
+    'kegiatan_wr',
+    'pengguna',
+    'program_kerja_wr',
+    'wr',
+}
+ALWAYS_ALLOWED_ENDPOINTS = {
+    'admin.enable_api',
+    'admin.disable_api',
+    'admin.api_status',
+    'admin.db_pool_status',
+    'client.disconnect_client',
+    'program_kerja_k_kategorial.get_program_budget',
+    'program_kerja_k_kategorial.get_program_evaluation',
+    'sync.get_sync_entities',
+}
+
+
+def get_api_status():
+    return api_status.is_enabled()
+
+
+def set_api_status(enabled):
+    return api_status.set(enabled)
+
+
+def check_api_enabled():
+    if not api_status.is_enabled():
+        return jsonify({
+            'status': 'error',
+            'message': 'API sedang dinonaktifkan'
+        }), 503
+    return None
+
+
+def enforce_api_status(request):
+    """Dipanggil dari before_request: tolak request blueprint saat API nonaktif"""
+    if request.method == 'OPTIONS' or request.blueprint is None:
+        return None
+    if request.blueprint in ALWAYS_ALLOWED_BLUEPRINTS or request.endpoint in ALWAYS_ALLOWED_ENDPOINTS:
+        return None
+    return check_api_enabled()
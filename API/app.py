@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, abort, jsonify, request
 from flask_cors import CORS
 import datetime
 import os
@@ -7,7 +7,12 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import get_db_connection, DB_CONFIG
+from config import get_db_connection, get_db_pool_stats, release_request_connections, DB_CONFIG
+from api_status import enforce_api_status
+from events import publish_data_change
+from conditional import bump_table_versions, check_not_modified, finalize_response
+from blob_store import start_gc_scheduler
+import metrics
 
 # Create Flask app
 app = Flask(__name__)
@@ -26,6 +31,56 @@ app.config['JSON_AS_ASCII'] = False  # Support Indonesian characters
 app.config['JSON_SORT_KEYS'] = False
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
 
+@app.before_request
+def start_metrics():
+    """Mulai mencatat durasi dan query request ini (lihat metrics.py)"""
+    metrics.start_request(request)
+
+@app.before_request
+def check_api_enabled():
+    """Tolak request ke blueprint saat API dinonaktifkan (status di-cache, lihat api_status.py)"""
+    return enforce_api_status(request)
+
+@app.before_request
+def conditional_get():
+    """Jawab 304 untuk list yang tidak berubah sejak ETag client (lihat conditional.py)"""
+    return check_not_modified(request, app.response_class)
+
+# Didaftarkan pertama supaya dijalankan terakhir (setelah kompresi)
+@app.after_request
+def record_metrics(response):
+    """Catat latency, jumlah query dan ukuran response per route"""
+    return metrics.finish_request(request, response)
+
+@app.after_request
+def push_data_change(response):
+    """Beri tahu client (lewat /events) bahwa data sebuah entity berubah"""
+    return publish_data_change(request, response)
+
+# Didaftarkan setelah push_data_change supaya dijalankan sebelumnya: client yang menerima
+# data_changed langsung mendapat ETag versi baru
+@app.after_request
+def bump_etag_versions(response):
+    """Naikkan versi tabel (ETag list) setelah write berhasil, lihat conditional.py"""
+    return bump_table_versions(request, response)
+
+@app.after_request
+def etag_and_compress(response):
+    """Pasang ETag dan kompres response JSON besar (gzip/brotli)"""
+    return finalize_response(request, response)
+
+@app.teardown_request
+def return_pooled_connections(exc):
+    """Pastikan koneksi pool yang tidak ditutup route kembali ke pool"""
+    release_request_connections()
+
+@app.teardown_request
+def discard_metrics(exc):
+    metrics.discard_request(request)
+
+# Sapu blob dokumen/foto yang tidak direferensikan secara berkala (lihat blob_store.py)
+start_gc_scheduler()
+
 # Import all blueprints
 from routes.admin_routes import admin_bp
 from routes.auth_routes import auth_bp
@@ -51,6 +106,11 @@ from routes.kategorial_routes import kategorial_bp
 from routes.binaan_routes import binaan_bp
 from routes.wr_routes import wr_bp
 from routes.tim_pembina_routes import tim_pembina_bp
+from routes.sync_routes import sync_bp
+from routes.stats_routes import stats_bp
+from routes.export_routes import export_bp
+from routes.event_routes import event_bp
+from routes.batch_routes import batch_bp
 
 # Register all blueprints
 app.register_blueprint(admin_bp)
@@ -77,6 +137,11 @@ app.register_blueprint(kategorial_bp)
 app.register_blueprint(binaan_bp)
 app.register_blueprint(wr_bp)
 app.register_blueprint(tim_pembina_bp)
+app.register_blueprint(sync_bp)
+app.register_blueprint(stats_bp)
+app.register_blueprint(export_bp)
+app.register_blueprint(event_bp)
+app.register_blueprint(batch_bp)
 
 # Basic routes
 @app.route('/')
@@ -116,7 +181,13 @@ def home():
             'kategorial': '/kategorial',
             'wilayah_rohani': '/wr',
             'binaan': '/binaan',
-            'tim_pembina': '/tim-pembina'
+            'tim_pembina': '/tim-pembina',
+            'sync': '/sync',
+            'stats': '/stats',
+            'export': '/export',
+            'events': '/events',
+            'batch': '/batch',
+            'metrics': '/metrics'
         }
     })
 
@@ -127,6 +198,14 @@ def health_check():
         'timestamp': datetime.datetime.now().isoformat()
     })
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Metrik request dan database dalam format teks Prometheus"""
+    token = os.getenv('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}' and request.args.get('token') != token:
+        abort(403)
+    return Response(metrics.render_prometheus(get_db_pool_stats()), mimetype='text/plain; version=0.0.4')
+
 @app.route('/test-db')
 def test_database():
     connection = get_db_connection()
@@ -0,0 +1,23 @@
+# Path: API/benchmark/__init__.py
+# Benchmark dan load test API dengan data paroki sintetis.
+#
+# Dijalankan dari folder API (butuh config.py, app.py dan modul lain di sana):
+#
+#   DB_NAME=db_gereja_bench python -m benchmark seed --jemaat 5000 --years 5
+#   DB_NAME=db_gereja_bench python -m benchmark run --mix admin --concurrency 8 --duration 30
+#   DB_NAME=db_gereja_bench python -m benchmark run --mix admin --concurrency 8 --duration 30 --save-baseline
+#
+# Database benchmark harus database MySQL terpisah yang sudah berisi skema
+# lengkap (import entf7819_db-client-server.sql lalu migration di folder sql/).
+# Skema ini tidak bisa diganti SQLite: route memakai placeholder %s, cursor
+# dictionary, GET_LOCK, view dan trigger MySQL. seed mengosongkan tabel yang
+# diisinya, sehingga hanya mau berjalan jika nama database mengandung
+# "bench" (atau dengan --force).
+#
+# seed   : lihat seed.py (jemaat per keluarga dengan NIK/no KK dan tanggal
+#          sakramen, keuangan beberapa tahun, kegiatan, pengumuman, dokumen
+#          beserta file-nya, log aktivitas, pengguna bench_user_NNN).
+# run    : lihat scenarios.py (campuran request) dan runner.py (statistik
+#          throughput/p50/p90/p99 per endpoint, baseline di
+#          benchmark/baselines/). Jika baseline untuk konfigurasi yang sama
+#          sudah ada, hasil dibandingkan dan exit code 1 saat ada regresi.
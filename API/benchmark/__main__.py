@@ -0,0 +1,153 @@
+# Path: API/benchmark/__main__.py
+# CLI benchmark: python -m benchmark seed|run ... (dari folder API)
+
+import argparse
+import contextlib
+import os
+import sys
+
+from benchmark import runner
+from benchmark.scenarios import MIXES, Dataset, HttpTransport, InProcessTransport, Scenario, pengumuman_aktif
+from benchmark.seed import Options, seed
+
+
+def _connect():
+    from config import get_db_connection
+    connection = get_db_connection()
+    if not connection:
+        print("[BENCH] Gagal terhubung ke database")
+        sys.exit(2)
+    return connection
+
+
+def cmd_seed(args):
+    from config import DB_CONFIG
+    database = DB_CONFIG['database']
+    if 'bench' not in database.lower() and not args.force:
+        print(f"[BENCH] Database '{database}' bukan database benchmark (nama harus mengandung 'bench').")
+        print("[BENCH] seed mengosongkan tabel jemaat, keuangan, dokumen, dll. Pakai DB_NAME=... atau --force.")
+        return 2
+
+    options = Options(jemaat=args.jemaat, years=args.years, keuangan_per_month=args.keuangan_per_month,
+                      kegiatan=args.kegiatan, pengumuman=args.pengumuman, dokumen=args.dokumen,
+                      max_file_kb=args.max_file_kb, logs=args.logs, users=args.users, wilayah=args.wilayah,
+                      seed=args.seed)
+    connection = _connect()
+    try:
+        counts = seed(connection, options)
+    finally:
+        connection.close()
+    print(f"[BENCH] Seed selesai di database {database}: {counts}")
+    return 0
+
+
+def cmd_run(args):
+    connection = _connect()
+    try:
+        dataset = Dataset.load(connection)
+    finally:
+        connection.close()
+    if not dataset.users:
+        print("[BENCH] Pengguna benchmark tidak ditemukan, jalankan `python -m benchmark seed` dulu")
+        return 2
+
+    transport = HttpTransport(args.url) if args.url else InProcessTransport()
+    scenario = Scenario(args.mix)
+
+    probe = transport.session()
+    try:
+        status, _, _ = probe.send(pengumuman_aktif(None, None), {})
+    finally:
+        probe.close()
+    if status == 503:
+        print("[BENCH] API sedang dinonaktifkan (503), aktifkan lewat POST /admin/enable")
+        return 2
+
+    config = {
+        'mix': args.mix,
+        'transport': transport.name,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'warmup': args.warmup,
+        'seed': args.seed,
+    }
+    print(f"[BENCH] {config} dataset={dataset.summary()}")
+
+    # Route mencetak banyak log debug per request; sembunyikan selama run
+    quiet = contextlib.redirect_stdout(open(os.devnull, 'w')) if not args.verbose else contextlib.nullcontext()
+    with quiet:
+        result, failures = runner.run(transport, scenario, dataset, concurrency=args.concurrency,
+                                      duration=args.duration, warmup=args.warmup, seed=args.seed)
+
+    for line in runner.format_report(result):
+        print(line)
+    if failures:
+        print(f"[BENCH] {len(failures)} request gagal tanpa response, contoh: {failures[:3]}")
+
+    path = args.baseline or runner.baseline_path(args.mix, transport.name, args.concurrency)
+    exit_code = 0
+    baseline = None if args.no_compare else runner.load_baseline(path)
+    if baseline is not None:
+        regressions, warnings = runner.compare(baseline, result, dataset.summary(),
+                                               tolerance=args.tolerance, p99_tolerance=args.p99_tolerance)
+        for warning in warnings:
+            print(f"[BENCH] PERINGATAN: {warning}")
+        if regressions:
+            print("=" * 70)
+            print(f"[BENCH] REGRESI dibanding baseline {path} ({baseline.get('created_at')}):")
+            for regression in regressions:
+                print(f"[BENCH]   {regression}")
+            print("=" * 70)
+            exit_code = 1
+        else:
+            print(f"[BENCH] Tidak ada regresi dibanding baseline {path}")
+    elif not args.save_baseline:
+        print(f"[BENCH] Belum ada baseline {path} (simpan dengan --save-baseline)")
+
+    if args.save_baseline:
+        runner.save_baseline(path, config, dataset.summary(), result)
+        print(f"[BENCH] Baseline disimpan: {path}")
+    return exit_code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Benchmark API Sistem Informasi Gereja')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    defaults = Options()
+    p_seed = commands.add_parser('seed', help='isi database benchmark dengan data sintetis')
+    p_seed.add_argument('--jemaat', type=int, default=defaults.jemaat)
+    p_seed.add_argument('--years', type=int, default=defaults.years, help='rentang tahun keuangan/kegiatan/log')
+    p_seed.add_argument('--keuangan-per-month', type=int, default=defaults.keuangan_per_month)
+    p_seed.add_argument('--kegiatan', type=int, default=defaults.kegiatan)
+    p_seed.add_argument('--pengumuman', type=int, default=defaults.pengumuman)
+    p_seed.add_argument('--dokumen', type=int, default=defaults.dokumen)
+    p_seed.add_argument('--max-file-kb', type=int, default=defaults.max_file_kb)
+    p_seed.add_argument('--logs', type=int, default=defaults.logs)
+    p_seed.add_argument('--users', type=int, default=defaults.users)
+    p_seed.add_argument('--wilayah', type=int, default=defaults.wilayah)
+    p_seed.add_argument('--seed', type=int, default=defaults.seed)
+    p_seed.add_argument('--force', action='store_true', help='izinkan database yang namanya tidak mengandung "bench"')
+    p_seed.set_defaults(func=cmd_seed)
+
+    p_run = commands.add_parser('run', help='jalankan load test dan bandingkan dengan baseline')
+    p_run.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    p_run.add_argument('--concurrency', type=int, default=8)
+    p_run.add_argument('--duration', type=float, default=30.0, help='detik yang diukur')
+    p_run.add_argument('--warmup', type=float, default=5.0, help='detik pemanasan (tidak diukur)')
+    p_run.add_argument('--seed', type=int, default=42)
+    p_run.add_argument('--url', help='URL server API; tanpa ini app dijalankan di proses yang sama')
+    p_run.add_argument('--baseline', help='file baseline (default benchmark/baselines/<mix>-<transport>-c<N>.json)')
+    p_run.add_argument('--save-baseline', action='store_true', help='simpan hasil sebagai baseline baru')
+    p_run.add_argument('--no-compare', action='store_true')
+    p_run.add_argument('--tolerance', type=float, default=0.25, help='kenaikan p50 / penurunan throughput yang diizinkan')
+    p_run.add_argument('--p99-tolerance', type=float, default=0.5)
+    p_run.add_argument('--verbose', action='store_true', help='tampilkan log route selama run')
+    p_run.set_defaults(func=cmd_run)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# Path: API/benchmark/runner.py
+# Penggerak load test dan baseline.
+#
+# run() menjalankan `concurrency` virtual user (satu thread masing-masing,
+# tanpa jeda antar request) selama `duration` detik setelah `warmup` detik
+# pemanasan yang tidak dihitung. Setiap thread mencatat latency per label
+# endpoint di memorinya sendiri; hasil digabung setelah semua thread selesai.
+#
+# Baseline disimpan per (mix, transport, concurrency) di
+# benchmark/baselines/. compare() menandai regresi jika, untuk endpoint dengan
+# sampel cukup:
+#   p50 naik lebih dari `tolerance` dan lebih dari MIN_DELTA_MS,
+#   p99 naik lebih dari `p99_tolerance` dan lebih dari MIN_DELTA_MS,
+#   error rate naik lebih dari MAX_ERROR_RATE_INCREASE,
+#   throughput total turun lebih dari `tolerance`.
+
+import datetime
+import json
+import math
+import os
+import platform
+import threading
+import time
+
+from benchmark.scenarios import new_user
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+TOTAL_LABEL = 'TOTAL'
+MIN_SAMPLES = 20
+MIN_DELTA_MS = 2.0
+MAX_ERROR_RATE_INCREASE = 0.01
+
+
+class _EndpointSamples:
+    __slots__ = ('latencies', 'errors', 'bytes', 'not_modified', 'statuses')
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.bytes = 0
+        self.not_modified = 0
+        self.statuses = {}
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.not_modified += other.not_modified
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile dari list yang sudah diurutkan"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _worker(index, transport, scenario, dataset, seed, start_at, measure_at, stop_at, samples, failures):
+    session = transport.session()
+    user = new_user(index, dataset, seed)
+    rng = user.rng
+    try:
+        while time.monotonic() < start_at:
+            time.sleep(0.001)
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            call = scenario.next_call(user, rng)
+            url_key = (call.path, tuple(sorted((call.params or {}).items())))
+            headers = {'Accept-Encoding': 'gzip'}
+            if call.revalidate and url_key in user.etags:
+                headers['If-None-Match'] = user.etags[url_key]
+
+            started = time.perf_counter()
+            try:
+                status, etag, body = session.send(call, headers)
+            except Exception as e:
+                status, etag, body = None, None, b''
+                failures.append(f"{call.label}: {e}")
+            elapsed = time.perf_counter() - started
+
+            if call.revalidate and status == 200 and etag:
+                user.etags[url_key] = etag
+            if call.on_reply is not None:
+                try:
+                    payload = json.loads(body) if status == 200 and body else None
+                except ValueError:
+                    payload = None
+                call.on_reply(user, status, payload)
+
+            if now < measure_at:
+                continue
+            stats = samples.get(call.label)
+            if stats is None:
+                stats = samples[call.label] = _EndpointSamples()
+            stats.latencies.append(elapsed)
+            stats.bytes += len(body)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status == 304:
+                stats.not_modified += 1
+            if status not in call.ok:
+                stats.errors += 1
+    finally:
+        session.close()
+
+
+def run(transport, scenario, dataset, concurrency=8, duration=30.0, warmup=5.0, seed=42):
+    """Jalankan load test, return dict hasil (lihat summarize)"""
+    start_at = time.monotonic() + 0.2
+    measure_at = start_at + warmup
+    stop_at = measure_at + duration
+    per_thread = [{} for _ in range(concurrency)]
+    failures = []
+    threads = [
+        threading.Thread(target=_worker, name=f'bench-{i}', daemon=True,
+                         args=(i, transport, scenario, dataset, seed, start_at, measure_at, stop_at,
+                               per_thread[i], failures))
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Request terakhir bisa selesai sedikit setelah stop_at
+    measured = max(duration, time.monotonic() - measure_at)
+
+    merged = {}
+    for samples in per_thread:
+        for label, stats in samples.items():
+            merged.setdefault(label, _EndpointSamples()).merge(stats)
+    return summarize(merged, measured), failures
+
+
+def _summarize_one(stats, seconds):
+    latencies = sorted(stats.latencies)
+    count = len(latencies)
+    return {
+        'count': count,
+        'errors': stats.errors,
+        'error_rate': round(stats.errors / count, 4) if count else 0.0,
+        'rps': round(count / seconds, 2) if seconds else 0.0,
+        'mean_ms': round(sum(latencies) / count * 1000, 2) if count else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 0.90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if count else 0.0,
+        'avg_bytes': int(stats.bytes / count) if count else 0,
+        'not_modified': stats.not_modified,
+        'statuses': {str(status): n for status, n in sorted(stats.statuses.items(), key=lambda item: str(item[0]))},
+    }
+
+
+def summarize(merged, seconds):
+    results = {label: _summarize_one(stats, seconds) for label, stats in sorted(merged.items())}
+    total = _EndpointSamples()
+    for stats in merged.values():
+        total.merge(stats)
+    results[TOTAL_LABEL] = _summarize_one(total, seconds)
+    return {'seconds': round(seconds, 2), 'endpoints': results}
+
+
+def format_report(result):
+    lines = []
+    header = f"{'endpoint':<34} {'count':>7} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'err%':>6} {'304':>6}"
+    lines.append(header)
+    lines.append('-' * len(header))
+    for label, r in result['endpoints'].items():
+        if label == TOTAL_LABEL:
+            lines.append('-' * len(header))
+        lines.append(f"{label:<34} {r['count']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} "
+                     f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} {r['error_rate'] * 100:>6.1f} {r['not_modified']:>6}")
+    lines.append(f"(latency dalam ms, diukur {result['seconds']} detik)")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+def baseline_path(mix, transport_name, concurrency):
+    return os.path.join(BASELINE_DIR, f"{mix}-{transport_name}-c{concurrency}.json")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, config, dataset_summary, result):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    document = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'config': config,
+        'dataset': dataset_summary,
+        'result': result,
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compare(baseline, result, dataset_summary, tolerance=0.25, p99_tolerance=0.5):
+    """Return (regresi, peringatan): list pesan"""
+    regressions = []
+    warnings = []
+    if baseline.get('dataset') != dataset_summary:
+        warnings.append(f"Dataset berbeda dari baseline: {baseline.get('dataset')} vs {dataset_summary}")
+
+    base_endpoints = baseline['result']['endpoints']
+    endpoints = result['endpoints']
+    for label, base in base_endpoints.items():
+        current = endpoints.get(label)
+        if current is None:
+            warnings.append(f"{label}: tidak ada di hasil sekarang")
+            continue
+        if base['count'] < MIN_SAMPLES or current['count'] < MIN_SAMPLES:
+            continue
+        for key, limit in (('p50_ms', tolerance), ('p99_ms', p99_tolerance)):
+            if current[key] > base[key] * (1 + limit) and current[key] - base[key] > MIN_DELTA_MS:
+                regressions.append(f"{label}: {key} {base[key]:.1f} -> {current[key]:.1f} "
+                                   f"(+{(current[key] / base[key] - 1) * 100 if base[key] else 0:.0f}%)")
+        if current['error_rate'] > base['error_rate'] + MAX_ERROR_RATE_INCREASE:
+            regressions.append(f"{label}: error rate {base['error_rate'] * 100:.1f}% -> {current['error_rate'] * 100:.1f}%")
+
+    base_total = base_endpoints.get(TOTAL_LABEL)
+    total = endpoints.get(TOTAL_LABEL)
+    if base_total and total and total['rps'] < base_total['rps'] * (1 - tolerance):
+        regressions.append(f"{TOTAL_LABEL}: throughput {base_total['rps']:.1f} -> {total['rps']:.1f} req/detik")
+    return regressions, warnings
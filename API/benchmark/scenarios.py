@@ -0,0 +1,389 @@
+# Path: API/benchmark/scenarios.py
+# Campuran request untuk benchmark.
+#
+# Setiap virtual user (satu thread di runner) memilih operasi secara acak
+# sesuai bobot mix. Operasi mengembalikan Call: request yang dikirim, label
+# endpoint untuk statistik (pola route, mis. "GET /jemaat/<id>") dan status
+# yang dianggap berhasil. Virtual user menyimpan state seperti aplikasi
+# client: user_id setelah login, connection_id setelah register, dan ETag
+# terakhir per URL (request list dikirim dengan If-None-Match seperti
+# refresh berkala di client).
+#
+# Mix:
+#   client    aplikasi client: login, data milik sendiri, pengumuman, heartbeat
+#   admin     aplikasi admin: list/pencarian jemaat, statistik, laporan, log, batch dashboard
+#   heartbeat badai heartbeat dari banyak client terdaftar
+#   files     upload dan download dokumen
+#   mixed     gabungan semua mix di atas
+
+import datetime
+import io
+import random
+
+from benchmark.seed import BENCH_ADMIN, BENCH_PASSWORD, BENCH_USER_PREFIX
+
+OK_STATUSES = (200, 304)
+SEARCH_TERMS_SAMPLE = 200
+
+
+class Dataset:
+    """Id dan kata kunci dari database benchmark yang dipakai untuk membentuk request"""
+
+    def __init__(self, users, jemaat_ids, search_terms, dokumen_ids):
+        self.users = users  # [(id_pengguna, username)]
+        self.jemaat_ids = jemaat_ids
+        self.search_terms = search_terms
+        self.dokumen_ids = dokumen_ids
+
+    @classmethod
+    def load(cls, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT id_pengguna, username FROM pengguna WHERE username LIKE %s ORDER BY id_pengguna",
+                           (f"{BENCH_USER_PREFIX}%",))
+            users = [(row[0], row[1]) for row in cursor.fetchall()]
+            cursor.execute("SELECT id_jemaat FROM jemaat")
+            jemaat_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT nama_lengkap FROM jemaat ORDER BY id_jemaat LIMIT %s", (SEARCH_TERMS_SAMPLE,))
+            terms = set()
+            for (nama,) in cursor.fetchall():
+                words = nama.split()
+                terms.update(words)
+                # Potongan di tengah kata, seperti yang diketik di kotak pencarian
+                terms.update(word[1:4].lower() for word in words if len(word) > 4)
+            cursor.execute("SELECT id_dokumen FROM dokumen")
+            dokumen_ids = [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+        return cls(users, jemaat_ids, sorted(terms), dokumen_ids)
+
+    def summary(self):
+        return {
+            'pengguna': len(self.users),
+            'jemaat': len(self.jemaat_ids),
+            'dokumen': len(self.dokumen_ids),
+        }
+
+
+class Call:
+    def __init__(self, label, method, path, params=None, json=None, files=None, data=None,
+                 ok=OK_STATUSES, revalidate=False, on_reply=None):
+        self.label = label
+        self.method = method
+        self.path = path
+        self.params = params
+        self.json = json
+        self.files = files  # {'file': (nama, bytes)}
+        self.data = data
+        self.ok = ok
+        self.revalidate = revalidate
+        self.on_reply = on_reply  # fungsi(user, status, body_json)
+
+
+class VirtualUser:
+    def __init__(self, index, dataset, rng):
+        self.index = index
+        self.dataset = dataset
+        self.rng = rng
+        self.user_id = None
+        self.username = None
+        if dataset.users:
+            self.user_id, self.username = dataset.users[index % len(dataset.users)]
+        self.connection_id = None
+        self.client_ip = f"10.{index // 250 % 250}.{index % 250}.{rng.randint(2, 254)}"
+        self.hostname = f"BENCH-CLIENT-{index:04d}"
+        self.etags = {}
+
+
+# ---------------------------------------------------------------------------
+# Operasi
+# ---------------------------------------------------------------------------
+
+def login(user, rng):
+    return Call('POST /auth/login', 'POST', '/auth/login',
+                json={'username': user.username, 'password': BENCH_PASSWORD})
+
+
+def admin_login(user, rng):
+    return Call('POST /admin/login', 'POST', '/admin/login',
+                json={'username': BENCH_ADMIN, 'password': BENCH_PASSWORD})
+
+
+def _remember_connection(user, status, body):
+    if status == 200 and body:
+        user.connection_id = body.get('connection_id')
+
+
+def register_client(user, rng):
+    return Call('POST /client/register', 'POST', '/client/register',
+                json={'client_ip': user.client_ip, 'hostname': user.hostname}, on_reply=_remember_connection)
+
+
+def heartbeat(user, rng):
+    if not user.connection_id:
+        return register_client(user, rng)
+    return Call('POST /client/heartbeat', 'POST', '/client/heartbeat',
+                json={'connection_id': user.connection_id, 'client_ip': user.client_ip})
+
+
+def heartbeat_batch(user, rng):
+    # Server registrasi lokal meneruskan heartbeat beberapa client sekaligus
+    if not user.connection_id:
+        return register_client(user, rng)
+    items = [{'connection_id': user.connection_id, 'client_ip': user.client_ip}]
+    items.extend({'client_ip': f"10.250.{rng.randint(0, 250)}.{rng.randint(2, 254)}"} for _ in range(rng.randint(5, 49)))
+    return Call('POST /client/heartbeat/batch', 'POST', '/client/heartbeat/batch', json={'heartbeats': items})
+
+
+def my_jemaat(user, rng):
+    return Call('GET /jemaat/my', 'GET', '/jemaat/my', params={'user_id': user.user_id}, revalidate=True)
+
+
+def my_keuangan(user, rng):
+    return Call('GET /keuangan/my', 'GET', '/keuangan/my', params={'user_id': user.user_id}, revalidate=True)
+
+
+def my_kegiatan(user, rng):
+    return Call('GET /kegiatan/my', 'GET', '/kegiatan/my', params={'user_id': user.user_id}, revalidate=True)
+
+
+def pengumuman_aktif(user, rng):
+    return Call('GET /pengumuman/aktif', 'GET', '/pengumuman/aktif', revalidate=True)
+
+
+def kegiatan_mendatang(user, rng):
+    return Call('GET /kegiatan/mendatang', 'GET', '/kegiatan/mendatang')
+
+
+def jemaat_detail(user, rng):
+    if not user.dataset.jemaat_ids:
+        return list_jemaat(user, rng)
+    return Call('GET /jemaat/<id>', 'GET', f"/jemaat/{rng.choice(user.dataset.jemaat_ids)}")
+
+
+def list_jemaat(user, rng):
+    pages = max(1, len(user.dataset.jemaat_ids) // 100)
+    return Call('GET /jemaat', 'GET', '/jemaat',
+                params={'is_admin': 'true', 'limit': 100, 'offset': rng.randrange(pages) * 100}, revalidate=True)
+
+
+def list_jemaat_cursor(user, rng):
+    return Call('GET /jemaat (cursor)', 'GET', '/jemaat', params={'is_admin': 'true', 'limit': 100, 'cursor': ''})
+
+
+def search_jemaat(user, rng):
+    term = rng.choice(user.dataset.search_terms) if user.dataset.search_terms else 'maria'
+    return Call('GET /jemaat?search', 'GET', '/jemaat', params={'is_admin': 'true', 'limit': 50, 'search': term})
+
+
+def autocomplete_jemaat(user, rng):
+    term = rng.choice(user.dataset.search_terms) if user.dataset.search_terms else 'ma'
+    return Call('GET /jemaat/autocomplete', 'GET', '/jemaat/autocomplete',
+                params={'q': term[:rng.randint(2, max(2, len(term)))]})
+
+
+def jemaat_statistics(user, rng):
+    return Call('GET /jemaat/statistics', 'GET', '/jemaat/statistics')
+
+
+def stats_summary(user, rng):
+    return Call('GET /stats/summary', 'GET', '/stats/summary', params={'months': 6})
+
+
+def keuangan_saldo(user, rng):
+    return Call('GET /keuangan/saldo', 'GET', '/keuangan/saldo')
+
+
+def keuangan_laporan(user, rng):
+    return Call('GET /keuangan/laporan-bulanan', 'GET', '/keuangan/laporan-bulanan')
+
+
+def list_keuangan(user, rng):
+    return Call('GET /keuangan', 'GET', '/keuangan', params={'is_admin': 'true', 'limit': 100}, revalidate=True)
+
+
+def add_keuangan(user, rng):
+    pemasukan = rng.random() < 0.6
+    return Call('POST /keuangan', 'POST', '/keuangan', json={
+        'user_id': user.user_id,
+        'tanggal': datetime.date.today().isoformat(),
+        'kategori': 'Pemasukan' if pemasukan else 'Pengeluaran',
+        'sub_kategori': 'Kolekte' if pemasukan else 'Operasional',
+        'jumlah': rng.randint(1, 500) * 10000,
+        'keterangan': 'benchmark',
+    })
+
+
+def add_log(user, rng):
+    return Call('POST /log/activities', 'POST', '/log/activities', json={
+        'id_pengguna': user.user_id, 'aktivitas': 'Benchmark', 'detail': 'load test', 'ip_address': user.client_ip,
+    })
+
+
+def list_logs(user, rng):
+    return Call('GET /log/activities', 'GET', '/log/activities', params={'limit': 100})
+
+
+def recent_logs(user, rng):
+    return Call('GET /log/activities/recent', 'GET', '/log/activities/recent')
+
+
+def active_clients(user, rng):
+    return Call('GET /client/active', 'GET', '/client/active')
+
+
+def list_files(user, rng):
+    return Call('GET /dokumen/files', 'GET', '/dokumen/files', params={'limit': 100}, revalidate=True)
+
+
+def file_detail(user, rng):
+    if not user.dataset.dokumen_ids:
+        return list_files(user, rng)
+    return Call('GET /dokumen/files/<id>', 'GET', f"/dokumen/files/{rng.choice(user.dataset.dokumen_ids)}")
+
+
+def download_file(user, rng):
+    if not user.dataset.dokumen_ids:
+        return list_files(user, rng)
+    return Call('GET /dokumen/files/<id>/download', 'GET',
+                f"/dokumen/files/{rng.choice(user.dataset.dokumen_ids)}/download")
+
+
+def upload_file(user, rng):
+    size = int(16 * 1024 * 64 ** rng.random())  # 16 KB .. 1 MB
+    return Call('POST /dokumen/upload', 'POST', '/dokumen/upload',
+                files={'file': (f"bench-{user.index}-{rng.randint(0, 10**9)}.pdf", rng.randbytes(size))},
+                data={'bentuk_dokumen': 'Laporan', 'keterangan': 'benchmark'})
+
+
+def dashboard_batch(user, rng):
+    return Call('POST /batch (dashboard)', 'POST', '/batch', json={'requests': [
+        {'id': 'stats', 'path': '/stats/summary', 'params': {'months': 6}},
+        {'id': 'saldo', 'path': '/keuangan/saldo'},
+        {'id': 'kegiatan', 'path': '/kegiatan/mendatang'},
+        {'id': 'pengumuman', 'path': '/pengumuman/aktif'},
+        {'id': 'log', 'path': '/log/activities/recent'},
+    ]})
+
+
+# ---------------------------------------------------------------------------
+# Mix: [(operasi, bobot)]
+# ---------------------------------------------------------------------------
+
+MIXES = {
+    'client': [
+        (login, 2), (my_jemaat, 10), (my_keuangan, 8), (my_kegiatan, 6), (pengumuman_aktif, 8),
+        (kegiatan_mendatang, 5), (heartbeat, 20), (jemaat_detail, 4), (add_keuangan, 1), (add_log, 2),
+    ],
+    'admin': [
+        (admin_login, 1), (list_jemaat, 10), (list_jemaat_cursor, 4), (search_jemaat, 10),
+        (autocomplete_jemaat, 6), (jemaat_detail, 6), (jemaat_statistics, 3), (stats_summary, 3),
+        (keuangan_saldo, 4), (keuangan_laporan, 3), (list_keuangan, 4), (list_logs, 4), (recent_logs, 3),
+        (list_files, 4), (active_clients, 3), (dashboard_batch, 3),
+    ],
+    'heartbeat': [
+        (heartbeat, 80), (heartbeat_batch, 15), (active_clients, 5),
+    ],
+    'files': [
+        (upload_file, 2), (download_file, 10), (list_files, 4), (file_detail, 4),
+    ],
+}
+MIXES['mixed'] = (
+    [(op, weight * 5) for op, weight in MIXES['client']]
+    + [(op, weight * 3) for op, weight in MIXES['admin']]
+    + [(op, weight) for op, weight in MIXES['heartbeat']]
+    + [(op, weight * 2) for op, weight in MIXES['files']]
+)
+
+
+class Scenario:
+    """Pemilih operasi berbobot untuk satu mix"""
+
+    def __init__(self, mix):
+        if mix not in MIXES:
+            raise ValueError(f"Mix tidak dikenal: {mix} (pilihan: {', '.join(sorted(MIXES))})")
+        self.mix = mix
+        self.operations = [op for op, _ in MIXES[mix]]
+        self.weights = [weight for _, weight in MIXES[mix]]
+
+    def next_call(self, user, rng):
+        operation = rng.choices(self.operations, weights=self.weights)[0]
+        return operation(user, rng)
+
+
+# ---------------------------------------------------------------------------
+# Transport: app Flask di proses yang sama, atau server HTTP
+# ---------------------------------------------------------------------------
+
+class InProcessTransport:
+    """Request lewat app.test_client(): tanpa jaringan, mengukur API dan database saja"""
+
+    name = 'inprocess'
+
+    def __init__(self):
+        from app import app
+        self.app = app
+
+    def session(self):
+        return _TestClientSession(self.app.test_client())
+
+
+class _TestClientSession:
+    def __init__(self, client):
+        self.client = client
+
+    def send(self, call, headers):
+        kwargs = {'method': call.method, 'query_string': call.params, 'headers': headers}
+        if call.json is not None:
+            kwargs['json'] = call.json
+        if call.files:
+            data = dict(call.data or {})
+            for field, (filename, content) in call.files.items():
+                data[field] = (io.BytesIO(content), filename)
+            kwargs['data'] = data
+            kwargs['content_type'] = 'multipart/form-data'
+        elif call.data:
+            kwargs['data'] = call.data
+        response = self.client.open(call.path, **kwargs)
+        try:
+            return response.status_code, response.headers.get('ETag'), response.get_data()
+        finally:
+            response.close()
+
+    def close(self):
+        pass
+
+
+class HttpTransport:
+    """Request ke server API yang sedang berjalan (termasuk biaya HTTP dan server WSGI)"""
+
+    name = 'http'
+
+    def __init__(self, base_url, timeout=30):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def session(self):
+        return _HttpSession(self)
+
+
+class _HttpSession:
+    def __init__(self, transport):
+        self.transport = transport
+        self.session = transport.requests.Session()
+
+    def send(self, call, headers):
+        files = {field: (filename, content) for field, (filename, content) in call.files.items()} if call.files else None
+        response = self.session.request(call.method, self.transport.base_url + call.path, params=call.params,
+                                        json=call.json, data=call.data, files=files, headers=headers,
+                                        timeout=self.transport.timeout)
+        return response.status_code, response.headers.get('ETag'), response.content
+
+    def close(self):
+        self.session.close()
+
+
+def new_user(index, dataset, seed):
+    return VirtualUser(index, dataset, random.Random(f"{seed}-{index}"))
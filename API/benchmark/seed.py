@@ -0,0 +1,459 @@
+# Path: API/benchmark/seed.py
+# Generator data paroki sintetis untuk benchmark.
+#
+# Data dibuat deterministik dari --seed, sehingga dua database yang di-seed
+# dengan opsi yang sama berisi data yang sama (baseline bisa dibandingkan).
+# Tabel yang diisi dikosongkan dulu (TRUNCATE), lalu diisi dengan
+# executemany per SEED_BATCH baris:
+#   pengguna        bench_user_001.. (password BENCH_PASSWORD) + admin bench_admin
+#   wilayah_rohani  satu ketua per wilayah
+#   jemaat          per keluarga (no KK sama), NIK 16 digit sesuai tanggal lahir
+#                   dan jenis kelamin, tanggal baptis/komuni/krisma/perkawinan
+#   keuangan        beberapa tahun, --keuangan-per-month transaksi per bulan
+#   kegiatan        tersebar sampai 90 hari ke depan
+#   pengumuman      sebagian aktif
+#   dokumen         beserta file di blob store (ukuran acak sampai --max-file-kb)
+#   log_aktivitas   tersebar selama --years tahun
+# Setelah itu indeks pencarian jemaat dan rollup keuangan dibangun ulang.
+
+import datetime
+import hashlib
+import io
+import random
+import time
+
+SEED_BATCH = 1000
+BENCH_PASSWORD = 'bench123'
+BENCH_USER_PREFIX = 'bench_user_'
+BENCH_ADMIN = 'bench_admin'
+
+SEEDED_TABLES = (
+    'jemaat', 'jemaat_search_token', 'keuangan', 'keuangan_rollup', 'kegiatan',
+    'pengumuman', 'dokumen', 'log_aktivitas', 'client_connections', 'pengguna',
+    'wilayah_rohani',
+)
+
+WILAYAH_ROHANI = (
+    'ST. DOMINICO SAVIO', 'STA. BRIGITTA', 'ST. ALOYSIUS GONZAGA',
+    'ST. YOHANES BAPTISTA DE LA SALLE', 'ST. FRANSISKUS XAVERIUS', 'STA. THERESIA',
+    'ST. PETRUS', 'ST. PAULUS', 'STA. MARIA GORETTI', 'ST. YOSEF', 'STA. ANNA',
+    'ST. MIKAEL', 'STA. KATARINA', 'ST. ANTONIUS PADUA', 'STA. MONIKA', 'ST. AGUSTINUS',
+)
+NAMA_DEPAN_L = (
+    'Yohanes', 'Petrus', 'Paulus', 'Antonius', 'Fransiskus', 'Stefanus', 'Yosef', 'Markus',
+    'Agustinus', 'Benediktus', 'Dominikus', 'Gregorius', 'Ignatius', 'Kristoforus', 'Lukas',
+    'Matius', 'Nikolaus', 'Robertus', 'Vincentius', 'Adi', 'Budi', 'Hendra', 'Rudi', 'Andreas',
+)
+NAMA_DEPAN_P = (
+    'Maria', 'Anastasia', 'Bernadeta', 'Caecilia', 'Elisabeth', 'Fransiska', 'Katarina',
+    'Lusia', 'Margaretha', 'Monika', 'Theresia', 'Veronika', 'Yuliana', 'Agnes', 'Brigitta',
+    'Dewi', 'Sri', 'Rina', 'Natalia', 'Helena', 'Sisilia', 'Klara', 'Angela', 'Regina',
+)
+NAMA_KELUARGA = (
+    'Siregar', 'Simanjuntak', 'Sitompul', 'Wijaya', 'Santoso', 'Kurniawan', 'Gunawan',
+    'Hartono', 'Setiawan', 'Halim', 'Tanoto', 'Lumban Gaol', 'Nainggolan', 'Pardede',
+    'Sinaga', 'Manurung', 'Saragih', 'Tampubolon', 'Da Costa', 'Fernandez', 'Pereira',
+    'Kewa', 'Lewar', 'Bataona', 'Suryadi', 'Prasetyo', 'Wibowo', 'Susanto', 'Purba', 'Lie',
+)
+KOTA = ('Jakarta', 'Bekasi', 'Bogor', 'Depok', 'Tangerang', 'Medan', 'Kupang', 'Ende',
+        'Yogyakarta', 'Semarang', 'Surabaya', 'Bandung', 'Maumere', 'Pematangsiantar')
+JALAN = ('Jl. Melati', 'Jl. Kenanga', 'Jl. Mawar', 'Jl. Anggrek', 'Jl. Flamboyan',
+         'Jl. Cempaka', 'Jl. Dahlia', 'Jl. Kamboja', 'Jl. Teratai', 'Jl. Bougenville')
+PEKERJAAN = ('Karyawan Swasta', 'PNS', 'Wiraswasta', 'Guru', 'Petani', 'Pelajar',
+             'Mahasiswa', 'Ibu Rumah Tangga', 'Pensiunan', 'Dokter', 'Perawat', 'TNI/Polri')
+PENDIDIKAN = ('SD', 'SMP', 'SMA', 'D3', 'S1', 'S2')
+KODE_WILAYAH = ('317401', '317402', '317501', '327501', '327601', '367101', '127101', '537101')
+
+SUB_PEMASUKAN = ('Kolekte', 'Persembahan', 'Donasi', 'Operasional', 'Stipendium')
+SUB_PENGELUARAN = ('Operasional', 'Sosial', 'Pemeliharaan', 'Donasi', 'Listrik dan Air')
+KATEGORI_KEGIATAN = ('Misa', 'Doa', 'Sosial', 'Pendidikan', 'Ibadah', 'Katekese', 'Rohani', 'Administratif', 'Lainnya')
+NAMA_KEGIATAN = ('Misa Lingkungan', 'Doa Rosario', 'Bakti Sosial', 'Rekoleksi OMK', 'Katekese Persiapan Krisma',
+                 'Rapat Dewan Paroki', 'Ziarah', 'Pendalaman Iman APP', 'Latihan Koor', 'Misa Syukur')
+BENTUK_DOKUMEN = ('Surat', 'Laporan', 'Notulen', 'Proposal', 'Sertifikat', 'Lainnya')
+FILE_EXT = ('pdf', 'docx', 'xlsx', 'jpg', 'png')
+AKTIVITAS = ('Login berhasil', 'Application Closed', 'Tambah jemaat', 'Update jemaat', 'Tambah keuangan',
+             'Upload dokumen', 'Download dokumen', 'Tambah kegiatan', 'Update pengumuman', 'Export data')
+
+
+class Options:
+    """Ukuran dataset; nilai default cukup untuk paroki menengah"""
+
+    def __init__(self, jemaat=2000, years=5, keuangan_per_month=40, kegiatan=400, pengumuman=60,
+                 dokumen=150, max_file_kb=2048, logs=20000, users=20, wilayah=12, seed=42):
+        self.jemaat = jemaat
+        self.years = years
+        self.keuangan_per_month = keuangan_per_month
+        self.kegiatan = kegiatan
+        self.pengumuman = pengumuman
+        self.dokumen = dokumen
+        self.max_file_kb = max_file_kb
+        self.logs = logs
+        self.users = users
+        self.wilayah = max(1, min(wilayah, len(WILAYAH_ROHANI)))
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def password_hash(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _random_date(rng, start, end):
+    return start + datetime.timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+
+def _random_datetime(rng, start, end):
+    seconds = int((end - start).total_seconds())
+    return start + datetime.timedelta(seconds=rng.randint(0, max(0, seconds)))
+
+
+def _add_years(date, years):
+    try:
+        return date.replace(year=date.year + years)
+    except ValueError:  # 29 Februari
+        return date.replace(year=date.year + years, day=28)
+
+
+def _age(born, today):
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def _nik(rng, region, born, female):
+    """NIK 16 digit: kode wilayah (6), tanggal lahir DDMMYY (tanggal +40 untuk perempuan), nomor urut (4)"""
+    day = born.day + 40 if female else born.day
+    return f"{region}{day:02d}{born.month:02d}{born.year % 100:02d}{rng.randint(1, 9999):04d}"
+
+
+def _kategori_umur(age):
+    if age < 5:
+        return 'Balita'
+    if age < 13:
+        return 'Anak'
+    if age < 18:
+        return 'Remaja'
+    if age < 36:
+        return 'OMK'
+    if age < 60:
+        return 'Dewasa'
+    return 'Lansia'
+
+
+def _insert_many(connection, cursor, sql, rows):
+    for start in range(0, len(rows), SEED_BATCH):
+        connection.start_transaction()
+        cursor.executemany(sql, rows[start:start + SEED_BATCH])
+        connection.commit()
+    return len(rows)
+
+
+def _existing_tables(cursor):
+    cursor.execute("SHOW TABLES")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def reset_tables(cursor):
+    tables = _existing_tables(cursor)
+    cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+    try:
+        for table in SEEDED_TABLES:
+            if table in tables:
+                cursor.execute(f"TRUNCATE TABLE {table}")
+    finally:
+        cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+
+
+def _seed_users(connection, cursor, options):
+    hashed = password_hash(BENCH_PASSWORD)
+    rows = [(f"{BENCH_USER_PREFIX}{i:03d}", hashed, f"Pengguna Benchmark {i}", f"{BENCH_USER_PREFIX}{i:03d}@bench.local", 'user')
+            for i in range(1, options.users + 1)]
+    _insert_many(connection, cursor, """
+        INSERT INTO pengguna (username, password, nama_lengkap, email, peran, is_active)
+        VALUES (%s, %s, %s, %s, %s, 1)
+    """, rows)
+    cursor.execute("SELECT id_pengguna FROM pengguna WHERE username LIKE %s ORDER BY id_pengguna", (f"{BENCH_USER_PREFIX}%",))
+    user_ids = [row[0] for row in cursor.fetchall()]
+
+    cursor.execute("SELECT id_admin FROM admin WHERE username = %s", (BENCH_ADMIN,))
+    row = cursor.fetchone()
+    if row:
+        admin_id = row[0]
+    else:
+        cursor.execute("""
+            INSERT INTO admin (username, password, nama_lengkap, email, peran, is_active)
+            VALUES (%s, %s, %s, %s, 'Admin', 1)
+        """, (BENCH_ADMIN, hashed, 'Admin Benchmark', 'bench_admin@bench.local'))
+        admin_id = cursor.lastrowid
+        connection.commit()
+    return user_ids, admin_id
+
+
+def _seed_wilayah(connection, cursor, rng, wilayah):
+    rows = []
+    for name in wilayah:
+        female = rng.random() < 0.5
+        nama = f"{rng.choice(NAMA_DEPAN_P if female else NAMA_DEPAN_L)} {rng.choice(NAMA_KELUARGA)}"
+        rows.append((name, nama, 'Perempuan' if female else 'Laki-laki', 'Ketua', f"08{rng.randint(10**9, 10**10 - 1)}",
+                     f"{rng.choice(JALAN)} No. {rng.randint(1, 200)}", '2024-2027'))
+    return _insert_many(connection, cursor, """
+        INSERT INTO wilayah_rohani (wilayah_rohani, nama_lengkap, jenis_kelamin, jabatan, no_hp, alamat, masa_jabatan, status)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, 'Aktif')
+    """, rows)
+
+
+JEMAAT_COLUMNS = (
+    'nama_lengkap', 'nik', 'nama_keluarga', 'no_kk', 'alamat', 'email', 'no_telepon', 'tanggal_lahir',
+    'tempat_lahir', 'umur', 'status_kekatolikan', 'kategori', 'hubungan_keluarga', 'jenis_kelamin',
+    'status_perkawinan', 'tanggal_perkawinan', 'kota_perkawinan', 'status_keanggotaan', 'jenis_pekerjaan',
+    'pendidikan_terakhir', 'nama_babtis', 'status_babtis', 'status_ekaristi', 'status_krisma',
+    'wilayah_rohani', 'created_by_pengguna', 'tanggal_babtis', 'tempat_babtis', 'tanggal_komuni',
+    'tempat_komuni', 'tanggal_krisma', 'tempat_krisma',
+)
+
+
+def _jemaat_row(rng, today, family, member, born, female, user_id, married_on=None):
+    age = _age(born, today)
+    nama_depan = rng.choice(NAMA_DEPAN_P if female else NAMA_DEPAN_L)
+    kota = family['kota']
+    baptis_dewasa = member == 'Kepala Keluarga' and rng.random() < 0.1
+    if baptis_dewasa:
+        tanggal_babtis = _add_years(born, rng.randint(18, 30)) + datetime.timedelta(days=rng.randint(0, 300))
+    else:
+        tanggal_babtis = born + datetime.timedelta(days=rng.randint(30, 365))
+    if tanggal_babtis > today:
+        tanggal_babtis = None
+    tanggal_komuni = _add_years(born, rng.choice((9, 10))) if age >= 10 else None
+    tanggal_krisma = _add_years(born, rng.randint(15, 17)) if age >= 17 and rng.random() < 0.85 else None
+    if age >= 60:
+        pekerjaan = 'Pensiunan'
+    elif age >= 23:
+        pekerjaan = rng.choice(PEKERJAAN)
+    elif age >= 6:
+        pekerjaan = 'Pelajar' if age < 19 else 'Mahasiswa'
+    else:
+        pekerjaan = None
+    status_keanggotaan = 'Aktif' if rng.random() < 0.92 else rng.choice(('Pindah', 'Meninggal', 'Tidak Aktif'))
+    return (
+        f"{nama_depan} {family['nama_keluarga']}",
+        _nik(rng, family['region'], born, female),
+        family['nama_keluarga'],
+        family['no_kk'],
+        family['alamat'],
+        f"{nama_depan.lower()}.{family['no_kk'][-6:]}@mail.local" if age >= 17 else None,
+        f"08{rng.randint(10**9, 10**10 - 1)}" if age >= 15 else None,
+        born,
+        kota,
+        age,
+        'Baptis Dewasa' if baptis_dewasa else 'Kelahiran',
+        _kategori_umur(age),
+        member,
+        'Perempuan' if female else 'Laki-laki',
+        'Menikah' if married_on else 'Belum Menikah',
+        married_on,
+        kota if married_on else None,
+        status_keanggotaan,
+        pekerjaan,
+        rng.choice(PENDIDIKAN) if age >= 23 else None,
+        rng.choice(NAMA_DEPAN_P if female else NAMA_DEPAN_L),
+        'Sudah' if tanggal_babtis else 'Belum',
+        'Sudah' if tanggal_komuni else 'Belum',
+        'Sudah' if tanggal_krisma else 'Belum',
+        family['wilayah'],
+        user_id,
+        tanggal_babtis,
+        f"Gereja {rng.choice(KOTA)}" if tanggal_babtis else None,
+        tanggal_komuni,
+        f"Gereja {kota}" if tanggal_komuni else None,
+        tanggal_krisma,
+        f"Gereja {kota}" if tanggal_krisma else None,
+    )
+
+
+def _generate_jemaat(rng, options, wilayah, user_ids, today):
+    rows = []
+    family_no = 0
+    while len(rows) < options.jemaat:
+        family_no += 1
+        region = rng.choice(KODE_WILAYAH)
+        issued = _random_date(rng, datetime.date(2005, 1, 1), today)
+        family = {
+            'region': region,
+            'no_kk': f"{region}{issued.day:02d}{issued.month:02d}{issued.year % 100:02d}{family_no % 10000:04d}",
+            'nama_keluarga': rng.choice(NAMA_KELUARGA),
+            'alamat': f"{rng.choice(JALAN)} No. {rng.randint(1, 250)}, {rng.choice(KOTA)}",
+            'kota': rng.choice(KOTA),
+            'wilayah': rng.choice(wilayah),
+        }
+        user_id = rng.choice(user_ids) if user_ids and rng.random() < 0.7 else None
+
+        head_age = rng.randint(28, 75)
+        head_born = _random_date(rng, _add_years(today, -head_age - 1), _add_years(today, -head_age))
+        head_female = rng.random() < 0.15
+        married = rng.random() < 0.8
+        married_on = _add_years(head_born, rng.randint(23, min(head_age, 35))) if married else None
+        rows.append(_jemaat_row(rng, today, family, 'Kepala Keluarga', head_born, head_female, user_id, married_on))
+
+        if married:
+            spouse_born = _random_date(rng, _add_years(head_born, -5), _add_years(head_born, 5))
+            rows.append(_jemaat_row(rng, today, family, 'Suami' if head_female else 'Istri', spouse_born,
+                                    not head_female, user_id, married_on))
+            first_child = married_on + datetime.timedelta(days=rng.randint(300, 900))
+            for _ in range(rng.choice((0, 1, 2, 2, 3, 3, 4))):
+                if first_child >= today:
+                    break
+                rows.append(_jemaat_row(rng, today, family, 'Anak', first_child, rng.random() < 0.5, user_id))
+                first_child += datetime.timedelta(days=rng.randint(500, 1500))
+    return rows[:options.jemaat]
+
+
+def _generate_keuangan(rng, options, user_ids, today):
+    rows = []
+    start = datetime.date(today.year - options.years + 1, 1, 1)
+    month = start
+    while month <= today:
+        next_month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        end = min(next_month - datetime.timedelta(days=1), today)
+        for _ in range(options.keuangan_per_month):
+            pemasukan = rng.random() < 0.6
+            sub = rng.choice(SUB_PEMASUKAN if pemasukan else SUB_PENGELUARAN)
+            jumlah = rng.randint(5, 5000) * 10000
+            rows.append((_random_date(rng, month, end), 'Pemasukan' if pemasukan else 'Pengeluaran', sub, jumlah,
+                         f"{sub} {month.strftime('%B %Y')}", rng.choice(user_ids) if user_ids else None))
+        month = next_month
+    return rows
+
+
+def _generate_kegiatan(rng, options, user_ids, today):
+    rows = []
+    start = datetime.date(today.year - options.years + 1, 1, 1)
+    end = today + datetime.timedelta(days=90)
+    for _ in range(options.kegiatan):
+        tanggal = _random_date(rng, start, end)
+        if tanggal < today:
+            status = 'Selesai' if rng.random() < 0.95 else 'Dibatalkan'
+        else:
+            status = 'Direncanakan'
+        rows.append((
+            rng.choice(NAMA_KEGIATAN), f"Gereja {rng.choice(KOTA)}", tanggal,
+            datetime.time(rng.choice((6, 8, 10, 16, 18, 19)), rng.choice((0, 30))),
+            f"{rng.choice(NAMA_DEPAN_L)} {rng.choice(NAMA_KELUARGA)}", rng.choice(KATEGORI_KEGIATAN),
+            status, rng.randint(0, 200) * 50000, None,
+            rng.choice(user_ids) if user_ids else None, rng.choice(('Umum', 'OMK', 'Lansia', 'Anak', 'Keluarga')),
+        ))
+    return rows
+
+
+def _generate_pengumuman(rng, options):
+    rows = []
+    for i in range(options.pengumuman):
+        judul = f"Pengumuman {rng.choice(NAMA_KEGIATAN)} #{i + 1}"
+        rows.append((judul, f"{judul}. " * rng.randint(3, 20), rng.choice(('Umum', 'OMK', 'Lansia', 'Keluarga')),
+                     'Administrator', 'Sekretariat Paroki', 1 if i >= options.pengumuman - 10 else 0))
+    return rows
+
+
+def _seed_dokumen(connection, cursor, rng, options, admin_id, today):
+    from blob_store import blob_store
+
+    rows = []
+    total_bytes = 0
+    start = datetime.datetime.combine(today - datetime.timedelta(days=365 * options.years), datetime.time())
+    now = datetime.datetime.combine(today, datetime.time())
+    for i in range(options.dokumen):
+        ext = rng.choice(FILE_EXT)
+        # Sebagian besar file kecil, sedikit yang besar (log-uniform 4 KB .. max_file_kb)
+        size = int(4096 * (max(1.0, options.max_file_kb / 4)) ** rng.random())
+        data = rng.randbytes(size)
+        file_hash, file_path, _ = blob_store.put_stream(io.BytesIO(data), ext)
+        total_bytes += size
+        bentuk = rng.choice(BENTUK_DOKUMEN)
+        rows.append((f"{bentuk} {i + 1:04d}.{ext}", bentuk, bentuk, file_path, file_hash, size,
+                     f"Dokumen benchmark {i + 1}", _random_datetime(rng, start, now), admin_id))
+    _insert_many(connection, cursor, """
+        INSERT INTO dokumen (nama_dokumen, bentuk_dokumen, kategori_file, file_path, file_hash, ukuran_file,
+                             keterangan, upload_date, uploaded_by_admin)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, rows)
+    return len(rows), total_bytes
+
+
+def _generate_logs(rng, options, user_ids, admin_id, today):
+    start = datetime.datetime.combine(today - datetime.timedelta(days=365 * options.years), datetime.time())
+    now = datetime.datetime.now()
+    rows = []
+    for _ in range(options.logs):
+        by_admin = rng.random() < 0.3 or not user_ids
+        aktivitas = rng.choice(AKTIVITAS)
+        rows.append((admin_id if by_admin else None, None if by_admin else rng.choice(user_ids), aktivitas,
+                     f"{aktivitas} (benchmark)", f"192.168.{rng.randint(0, 10)}.{rng.randint(2, 254)}",
+                     _random_datetime(rng, start, now)))
+    rows.sort(key=lambda row: row[-1])
+    return rows
+
+
+def _rebuild_indexes(connection):
+    import finance_rollup
+    import jemaat_search
+
+    for name, rebuild in (('jemaat_search', jemaat_search.rebuild), ('finance_rollup', finance_rollup.rebuild)):
+        try:
+            rebuild(connection)
+        except Exception as e:
+            print(f"[SEED] Gagal membangun ulang {name}: {e}")
+
+
+def seed(connection, options):
+    """Kosongkan tabel benchmark lalu isi dengan data sintetis. Return jumlah row per tabel."""
+    rng = random.Random(options.seed)
+    today = datetime.date.today()
+    counts = {}
+    started = time.perf_counter()
+    cursor = connection.cursor()
+    try:
+        reset_tables(cursor)
+        connection.commit()
+
+        user_ids, admin_id = _seed_users(connection, cursor, options)
+        counts['pengguna'] = len(user_ids)
+
+        wilayah = list(WILAYAH_ROHANI[:options.wilayah])
+        counts['wilayah_rohani'] = _seed_wilayah(connection, cursor, rng, wilayah)
+
+        columns = ', '.join(JEMAAT_COLUMNS)
+        placeholders = ', '.join(['%s'] * len(JEMAAT_COLUMNS))
+        counts['jemaat'] = _insert_many(connection, cursor, f"INSERT INTO jemaat ({columns}) VALUES ({placeholders})",
+                                        _generate_jemaat(rng, options, wilayah, user_ids, today))
+        print(f"[SEED] jemaat: {counts['jemaat']}")
+
+        counts['keuangan'] = _insert_many(connection, cursor, """
+            INSERT INTO keuangan (tanggal, kategori, sub_kategori, jumlah, keterangan, created_by_pengguna)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, _generate_keuangan(rng, options, user_ids, today))
+        print(f"[SEED] keuangan: {counts['keuangan']}")
+
+        counts['kegiatan'] = _insert_many(connection, cursor, """
+            INSERT INTO kegiatan (nama_kegiatan, lokasi, tanggal_kegiatan, waktu_kegiatan, penanggung_jawab,
+                                  kategori, status, biaya, keterangan, created_by_pengguna, sasaran_kegiatan)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, _generate_kegiatan(rng, options, user_ids, today))
+
+        counts['pengumuman'] = _insert_many(connection, cursor, """
+            INSERT INTO pengumuman (judul, isi, sasaran, pembuat, penanggung_jawab, is_active)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, _generate_pengumuman(rng, options))
+
+        counts['dokumen'], counts['dokumen_bytes'] = _seed_dokumen(connection, cursor, rng, options, admin_id, today)
+        print(f"[SEED] dokumen: {counts['dokumen']} ({counts['dokumen_bytes'] / 1024 / 1024:.1f} MB)")
+
+        counts['log_aktivitas'] = _insert_many(connection, cursor, """
+            INSERT INTO log_aktivitas (id_admin, id_pengguna, aktivitas, detail, ip_address, timestamp)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, _generate_logs(rng, options, user_ids, admin_id, today))
+        print(f"[SEED] log_aktivitas: {counts['log_aktivitas']}")
+    finally:
+        cursor.close()
+
+    _rebuild_indexes(connection)
+    counts['seconds'] = round(time.perf_counter() - started, 1)
+    return counts
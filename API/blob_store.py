@@ -0,0 +1,264 @@
+# Path: API/blob_store.py
+# Penyimpanan file berbasis isi (content-addressed) untuk dokumen dan foto struktur.
+#
+# Setiap file disimpan sekali dengan nama SHA-256 isinya, di-shard per dua
+# level direktori: uploads/blobs/ab/cd/abcd...<ext>. Ekstensi hanya kosmetik
+# (supaya foto yang disajikan statis mendapat MIME type yang benar); pencarian
+# selalu berdasarkan hash. Jumlah referensi dihitung dari kolom dokumen.file_hash
+# dan struktur.foto_hash, dan blob dihapus saat referensi terakhir hilang.
+# Blob yang terlewat (masih baru saat row dihapus, atau upload yang tidak jadi
+# disimpan) disapu thread GC berkala (start_gc_scheduler, dipanggil dari app.py).
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+BLOB_DIR = os.path.join('uploads', 'blobs')
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# Blob tanpa referensi yang lebih muda dari ini tidak dihapus oleh GC
+# (mis. foto struktur baru yang sudah diupload tetapi datanya belum disimpan)
+GC_MIN_AGE_SECONDS = 24 * 60 * 60
+
+# Saat row dihapus, blob yang baru saja diupload/dipakai ulang dibiarkan untuk
+# GC berikutnya karena mungkin sedang menunggu direferensikan row baru
+RECENT_USE_GRACE_SECONDS = 60 * 60
+
+# Jarak antar sapuan GC otomatis; hanya satu proses API yang menyapu sekaligus
+GC_INTERVAL_SECONDS = 6 * 60 * 60
+
+_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+_PATH_HASH_RE = re.compile(r'blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(?:\.\w+)?$')
+
+# Kolom yang mereferensikan blob: (tabel, kolom hash)
+BLOB_REFERENCES = (
+    ('dokumen', 'file_hash'),
+    ('struktur', 'foto_hash'),
+)
+
+
+class BlobLockError(Exception):
+    """Named lock blob tidak didapat dalam batas waktu"""
+
+
+def is_valid_hash(value):
+    return bool(value) and bool(_HASH_RE.match(value))
+
+
+def hash_from_path(path):
+    """Ambil hash dari path/URL blob, None jika bukan path blob"""
+    if not path:
+        return None
+    match = _PATH_HASH_RE.search(str(path).replace('\\', '/'))
+    return match.group(1) if match else None
+
+
+class BlobStore:
+
+    def __init__(self, root=BLOB_DIR):
+        self.root = root
+
+    def _shard_dir(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4])
+
+    def find(self, sha256):
+        """Return path blob jika sudah ada, selain itu None"""
+        if not is_valid_hash(sha256):
+            return None
+        shard = self._shard_dir(sha256)
+        try:
+            for name in os.listdir(shard):
+                if name.split('.', 1)[0] == sha256:
+                    return os.path.join(shard, name)
+        except FileNotFoundError:
+            pass
+        return None
+
+    def put_file(self, src_path, sha256, ext=''):
+        """Pindahkan file yang sudah di-hash ke store.
+
+        Jika isi yang sama sudah ada, src_path dihapus dan blob lama dipakai.
+        Return (path blob, created).
+        """
+        existing = self.find(sha256)
+        if existing:
+            os.remove(src_path)
+            # Perbarui mtime supaya GC tidak menghapus blob yang baru dipakai ulang
+            os.utime(existing)
+            return existing, False
+
+        shard = self._shard_dir(sha256)
+        os.makedirs(shard, exist_ok=True)
+        ext = f".{ext.lower().lstrip('.')}" if ext else ''
+        path = os.path.join(shard, f"{sha256}{ext}")
+        os.replace(src_path, path)
+        return path, True
+
+    def put_stream(self, stream, ext=''):
+        """Simpan isi stream (mis. FileStorage) sambil menghitung hash. Return (sha256, path, created)."""
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for block in iter(lambda: stream.read(READ_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    f.write(block)
+            sha256 = digest.hexdigest()
+            path, created = self.put_file(tmp_path, sha256, ext)
+            return sha256, path, created
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def remove(self, sha256):
+        path = self.find(sha256)
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def iter_blobs(self):
+        """Yield (sha256, path) untuk semua blob"""
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                sha256 = name.split('.', 1)[0]
+                if is_valid_hash(sha256):
+                    yield sha256, os.path.join(dirpath, name)
+
+
+blob_store = BlobStore()
+
+
+@contextmanager
+def blob_lock(cursor, sha256, timeout=10):
+    """Named lock MySQL per hash supaya tambah referensi dan GC tidak balapan antar worker"""
+    name = f"blob:{sha256[:56]}"
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (name, timeout))
+    row = cursor.fetchone()
+    cursor.fetchall()
+    acquired = row[0] if not isinstance(row, dict) else list(row.values())[0]
+    if acquired != 1:
+        # 0 = timeout, NULL = error: jangan lanjut tanpa lock
+        raise BlobLockError(f"Lock blob {sha256[:12]} tidak didapat dalam {timeout} detik")
+    try:
+        yield
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        cursor.fetchall()
+
+
+def count_references(cursor, sha256):
+    total = 0
+    for table, column in BLOB_REFERENCES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = %s", (sha256,))
+        row = cursor.fetchone()
+        total += (row[0] if not isinstance(row, dict) else list(row.values())[0]) or 0
+    return total
+
+
+def release_blob(connection, sha256, min_age=RECENT_USE_GRACE_SECONDS):
+    """Hapus blob jika tidak ada lagi row yang mereferensikannya. Dipanggil setelah commit."""
+    path = blob_store.find(sha256)
+    if not path:
+        return False
+    try:
+        if time.time() - os.path.getmtime(path) < min_age:
+            return False
+    except FileNotFoundError:
+        return False
+
+    cursor = connection.cursor()
+    try:
+        with blob_lock(cursor, sha256):
+            # Akhiri snapshot lama supaya hitungan melihat referensi yang baru di-commit
+            connection.commit()
+            if count_references(cursor, sha256) == 0:
+                blob_store.remove(sha256)
+                print(f"[BLOB] Blob {sha256[:12]} dihapus (tidak ada referensi)")
+                return True
+        return False
+    except BlobLockError as e:
+        # Blob sedang dipakai request lain; dibiarkan untuk GC berikutnya
+        print(f"[BLOB] {e}, dilewati")
+        return False
+    finally:
+        cursor.close()
+
+
+def collect_garbage(connection, min_age=GC_MIN_AGE_SECONDS):
+    """Hapus semua blob tanpa referensi yang lebih tua dari min_age detik"""
+    removed = 0
+    freed = 0
+    for sha256, path in list(blob_store.iter_blobs()):
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            continue
+        if release_blob(connection, sha256, min_age):
+            removed += 1
+            freed += size
+    return {'removed': removed, 'freed_bytes': freed}
+
+
+_gc_thread = None
+_gc_thread_lock = threading.Lock()
+
+
+def start_gc_scheduler(interval=GC_INTERVAL_SECONDS):
+    """Jalankan collect_garbage setiap interval detik di thread latar belakang (sekali per proses)"""
+    global _gc_thread
+    with _gc_thread_lock:
+        if _gc_thread is None:
+            _gc_thread = threading.Thread(target=_gc_loop, args=(interval,), name='blob-gc', daemon=True)
+            _gc_thread.start()
+
+
+def _gc_loop(interval):
+    from config import get_db_connection
+
+    while True:
+        time.sleep(interval)
+        connection = get_db_connection()
+        if not connection:
+            print("[BLOB] GC berkala dilewati: database tidak tersedia")
+            continue
+        cursor = connection.cursor()
+        try:
+            # Proses API lain yang sedang menyapu cukup dibiarkan
+            cursor.execute("SELECT GET_LOCK('blob_gc', 0)")
+            if cursor.fetchone()[0] != 1:
+                continue
+            try:
+                result = collect_garbage(connection)
+                if result['removed']:
+                    print(f"[BLOB] GC berkala: {result['removed']} blob dihapus, {result['freed_bytes']} bytes")
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK('blob_gc')")
+                cursor.fetchall()
+        except Exception as e:
+            print(f"[BLOB] GC berkala gagal: {e}")
+        finally:
+            cursor.close()
+            connection.close()
+
+
+def blob_stats():
+    count = 0
+    total = 0
+    for _, path in blob_store.iter_blobs():
+        try:
+            total += os.path.getsize(path)
+            count += 1
+        except FileNotFoundError:
+            continue
+    return {'blobs': count, 'total_bytes': total}
@@ -0,0 +1,311 @@
+# Path: API/chunked_upload.py
+# Upload dokumen bertahap (chunked) yang bisa dilanjutkan setelah koneksi putus.
+#
+# Protokol (route ada di dokumen_routes.py):
+#   POST   /dokumen/uploads                 -> init, return upload_id + chunk_size
+#   PUT    /dokumen/uploads/<id>?offset=N   -> kirim satu chunk sebagai body mentah,
+#                                              header X-Chunk-SHA256 wajib
+#   GET    /dokumen/uploads/<id>            -> jumlah byte yang sudah diterima (resume)
+#   POST   /dokumen/uploads/<id>/commit     -> verifikasi lalu simpan sebagai dokumen
+#                                              (boleh diulang jika gagal, tanpa kirim ulang chunk)
+#   DELETE /dokumen/uploads/<id>            -> batalkan upload
+#
+# State disimpan di disk (uploads/tmp) sehingga upload tetap bisa dilanjutkan
+# setelah restart server atau jika chunk berikutnya ditangani worker lain.
+# Penulisan ke satu upload dikunci dengan file lock (<id>.lock, fcntl/msvcrt)
+# sehingga berlaku antar thread maupun antar proses worker.
+
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _try_lock(f):
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(f):
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+UPLOAD_TMP_DIR = os.path.join('uploads', 'tmp')
+
+# Ukuran chunk yang disarankan ke client; harus di bawah MAX_CONTENT_LENGTH (16MB)
+CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', str(4 * 1024 * 1024)))
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', str(2 * 1024 * 1024 * 1024)))
+
+# Upload yang tidak disentuh selama ini dianggap ditinggalkan
+STALE_AFTER_SECONDS = 24 * 60 * 60
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """Error protokol upload; status = HTTP status code, extra ikut dikirim ke client"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.extra = extra
+
+
+def sha256_file(path):
+    """Hitung SHA-256 file secara streaming"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkedUploadStore:
+    """Penyimpanan sesi upload chunked di direktori sementara"""
+
+    def __init__(self, base_dir=UPLOAD_TMP_DIR, stale_after=STALE_AFTER_SECONDS):
+        self.base_dir = base_dir
+        self.stale_after = stale_after
+
+    def create(self, metadata, total_size=None):
+        if total_size is not None:
+            if total_size < 0:
+                raise UploadError('Ukuran file tidak valid')
+            if total_size > MAX_UPLOAD_SIZE:
+                raise UploadError(f'Ukuran file melebihi batas {MAX_UPLOAD_SIZE} bytes', 413)
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.purge_stale()
+
+        upload_id = uuid.uuid4().hex
+        state = {
+            'upload_id': upload_id,
+            'metadata': metadata,
+            'total_size': total_size,
+            'received': 0,
+            'created_at': time.time(),
+            'updated_at': time.time(),
+        }
+        open(self._lock_path(upload_id), 'wb').close()
+        open(self._part_path(upload_id), 'wb').close()
+        self._save(state)
+        return state
+
+    def get(self, upload_id):
+        state = self._load(upload_id)
+        # Ukuran file .part adalah sumber kebenaran (chunk gagal sudah di-truncate)
+        try:
+            state['received'] = os.path.getsize(self._part_path(upload_id))
+        except FileNotFoundError:
+            raise UploadError('Upload tidak ditemukan atau sudah kedaluwarsa', 404)
+        return state
+
+    def append(self, upload_id, offset, stream, expected_sha256):
+        """Tulis satu chunk dari stream ke file .part secara streaming.
+
+        offset harus sama dengan jumlah byte yang sudah diterima (409 jika
+        tidak, dengan `received` untuk resume). Chunk yang gagal atau
+        checksum-nya salah di-truncate sehingga bisa dikirim ulang.
+        """
+        self._check_id(upload_id)
+        if not expected_sha256:
+            raise UploadError('Header X-Chunk-SHA256 wajib diisi')
+
+        with self._locked(upload_id):
+            if self._load(upload_id).get('sha256'):
+                raise UploadError('Upload sudah diselesaikan', 409)
+            state = self.get(upload_id)
+            received = state['received']
+            if offset != received:
+                raise UploadError('Offset chunk tidak sesuai', 409, received=received)
+
+            total = state['total_size']
+            part_path = self._part_path(upload_id)
+            digest = hashlib.sha256()
+            written = 0
+            try:
+                with open(part_path, 'ab') as f:
+                    while True:
+                        block = stream.read(READ_BLOCK_SIZE)
+                        if not block:
+                            break
+                        written += len(block)
+                        if written > MAX_CHUNK_SIZE:
+                            raise UploadError(f'Chunk melebihi batas {MAX_CHUNK_SIZE} bytes', 413)
+                        if total is not None and received + written > total:
+                            raise UploadError('Data melebihi ukuran file yang dideklarasikan')
+                        if received + written > MAX_UPLOAD_SIZE:
+                            raise UploadError(f'Ukuran file melebihi batas {MAX_UPLOAD_SIZE} bytes', 413)
+                        digest.update(block)
+                        f.write(block)
+
+                if digest.hexdigest() != expected_sha256.strip().lower():
+                    raise UploadError('Checksum chunk tidak cocok', received=received)
+            except Exception:
+                os.truncate(part_path, received)
+                raise
+
+            state['received'] = received + written
+            state['updated_at'] = time.time()
+            self._save(state)
+            return state
+
+    @contextmanager
+    def finish(self, upload_id, expected_sha256=None):
+        """Verifikasi upload lengkap lalu yield (path file, size, sha256, metadata).
+
+        Dipakai dengan `with`: lock upload dipegang sampai blok selesai, dan
+        file upload baru dihapus jika blok selesai tanpa exception. Jika blok
+        gagal (database mati, INSERT gagal), commit bisa diulang tanpa
+        mengirim ulang chunk. Path None berarti file sudah dipindah ke blob
+        store oleh percobaan sebelumnya.
+        """
+        self._check_id(upload_id)
+        with self._locked(upload_id):
+            state = self._load(upload_id)
+            part_path = self._part_path(upload_id)
+            commit_path = self._commit_path(upload_id)
+            checksum = state.get('sha256')
+            if checksum is None:
+                state = self.get(upload_id)
+                received = state['received']
+                total = state['total_size']
+                if total is not None and received != total:
+                    raise UploadError('Upload belum lengkap', 409, received=received)
+                checksum = sha256_file(part_path)
+                if expected_sha256 and checksum != expected_sha256.strip().lower():
+                    raise UploadError('Checksum file tidak cocok')
+                # Dicatat sebelum .part dipindah: chunk baru ditolak, retry tidak hash ulang
+                state['sha256'] = checksum
+                state['updated_at'] = time.time()
+                self._save(state)
+            elif expected_sha256 and checksum != expected_sha256.strip().lower():
+                raise UploadError('Checksum file tidak cocok')
+            if not os.path.exists(commit_path) and os.path.exists(part_path):
+                os.replace(part_path, commit_path)
+
+            yield (commit_path if os.path.exists(commit_path) else None,
+                   state['received'], checksum, state['metadata'])
+            self._remove_files(upload_id)
+        try:
+            os.remove(self._lock_path(upload_id))
+        except OSError:
+            pass
+
+    def discard(self, upload_id):
+        self._check_id(upload_id)
+        try:
+            with self._locked(upload_id):
+                self._remove_files(upload_id)
+        except UploadError as e:
+            if e.status != 404:
+                raise
+            # Tanpa file lock (sudah dihapus, atau upload dari versi lama): bersihkan sisa file
+            self._remove_files(upload_id)
+        # Dihapus setelah dilepas (Windows tidak bisa menghapus file yang masih terbuka)
+        try:
+            os.remove(self._lock_path(upload_id))
+        except OSError:
+            pass
+
+    def purge_stale(self):
+        """Hapus upload yang sudah lama ditinggalkan"""
+        if not os.path.isdir(self.base_dir):
+            return 0
+        cutoff = time.time() - self.stale_after
+        purged = 0
+        for name in os.listdir(self.base_dir):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-5]
+            try:
+                if os.path.getmtime(os.path.join(self.base_dir, name)) < cutoff:
+                    self.discard(upload_id)
+                    purged += 1
+            except (OSError, UploadError):
+                continue
+        if purged:
+            print(f"[UPLOAD] {purged} upload chunked yang ditinggalkan dihapus")
+        return purged
+
+    def _remove_files(self, upload_id):
+        for path in (self._part_path(upload_id), self._commit_path(upload_id), self._meta_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _locked(self, upload_id):
+        """File lock eksklusif untuk satu upload. Tidak menunggu: jika request lain
+        (thread atau worker lain) sedang menulis upload yang sama, 409."""
+        try:
+            f = open(self._lock_path(upload_id), 'r+b')
+        except FileNotFoundError:
+            raise UploadError('Upload tidak ditemukan atau sudah kedaluwarsa', 404)
+        try:
+            if not _try_lock(f):
+                raise UploadError('Upload sedang diproses request lain', 409)
+            try:
+                yield
+            finally:
+                _unlock(f)
+        finally:
+            f.close()
+
+    def _load(self, upload_id):
+        self._check_id(upload_id)
+        try:
+            with open(self._meta_path(upload_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadError('Upload tidak ditemukan atau sudah kedaluwarsa', 404)
+
+    def _save(self, state):
+        meta_path = self._meta_path(state['upload_id'])
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, meta_path)
+
+    def _check_id(self, upload_id):
+        if not _UPLOAD_ID_RE.match(upload_id or ''):
+            raise UploadError('Upload tidak ditemukan atau sudah kedaluwarsa', 404)
+
+    def _part_path(self, upload_id):
+        return os.path.join(self.base_dir, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id):
+        return os.path.join(self.base_dir, f"{upload_id}.json")
+
+    def _commit_path(self, upload_id):
+        return os.path.join(self.base_dir, f"{upload_id}.commit")
+
+    def _lock_path(self, upload_id):
+        return os.path.join(self.base_dir, f"{upload_id}.lock")
+
+
+upload_store = ChunkedUploadStore()
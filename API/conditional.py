@@ -0,0 +1,229 @@
+# Path: API/conditional.py
+# Conditional GET (ETag / If-None-Match -> 304) dan kompresi response.
+#
+# ETag endpoint list dihitung dari counter versi per tabel (tabel
+# table_version, sql/67-create_table_version.sql) ditambah URL lengkap
+# (termasuk user_id dan filter) dan tanggal hari ini (beberapa list memfilter
+# berdasarkan tanggal). Versi dinaikkan bump_table_versions sekali per request
+# tulis yang berhasil, setelah route commit dan memperbarui indeks pencarian
+# jemaat: response yang diberi ETag versi baru selalu dihitung dari data dan
+# indeks yang sudah lengkap.
+# Menghitungnya hanya butuh satu query primary key, dan jika ETag cocok route
+# tidak dijalankan sama sekali: client yang refresh berkala tanpa ada
+# perubahan data hanya menerima 304 tanpa body.
+#
+# Response JSON/teks >= COMPRESS_MIN_SIZE dikompres gzip (atau brotli jika
+# modul brotli terpasang dan diminta client). Stream (SSE, export) dan
+# download file tidak disentuh: keduanya mengatur header sendiri dan
+# download butuh Content-Length asli untuk resume.
+
+import datetime
+import gzip
+import hashlib
+from flask import g
+from config import get_db_connection
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+VERSION_TABLE = 'table_version'
+
+# Endpoint (blueprint.fungsi) -> tabel yang isinya menentukan response
+CONDITIONAL_ENDPOINTS = {
+    'aset.get_aset': ('aset',),
+    'binaan.get_binaan': ('k_binaan',),
+    'buku_kronik.get_buku_kronik_list': ('buku_kronik',),
+    'dokumen.get_files': ('dokumen', 'admin'),
+    'jemaat.get_my_jemaat': ('jemaat',),
+    'jemaat.get_jemaat': ('jemaat',),
+    'kategorial.get_kategorial': ('kategorial',),
+    'kegiatan.get_my_kegiatan': ('kegiatan', 'pengguna'),
+    'kegiatan.get_kegiatan': ('kegiatan', 'pengguna'),
+    'kegiatan_wr.get_my_kegiatan_wr': ('kegiatan_wr', 'pengguna'),
+    'kegiatan_wr.get_all_kegiatan_wr': ('kegiatan_wr', 'pengguna'),
+    'keuangan.get_my_keuangan': ('keuangan', 'pengguna'),
+    'keuangan.get_keuangan': ('keuangan', 'pengguna'),
+    'keuangan_kategorial.get_keuangan_kategorial': ('keuangan_kategorial', 'admin'),
+    'pengguna.get_all_pengguna': ('pengguna', 'admin'),
+    'pengumuman.get_pengumuman': ('pengumuman',),
+    'pengumuman.get_pengumuman_aktif': ('pengumuman',),
+    'program_kerja.get_program_kerja': ('program_kerja',),
+    'program_kerja_wr.get_program_kerja_wr': ('program_kerja_wr', 'pengguna'),
+    'program_kerja_k_kategorial.get_program_kerja_k_kategorial_list': ('program_kerja_k_kategorial',),
+    'struktur.get_struktur': ('struktur',),
+    'tim_pembina.get_tim_pembina': ('tim_pembina_peserta',),
+    'wr.get_wr': ('wilayah_rohani',),
+}
+
+# Endpoint dengan ?search= yang hasilnya dibaca dari indeks token: versi
+# indeks (dinaikkan jemaat_search setelah reindex/rebuild) ikut ETag, karena
+# indeks diperbarui setelah data jemaat commit
+SEARCH_INDEX_ENDPOINTS = {
+    'jemaat.get_jemaat': 'jemaat_search_token',
+}
+
+# Blueprint -> tabel yang versinya dinaikkan setelah POST/PUT/PATCH/DELETE berhasil
+WRITE_TABLES = {
+    'admin': ('admin',),
+    'aset': ('aset',),
+    'auth': ('pengguna',),
+    'binaan': ('k_binaan',),
+    'buku_kronik': ('buku_kronik',),
+    'dokumen': ('dokumen',),
+    'jemaat': ('jemaat',),
+    'kategorial': ('kategorial',),
+    'kegiatan': ('kegiatan',),
+    'kegiatan_wr': ('kegiatan_wr',),
+    'keuangan': ('keuangan',),
+    'keuangan_kategorial': ('keuangan_kategorial',),
+    'pengguna': ('pengguna', 'admin'),
+    'pengumuman': ('pengumuman',),
+    'program_kerja': ('program_kerja',),
+    'program_kerja_wr': ('program_kerja_wr',),
+    'program_kerja_k_kategorial': ('program_kerja_k_kategorial',),
+    'struktur': ('struktur',),
+    'tim_pembina': ('tim_pembina_peserta',),
+    'wr': ('wilayah_rohani',),
+}
+
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_TYPES = ('application/json', 'text/plain', 'text/html', 'text/csv')
+
+_version_table_ok = True
+
+
+def _table_versions(tables):
+    """Versi tabel dari table_version, None jika tabel belum dibuat (migration 67)"""
+    global _version_table_ok
+    if not _version_table_ok:
+        return None
+    connection = get_db_connection()
+    if not connection:
+        return None
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"SELECT table_name, version FROM {VERSION_TABLE} WHERE table_name IN ({', '.join(['%s'] * len(tables))})",
+            tables
+        )
+        versions = dict(cursor.fetchall())
+        cursor.close()
+        return [versions.get(table, 0) for table in tables]
+    except Exception as e:
+        if '1146' in str(e):  # ER_NO_SUCH_TABLE
+            _version_table_ok = False
+            print(f"[ETAG] Tabel {VERSION_TABLE} tidak ada, conditional GET dinonaktifkan")
+        else:
+            print(f"[ETAG] Gagal membaca versi tabel: {e}")
+        return None
+    finally:
+        connection.close()
+
+
+def bump_table_versions(request, response):
+    """after_request: naikkan versi tabel yang ditulis request ini (transaksi sendiri, sangat singkat).
+    g.skip_data_change (dry run, upload chunk) berarti data tidak berubah."""
+    tables = WRITE_TABLES.get(request.blueprint)
+    if (not tables
+            or not _version_table_ok
+            or request.method not in ('POST', 'PUT', 'PATCH', 'DELETE')
+            or response.status_code >= 400
+            or g.get('skip_data_change')):
+        return response
+    connection = get_db_connection()
+    if not connection:
+        return response
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name IN ({', '.join(['%s'] * len(tables))})",
+            tables
+        )
+        connection.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"[ETAG] Gagal menaikkan versi {', '.join(tables)}: {e}")
+    finally:
+        connection.close()
+    return response
+
+
+def compute_etag(request):
+    """ETag untuk request GET ke endpoint list, atau None jika tidak didukung"""
+    tables = CONDITIONAL_ENDPOINTS.get(request.endpoint)
+    if not tables or 'updated_since' in request.args:
+        # Response sync berisi watermark baru setiap request
+        return None
+    if request.args.get('search') and request.endpoint in SEARCH_INDEX_ENDPOINTS:
+        tables = tables + (SEARCH_INDEX_ENDPOINTS[request.endpoint],)
+    versions = _table_versions(tables)
+    if versions is None:
+        return None
+    key = '|'.join([
+        request.endpoint,
+        request.full_path,
+        datetime.date.today().isoformat(),
+        ','.join(str(v) for v in versions),
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+
+
+def check_not_modified(request, response_class):
+    """before_request: return 304 jika ETag client masih sama, selain itu simpan ETag untuk after_request"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    etag = compute_etag(request)
+    if not etag:
+        return None
+    g.etag = etag
+    if request.if_none_match.contains_weak(etag):
+        response = response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+
+def _choose_encoding(accept_encoding):
+    if brotli is not None and 'br' in accept_encoding:
+        return 'br'
+    if 'gzip' in accept_encoding:
+        return 'gzip'
+    return None
+
+
+def finalize_response(request, response):
+    """after_request: pasang ETag dan kompres body jika layak"""
+    etag = g.pop('etag', None)
+    if etag and response.status_code == 200:
+        # Weak: body bisa dikirim gzip/brotli/mentah dengan ETag yang sama
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    encoding = _choose_encoding(request.accept_encodings)
+    if not encoding:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=5)
+    else:
+        compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = str(len(compressed))
+    response.vary.add('Accept-Encoding')
+    return response
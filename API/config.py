@@ -1,8 +1,12 @@
 import mysql.connector
 from mysql.connector import Error
 import os
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from pathlib import Path
+from db_pool import ConnectionPool
+from metrics import instrument_connection
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent / '.env'
@@ -28,8 +32,76 @@ print(f"[CONFIG] Database: {DB_CONFIG['database']} @ {DB_CONFIG['host']}:{DB_CON
 print(f"[CONFIG] User: {DB_CONFIG['user']}")
 print(f"[CONFIG] Password: {'(set)' if DB_CONFIG['password'] else '(empty - WARNING!)'}")
 
-def get_db_connection():
-    """Membuat koneksi ke database MySQL"""
+# Connection pool configuration
+DB_POOL_CONFIG = {
+    'size': int(os.getenv('DB_POOL_SIZE', 10)),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+    'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+    'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 30)),
+}
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'true').lower() != 'false'
+
+db_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG) if DB_POOL_ENABLED else None
+
+# Koneksi yang dipakai bersama oleh beberapa route dalam satu thread (lihat shared_connection)
+_shared = threading.local()
+
+class SharedConnection:
+    """Koneksi pool yang dipinjamkan ke beberapa route berturut-turut.
+
+    close() dari route hanya membersihkan state sesi (hasil yang belum dibaca,
+    transaksi yang tertinggal); koneksi dikembalikan ke pool oleh shared_connection().
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def close(self):
+        connection = self._connection
+        try:
+            if connection.unread_result:
+                connection.consume_results()
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception as e:
+            print(f"[POOL] Gagal membersihkan koneksi bersama: {e}")
+
+    def is_connected(self):
+        # Tidak ping server setiap route memanggil close_db_connection();
+        # koneksi yang putus tetap terlihat sebagai error query
+        return True
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+@contextmanager
+def shared_connection():
+    """Selama blok ini, get_db_connection() di thread yang sama mengembalikan
+    satu koneksi pool yang sama (dipakai /batch untuk menjalankan beberapa route)"""
+    if getattr(_shared, 'connection', None) is not None:
+        yield _shared.connection
+        return
+    connection = _open_connection()
+    if connection is None:
+        # Route mencoba mengambil koneksi sendiri dan melaporkan errornya
+        yield None
+        return
+    _shared.connection = SharedConnection(connection)
+    try:
+        yield _shared.connection
+    finally:
+        _shared.connection = None
+        connection.close()
+
+def _open_connection():
+    if db_pool is not None:
+        return db_pool.get()
     try:
         connection = mysql.connector.connect(**DB_CONFIG)
         if connection.is_connected():
@@ -41,13 +113,40 @@ def get_db_connection():
         print(f"[ERROR] Unexpected error during database connection: {e}")
         return None
 
+def get_db_connection():
+    """Ambil koneksi MySQL dari pool (atau koneksi baru jika pool dinonaktifkan).
+
+    Cursor dari koneksi ini dicatat oleh metrics (jumlah dan durasi query per request).
+    """
+    shared = getattr(_shared, 'connection', None)
+    if shared is not None:
+        # Tanpa ping: umur koneksi bersama diatur shared_connection()
+        return instrument_connection(shared)
+    return instrument_connection(_open_connection())
+
 def close_db_connection(connection):
+    """Tutup koneksi - untuk koneksi pool, koneksi dikembalikan ke pool"""
     if connection and connection.is_connected():
         try:
             connection.close()
         except Exception as e:
             print(f"Error closing database connection: {e}")
 
+def release_request_connections():
+    """Kembalikan koneksi yang lupa ditutup oleh route (dipanggil di teardown_request)"""
+    if db_pool is not None:
+        shared = getattr(_shared, 'connection', None)
+        leaked = db_pool.release_thread_connections(keep=shared._connection if shared is not None else None)
+        if leaked:
+            print(f"[POOL] {leaked} koneksi tidak ditutup oleh route, dikembalikan ke pool")
+
+def get_db_pool_stats():
+    if db_pool is None:
+        return {'enabled': False}
+    stats = db_pool.stats()
+    stats['enabled'] = True
+    return stats
+
 def test_db_connection():
     connection = get_db_connection()
     if connection:
@@ -0,0 +1,259 @@
+# Path: API/db_pool.py
+# Connection pool MySQL yang dipakai oleh config.get_db_connection()
+
+import threading
+import time
+import weakref
+import mysql.connector
+from mysql.connector import Error
+
+
+class PooledConnection:
+    """Proxy koneksi MySQL. close() mengembalikan koneksi ke pool, bukan memutusnya.
+
+    is_connected() dan autocommit dijawab dari state lokal (tanpa query ke server);
+    koneksi yang putus terdeteksi oleh ping berkala pool saat get().
+    """
+
+    def __init__(self, pool, raw, autocommit):
+        self._pool = pool
+        self._raw = raw
+        self._owner = threading.get_ident()
+        self._autocommit = autocommit
+
+    def close(self, leaked=False):
+        raw = self._raw
+        if raw is None:
+            return
+        self._raw = None
+        self._pool._release(self, raw, leaked, self._autocommit)
+
+    def is_connected(self):
+        # Belum dikembalikan ke pool; tidak ping server setiap close_db_connection()
+        return self._raw is not None
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        raw = self._raw
+        if raw is None:
+            raise Error(msg="Connection sudah dikembalikan ke pool")
+        raw.autocommit = value
+        self._autocommit = bool(value)
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise Error(msg="Connection sudah dikembalikan ke pool")
+        return getattr(raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Jaring pengaman untuk route yang lupa menutup koneksi
+        try:
+            if self.__dict__.get('_raw') is not None:
+                self.close(leaked=True)
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Pool koneksi MySQL yang thread-safe dan dibatasi ukurannya.
+
+    - Health check (ping) untuk koneksi yang sudah idle lebih dari ping_interval
+    - Koneksi idle lebih dari max_idle detik ditutup (eviction)
+    - Jika pool penuh, get() menunggu hingga timeout detik lalu mengembalikan None
+    """
+
+    def __init__(self, db_config, size=10, timeout=5.0, max_idle=300, ping_interval=30):
+        self._config = dict(db_config)
+        self._size = max(1, int(size))
+        self._timeout = float(timeout)
+        self._max_idle = float(max_idle)
+        self._ping_interval = float(ping_interval)
+        self._autocommit = bool(self._config.get('autocommit', False))
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = []  # list of (raw_connection, last_used)
+        self._in_use = weakref.WeakValueDictionary()  # id(proxy) -> proxy
+        self._total = 0
+
+        # Metrics
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._evicted = 0
+        self._exhausted = 0
+        self._leaked = 0
+        self._peak_in_use = 0
+        self._wait_total = 0.0
+
+    def get(self):
+        """Ambil koneksi dari pool. Return None jika gagal atau pool habis."""
+        started = time.monotonic()
+        deadline = started + self._timeout
+
+        with self._cond:
+            self._evict_idle_locked()
+            while not self._idle and self._total >= self._size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._exhausted += 1
+                    self._wait_total += time.monotonic() - started
+                    print(f"[POOL] Pool habis ({self._size} koneksi dipakai), request ditolak")
+                    return None
+                self._cond.wait(remaining)
+                self._evict_idle_locked()
+
+            self._wait_total += time.monotonic() - started
+            if self._idle:
+                raw, last_used = self._idle.pop()
+            else:
+                raw, last_used = None, None
+                self._total += 1
+
+        if raw is not None and not self._is_healthy(raw, last_used):
+            self._close_raw(raw)
+            with self._cond:
+                self._discarded += 1
+            raw = None
+
+        if raw is None:
+            raw = self._connect()
+            if raw is None:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                return None
+        else:
+            with self._cond:
+                self._reused += 1
+
+        proxy = PooledConnection(self, raw, self._autocommit)
+        with self._cond:
+            self._in_use[id(proxy)] = proxy
+            self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+        return proxy
+
+    def release_thread_connections(self, keep=None):
+        """Kembalikan semua koneksi yang masih dipegang thread ini (dipanggil di teardown request).
+
+        keep: koneksi yang tetap dipegang (koneksi bersama /batch, lihat config.shared_connection).
+        """
+        ident = threading.get_ident()
+        with self._cond:
+            leftovers = [p for p in list(self._in_use.values()) if p._owner == ident and p is not keep]
+        for proxy in leftovers:
+            proxy.close(leaked=True)
+        return len(leftovers)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self._size,
+                'total': self._total,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'peak_in_use': self._peak_in_use,
+                'created': self._created,
+                'reused': self._reused,
+                'discarded_unhealthy': self._discarded,
+                'evicted_idle': self._evicted,
+                'exhausted': self._exhausted,
+                'leaked': self._leaked,
+                'wait_seconds_total': round(self._wait_total, 4),
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    def _release(self, proxy, raw, leaked=False, autocommit=None):
+        reusable = self._reset(raw, autocommit)
+        with self._cond:
+            self._in_use.pop(id(proxy), None)
+            if leaked:
+                # dihitung di bawah lock yang sama dengan statistik lain
+                self._leaked += 1
+            if reusable:
+                self._idle.append((raw, time.monotonic()))
+            else:
+                self._total -= 1
+                self._discarded += 1
+            self._cond.notify()
+        if not reusable:
+            self._close_raw(raw)
+
+    def _reset(self, raw, autocommit=None):
+        """Bersihkan state sesi sebelum koneksi dipakai ulang.
+
+        Hanya memakai flag lokal connector (unread_result, in_transaction) dan
+        autocommit yang dicatat proxy, jadi koneksi yang bersih kembali tanpa
+        query tambahan. Koneksi putus terdeteksi _is_healthy saat get().
+        """
+        try:
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+            if autocommit is not None and autocommit != self._autocommit:
+                raw.autocommit = self._autocommit
+            return True
+        except Exception as e:
+            print(f"[POOL] Koneksi dibuang saat reset: {e}")
+            return False
+
+    def _is_healthy(self, raw, last_used):
+        if time.monotonic() - last_used < self._ping_interval:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self):
+        if not self._idle:
+            return
+        now = time.monotonic()
+        keep = []
+        for raw, last_used in self._idle:
+            if now - last_used > self._max_idle:
+                self._total -= 1
+                self._evicted += 1
+                self._close_raw(raw)
+            else:
+                keep.append((raw, last_used))
+        self._idle = keep
+
+    def _connect(self):
+        try:
+            raw = mysql.connector.connect(**self._config)
+            if raw.is_connected():
+                with self._cond:
+                    self._created += 1
+                return raw
+        except Error as e:
+            print(f"[ERROR] Database connection error: {e}")
+        except Exception as e:
+            print(f"[ERROR] Unexpected error during database connection: {e}")
+        return None
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -0,0 +1,219 @@
+# Path: API/events.py
+# Event push (broadcast, presence, data berubah) untuk /events.
+#
+# Setiap event disimpan di tabel event_log (sql/66-create_event_log.sql)
+# dengan id yang naik terus; id ini dipakai client sebagai Last-Event-ID untuk
+# melanjutkan stream tanpa kehilangan event. Karena API bisa berjalan di
+# beberapa proses, tabel adalah sumber kebenaran. Di dalam satu proses,
+# EventBus membangunkan semua koneksi yang menunggu: langsung saat event
+# dipublikasikan oleh proses yang sama, atau lewat satu thread watcher yang
+# mengecek MAX(id_event) setiap WATCH_INTERVAL detik selama ada yang menunggu.
+# Jadi N client yang idle = satu query ringan per proses, bukan N polling.
+#
+# Tipe event:
+#   broadcast     pesan broadcast baru       {id_pesan, pesan, pengirim_admin, ...}
+#   presence      client connect/disconnect  {id_connection, status, ...}
+#   data_changed  tabel berubah              {entity, method}
+
+import json
+import threading
+import time
+from flask import g
+from config import get_db_connection
+from sync import SYNC_TABLES
+
+EVENT_TABLE = 'event_log'
+EVENT_TYPES = ('broadcast', 'presence', 'data_changed')
+
+# Entity yang perubahan datanya dipublikasikan (nama blueprint = nama entity)
+DATA_ENTITIES = set(SYNC_TABLES) | {'pengguna'}
+
+WATCH_INTERVAL = 0.5
+RETENTION_HOURS = 24
+PRUNE_EVERY = 500  # publish per proses sebelum event lama dibersihkan
+FETCH_LIMIT = 200
+# id_event dibagikan saat INSERT, tetapi baris baru terlihat setelah commit:
+# id yang lebih kecil bisa muncul belakangan. Celah id yang lebih muda dari
+# ini ditunggu dulu; yang lebih tua dianggap rollback dan dilewati.
+GAP_GRACE_SECONDS = 2
+
+
+class EventBus:
+    """Bangunkan request yang menunggu event baru di proses ini"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest = None
+        self._waiting = 0
+        self._watcher = None
+
+    def notify(self, event_id):
+        with self._cond:
+            if self._latest is None or event_id > self._latest:
+                self._latest = event_id
+                self._cond.notify_all()
+
+    def latest(self):
+        """id event terakhir (query database jika belum diketahui)"""
+        with self._cond:
+            if self._latest is not None:
+                return self._latest
+        self.notify(_query_latest_id())
+        return self._latest
+
+    def wait(self, after_id, timeout):
+        """Tunggu sampai ada event dengan id > after_id atau timeout. Return id terakhir."""
+        latest = self.latest()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._waiting += 1
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name='event-watcher', daemon=True)
+                self._watcher.start()
+            try:
+                while self._latest <= after_id:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                latest = self._latest
+            finally:
+                self._waiting -= 1
+        return latest
+
+    def _watch(self):
+        # Event dari proses lain hanya terlihat lewat database
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            with self._cond:
+                if not self._waiting:
+                    self._watcher = None
+                    return
+            try:
+                self.notify(_query_latest_id())
+            except Exception as e:
+                print(f"[EVENTS] Watcher gagal membaca event terakhir: {e}")
+
+
+bus = EventBus()
+_publish_count = 0
+
+
+def _query_latest_id():
+    connection = get_db_connection()
+    if not connection:
+        raise RuntimeError('Database error')
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT COALESCE(MAX(id_event), 0) FROM {EVENT_TABLE}")
+        row = cursor.fetchone()
+        cursor.close()
+        return int(row[0]) if row else 0
+    finally:
+        connection.close()
+
+
+def _prune(cursor):
+    cursor.execute(
+        f"DELETE FROM {EVENT_TABLE} WHERE created_at < NOW() - INTERVAL %s HOUR",
+        (RETENTION_HOURS,)
+    )
+
+
+def publish(event_type, data=None, entity=None):
+    """Simpan event dan bangunkan stream yang menunggu. Gagal publish tidak
+    menggagalkan request pemanggil (client tetap punya polling cadangan)."""
+    global _publish_count
+    connection = get_db_connection()
+    if not connection:
+        print(f"[EVENTS] Gagal publish {event_type}: database error")
+        return None
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"INSERT INTO {EVENT_TABLE} (tipe, entity, payload) VALUES (%s, %s, %s)",
+            (event_type, entity, json.dumps(data or {}, default=str))
+        )
+        event_id = cursor.lastrowid
+        _publish_count += 1
+        if _publish_count % PRUNE_EVERY == 0:
+            _prune(cursor)
+        connection.commit()
+        cursor.close()
+        bus.notify(event_id)
+        return event_id
+    except Exception as e:
+        print(f"[EVENTS] Gagal publish {event_type}: {e}")
+        return None
+    finally:
+        connection.close()
+
+
+def fetch_events(after_id, types=None, limit=FETCH_LIMIT):
+    """Event dengan id > after_id, urut id. Return (events, reset, scanned_id).
+
+    scanned_id adalah id tertinggi yang sudah diperiksa (termasuk event yang
+    tersaring oleh types) dan menjadi posisi berikutnya; pembacaan berhenti
+    di celah id yang mungkin masih menunggu commit. reset=True berarti
+    after_id lebih lama dari event tertua yang masih disimpan: client harus
+    memuat ulang datanya karena ada event yang hilang.
+    """
+    connection = get_db_connection()
+    if not connection:
+        raise RuntimeError('Database error')
+    try:
+        cursor = connection.cursor(dictionary=True)
+        reset = False
+        if after_id > 0:
+            cursor.execute(f"SELECT MIN(id_event) AS oldest FROM {EVENT_TABLE}")
+            row = cursor.fetchone()
+            oldest = row['oldest'] if row else None
+            reset = oldest is not None and oldest > after_id + 1
+
+        # Filter types dilakukan di sini (bukan di SQL) supaya event yang
+        # tersaring tetap ikut memajukan scanned_id
+        cursor.execute(
+            f"""SELECT id_event, tipe, entity, payload, created_at,
+                       created_at < NOW() - INTERVAL %s SECOND AS settled
+                FROM {EVENT_TABLE} WHERE id_event > %s ORDER BY id_event LIMIT %s""",
+            (GAP_GRACE_SECONDS, after_id, limit)
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        connection.close()
+
+    events = []
+    scanned_id = after_id
+    for row in rows:
+        contiguous = row['id_event'] == scanned_id + 1 or (reset and scanned_id == after_id)
+        if not contiguous and not row['settled']:
+            break
+        scanned_id = row['id_event']
+        if types and row['tipe'] not in types:
+            continue
+        try:
+            data = json.loads(row['payload']) if row['payload'] else {}
+        except ValueError:
+            data = {}
+        if row['entity']:
+            data.setdefault('entity', row['entity'])
+        events.append({
+            'id': row['id_event'],
+            'type': row['tipe'],
+            'data': data,
+            'created_at': row['created_at'].isoformat(sep=' ') if row['created_at'] else None,
+        })
+    return events, reset, scanned_id
+
+
+def publish_data_change(request, response):
+    """after_request: publikasikan data_changed untuk write yang berhasil.
+    Route bisa mengeset g.skip_data_change jika POST-nya tidak mengubah data (dry run)."""
+    if (request.method in ('POST', 'PUT', 'PATCH', 'DELETE')
+            and request.blueprint in DATA_ENTITIES
+            and response.status_code < 400
+            and not g.get('skip_data_change')):
+        publish('data_changed', {'entity': request.blueprint, 'method': request.method},
+                entity=request.blueprint)
+    return response
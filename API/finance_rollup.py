@@ -0,0 +1,265 @@
+# Path: API/finance_rollup.py
+# Rollup bulanan keuangan yang dipelihara secara incremental.
+#
+# Tabel keuangan_rollup (sql/64-create_keuangan_rollup.sql) menyimpan total dan
+# jumlah transaksi per (sumber, tahun, bulan, jenis, sub_kategori, owner).
+# Setiap insert/update/delete di keuangan_routes dan keuangan_kategorial_routes
+# dibungkus rollup_transaction() sehingga perubahan row dan delta rollup
+# di-commit bersamaan. Saldo dan laporan bulanan cukup membaca rollup
+# (O(jumlah bulan)) tanpa SUM() atas seluruh tabel keuangan.
+#
+# Backfill / perbaikan: POST /admin/keuangan-rollup/rebuild atau
+#   python finance_rollup.py rebuild [keuangan|keuangan_kategorial]
+
+from contextlib import contextmanager
+
+ROLLUP_TABLE = 'keuangan_rollup'
+
+# Pemetaan kolom per tabel sumber ke kolom rollup
+ROLLUP_SOURCES = {
+    'keuangan': {
+        'table': 'keuangan',
+        'pk': 'id_keuangan',
+        'jenis': 'kategori',
+        'sub_kategori': 'sub_kategori',
+        'owner': 'created_by_pengguna',
+    },
+    'keuangan_kategorial': {
+        'table': 'keuangan_kategorial',
+        'pk': 'id_keuangan_kategorial',
+        'jenis': 'jenis',
+        'sub_kategori': 'kategori',
+        'owner': 'created_by_admin',
+    },
+}
+
+_KEY_COLUMNS = ('tahun', 'bulan', 'jenis', 'sub_kategori', 'owner_id')
+
+
+class RollupLockError(Exception):
+    """Named lock rollup tidak didapat dalam batas waktu"""
+
+
+def _source(name):
+    if name not in ROLLUP_SOURCES:
+        raise KeyError(f"Sumber rollup tidak dikenal: {name}")
+    return ROLLUP_SOURCES[name]
+
+
+@contextmanager
+def rollup_lock(cursor, source, timeout=10):
+    """Named lock MySQL per sumber supaya delta dan rebuild tidak balapan.
+
+    Satu lock per sumber berarti write keuangan berjalan satu per satu; lock
+    hanya dipegang selama satu row + dua upsert rollup, dan volume input
+    keuangan (manual oleh pengurus) jauh di bawah batas itu.
+    """
+    name = f"rollup:{source}"
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (name, timeout))
+    row = cursor.fetchone()
+    cursor.fetchall()
+    if row is None or row[0] != 1:
+        # 0 = timeout, NULL = error: tanpa lock delta bisa tumpang tindih
+        raise RollupLockError(f"Lock rollup {source} tidak didapat dalam {timeout} detik, coba lagi")
+    try:
+        yield
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        cursor.fetchall()
+
+
+def _fetch_key(cursor, source, record_id):
+    """Return (kunci rollup, jumlah) untuk satu row sumber, None jika tidak ada"""
+    cfg = _source(source)
+    cursor.execute(f"""
+        SELECT YEAR(tanggal), MONTH(tanggal), {cfg['jenis']},
+               COALESCE({cfg['sub_kategori']}, ''), COALESCE({cfg['owner']}, 0), jumlah
+        FROM {cfg['table']}
+        WHERE {cfg['pk']} = %s
+        FOR UPDATE
+    """, (record_id,))
+    row = cursor.fetchone()
+    cursor.fetchall()
+    if row is None or row[0] is None or row[5] is None:
+        return None
+    return tuple(row[:5]), row[5]
+
+
+def _apply_delta(cursor, source, key, amount, count):
+    cursor.execute(f"""
+        INSERT INTO {ROLLUP_TABLE}
+            (sumber, tahun, bulan, jenis, sub_kategori, owner_id, total, jumlah_transaksi)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total = total + VALUES(total),
+            jumlah_transaksi = jumlah_transaksi + VALUES(jumlah_transaksi)
+    """, (source, *key, amount, count))
+
+    if count < 0:
+        where = " AND ".join(f"{column} = %s" for column in _KEY_COLUMNS)
+        cursor.execute(
+            f"DELETE FROM {ROLLUP_TABLE} WHERE sumber = %s AND {where} AND jumlah_transaksi <= 0",
+            (source, *key)
+        )
+
+
+class RollupChange:
+    """Handle untuk route: set record_id setelah INSERT (cursor.lastrowid)"""
+
+    def __init__(self, record_id=None):
+        self.record_id = record_id
+
+
+@contextmanager
+def rollup_transaction(connection, source, record_id=None):
+    """Jalankan perubahan pada satu row sumber dan delta rollup-nya dalam satu transaksi.
+
+    Pemakaian:
+        with rollup_transaction(connection, 'keuangan', keuangan_id):
+            cursor.execute("UPDATE keuangan ...", params)
+
+        with rollup_transaction(connection, 'keuangan') as change:
+            cursor.execute("INSERT INTO keuangan ...", params)
+            change.record_id = cursor.lastrowid
+
+    Commit dilakukan saat keluar dari blok; exception -> rollback lalu diteruskan.
+    """
+    _source(source)
+    change = RollupChange(record_id)
+    rollup_cursor = connection.cursor()
+    try:
+        with rollup_lock(rollup_cursor, source):
+            connection.start_transaction()
+            try:
+                before = _fetch_key(rollup_cursor, source, record_id) if record_id is not None else None
+                yield change
+                after = _fetch_key(rollup_cursor, source, change.record_id) if change.record_id is not None else None
+
+                if before != after:
+                    if before:
+                        _apply_delta(rollup_cursor, source, before[0], -before[1], -1)
+                    if after:
+                        _apply_delta(rollup_cursor, source, after[0], after[1], 1)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    finally:
+        rollup_cursor.close()
+
+
+def rebuild(connection, source=None):
+    """Hitung ulang rollup dari tabel sumber. Return {sumber: jumlah row rollup}."""
+    sources = [source] if source else list(ROLLUP_SOURCES)
+    result = {}
+    cursor = connection.cursor()
+    try:
+        for name in sources:
+            cfg = _source(name)
+            with rollup_lock(cursor, name, timeout=60):
+                connection.start_transaction()
+                try:
+                    cursor.execute(f"DELETE FROM {ROLLUP_TABLE} WHERE sumber = %s", (name,))
+                    cursor.execute(f"""
+                        INSERT INTO {ROLLUP_TABLE}
+                            (sumber, tahun, bulan, jenis, sub_kategori, owner_id, total, jumlah_transaksi)
+                        SELECT %s, YEAR(tanggal), MONTH(tanggal), {cfg['jenis']},
+                               COALESCE({cfg['sub_kategori']}, ''), COALESCE({cfg['owner']}, 0),
+                               SUM(jumlah), COUNT(*)
+                        FROM {cfg['table']}
+                        WHERE tanggal IS NOT NULL AND jumlah IS NOT NULL
+                        GROUP BY YEAR(tanggal), MONTH(tanggal), {cfg['jenis']},
+                                 COALESCE({cfg['sub_kategori']}, ''), COALESCE({cfg['owner']}, 0)
+                    """, (name,))
+                    result[name] = cursor.rowcount
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+            print(f"[ROLLUP] Rollup {name} dibangun ulang: {result[name]} baris")
+    finally:
+        cursor.close()
+    return result
+
+
+def get_saldo(cursor, source, owner_id=None):
+    """Total pemasukan, pengeluaran dan saldo dari rollup (cursor dictionary)"""
+    _source(source)
+    query = f"SELECT jenis, COALESCE(SUM(total), 0) AS total FROM {ROLLUP_TABLE} WHERE sumber = %s"
+    params = [source]
+    if owner_id is not None:
+        query += " AND owner_id = %s"
+        params.append(owner_id)
+    query += " GROUP BY jenis"
+    cursor.execute(query, params)
+    totals = {row['jenis']: float(row['total'] or 0) for row in cursor.fetchall()}
+
+    pemasukan = totals.get('Pemasukan', 0.0)
+    pengeluaran = totals.get('Pengeluaran', 0.0)
+    return {
+        'total_pemasukan': pemasukan,
+        'total_pengeluaran': pengeluaran,
+        'saldo': pemasukan - pengeluaran
+    }
+
+
+def get_laporan_bulanan(cursor, source, year=None, month=None, owner_id=None, limit=12):
+    """Total per bulan dan jenis dari rollup, format sama dengan v_laporan_keuangan_bulanan.
+
+    Dengan year dan month: hanya bulan tersebut. Tanpa keduanya: `limit` bulan terakhir.
+    """
+    _source(source)
+    conditions = ["sumber = %s"]
+    params = [source]
+    if owner_id is not None:
+        conditions.append("owner_id = %s")
+        params.append(owner_id)
+    if year and month:
+        conditions.append("tahun = %s AND bulan = %s")
+        params.extend([year, month])
+    elif year:
+        conditions.append("tahun = %s")
+        params.append(year)
+
+    query = f"""
+        SELECT tahun, bulan, jenis AS kategori,
+               SUM(total) AS total, SUM(jumlah_transaksi) AS jumlah_transaksi
+        FROM {ROLLUP_TABLE}
+        WHERE {' AND '.join(conditions)}
+        GROUP BY tahun, bulan, jenis
+        ORDER BY tahun DESC, bulan DESC, jenis
+    """
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+
+    if not (year and month) and limit:
+        months = []
+        for row in rows:
+            period = (row['tahun'], row['bulan'])
+            if period not in months:
+                months.append(period)
+        keep = set(months[:limit])
+        rows = [row for row in rows if (row['tahun'], row['bulan']) in keep]
+
+    for row in rows:
+        row['total'] = float(row['total'] or 0)
+        row['jumlah_transaksi'] = int(row['jumlah_transaksi'] or 0)
+    return rows
+
+
+if __name__ == '__main__':
+    import sys
+    from config import get_db_connection
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'rebuild':
+        print("Pemakaian: python finance_rollup.py rebuild [keuangan|keuangan_kategorial]")
+        sys.exit(1)
+
+    conn = get_db_connection()
+    if not conn:
+        print("[ROLLUP] Gagal terhubung ke database")
+        sys.exit(1)
+    try:
+        print(rebuild(conn, sys.argv[2] if len(sys.argv) > 2 else None))
+    finally:
+        conn.close()
@@ -0,0 +1,773 @@
+# Path: API/jemaat_import.py
+# Import massal jemaat dari CSV / XLSX / JSON lines (POST /jemaat/import).
+#
+# Body request adalah isi file mentah (bukan multipart). Baris dibaca satu per
+# satu dari stream request, tidak pernah seluruh file di memori (kecuali XLSX:
+# format zip perlu dibaca dari akhir, jadi body di-spool ke file sementara lalu
+# dibaca openpyxl mode read-only baris per baris).
+#
+# Pipeline per baris:
+#   1. header dipetakan ke kolom jemaat (nama kolom, judul kolom grid/export
+#      "No. KK", "J. Kelamin", dll, dan beberapa alias umum)
+#   2. normalisasi + validasi: nama_lengkap wajib, NIK dan No. KK 16 digit
+#      (kode provinsi, bagian tanggal lahir NIK), tanggal (ISO, DD/MM/YYYY,
+#      tanggal Excel), jenis kelamin (L/P), wilayah_rohani harus dikenal
+#      (pilihan di form jemaat, tabel wilayah_rohani, atau sudah dipakai
+#      jemaat), email, panjang teks
+#      sesuai tipe kolom
+#   3. NIK ganda di dalam file atau sudah terdaftar di database ditolak
+#   4. baris valid dikumpulkan per batch_size lalu di-INSERT dengan satu
+#      INSERT multi-baris ... RETURNING id_jemaat (MariaDB 10.5+), sehingga id
+#      baru dibaca langsung dari database. Jika batch gagal di database, batch
+#      diulang per baris (SAVEPOINT) supaya error bisa ditunjuk per baris.
+#
+# on_error=skip (default): baris yang tidak valid dilewati, setiap batch di-commit
+# sendiri. on_error=abort: seluruh import satu transaksi, dan jika ada satu
+# baris saja yang gagal tidak ada yang disimpan. dry_run hanya menjalankan
+# langkah 1-3 dan melaporkan hasilnya tanpa menulis apa pun.
+#
+# Setelah commit, indeks pencarian jemaat diperbarui sekaligus untuk semua id
+# baru (jemaat_search.safe_reindex_many); versi ETag dinaikkan sesudahnya (conditional.py).
+
+import codecs
+import csv
+import datetime
+import json
+import re
+import tempfile
+import time
+
+from jemaat_search import safe_reindex_many
+
+BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+MAX_REPORTED_ROWS = 1000  # baris error/peringatan yang dikirim di laporan
+READ_BLOCK_SIZE = 64 * 1024
+XLSX_SPOOL_MEMORY = 8 * 1024 * 1024
+
+FORMATS = ('csv', 'xlsx', 'jsonl')
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'xlsx',
+    'application/x-ndjson': 'jsonl',
+    'application/jsonl': 'jsonl',
+    'application/json-lines': 'jsonl',
+    'application/jsonlines': 'jsonl',
+}
+EXTENSIONS = {'.csv': 'csv', '.txt': 'csv', '.xlsx': 'xlsx', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Kolom yang boleh diisi lewat import (sama dengan field_mapping POST /jemaat)
+IMPORT_COLUMNS = (
+    'nama_lengkap', 'alamat', 'no_telepon', 'email', 'tanggal_lahir', 'jenis_kelamin', 'status_menikah',
+    'wilayah_rohani', 'nama_keluarga', 'no_kk', 'nik', 'tempat_lahir', 'umur', 'status_kekatolikan',
+    'kategori', 'hubungan_keluarga', 'pendidikan_terakhir', 'jenis_pekerjaan', 'detail_pekerjaan',
+    'status_babtis', 'tanggal_babtis', 'tempat_babtis', 'nama_babtis', 'status_ekaristi', 'tanggal_komuni',
+    'tempat_komuni', 'status_krisma', 'tanggal_krisma', 'tempat_krisma', 'status_perkawinan', 'keuskupan',
+    'paroki', 'kota_perkawinan', 'tanggal_perkawinan', 'status_perkawinan_detail', 'status_keanggotaan',
+    'wr_tujuan', 'paroki_tujuan',
+)
+DATE_COLUMNS = ('tanggal_lahir', 'tanggal_babtis', 'tanggal_komuni', 'tanggal_krisma', 'tanggal_perkawinan')
+SACRAMENT_DATE_COLUMNS = DATE_COLUMNS[1:]
+DIGIT_COLUMNS = {'nik': 'NIK', 'no_kk': 'No. KK'}
+DIGIT_LENGTH = 16
+
+# Judul kolom di grid / file export (server/components/jemaat_model.py) dan alias umum
+HEADER_ALIASES = {
+    'nama': 'nama_lengkap',
+    'nama_umat': 'nama_lengkap',
+    'nomor_kk': 'no_kk',
+    'kk': 'no_kk',
+    'no_kartu_keluarga': 'no_kk',
+    'nomor_nik': 'nik',
+    'wilayah': 'wilayah_rohani',
+    'tgl_lahir': 'tanggal_lahir',
+    'j_kelamin': 'jenis_kelamin',
+    'jk': 'jenis_kelamin',
+    'pend_terakhir': 'pendidikan_terakhir',
+    'pendidikan': 'pendidikan_terakhir',
+    'status_pekerjaan': 'jenis_pekerjaan',
+    'pekerjaan': 'jenis_pekerjaan',
+    'telepon': 'no_telepon',
+    'no_hp': 'no_telepon',
+    'kota': 'kota_perkawinan',
+    'tgl_babtis': 'tanggal_babtis',
+    'tgl_komuni': 'tanggal_komuni',
+    'tgl_krisma': 'tanggal_krisma',
+    'tgl_perkawinan': 'tanggal_perkawinan',
+}
+# Kolom export yang tidak diimport (diisi server)
+IGNORED_HEADERS = {'no', 'id_jemaat', 'dibuat_oleh', 'created_by_pengguna', 'created_at', 'updated_at'}
+
+# Pilihan wilayah rohani di form jemaat (server/components/dialogs.py JemaatDialog)
+WILAYAH_ROHANI = (
+    'ST. YOHANES BAPTISTA DE LA SALLE', 'ST. ALOYSIUS GONZAGA', 'ST. GREGORIUS AGUNG', 'ST. DOMINICO SAVIO',
+    'ST. THOMAS AQUINAS', 'ST. ALBERTUS AGUNG', 'ST. BONAVENTURA', 'STA. KATARINA DARI SIENA', 'STA. SISILIA',
+    'ST. BLASIUS', 'ST. CAROLUS BORROMEUS', 'ST. BONIFASIUS', 'ST. CORNELIUS', 'STA. BRIGITTA',
+    'ST. IGNASIUS DARI LOYOLA', 'ST. PIUS X', 'STA. AGNES', 'ST. AGUSTINUS', 'STA. FAUSTINA',
+    'ST. YOHANES MARIA VIANNEY', 'STA. MARIA GORETTI', 'STA. PERPETUA', 'ST. LUKAS', 'STA. SKOLASTIKA',
+    'STA. THERESIA DARI AVILLA', 'ST. VINCENTIUS A PAULO',
+)
+
+GENDER_VALUES = {
+    'l': 'Laki-laki', 'laki_laki': 'Laki-laki', 'laki': 'Laki-laki', 'pria': 'Laki-laki', 'm': 'Laki-laki',
+    'p': 'Perempuan', 'perempuan': 'Perempuan', 'wanita': 'Perempuan', 'f': 'Perempuan',
+}
+# Kode provinsi di NIK / No. KK (Aceh 11 sampai Papua 9x)
+MIN_PROVINCE_CODE = 11
+MIN_BIRTH_YEAR = 1900
+MAX_AGE = 130
+
+_HEADER_RE = re.compile(r'[^0-9a-z]+')
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_VARCHAR_RE = re.compile(r'^(?:var)?char\((\d+)\)', re.IGNORECASE)
+_SCIENTIFIC_RE = re.compile(r'^\d(?:[.,]\d+)?e\+?\d+$', re.IGNORECASE)
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y/%m/%d')
+_EXCEL_EPOCH = datetime.date(1899, 12, 30)
+
+
+class ImportFileError(Exception):
+    """File tidak bisa diproses sama sekali; status = HTTP status code, extra ikut dikirim ke client"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.extra = extra
+
+
+def _flag(args, name):
+    return str(args.get(name, '')).lower() in ('1', 'true', 'yes', 'on')
+
+
+class ImportOptions:
+    """Opsi import dari query string"""
+
+    def __init__(self, fmt, dry_run=False, on_error='skip', batch_size=BATCH_SIZE, encoding='utf-8',
+                 delimiter=None, sheet=None, default_wilayah=None, allow_new_wilayah=False):
+        self.format = fmt
+        self.dry_run = dry_run
+        self.on_error = on_error
+        self.batch_size = batch_size
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.sheet = sheet
+        self.default_wilayah = default_wilayah
+        self.allow_new_wilayah = allow_new_wilayah
+
+    @classmethod
+    def from_request(cls, args, content_type):
+        fmt = (args.get('format') or '').lower()
+        if not fmt:
+            fmt = CONTENT_TYPES.get((content_type or '').split(';')[0].strip().lower(), '')
+        if not fmt:
+            filename = (args.get('filename') or '').lower()
+            fmt = next((f for ext, f in EXTENSIONS.items() if filename.endswith(ext)), '')
+        if fmt not in FORMATS:
+            raise ImportFileError(f"Format file tidak dikenal, pakai format={'|'.join(FORMATS)}")
+
+        on_error = (args.get('on_error') or 'skip').lower()
+        if on_error not in ('skip', 'abort'):
+            raise ImportFileError('on_error harus skip atau abort')
+
+        try:
+            batch_size = int(args.get('batch_size', BATCH_SIZE))
+        except ValueError:
+            raise ImportFileError('batch_size harus berupa angka')
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        encoding = args.get('encoding') or 'utf-8'
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            raise ImportFileError(f"Encoding tidak dikenal: {encoding}")
+
+        delimiter = args.get('delimiter')
+        if delimiter == 'tab':
+            delimiter = '\t'
+        if delimiter is not None and len(delimiter) != 1:
+            raise ImportFileError('delimiter harus satu karakter (atau "tab")')
+
+        return cls(fmt, dry_run=_flag(args, 'dry_run'), on_error=on_error, batch_size=batch_size,
+                   encoding=encoding, delimiter=delimiter, sheet=args.get('sheet'),
+                   default_wilayah=(args.get('wilayah_rohani') or '').strip() or None,
+                   allow_new_wilayah=_flag(args, 'allow_new_wilayah'))
+
+
+# ---------------------------------------------------------------------------
+# Pembaca file: semua menghasilkan (nomor baris, {header: nilai})
+# ---------------------------------------------------------------------------
+
+def _byte_lines(stream):
+    pending = b''
+    for block in iter(lambda: stream.read(READ_BLOCK_SIZE), b''):
+        pending += block
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line + b'\n'
+    if pending:
+        yield pending
+
+
+def _guess_delimiter(header_line):
+    return max((',', ';', '\t'), key=header_line.count)
+
+
+def read_csv(stream, options):
+    """Baris CSV. Nomor baris sama dengan nomor baris di spreadsheet (header = 1).
+    Baris yang tidak bisa di-decode ditandai dengan key None berisi pesan error."""
+    bad_lines = set()
+    line_no = 0
+
+    def text_lines():
+        nonlocal line_no
+        for raw in _byte_lines(stream):
+            line_no += 1
+            if line_no == 1 and raw.startswith(codecs.BOM_UTF8):
+                raw = raw[len(codecs.BOM_UTF8):]
+            try:
+                yield raw.decode(options.encoding)
+            except UnicodeDecodeError:
+                bad_lines.add(line_no)
+                yield raw.decode(options.encoding, errors='replace')
+
+    lines = text_lines()
+    header_line = next(lines, None)
+    if header_line is None:
+        raise ImportFileError('File kosong')
+    delimiter = options.delimiter or _guess_delimiter(header_line)
+
+    def with_header():
+        yield header_line
+        yield from lines
+
+    reader = csv.reader(with_header(), delimiter=delimiter)
+    record_no = 1
+    try:
+        header = next(reader)
+        last_line = reader.line_num
+        for values in reader:
+            record_no += 1
+            first_line, last_line = last_line + 1, reader.line_num
+            if not any(value.strip() for value in values):
+                continue
+            row = dict(zip(header, values))
+            if len(values) > len(header) and any(value.strip() for value in values[len(header):]):
+                row[None] = f"Baris berisi {len(values)} kolom, header hanya {len(header)}"
+            if any(first_line <= n <= last_line for n in bad_lines):
+                row[None] = f"Karakter tidak valid untuk encoding {options.encoding} (kirim encoding=cp1252 untuk CSV Excel lama)"
+            yield record_no, row
+    except csv.Error as e:
+        raise ImportFileError(f"CSV tidak valid setelah baris {record_no}: {e}")
+
+
+def read_jsonl(stream, options):
+    for line_no, raw in enumerate(_byte_lines(stream), start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw.decode(options.encoding))
+        except (UnicodeDecodeError, ValueError) as e:
+            yield line_no, {None: f"JSON tidak valid: {e}"}
+            continue
+        if not isinstance(row, dict):
+            yield line_no, {None: 'Setiap baris harus berupa objek JSON'}
+            continue
+        yield line_no, row
+
+
+def read_xlsx(stream, options):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('Import XLSX membutuhkan openpyxl di server', status=501)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MEMORY)
+    try:
+        for block in iter(lambda: stream.read(READ_BLOCK_SIZE), b''):
+            spool.write(block)
+        spool.seek(0)
+        try:
+            workbook = load_workbook(spool, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFileError(f"File XLSX tidak bisa dibaca: {e}")
+        try:
+            if options.sheet:
+                if options.sheet not in workbook.sheetnames:
+                    raise ImportFileError(f"Sheet '{options.sheet}' tidak ada (sheet: {', '.join(workbook.sheetnames)})")
+                sheet = workbook[options.sheet]
+            else:
+                sheet = workbook.worksheets[0]
+
+            header = None
+            for row_no, values in enumerate(sheet.iter_rows(min_row=1, values_only=True), start=1):
+                if not any(value is not None and str(value).strip() for value in values):
+                    continue
+                if header is None:
+                    header = [str(value).strip() if value is not None else '' for value in values]
+                    continue
+                yield row_no, dict(zip(header, values))
+            if header is None:
+                raise ImportFileError('File kosong')
+        finally:
+            workbook.close()
+    finally:
+        spool.close()
+
+
+READERS = {'csv': read_csv, 'xlsx': read_xlsx, 'jsonl': read_jsonl}
+
+
+# ---------------------------------------------------------------------------
+# Validasi
+# ---------------------------------------------------------------------------
+
+def normalize_header(name):
+    return _HEADER_RE.sub('_', str(name or '').strip().lower()).strip('_')
+
+
+def _wilayah_key(name):
+    return ' '.join(str(name).replace('.', ' ').split()).casefold()
+
+
+def _clean(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value if value and value != '-' else None
+    return value
+
+
+def _age(born, today):
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def parse_date(value):
+    """date dari datetime/date, teks ISO atau DD/MM/YYYY, atau nomor seri tanggal Excel"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if 1 <= value < 100000:
+            return _EXCEL_EPOCH + datetime.timedelta(days=int(value))
+        raise ValueError
+    text = str(value).strip()
+    if len(text) > 10 and text[10] in (' ', 'T'):
+        text = text[:10]  # datetime dari export
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError
+
+
+class RowValidator:
+    """Normalisasi dan validasi satu baris; menyimpan NIK yang sudah terlihat di file"""
+
+    def __init__(self, column_types, known_wilayah, options, today=None):
+        self.column_types = column_types  # kolom -> (panjang maks atau None, default)
+        self.options = options
+        self.today = today or datetime.date.today()
+        self.known_wilayah = {_wilayah_key(name): name for name in known_wilayah}
+        self.default_wilayah = None
+        if options.default_wilayah:
+            self.default_wilayah = self.known_wilayah.setdefault(_wilayah_key(options.default_wilayah),
+                                                                 options.default_wilayah)
+        self.new_wilayah = set()
+        self.seen_nik = {}
+        self.mapped_columns = set()
+        self.ignored_columns = set()
+        self._headers = {}
+
+    def column_for(self, header):
+        if header in self._headers:
+            return self._headers[header]
+        key = normalize_header(header)
+        column = key if key in IMPORT_COLUMNS else HEADER_ALIASES.get(key)
+        if column is not None and column not in self.column_types:
+            column = None  # kolom belum ada di database (migration belum dijalankan)
+        if column is None:
+            if key and key not in IGNORED_HEADERS:
+                self.ignored_columns.add(str(header))
+        else:
+            self.mapped_columns.add(column)
+        self._headers[header] = column
+        return column
+
+    def validate(self, row_no, raw, numeric_digits_ok):
+        """Return (values, errors, warnings)"""
+        errors = []
+        warnings = []
+        if None in raw:
+            errors.append(raw.pop(None))
+            if not raw:
+                return {}, errors, warnings
+
+        values = {}
+        for header, value in raw.items():
+            column = self.column_for(header)
+            value = _clean(value)
+            if column is None or value is None:
+                continue
+            if column in values:
+                errors.append(f"Kolom {column} muncul lebih dari sekali")
+                continue
+            values[column] = value
+
+        if not values.get('nama_lengkap'):
+            errors.append('nama_lengkap wajib diisi')
+
+        for column, label in DIGIT_COLUMNS.items():
+            if column in values:
+                digits, error = self._digits(values[column], label, numeric_digits_ok)
+                if error:
+                    errors.append(error)
+                    del values[column]
+                else:
+                    values[column] = digits
+
+        for column in DATE_COLUMNS:
+            if column not in values:
+                continue
+            try:
+                day = parse_date(values[column])
+            except ValueError:
+                errors.append(f"{column} '{values[column]}' bukan tanggal (pakai YYYY-MM-DD atau DD/MM/YYYY)")
+                del values[column]
+                continue
+            if day > self.today:
+                errors.append(f"{column} {day.isoformat()} di masa depan")
+            elif day.year < MIN_BIRTH_YEAR:
+                errors.append(f"{column} {day.isoformat()} sebelum tahun {MIN_BIRTH_YEAR}")
+            values[column] = day
+
+        born = values.get('tanggal_lahir')
+        if isinstance(born, datetime.date):
+            for column in SACRAMENT_DATE_COLUMNS:
+                day = values.get(column)
+                if isinstance(day, datetime.date) and day < born:
+                    errors.append(f"{column} {day.isoformat()} sebelum tanggal_lahir {born.isoformat()}")
+            values['umur'] = _age(born, self.today)
+        elif 'umur' in values:
+            try:
+                umur = int(float(values['umur']))
+                if not 0 <= umur <= MAX_AGE:
+                    raise ValueError
+                values['umur'] = umur
+            except (TypeError, ValueError):
+                errors.append(f"umur '{values['umur']}' tidak valid")
+                del values['umur']
+
+        if 'jenis_kelamin' in values:
+            gender = GENDER_VALUES.get(normalize_header(values['jenis_kelamin']))
+            if gender is None:
+                errors.append(f"jenis_kelamin '{values['jenis_kelamin']}' tidak valid (pakai L/P)")
+            else:
+                values['jenis_kelamin'] = gender
+
+        if 'nik' in values:
+            if not errors:
+                warnings.extend(self._nik_warnings(values['nik'], born, values.get('jenis_kelamin')))
+            first_row = self.seen_nik.setdefault(values['nik'], row_no)
+            if first_row != row_no:
+                errors.append(f"NIK {values['nik']} sama dengan baris {first_row}")
+
+        wilayah = values.get('wilayah_rohani') or self.default_wilayah
+        if wilayah is not None:
+            canonical = self.known_wilayah.get(_wilayah_key(wilayah))
+            if canonical is None:
+                if self.options.allow_new_wilayah:
+                    canonical = self.known_wilayah[_wilayah_key(wilayah)] = str(wilayah)
+                    self.new_wilayah.add(canonical)
+                else:
+                    errors.append(f"wilayah_rohani '{wilayah}' tidak dikenal")
+            if canonical is not None:
+                values['wilayah_rohani'] = canonical
+
+        if 'email' in values and not _EMAIL_RE.match(str(values['email'])):
+            errors.append(f"email '{values['email']}' tidak valid")
+
+        for column, value in values.items():
+            if column == 'umur' or column in DATE_COLUMNS:
+                continue
+            if isinstance(value, float) and value.is_integer():
+                value = values[column] = str(int(value))
+            elif not isinstance(value, str):
+                value = values[column] = str(value)
+            max_length = self.column_types[column][0]
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{column} terlalu panjang ({len(value)} karakter, maks {max_length})")
+
+        return values, errors, warnings
+
+    def _digits(self, value, label, numeric_ok):
+        if isinstance(value, bool):
+            return None, f"{label} tidak valid"
+        if isinstance(value, (int, float)):
+            # Excel hanya menyimpan 15 digit presisi: angka 16 digit pasti sudah berubah
+            if not numeric_ok or isinstance(value, float):
+                return None, f"{label} tersimpan sebagai angka (presisi hilang), format kolom {label} sebagai Text"
+            text = str(value)
+        else:
+            text = str(value).strip().lstrip("'")
+            if _SCIENTIFIC_RE.match(text):
+                return None, f"{label} '{text}' dalam notasi ilmiah (Excel), format kolom {label} sebagai Text"
+            text = re.sub(r'[\s.\-]', '', text)
+        if not text.isdigit() or len(text) != DIGIT_LENGTH:
+            return None, f"{label} '{value}' harus {DIGIT_LENGTH} digit angka"
+        if int(text[:2]) < MIN_PROVINCE_CODE:
+            return None, f"{label} {text}: kode provinsi {text[:2]} tidak valid"
+        if label == 'NIK':
+            day, month = int(text[6:8]), int(text[8:10])
+            if day > 40:
+                day -= 40
+            if not (1 <= day <= 31 and 1 <= month <= 12):
+                return None, f"NIK {text}: bagian tanggal lahir ({text[6:12]}) tidak valid"
+            if text[12:] == '0000':
+                return None, f"NIK {text}: nomor urut tidak boleh 0000"
+        return text, None
+
+    @staticmethod
+    def _nik_warnings(nik, born, gender):
+        """NIK memuat tanggal lahir DDMMYY (tanggal +40 untuk perempuan)"""
+        warnings = []
+        day, month, year = int(nik[6:8]), int(nik[8:10]), int(nik[10:12])
+        female = day > 40
+        if female:
+            day -= 40
+        if isinstance(born, datetime.date) and (day, month, year) != (born.day, born.month, born.year % 100):
+            warnings.append(f"Tanggal lahir di NIK ({nik[6:12]}) berbeda dengan tanggal_lahir {born.isoformat()}")
+        if gender and gender != ('Perempuan' if female else 'Laki-laki'):
+            warnings.append(f"Jenis kelamin di NIK ({'Perempuan' if female else 'Laki-laki'}) berbeda dengan {gender}")
+        return warnings
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _column_types(cursor):
+    """kolom jemaat -> (panjang maks varchar atau None, nilai default)"""
+    cursor.execute("SHOW COLUMNS FROM jemaat")
+    columns = {}
+    for row in cursor.fetchall():
+        match = _VARCHAR_RE.match(row[1].decode() if isinstance(row[1], bytes) else str(row[1]))
+        columns[row[0]] = (int(match.group(1)) if match else None, row[4])
+    return columns
+
+
+def _known_wilayah(cursor):
+    names = set(WILAYAH_ROHANI)
+    for query in ("SELECT DISTINCT wilayah_rohani FROM wilayah_rohani",
+                  "SELECT DISTINCT wilayah_rohani FROM jemaat WHERE wilayah_rohani IS NOT NULL AND wilayah_rohani <> ''"):
+        try:
+            cursor.execute(query)
+            names.update(row[0] for row in cursor.fetchall() if row[0])
+        except Exception as e:
+            print(f"[IMPORT] Gagal membaca daftar wilayah rohani: {e}")
+    return names
+
+
+class ImportReport:
+    def __init__(self, options):
+        self.options = options
+        self.started = time.monotonic()
+        self.total = 0
+        self.valid = 0
+        self.inserted = 0
+        self.failed = 0
+        self.warning_rows = 0
+        self.rows = []  # {'row', 'nama_lengkap', 'errors', 'warnings'}
+        self.truncated = False
+
+    def add(self, row_no, nama, errors, warnings):
+        if errors:
+            self.failed += 1
+        if warnings:
+            self.warning_rows += 1
+        if len(self.rows) < MAX_REPORTED_ROWS:
+            self.rows.append({'row': row_no, 'nama_lengkap': nama, 'errors': errors, 'warnings': warnings})
+        else:
+            self.truncated = True
+
+    def to_dict(self, validator, committed):
+        return {
+            'dry_run': self.options.dry_run,
+            'format': self.options.format,
+            'on_error': self.options.on_error,
+            'total_rows': self.total,
+            'valid_rows': self.valid,
+            'inserted': self.inserted,
+            'failed': self.failed,
+            'warning_rows': self.warning_rows,
+            'committed': committed,
+            'rows': self.rows,
+            'rows_truncated': self.truncated,
+            'columns': sorted(validator.mapped_columns) if validator else [],
+            'ignored_columns': sorted(validator.ignored_columns) if validator else [],
+            'new_wilayah': sorted(validator.new_wilayah) if validator else [],
+            'seconds': round(time.monotonic() - self.started, 2),
+        }
+
+
+class JemaatImporter:
+    """Kumpulkan baris valid per batch dan INSERT multi-baris dengan RETURNING id_jemaat"""
+
+    def __init__(self, connection, cursor, column_types, options, user_id, report):
+        self.connection = connection
+        self.cursor = cursor
+        self.options = options
+        self.user_id = user_id
+        self.report = report
+        self.columns = [column for column in IMPORT_COLUMNS if column in column_types]
+        self.defaults = {column: column_types[column][1] for column in self.columns}
+        self.insert_prefix = f"INSERT INTO jemaat (created_by_pengguna, {', '.join(self.columns)}) VALUES "
+        self.row_placeholders = f"({', '.join(['%s'] * (len(self.columns) + 1))})"
+        self.sql = self.insert_prefix + self.row_placeholders
+        self.pending = []  # (row_no, values, warnings)
+        self.inserted_ids = []
+        self.uncommitted_ids = []
+        self.in_transaction = False
+
+    def add(self, row_no, values, warnings):
+        self.pending.append((row_no, values, warnings))
+        if len(self.pending) >= self.options.batch_size:
+            self.flush()
+
+    def _existing_nik(self, rows):
+        niks = list({values['nik'] for _, values, _ in rows if 'nik' in values})
+        if not niks:
+            return {}
+        self.cursor.execute(
+            f"SELECT nik, MIN(id_jemaat) FROM jemaat WHERE nik IN ({', '.join(['%s'] * len(niks))}) GROUP BY nik",
+            niks
+        )
+        return dict(self.cursor.fetchall())
+
+    def _params(self, values):
+        return (self.user_id,) + tuple(values.get(column, self.defaults[column]) for column in self.columns)
+
+    def flush(self):
+        rows, self.pending = self.pending, []
+        if not rows:
+            return
+        existing = self._existing_nik(rows)
+        accepted = []
+        for row_no, values, warnings in rows:
+            if values.get('nik') in existing:
+                self.report.add(row_no, values.get('nama_lengkap'),
+                                [f"NIK {values['nik']} sudah terdaftar (id_jemaat {existing[values['nik']]})"], warnings)
+                continue
+            self.report.valid += 1
+            if warnings:
+                self.report.add(row_no, values.get('nama_lengkap'), [], warnings)
+            accepted.append((row_no, values))
+        # Mode abort yang sudah punya baris gagal tetap divalidasi sampai akhir, tanpa insert
+        if self.options.dry_run or not accepted or (self.options.on_error == 'abort' and self.report.failed):
+            return
+
+        if not self.in_transaction:
+            self.cursor.execute("START TRANSACTION")
+            self.in_transaction = True
+        self.cursor.execute("SAVEPOINT jemaat_import_batch")
+        try:
+            # Id dibaca dari RETURNING, tidak diasumsikan berurutan dari lastrowid
+            # (auto_increment_increment, innodb_autoinc_lock_mode 2)
+            sql = (self.insert_prefix + ', '.join([self.row_placeholders] * len(accepted))
+                   + " RETURNING id_jemaat")
+            params = [param for _, values in accepted for param in self._params(values)]
+            self.cursor.execute(sql, params)
+            ids = [row[0] for row in self.cursor.fetchall()]
+            self.uncommitted_ids.extend(ids)
+            self.report.inserted += len(ids)
+        except Exception as e:
+            print(f"[IMPORT] Batch {accepted[0][0]}-{accepted[-1][0]} gagal ({e}), diulang per baris")
+            self.cursor.execute("ROLLBACK TO SAVEPOINT jemaat_import_batch")
+            self._insert_one_by_one(accepted)
+        if self.options.on_error == 'skip':
+            self.commit()
+
+    def _insert_one_by_one(self, rows):
+        for row_no, values in rows:
+            self.cursor.execute("SAVEPOINT jemaat_import_row")
+            try:
+                self.cursor.execute(self.sql, self._params(values))
+            except Exception as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT jemaat_import_row")
+                self.report.valid -= 1
+                self.report.add(row_no, values.get('nama_lengkap'), [f"Database error: {e}"], [])
+                continue
+            self.uncommitted_ids.append(self.cursor.lastrowid)
+            self.report.inserted += 1
+
+    def commit(self):
+        self.connection.commit()
+        self.in_transaction = False
+        self.inserted_ids.extend(self.uncommitted_ids)
+        self.uncommitted_ids = []
+
+    def rollback(self):
+        self.connection.rollback()
+        self.in_transaction = False
+        self.pending = []
+        self.report.inserted -= len(self.uncommitted_ids)
+        self.uncommitted_ids = []
+
+
+def run_import(connection, stream, options, user_id):
+    """Jalankan import dari stream body request. Return laporan (dict).
+    ImportFileError yang terjadi di tengah file membawa laporan sementara di extra['report']."""
+    report = ImportReport(options)
+    cursor = connection.cursor()
+    importer = None
+    validator = None
+    committed = False
+    try:
+        column_types = _column_types(cursor)
+        validator = RowValidator(column_types, _known_wilayah(cursor), options)
+        importer = JemaatImporter(connection, cursor, column_types, options, user_id, report)
+        numeric_digits_ok = options.format == 'jsonl'
+
+        for row_no, raw in READERS[options.format](stream, options):
+            report.total += 1
+            values, errors, warnings = validator.validate(row_no, raw, numeric_digits_ok)
+            # CSV/XLSX: semua header sudah dipetakan setelah baris pertama
+            if report.total == 1 and options.format != 'jsonl' and 'nama_lengkap' not in validator.mapped_columns:
+                raise ImportFileError('Kolom nama_lengkap (Nama Lengkap) tidak ditemukan di header file')
+            if errors:
+                report.add(row_no, values.get('nama_lengkap'), errors, warnings)
+                continue
+            importer.add(row_no, values, warnings)
+        if report.total == 0:
+            raise ImportFileError('File tidak berisi baris data')
+        importer.flush()
+
+        if options.dry_run:
+            pass
+        elif options.on_error == 'abort' and report.failed:
+            importer.rollback()
+            print(f"[IMPORT] Dibatalkan: {report.failed} baris gagal, tidak ada data yang disimpan")
+        else:
+            importer.commit()
+            committed = True
+    except ImportFileError as e:
+        # Batch yang sudah di-commit (on_error=skip) tetap tersimpan, sisanya dibatalkan
+        if importer is not None:
+            importer.rollback()
+        e.extra['report'] = report.to_dict(validator, committed=bool(importer and importer.inserted_ids))
+        raise
+    except Exception:
+        if importer is not None:
+            importer.rollback()
+        raise
+    finally:
+        cursor.close()
+        if importer is not None and importer.inserted_ids:
+            safe_reindex_many(connection, importer.inserted_ids)
+
+    print(f"[IMPORT] {options.format} total={report.total} valid={report.valid} inserted={report.inserted} "
+          f"failed={report.failed} dry_run={options.dry_run} ({time.monotonic() - report.started:.1f}s)")
+    return report.to_dict(validator, committed)
@@ -0,0 +1,293 @@
+# Path: API/jemaat_search.py
+# Indeks pencarian jemaat berbasis tabel token (jemaat_search_token).
+#
+# Server produksi memakai MariaDB (tanpa parser FULLTEXT ngram), jadi indeks
+# dipelihara sendiri: setiap kata dari kolom yang dicari dinormalisasi (huruf
+# kecil, tanpa diakritik) lalu disimpan bersama semua akhirannya (>= 2 huruf).
+# Pencarian 'gus' menjadi range scan `suffix LIKE 'gus%'` di primary key
+# sehingga tetap memakai indeks, berbeda dengan LIKE '%gus%' yang selalu full
+# scan. Kolom posisi = 0 menandai awal kata, dipakai untuk autocomplete
+# (prefix) dan untuk ranking: cocok persis > awal kata > tengah kata, dikali
+# bobot kolom.
+#
+# Tabel dipelihara oleh jemaat_routes (reindex_jemaat/remove_jemaat setelah
+# insert/update/delete, reindex_many setelah import massal). Isi awal /
+# perbaikan: POST /admin/jemaat-search/rebuild atau
+#   python jemaat_search.py rebuild
+
+import re
+import unicodedata
+from contextlib import contextmanager
+
+SEARCH_TABLE = 'jemaat_search_token'
+VERSION_TABLE = 'table_version'  # baris SEARCH_TABLE ikut ETag pencarian (API/conditional.py)
+
+# kolom jemaat -> (id kolom di tabel token, bobot ranking)
+SEARCH_COLUMNS = {
+    'nama_lengkap': (1, 8),
+    'nama_keluarga': (2, 4),
+    'alamat': (3, 2),
+    'email': (4, 1),
+    'no_telepon': (5, 1),
+}
+
+MAX_TOKEN_LENGTH = 64
+MIN_INFIX_LENGTH = 2  # akhiran lebih pendek dari ini tidak disimpan
+MAX_TERMS = 5
+REBUILD_BATCH_SIZE = 1000
+
+_TOKEN_RE = re.compile(r'\w+')
+
+_WEIGHT_SQL = "CASE kolom {} ELSE 1 END".format(
+    ' '.join(f"WHEN {column_id} THEN {weight}" for column_id, weight in SEARCH_COLUMNS.values())
+)
+
+
+def normalize(value):
+    """Huruf kecil tanpa diakritik, sama dengan indeks di aplikasi desktop"""
+    if value is None:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    if not text.isascii():
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return text.casefold()
+
+
+def tokenize(value):
+    return [token[:MAX_TOKEN_LENGTH] for token in _TOKEN_RE.findall(normalize(value))]
+
+
+def _token_rows(row):
+    """Baris (suffix, id_jemaat, kolom, posisi) untuk satu record jemaat"""
+    rows = set()
+    for column, (column_id, _) in SEARCH_COLUMNS.items():
+        for token in tokenize(row.get(column)):
+            rows.add((token, row['id_jemaat'], column_id, 0))
+            for offset in range(1, len(token) - MIN_INFIX_LENGTH + 1):
+                rows.add((token[offset:], row['id_jemaat'], column_id, offset))
+    return list(rows)
+
+
+class SearchLockError(Exception):
+    """Lock indeks pencarian tidak didapat dalam batas waktu"""
+
+
+@contextmanager
+def search_lock(cursor, timeout=10):
+    """Named lock MySQL supaya reindex per baris dan rebuild tidak balapan"""
+    cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", ('jemaat_search', timeout))
+    row = cursor.fetchone()
+    cursor.fetchall()
+    acquired = row['acquired'] if isinstance(row, dict) else row[0]
+    if acquired != 1:
+        # 0 = timeout (mis. rebuild sedang berjalan), NULL = error
+        raise SearchLockError(f"Lock indeks pencarian tidak didapat dalam {timeout} detik")
+    try:
+        yield
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", ('jemaat_search',))
+        cursor.fetchall()
+
+
+def _bump_version(connection):
+    """Naikkan versi indeks setelah commit supaya ETag GET /jemaat?search= berubah"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name = %s", (SEARCH_TABLE,))
+        connection.commit()
+    except Exception as e:
+        print(f"[SEARCH] Gagal menaikkan versi indeks: {e}")
+    finally:
+        cursor.close()
+
+
+def _insert_tokens(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f"INSERT IGNORE INTO {SEARCH_TABLE} (suffix, id_jemaat, kolom, posisi) VALUES (%s, %s, %s, %s)",
+            rows
+        )
+
+
+def _select_rows_sql():
+    return f"SELECT id_jemaat, {', '.join(SEARCH_COLUMNS)} FROM jemaat"
+
+
+def reindex_jemaat(connection, jemaat_id):
+    """Perbarui token satu jemaat (dipanggil setelah insert/update). Jemaat yang
+    sudah tidak ada otomatis terhapus dari indeks."""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        with search_lock(cursor):
+            connection.start_transaction()
+            try:
+                cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE id_jemaat = %s", (jemaat_id,))
+                cursor.execute(_select_rows_sql() + " WHERE id_jemaat = %s", (jemaat_id,))
+                row = cursor.fetchone()
+                cursor.fetchall()
+                if row:
+                    _insert_tokens(cursor, _token_rows(row))
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    finally:
+        cursor.close()
+    _bump_version(connection)
+
+
+def reindex_many(connection, jemaat_ids):
+    """Perbarui token banyak jemaat sekaligus (import massal), per REBUILD_BATCH_SIZE id"""
+    jemaat_ids = list(jemaat_ids)
+    cursor = connection.cursor(dictionary=True)
+    try:
+        with search_lock(cursor, timeout=60):
+            for start in range(0, len(jemaat_ids), REBUILD_BATCH_SIZE):
+                batch = jemaat_ids[start:start + REBUILD_BATCH_SIZE]
+                placeholders = ', '.join(['%s'] * len(batch))
+                connection.start_transaction()
+                try:
+                    cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE id_jemaat IN ({placeholders})", batch)
+                    cursor.execute(_select_rows_sql() + f" WHERE id_jemaat IN ({placeholders})", batch)
+                    rows = []
+                    for row in cursor.fetchall():
+                        rows.extend(_token_rows(row))
+                    _insert_tokens(cursor, rows)
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+    finally:
+        cursor.close()
+    _bump_version(connection)
+
+
+def remove_jemaat(connection, jemaat_id):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE id_jemaat = %s", (jemaat_id,))
+        connection.commit()
+    finally:
+        cursor.close()
+    _bump_version(connection)
+
+
+def safe_reindex(connection, jemaat_id, removed=False):
+    """Versi route: kegagalan indeks tidak menggagalkan perubahan data (bisa di-rebuild)"""
+    try:
+        if removed:
+            remove_jemaat(connection, jemaat_id)
+        else:
+            reindex_jemaat(connection, jemaat_id)
+    except Exception as e:
+        print(f"[SEARCH] Gagal memperbarui indeks jemaat {jemaat_id}: {e}")
+
+
+def safe_reindex_many(connection, jemaat_ids):
+    try:
+        reindex_many(connection, jemaat_ids)
+    except Exception as e:
+        print(f"[SEARCH] Gagal memperbarui indeks {len(jemaat_ids)} jemaat: {e}")
+
+
+def rebuild(connection):
+    """Bangun ulang seluruh indeks dari tabel jemaat. Return jumlah jemaat dan token."""
+    cursor = connection.cursor(dictionary=True)
+    jemaat_count = 0
+    token_count = 0
+    try:
+        with search_lock(cursor, timeout=60):
+            connection.start_transaction()
+            try:
+                cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+                last_id = 0
+                while True:
+                    cursor.execute(
+                        _select_rows_sql() + " WHERE id_jemaat > %s ORDER BY id_jemaat LIMIT %s",
+                        (last_id, REBUILD_BATCH_SIZE)
+                    )
+                    batch = cursor.fetchall()
+                    if not batch:
+                        break
+                    rows = []
+                    for row in batch:
+                        rows.extend(_token_rows(row))
+                    _insert_tokens(cursor, rows)
+                    jemaat_count += len(batch)
+                    token_count += len(rows)
+                    last_id = batch[-1]['id_jemaat']
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    finally:
+        cursor.close()
+    _bump_version(connection)
+    print(f"[SEARCH] Indeks jemaat dibangun ulang: {jemaat_count} jemaat, {token_count} token")
+    return {'jemaat': jemaat_count, 'token': token_count}
+
+
+def search_terms(text):
+    """Kata kunci unik dari input, maksimal MAX_TERMS (yang terpanjang)"""
+    terms = list(dict.fromkeys(tokenize(text)))
+    if len(terms) > MAX_TERMS:
+        terms = sorted(terms, key=len, reverse=True)[:MAX_TERMS]
+    return terms
+
+
+def match_subquery(text, columns=None, prefix_only=False):
+    """Subquery (hasil_id, skor) untuk jemaat yang memuat semua kata kunci.
+
+    columns membatasi kolom yang dicari (default semua SEARCH_COLUMNS).
+    prefix_only hanya mencocokkan awal kata (autocomplete).
+    Return (sql, params) atau None jika input tidak berisi kata kunci.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+
+    column_ids = [SEARCH_COLUMNS[column][0] for column in (columns or SEARCH_COLUMNS)]
+    selects = []
+    params = []
+    for term in terms:
+        conditions = ["suffix LIKE %s"]
+        term_params = [term.replace('_', '\\_') + '%']
+        if prefix_only or len(term) < MIN_INFIX_LENGTH:
+            conditions.append("posisi = 0")
+        if len(column_ids) < len(SEARCH_COLUMNS):
+            conditions.append(f"kolom IN ({', '.join(['%s'] * len(column_ids))})")
+            term_params.extend(column_ids)
+
+        selects.append(f"""
+            SELECT id_jemaat,
+                   MAX(({_WEIGHT_SQL}) * CASE WHEN posisi > 0 THEN 1 WHEN suffix = %s THEN 3 ELSE 2 END) AS skor
+            FROM {SEARCH_TABLE}
+            WHERE {' AND '.join(conditions)}
+            GROUP BY id_jemaat""")
+        params.append(term)
+        params.extend(term_params)
+
+    sql = f"""
+        SELECT id_jemaat AS hasil_id, SUM(skor) AS skor
+        FROM ({' UNION ALL '.join(selects)}) cocok
+        GROUP BY id_jemaat
+        HAVING COUNT(*) = {len(terms)}"""
+    return sql, params
+
+
+if __name__ == '__main__':
+    import sys
+    from config import get_db_connection
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'rebuild':
+        print("Pemakaian: python jemaat_search.py rebuild")
+        sys.exit(1)
+
+    conn = get_db_connection()
+    if not conn:
+        print("[SEARCH] Gagal terhubung ke database")
+        sys.exit(1)
+    try:
+        print(rebuild(conn))
+    finally:
+        conn.close()
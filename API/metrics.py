@@ -0,0 +1,320 @@
+# Path: API/metrics.py
+# Instrumentasi request dan query database, diekspos di /metrics (format
+# teks Prometheus).
+#
+# Per route (pola URL, mis. /jemaat/<int:jemaat_id>) dan method dicatat:
+# jumlah request per status, histogram latency, jumlah dan durasi query
+# database, serta ukuran response (setelah kompresi). Query dihitung lewat
+# cursor yang dibungkus oleh config.get_db_connection() (InstrumentedConnection);
+# query di luar request (thread latar belakang) dicatat dengan route
+# "(background)".
+#
+# Request yang lebih lambat dari METRICS_SLOW_REQUEST_MS dicetak sebagai
+# [SLOW] beserta query terlambatnya (SQL dan parameter). Parameter query
+# yang menyentuh kolom password tidak dicetak.
+
+import os
+import threading
+import time
+
+SLOW_REQUEST_SECONDS = float(os.getenv('METRICS_SLOW_REQUEST_MS', 1000)) / 1000
+SLOW_LOG_QUERIES = 10  # query terlambat yang dicetak per request lambat
+MAX_TRACKED_QUERIES = 200  # query per request yang disimpan untuk slow log
+MAX_LOGGED_SQL = 500
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BACKGROUND_ROUTE = '(background)'
+UNMATCHED_ROUTE = '(unmatched)'
+
+_lock = threading.Lock()
+_local = threading.local()
+
+_requests = {}  # (route, method, status) -> jumlah
+_latency = {}  # (route, method) -> [count per bucket..., +Inf], sum
+_db_queries = {}  # (route, method) -> jumlah query
+_db_seconds = {}  # (route, method) -> detik
+_response_bytes = {}  # (route, method) -> byte
+_slow = {}  # (route, method) -> jumlah request lambat
+_in_progress = 0
+
+
+class _RequestStats:
+    __slots__ = ('started', 'db_count', 'db_seconds', 'queries', 'finished')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_seconds = 0.0
+        self.queries = []  # (detik, sql, params)
+        self.finished = False
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+# ---------------------------------------------------------------------------
+# Hook request (dipanggil dari app.py)
+# ---------------------------------------------------------------------------
+
+def start_request(request):
+    """before_request: mulai menghitung waktu dan query request ini"""
+    global _in_progress
+    stats = _RequestStats()
+    request.environ['metrics.stats'] = stats
+    _stack().append(stats)
+    with _lock:
+        _in_progress += 1
+
+
+def finish_request(request, response):
+    """after_request: catat latency, query dan ukuran response"""
+    global _in_progress
+    stats = request.environ.get('metrics.stats')
+    if stats is None or stats.finished:
+        return response
+    stats.finished = True
+    elapsed = time.perf_counter() - stats.started
+    route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+    key = (route, request.method)
+    size = 0 if response.is_streamed else (response.calculate_content_length() or 0)
+
+    with _lock:
+        _in_progress -= 1
+        status_key = (route, request.method, str(response.status_code))
+        _requests[status_key] = _requests.get(status_key, 0) + 1
+        buckets = _latency.get(key)
+        if buckets is None:
+            buckets = _latency[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                buckets[0][i] += 1
+        buckets[0][-1] += 1
+        buckets[1] += elapsed
+        _db_queries[key] = _db_queries.get(key, 0) + stats.db_count
+        _db_seconds[key] = _db_seconds.get(key, 0.0) + stats.db_seconds
+        _response_bytes[key] = _response_bytes.get(key, 0) + size
+        if elapsed >= SLOW_REQUEST_SECONDS:
+            _slow[key] = _slow.get(key, 0) + 1
+
+    if elapsed >= SLOW_REQUEST_SECONDS:
+        _log_slow_request(request, response, elapsed, stats)
+    _pop(stats)
+    return response
+
+
+def discard_request(request):
+    """teardown_request: lepas state request yang tidak sampai after_request"""
+    global _in_progress
+    stats = request.environ.get('metrics.stats')
+    if stats is None:
+        return
+    if not stats.finished:
+        stats.finished = True
+        with _lock:
+            _in_progress -= 1
+    _pop(stats)
+
+
+def _pop(stats):
+    stack = _stack()
+    if stats in stack:
+        stack.remove(stats)
+
+
+def _log_slow_request(request, response, elapsed, stats):
+    print(f"[SLOW] {request.method} {request.full_path.rstrip('?')} -> {response.status_code} "
+          f"{elapsed * 1000:.0f} ms, {stats.db_count} query {stats.db_seconds * 1000:.0f} ms")
+    for seconds, sql, params in sorted(stats.queries, key=lambda q: q[0], reverse=True)[:SLOW_LOG_QUERIES]:
+        print(f"[SLOW]   {seconds * 1000:.1f} ms: {sql}")
+        if params is not None:
+            print(f"[SLOW]     params: {params}")
+
+
+# ---------------------------------------------------------------------------
+# Instrumentasi database
+# ---------------------------------------------------------------------------
+
+def _format_sql(operation):
+    sql = operation.decode('utf-8', 'replace') if isinstance(operation, (bytes, bytearray)) else str(operation)
+    sql = ' '.join(sql.split())
+    return sql if len(sql) <= MAX_LOGGED_SQL else sql[:MAX_LOGGED_SQL] + '...'
+
+
+def _format_params(sql, params):
+    if params is None or 'password' in sql.lower():
+        return None
+    text = repr(params)
+    return text if len(text) <= MAX_LOGGED_SQL else text[:MAX_LOGGED_SQL] + '...'
+
+
+def record_query(operation, params, seconds, count=True):
+    """Catat satu query (atau fetch jika count=False) pada request yang sedang berjalan"""
+    stack = _stack()
+    if stack:
+        stats = stack[-1]
+        stats.db_seconds += seconds
+        if count:
+            stats.db_count += 1
+            if len(stats.queries) < MAX_TRACKED_QUERIES:
+                sql = _format_sql(operation)
+                stats.queries.append((seconds, sql, _format_params(sql, params)))
+        elif stats.queries:
+            # Waktu fetch dihitung ke query terakhir
+            last_seconds, sql, logged_params = stats.queries[-1]
+            stats.queries[-1] = (last_seconds + seconds, sql, logged_params)
+        return
+
+    key = (BACKGROUND_ROUTE, '-')
+    with _lock:
+        if count:
+            _db_queries[key] = _db_queries.get(key, 0) + 1
+        _db_seconds[key] = _db_seconds.get(key, 0.0) + seconds
+
+
+class InstrumentedCursor:
+    """Cursor MySQL yang mencatat jumlah dan durasi query (lihat record_query)"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, method, operation, params, args, kwargs, count=True):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record_query(operation, params, time.perf_counter() - started, count)
+
+    def execute(self, operation, *args, **kwargs):
+        params = args[0] if args else kwargs.get('params')
+        return self._timed(self._cursor.execute, operation, params, (operation,) + args, kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        params = f"{len(seq_params)} baris" if hasattr(seq_params, '__len__') else None
+        return self._timed(self._cursor.executemany, operation, params, (operation, seq_params) + args, kwargs)
+
+    def callproc(self, procname, *args, **kwargs):
+        params = args[0] if args else None
+        return self._timed(self._cursor.callproc, f"CALL {procname}", params, (procname,) + args, kwargs)
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone, None, None, (), {}, count=False)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed(self._cursor.fetchmany, None, None, args, kwargs, count=False)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall, None, None, (), {}, count=False)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+
+class InstrumentedConnection:
+    """Proxy koneksi yang mengembalikan InstrumentedCursor dari cursor()"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._connection.close()
+
+
+def instrument_connection(connection):
+    return InstrumentedConnection(connection) if connection is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Format teks Prometheus
+# ---------------------------------------------------------------------------
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render_prometheus(pool_stats=None):
+    """Semua metrik dalam format teks Prometheus (text/plain; version=0.0.4)"""
+    with _lock:
+        requests = dict(_requests)
+        latency = {key: ([*value[0]], value[1]) for key, value in _latency.items()}
+        db_queries = dict(_db_queries)
+        db_seconds = dict(_db_seconds)
+        response_bytes = dict(_response_bytes)
+        slow = dict(_slow)
+        in_progress = _in_progress
+
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{labels} {_number(value)}")
+
+    metric('gereja_api_requests_total', 'counter', 'Jumlah request per route, method dan status',
+           [(_labels(route=r, method=m, status=s), v) for (r, m, s), v in sorted(requests.items())])
+
+    histogram = []
+    for (route, method), (counts, total) in sorted(latency.items()):
+        for bound, count in zip(LATENCY_BUCKETS, counts):
+            histogram.append((_labels(route=route, method=method, le=repr(bound)), count))
+        histogram.append((_labels(route=route, method=method, le='+Inf'), counts[-1]))
+    lines.append('# HELP gereja_api_request_duration_seconds Latency request per route dan method')
+    lines.append('# TYPE gereja_api_request_duration_seconds histogram')
+    for labels, value in histogram:
+        lines.append(f"gereja_api_request_duration_seconds_bucket{labels} {value}")
+    for (route, method), (counts, total) in sorted(latency.items()):
+        labels = _labels(route=route, method=method)
+        lines.append(f"gereja_api_request_duration_seconds_sum{labels} {_number(total)}")
+        lines.append(f"gereja_api_request_duration_seconds_count{labels} {counts[-1]}")
+
+    metric('gereja_api_db_queries_total', 'counter', 'Jumlah query database per route',
+           [(_labels(route=r, method=m), v) for (r, m), v in sorted(db_queries.items())])
+    metric('gereja_api_db_seconds_total', 'counter', 'Waktu query dan fetch database per route (detik)',
+           [(_labels(route=r, method=m), v) for (r, m), v in sorted(db_seconds.items())])
+    metric('gereja_api_response_bytes_total', 'counter', 'Ukuran body response per route (byte, setelah kompresi)',
+           [(_labels(route=r, method=m), v) for (r, m), v in sorted(response_bytes.items())])
+    metric('gereja_api_slow_requests_total', 'counter',
+           f'Request lebih lambat dari {SLOW_REQUEST_SECONDS * 1000:.0f} ms per route',
+           [(_labels(route=r, method=m), v) for (r, m), v in sorted(slow.items())])
+    metric('gereja_api_requests_in_progress', 'gauge', 'Request yang sedang diproses', [('', in_progress)])
+
+    if pool_stats and pool_stats.get('enabled'):
+        for name in ('size', 'total', 'in_use', 'idle', 'peak_in_use'):
+            metric(f'gereja_api_db_pool_{name}', 'gauge', f'Connection pool: {name}', [('', pool_stats.get(name, 0))])
+        for name in ('created', 'reused', 'discarded_unhealthy', 'evicted_idle', 'exhausted', 'leaked'):
+            metric(f'gereja_api_db_pool_{name}_total', 'counter', f'Connection pool: {name}', [('', pool_stats.get(name, 0))])
+        metric('gereja_api_db_pool_wait_seconds_total', 'counter', 'Total waktu menunggu koneksi pool',
+               [('', float(pool_stats.get('wait_seconds_total', 0)))])
+
+    return '\n'.join(lines) + '\n'
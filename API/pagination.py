@@ -0,0 +1,89 @@
+# Path: API/pagination.py
+# Keyset (cursor) pagination untuk endpoint list yang besar.
+#
+# Mode cursor bersifat opt-in: client mengirim parameter `cursor` (kosong untuk
+# halaman pertama) dan menerima `next_cursor` di response. Query berikutnya
+# mencari langsung di index (sort_column, primary key) tanpa OFFSET.
+
+import base64
+import datetime
+import decimal
+import json
+
+
+def is_cursor_request(args):
+    """True jika client meminta mode cursor (parameter `cursor` ada, boleh kosong)"""
+    return 'cursor' in args
+
+
+def encode_cursor(sort_value, pk_value):
+    if isinstance(sort_value, datetime.datetime):
+        sort_value = sort_value.isoformat(sep=' ')
+    elif isinstance(sort_value, (datetime.date, datetime.time)):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, decimal.Decimal):
+        sort_value = str(sort_value)
+    raw = json.dumps([sort_value, pk_value], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (sort_value, pk_value). Raise ValueError jika cursor rusak."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, pk_value = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Cursor tidak valid')
+    if not isinstance(pk_value, int):
+        raise ValueError('Cursor tidak valid')
+    return sort_value, pk_value
+
+
+class KeysetPaginator:
+    """Membangun kondisi WHERE/ORDER BY keyset dan next_cursor untuk satu endpoint.
+
+    Urutan selalu (sort_column, pk_column) sehingga halaman stabil meskipun
+    nilai sort_column duplikat. NULL diperlakukan seperti MySQL: paling awal
+    untuk ASC dan paling akhir untuk DESC.
+    """
+
+    def __init__(self, sort_column, pk_column, descending=False, sort_key=None, pk_key=None):
+        self.sort_column = sort_column
+        self.pk_column = pk_column
+        self.descending = descending
+        # Nama key di row hasil fetch (tanpa alias tabel)
+        self.sort_key = sort_key or sort_column.split('.')[-1]
+        self.pk_key = pk_key or pk_column.split('.')[-1]
+
+    def condition(self, token):
+        """Return (sql, params) untuk posisi setelah cursor, atau (None, []) untuk halaman pertama"""
+        if not token:
+            return None, []
+
+        sort_value, pk_value = decode_cursor(token)
+        col, pk = self.sort_column, self.pk_column
+        op = '<' if self.descending else '>'
+
+        if sort_value is None:
+            if self.descending:
+                return f"({col} IS NULL AND {pk} {op} %s)", [pk_value]
+            return f"(({col} IS NULL AND {pk} {op} %s) OR {col} IS NOT NULL)", [pk_value]
+
+        sql = f"({col} {op} %s OR ({col} = %s AND {pk} {op} %s)"
+        if self.descending:
+            sql += f" OR {col} IS NULL"
+        sql += ")"
+        return sql, [sort_value, sort_value, pk_value]
+
+    def order_by(self):
+        direction = 'DESC' if self.descending else 'ASC'
+        return f" ORDER BY {self.sort_column} {direction}, {self.pk_column} {direction}"
+
+    def finalize(self, rows, limit):
+        """Potong hasil fetch (limit + 1 baris) dan hitung next_cursor"""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(last.get(self.sort_key), last.get(self.pk_key))
@@ -0,0 +1,266 @@
+# Path: API/presence.py
+# Status online client (tabel client_connections) disimpan di memori.
+#
+# Heartbeat hanya memperbarui last_activity di memori; thread latar belakang
+# setiap FLUSH_INTERVAL detik menulis last_activity yang berubah dalam satu
+# UPDATE per batch, memutus client yang tidak mengirim heartbeat selama
+# CLIENT_TIMEOUT detik, lalu membaca ulang daftar client aktif dari database.
+# Pembacaan ulang ini menyamakan state antar proses API (client bisa
+# heartbeat ke proses lain), sehingga daftar di memori paling lambat
+# FLUSH_INTERVAL detik tertinggal dari proses lain.
+#
+# Connect/disconnect tetap langsung ditulis ke database oleh route karena
+# jarang dan perlu id_connection dari AUTO_INCREMENT.
+
+import atexit
+import datetime
+import threading
+import time
+from config import get_db_connection
+from events import publish
+
+CLIENT_TIMEOUT = 120  # detik tanpa heartbeat sebelum client dianggap terputus
+FLUSH_INTERVAL = 15
+FLUSH_BATCH = 500
+
+SESSION_COLUMNS = ('id_connection', 'client_ip', 'hostname', 'connect_time', 'status', 'last_activity')
+
+
+class PresenceTracker:
+    """Daftar client yang terhubung beserta waktu heartbeat terakhirnya"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}  # id_connection -> row client_connections
+        self._added = {}  # id_connection -> waktu (monotonic) ditambahkan di proses ini
+        self._dirty = set()
+        self._loaded = False
+        self._thread = None
+        self._timeouts = 0
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='presence-flush', daemon=True)
+                self._thread.start()
+            loaded = self._loaded
+        if not loaded:
+            self.reload()
+
+    def _run(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.flush()
+                self.sweep()
+                self.reload()
+            except Exception as e:
+                print(f"[PRESENCE] Sinkronisasi presence gagal: {e}")
+
+    def register(self, connection_id, client_ip, hostname, connect_time):
+        """Client baru yang sudah di-INSERT oleh route"""
+        self._ensure_running()
+        with self._lock:
+            self._sessions[connection_id] = {
+                'id_connection': connection_id,
+                'client_ip': client_ip,
+                'hostname': hostname,
+                'connect_time': connect_time,
+                'status': 'Terhubung',
+                'last_activity': connect_time,
+            }
+            self._added[connection_id] = time.monotonic()
+
+    def touch(self, connection_id=None, client_ip=None):
+        """Catat heartbeat. Return jumlah koneksi aktif yang cocok (0 = tidak ditemukan)."""
+        self._ensure_running()
+        try:
+            connection_id = int(connection_id) if connection_id else None
+        except (TypeError, ValueError):
+            return 0
+
+        touched = self._touch_memory(connection_id, client_ip)
+        if touched:
+            return touched
+
+        # Belum dikenal di proses ini (didaftarkan proses lain sebelum reload)
+        self._load_connected(connection_id, client_ip)
+        return self._touch_memory(connection_id, client_ip)
+
+    def _touch_memory(self, connection_id, client_ip):
+        now = datetime.datetime.now()
+        with self._lock:
+            if connection_id:
+                matches = [connection_id] if connection_id in self._sessions else []
+            else:
+                matches = [cid for cid, s in self._sessions.items() if s['client_ip'] == client_ip]
+            for cid in matches:
+                self._sessions[cid]['last_activity'] = now
+                self._dirty.add(cid)
+        return len(matches)
+
+    def remove(self, connection_id=None, client_ip=None):
+        """Client disconnect (status sudah ditulis ke database oleh route)"""
+        with self._lock:
+            if connection_id:
+                try:
+                    ids = [int(connection_id)]
+                except (TypeError, ValueError):
+                    ids = []
+            else:
+                ids = [cid for cid, s in self._sessions.items() if s['client_ip'] == client_ip]
+            for cid in ids:
+                self._sessions.pop(cid, None)
+                self._added.pop(cid, None)
+                self._dirty.discard(cid)
+
+    def active_sessions(self):
+        """Client yang masih mengirim heartbeat, terbaru dulu"""
+        self._ensure_running()
+        cutoff = datetime.datetime.now() - datetime.timedelta(seconds=CLIENT_TIMEOUT)
+        with self._lock:
+            sessions = [dict(s) for s in self._sessions.values()
+                        if s['last_activity'] and s['last_activity'] >= cutoff]
+        sessions.sort(key=lambda s: s['last_activity'], reverse=True)
+        return sessions
+
+    def take_timeout_count(self):
+        """Jumlah client yang diputus karena timeout sejak pemanggilan terakhir"""
+        with self._lock:
+            count, self._timeouts = self._timeouts, 0
+        return count
+
+    def flush(self):
+        """Tulis last_activity yang berubah ke database"""
+        with self._lock:
+            pending = {cid: self._sessions[cid]['last_activity'] for cid in self._dirty if cid in self._sessions}
+            self._dirty.clear()
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        connection = get_db_connection()
+        if not connection:
+            with self._lock:
+                self._dirty.update(pending)
+            raise RuntimeError('Database error')
+        try:
+            cursor = connection.cursor()
+            for start in range(0, len(items), FLUSH_BATCH):
+                batch = items[start:start + FLUSH_BATCH]
+                cases = ' '.join(['WHEN %s THEN %s'] * len(batch))
+                placeholders = ', '.join(['%s'] * len(batch))
+                params = [value for item in batch for value in item]
+                params.extend(cid for cid, _ in batch)
+                # GREATEST: jangan mundurkan heartbeat yang ditulis proses lain
+                cursor.execute(f"""
+                    UPDATE client_connections
+                    SET last_activity = GREATEST(last_activity, CASE id_connection {cases} END)
+                    WHERE status = 'Terhubung' AND id_connection IN ({placeholders})
+                """, params)
+            connection.commit()
+            cursor.close()
+        except Exception:
+            with self._lock:
+                for cid in pending:
+                    if cid in self._sessions:
+                        self._dirty.add(cid)
+            raise
+        finally:
+            connection.close()
+        return len(items)
+
+    def sweep(self):
+        """Putuskan client yang tidak mengirim heartbeat selama CLIENT_TIMEOUT"""
+        now = datetime.datetime.now()
+        cutoff = now - datetime.timedelta(seconds=CLIENT_TIMEOUT)
+        connection = get_db_connection()
+        if not connection:
+            raise RuntimeError('Database error')
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                UPDATE client_connections
+                SET status = 'Terputus', disconnect_time = %s, last_activity = last_activity
+                WHERE status = 'Terhubung' AND last_activity < %s
+            """, (now, cutoff))
+            count = cursor.rowcount
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+        with self._lock:
+            for cid in [cid for cid, s in self._sessions.items()
+                        if s['last_activity'] is not None and s['last_activity'] < cutoff]:
+                self._sessions.pop(cid, None)
+                self._added.pop(cid, None)
+                self._dirty.discard(cid)
+            self._timeouts += count
+        if count:
+            publish('presence', {'status': 'Terputus', 'timeout': count})
+        return count
+
+    def reload(self):
+        """Samakan daftar client aktif dengan database"""
+        started = time.monotonic()
+        connection = get_db_connection()
+        if not connection:
+            raise RuntimeError('Database error')
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT {', '.join(SESSION_COLUMNS)} FROM client_connections
+                WHERE status = 'Terhubung'
+            """)
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+
+        with self._lock:
+            sessions = {}
+            for row in rows:
+                current = self._sessions.get(row['id_connection'])
+                if current and current['last_activity'] and (
+                        not row['last_activity'] or current['last_activity'] > row['last_activity']):
+                    row['last_activity'] = current['last_activity']
+                sessions[row['id_connection']] = row
+            # Client yang didaftarkan setelah SELECT di atas belum terlihat
+            for cid, added in self._added.items():
+                if added >= started and cid in self._sessions:
+                    sessions.setdefault(cid, self._sessions[cid])
+            self._sessions = sessions
+            self._added = {cid: added for cid, added in self._added.items() if cid in sessions}
+            self._dirty &= set(sessions)
+            self._loaded = True
+
+    def _load_connected(self, connection_id, client_ip):
+        connection = get_db_connection()
+        if not connection:
+            raise RuntimeError('Database error')
+        try:
+            cursor = connection.cursor(dictionary=True)
+            query = f"SELECT {', '.join(SESSION_COLUMNS)} FROM client_connections WHERE status = 'Terhubung' AND "
+            if connection_id:
+                cursor.execute(query + "id_connection = %s", (connection_id,))
+            else:
+                cursor.execute(query + "client_ip = %s", (client_ip,))
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+        with self._lock:
+            for row in rows:
+                self._sessions.setdefault(row['id_connection'], row)
+
+
+tracker = PresenceTracker()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        tracker.flush()
+    except Exception as e:
+        print(f"[PRESENCE] Flush terakhir gagal: {e}")
@@ -1,52 +1,20 @@
 # Path: api/routes/admin_routes.py
 
 from flask import Blueprint, jsonify, request
-from config import get_db_connection
+from config import get_db_connection, get_db_pool_stats
+from api_status import get_api_status, set_api_status
+from blob_store import blob_stats, collect_garbage
+from finance_rollup import ROLLUP_SOURCES, RollupLockError, rebuild as rebuild_finance_rollup
+from presence import SESSION_COLUMNS, tracker
+from jemaat_search import SearchLockError, rebuild as rebuild_jemaat_search
 import datetime
 import hashlib
-import os
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            set_api_status(True)
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def set_api_status(enabled):
-    try:
-        with open(API_STATUS_FILE, 'w') as f:
-            f.write('enabled' if enabled else 'disabled')
-        return True
-    except Exception as e:
-        print(f"Error writing API status: {e}")
-        return False
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @admin_bp.route('/login', methods=['POST'])
 def admin_login():
     """Endpoint untuk login admin"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -112,10 +80,6 @@ def admin_login():
 @admin_bp.route('/update-last-login', methods=['POST'])
 def update_admin_last_login():
     """Endpoint untuk update last login admin"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -150,49 +114,19 @@ def update_admin_last_login():
 
 @admin_bp.route('/active-sessions', methods=['GET'])
 def get_active_sessions():
-    """Endpoint untuk mendapatkan daftar client yang aktif dengan timeout detection"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+    """Endpoint untuk mendapatkan daftar client yang aktif.
 
+    Dijawab dari presence tracker di memori; client yang tidak mengirim
+    heartbeat selama 2 menit diputus oleh sweep di background (presence.py).
+    """
     try:
-        cursor = connection.cursor(dictionary=True)
-
-        # Step 1: Auto-disconnect clients yang timeout (tidak ada heartbeat selama 2 menit)
-        # Client dianggap timeout jika last_activity > 2 menit yang lalu
-        now = datetime.datetime.now()
-        timeout_query = """
-        UPDATE client_connections
-        SET status = 'Terputus', disconnect_time = %s
-        WHERE status = 'Terhubung'
-        AND last_activity < DATE_SUB(NOW(), INTERVAL 2 MINUTE)
-        """
-        cursor.execute(timeout_query, (now,))
-        timeout_count = cursor.rowcount
-        connection.commit()
-
-        # Step 2: Query hanya client yang benar-benar aktif (status = Terhubung)
-        # Tambahkan id_connection untuk identifikasi unik dan hindari duplikasi
-        query = """
-        SELECT id_connection, client_ip, hostname, connect_time, status, last_activity
-        FROM client_connections
-        WHERE status = 'Terhubung'
-        ORDER BY last_activity DESC
-        """
-        cursor.execute(query)
-        result = cursor.fetchall()
-
-        cursor.close()
-        connection.close()
+        result = [{column: session[column] for column in SESSION_COLUMNS}
+                  for session in tracker.active_sessions()]
 
         return jsonify({
             'status': 'success',
             'data': result,
-            'timeout_disconnected': timeout_count  # Jumlah client yang di-timeout
+            'timeout_disconnected': tracker.take_timeout_count()  # Jumlah client yang di-timeout
         })
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -200,10 +134,6 @@ def get_active_sessions():
 @admin_bp.route('/client-activity-history', methods=['GET'])
 def get_client_activity_history():
     """Endpoint untuk mendapatkan riwayat aktivitas semua client (termasuk yang terputus)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -262,10 +192,6 @@ def get_client_activity_history():
 @admin_bp.route('/broadcast', methods=['POST'])
 def admin_broadcast():
     """Endpoint untuk mengirim broadcast message dari admin"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -339,13 +265,90 @@ def api_status():
         'message': 'API aktif' if get_api_status() else 'API nonaktif'
     })
 
+@admin_bp.route('/db-pool')
+def db_pool_status():
+    """Statistik connection pool database"""
+    return jsonify({
+        'status': 'success',
+        'data': get_db_pool_stats()
+    })
+
+@admin_bp.route('/blobs')
+def blob_store_status():
+    """Statistik blob store dokumen/foto"""
+    return jsonify({
+        'status': 'success',
+        'data': blob_stats()
+    })
+
+@admin_bp.route('/blobs/gc', methods=['POST'])
+def blob_store_gc():
+    """Hapus blob yang tidak direferensikan dokumen/struktur mana pun"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        result = collect_garbage(connection)
+        return jsonify({
+            'status': 'success',
+            'message': f"{result['removed']} blob dihapus",
+            'data': result
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
+
+@admin_bp.route('/keuangan-rollup/rebuild', methods=['POST'])
+def rebuild_keuangan_rollup():
+    """Bangun ulang tabel rollup keuangan dari data keuangan/keuangan_kategorial"""
+    source = (request.get_json(silent=True) or {}).get('sumber') or request.args.get('sumber')
+    if source and source not in ROLLUP_SOURCES:
+        return jsonify({'status': 'error', 'message': f'Sumber tidak dikenal: {source}'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        result = rebuild_finance_rollup(connection, source)
+        return jsonify({
+            'status': 'success',
+            'message': 'Rollup keuangan berhasil dibangun ulang',
+            'data': result
+        })
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
+
+@admin_bp.route('/jemaat-search/rebuild', methods=['POST'])
+def rebuild_jemaat_search_index():
+    """Bangun ulang indeks pencarian jemaat (jemaat_search_token)"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        result = rebuild_jemaat_search(connection)
+        return jsonify({
+            'status': 'success',
+            'message': 'Indeks pencarian jemaat berhasil dibangun ulang',
+            'data': result
+        })
+    except SearchLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
+
 @admin_bp.route('/log-activity', methods=['POST'])
 def log_admin_activity():
     """Log aktivitas admin"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -382,10 +385,6 @@ def log_admin_activity():
 @admin_bp.route('/users', methods=['GET'])
 def get_users():
     """Get list of all users"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -413,10 +412,6 @@ def get_users():
 @admin_bp.route('/users', methods=['POST'])
 def create_user():
     """Create new user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid data'}), 400
@@ -451,10 +446,6 @@ def create_user():
 @admin_bp.route('/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
     """Update user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid data'}), 400
@@ -500,10 +491,6 @@ def update_user(user_id):
 @admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     """Delete user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -522,10 +509,6 @@ def delete_user(user_id):
 @admin_bp.route('/create-user', methods=['POST'])
 def create_admin_user():
     """Endpoint untuk menambah admin/user baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -592,10 +575,6 @@ def create_admin_user():
 @admin_bp.route('/list-users', methods=['GET'])
 def list_admin_users():
     """Endpoint untuk daftar semua admin/user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -634,10 +613,6 @@ def list_admin_users():
 @admin_bp.route('/update-user/<int:admin_id>', methods=['PUT'])
 def update_admin_user(admin_id):
     """Endpoint untuk update admin/user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Invalid JSON data'}), 400
@@ -2,39 +2,13 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
-import os
+from sync import apply_sync
 
 aset_bp = Blueprint('aset', __name__, url_prefix='/aset')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error',
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @aset_bp.route('', methods=['GET'])
 def get_aset():
     """Ambil semua data aset"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -81,8 +55,17 @@ def get_aset():
             base_query += " AND lokasi = %s"
             params.append(lokasi)
 
-        base_query += " ORDER BY nama_aset ASC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'aset', cursor, sync_conditions, params)
+        for condition in sync_conditions:
+            base_query += " AND " + condition
+
+        if sync:
+            base_query += " ORDER BY nama_aset ASC"
+        else:
+            base_query += " ORDER BY nama_aset ASC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
         cursor.execute(base_query, params)
         aset_list = cursor.fetchall()
@@ -130,14 +113,19 @@ def get_aset():
             if item.get('updated_at'):
                 item['updated_at'] = item['updated_at'].isoformat()  # type: ignore
 
-        return jsonify({
+        response = {
             'status': 'success',
             'data': aset_list,
             'total': total,
             'limit': limit,
             'offset': offset
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
 
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"Error getting aset: {e}")
         return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
@@ -148,10 +136,6 @@ def get_aset():
 @aset_bp.route('', methods=['POST'])
 def add_aset():
     """Tambah data aset baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -224,10 +208,6 @@ def add_aset():
 @aset_bp.route('/<int:aset_id>', methods=['GET'])
 def get_aset_by_id(aset_id):
     """Ambil data aset berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -263,10 +243,6 @@ def get_aset_by_id(aset_id):
 @aset_bp.route('/<int:aset_id>', methods=['PUT'])
 def update_aset(aset_id):
     """Update data aset"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -337,10 +313,6 @@ def update_aset(aset_id):
 @aset_bp.route('/<int:aset_id>', methods=['DELETE'])
 def delete_aset(aset_id):
     """Hapus data aset"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -372,10 +344,6 @@ def delete_aset(aset_id):
 @aset_bp.route('/statistics', methods=['GET'])
 def get_aset_statistics():
     """Ambil statistik aset"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -454,10 +422,6 @@ def get_aset_statistics():
 @aset_bp.route('/kategori', methods=['GET'])
 def get_aset_categories():
     """Ambil daftar kategori aset yang ada"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -487,10 +451,6 @@ def get_aset_categories():
 @aset_bp.route('/lokasi', methods=['GET'])
 def get_aset_locations():
     """Ambil daftar lokasi aset yang ada"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
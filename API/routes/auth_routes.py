@@ -8,35 +8,9 @@ import os
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @auth_bp.route('/login', methods=['POST'])
 def user_login():
     """Login untuk pengguna biasa (bukan admin)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -92,10 +66,6 @@ def user_login():
 @auth_bp.route('/register', methods=['POST'])
 def register_user():
     """Register pengguna baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -149,10 +119,6 @@ def register_user():
 @auth_bp.route('/change-password', methods=['POST'])
 def change_password():
     """Ganti password pengguna"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -196,10 +162,6 @@ def change_password():
 @auth_bp.route('/reset-password', methods=['POST'])
 def reset_password():
     """Reset password pengguna (untuk admin)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -256,10 +218,6 @@ def reset_password():
 @auth_bp.route('/verify-token', methods=['POST'])
 def verify_token():
     """Verifikasi token atau session (placeholder untuk future implementation)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     token = data.get('token')
     
@@ -277,10 +235,6 @@ def verify_token():
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
     """Logout pengguna"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     user_id = data.get('user_id')
     
@@ -295,10 +249,6 @@ def logout():
 @auth_bp.route('/profile', methods=['GET'])
 def get_profile():
     """Ambil profil pengguna berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     user_id = request.args.get('user_id')
     
     if not user_id:
@@ -336,10 +286,6 @@ def get_profile():
 @auth_bp.route('/profile', methods=['PUT'])
 def update_profile():
     """Update profil pengguna"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -383,10 +329,6 @@ def update_profile():
 @auth_bp.route('/upload-photo', methods=['POST'])
 def upload_photo():
     """Upload foto profil pengguna"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     if 'file' not in request.files:
         return jsonify({'status': 'error', 'message': 'Tidak ada file yang diupload'}), 400
 
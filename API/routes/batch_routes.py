@@ -0,0 +1,174 @@
+# Path: api/routes/batch_routes.py
+# Beberapa request API dalam satu round-trip.
+#
+# POST /batch
+#   {"requests": [{"id": "stats", "method": "GET", "path": "/stats/summary",
+#                  "params": {"months": 6}, "body": null, "etag": "W/\"...\""},
+#                 ...],
+#    "parallel": true}
+#
+# Setiap sub-request dijalankan lewat routing Flask biasa sehingga hook
+# before/after request tetap berlaku (status API, ETag/304, event
+# data_changed). Hasilnya dikembalikan sekaligus, urut sesuai daftar:
+#   {"status": "success", "data": {"stats": {"status": 200, "etag": ..., "body": {...}}, ...}}
+# Sub-request yang gagal tidak menggagalkan batch; status dan body error-nya
+# dikembalikan seperti jika dipanggil langsung.
+#
+# Sub-request dalam satu lane berbagi satu koneksi pool
+# (config.shared_connection). Batch yang seluruhnya GET dijalankan paralel
+# oleh maksimal BATCH_WORKERS lane; batch yang mengubah data (atau
+# "parallel": false) dijalankan berurutan dalam satu lane. Lane yang tidak
+# mendapat worker kosong dijalankan di thread request itu sendiri, jadi
+# batch tidak pernah mengantre di belakang batch lain.
+# Stream (/events, /export) dan /batch bertingkat tidak bisa dipakai.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.datastructures import MultiDict
+from config import shared_connection
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/batch')
+
+MAX_SUB_REQUESTS = 20
+BATCH_WORKERS = 4
+ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+BLOCKED_PREFIXES = ('/batch', '/events', '/export')
+
+# Lane tambahan dari semua batch yang berjalan bersamaan; dibatasi supaya
+# tidak menghabiskan pool koneksi database
+EXECUTOR_WORKERS = 8
+_executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix='batch')
+# Worker yang belum dipakai; lane hanya di-submit jika bisa langsung berjalan
+_free_workers = threading.BoundedSemaphore(EXECUTOR_WORKERS)
+
+
+def _parse_sub_requests(payload):
+    items = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError('Field requests harus berupa list yang tidak kosong')
+    if len(items) > MAX_SUB_REQUESTS:
+        raise ValueError(f'Maksimal {MAX_SUB_REQUESTS} request per batch')
+
+    subs = []
+    seen = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f'Request #{index} tidak valid')
+        sub_id = str(item.get('id', index))
+        if sub_id in seen:
+            raise ValueError(f'Id request duplikat: {sub_id}')
+        seen.add(sub_id)
+
+        method = str(item.get('method', 'GET')).upper()
+        if method not in ALLOWED_METHODS:
+            raise ValueError(f'Method tidak didukung: {method}')
+        path = item.get('path')
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise ValueError(f'Path request {sub_id} harus diawali /')
+        url = urlsplit(path)
+        if any(url.path == prefix or url.path.startswith(prefix + '/') for prefix in BLOCKED_PREFIXES):
+            raise ValueError(f'Endpoint tidak bisa dipakai dalam batch: {url.path}')
+
+        params = item.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError(f'Params request {sub_id} harus berupa object')
+        query = parse_qsl(url.query, keep_blank_values=True)
+        query.extend((key, str(value)) for key, value in params.items() if value is not None)
+
+        subs.append({
+            'id': sub_id,
+            'method': method,
+            'path': url.path,
+            'query': query,
+            'body': item.get('body'),
+            'etag': item.get('etag'),
+        })
+    return subs
+
+
+def _dispatch(app, sub, remote_addr):
+    """Jalankan satu sub-request, return {'status', 'etag', 'body'}"""
+    headers = {'If-None-Match': sub['etag']} if sub['etag'] else {}
+    kwargs = {}
+    if sub['body'] is not None and sub['method'] != 'GET':
+        kwargs['json'] = sub['body']
+    try:
+        # App context baru per sub-request: tanpa ini Flask memakai ulang app context
+        # request /batch, sehingga flask.g (skip_data_change, metrics) terbawa ke
+        # sub-request berikutnya dan ke request luar
+        with app.app_context(), \
+                app.test_request_context(sub['path'], method=sub['method'], query_string=MultiDict(sub['query']),
+                                         headers=headers, environ_base={'REMOTE_ADDR': remote_addr},
+                                         **kwargs):
+            response = app.full_dispatch_request()
+            try:
+                result = {'status': response.status_code}
+                if response.headers.get('ETag'):
+                    result['etag'] = response.headers['ETag']
+                if response.direct_passthrough or response.is_streamed:
+                    result = {'status': 400, 'body': {'status': 'error', 'message': 'Response stream/file tidak bisa dikirim lewat batch'}}
+                elif response.status_code != 304:
+                    result['body'] = response.get_json() if response.is_json else response.get_data(as_text=True)
+                return result
+            finally:
+                response.close()
+    except Exception as e:
+        print(f"[BATCH] {sub['method']} {sub['path']} gagal: {e}")
+        return {'status': 500, 'body': {'status': 'error', 'message': str(e)}}
+
+
+@batch_bp.route('', methods=['POST'])
+def run_batch():
+    """Jalankan beberapa request API dan kembalikan hasilnya dalam satu response"""
+    payload = request.get_json(silent=True)
+    try:
+        subs = _parse_sub_requests(payload)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    try:
+        started = time.monotonic()
+        app = current_app._get_current_object()
+        remote_addr = request.remote_addr
+        read_only = all(sub['method'] == 'GET' for sub in subs)
+        lanes = min(BATCH_WORKERS, len(subs)) if read_only and payload.get('parallel', True) is not False else 1
+        results = [None] * len(subs)
+
+        def run_lane(lane):
+            with shared_connection():
+                for index in range(lane, len(subs), lanes):
+                    results[index] = _dispatch(app, subs[index], remote_addr)
+
+        def run_pooled_lane(lane):
+            try:
+                run_lane(lane)
+            finally:
+                _free_workers.release()
+
+        # Lane 0 dan lane yang tidak kebagian worker dijalankan di thread request ini
+        futures = []
+        inline = [0]
+        for lane in range(1, lanes):
+            if _free_workers.acquire(blocking=False):
+                try:
+                    futures.append(_executor.submit(run_pooled_lane, lane))
+                except Exception:
+                    _free_workers.release()
+                    raise
+            else:
+                inline.append(lane)
+        for lane in inline:
+            run_lane(lane)
+        for future in futures:
+            future.result()
+
+        return jsonify({
+            'status': 'success',
+            'data': {sub['id']: result for sub, result in zip(subs, results)},
+            'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -4,6 +4,7 @@ Routes untuk Kelompok Binaan (K. Binaan) - Pengurus Kelompok Binaan
 
 from flask import Blueprint, request, jsonify
 from config import get_db_connection
+from sync import apply_sync
 import logging
 
 binaan_bp = Blueprint('binaan', __name__, url_prefix='/binaan')
@@ -16,17 +17,32 @@ def get_binaan():
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        cursor.execute("SELECT * FROM k_binaan ORDER BY nama_lengkap ASC")
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        conditions = []
+        params = []
+        sync = apply_sync(request.args, 'binaan', cursor, conditions, params)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        cursor.execute(f"SELECT * FROM k_binaan{where} ORDER BY nama_lengkap ASC", params)
         data = cursor.fetchall()
 
         cursor.close()
         conn.close()
 
-        return jsonify({
+        response = {
             "success": True,
             "data": data,
             "message": "Data retrieved successfully"
-        }), 200
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "data": str(e),
+            "message": "Invalid updated_since"
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
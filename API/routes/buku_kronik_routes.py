@@ -4,11 +4,11 @@
 from flask import Blueprint, request, jsonify, session
 from typing import Tuple, Dict, Any
 import datetime
+from sync import apply_sync
 
 # Blueprint
 buku_kronik_bp = Blueprint('buku_kronik', __name__, url_prefix='/buku-kronik')
 
-
 # ========== HELPER FUNCTIONS ==========
 def check_user_logged_in():
     """Check if user is logged in"""
@@ -16,12 +16,10 @@ def check_user_logged_in():
         return False
     return True
 
-
 def get_current_user_id():
     """Get current user ID from session"""
     return session.get('user_id')
 
-
 def success_response(data=None, message="Success"):
     """Return success response"""
     return jsonify({
@@ -30,7 +28,6 @@ def success_response(data=None, message="Success"):
         "message": message
     }), 200
 
-
 def error_response(message="Error", status_code=400):
     """Return error response"""
     return jsonify({
@@ -38,7 +35,6 @@ def error_response(message="Error", status_code=400):
         "data": message
     }), status_code
 
-
 # ========== ROUTES ==========
 
 @buku_kronik_bp.route('', methods=['GET'])
@@ -52,6 +48,13 @@ def get_buku_kronik_list():
         if not db:
             return error_response("Database connection failed", 500)
 
+        cursor = db.cursor(dictionary=True)
+
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        conditions = []
+        params = []
+        sync = apply_sync(request.args, 'buku_kronik', cursor, conditions, params)
+
         # Get all kronik entries sorted by date descending
         query = """
             SELECT
@@ -63,11 +66,12 @@ def get_buku_kronik_list():
                 created_at,
                 updated_at
             FROM buku_kronik
-            ORDER BY tanggal DESC, created_at DESC
         """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY tanggal DESC, created_at DESC"
 
-        cursor = db.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
 
         # Format hasil
@@ -94,8 +98,13 @@ def get_buku_kronik_list():
         cursor.close()
         db.close()
 
-        return success_response({"data": kronik_list}, "Buku kronik berhasil dimuat")
+        result = {"data": kronik_list}
+        if sync:
+            result.update(sync.payload())
+        return success_response(result, "Buku kronik berhasil dimuat")
 
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Error: {str(e)}", 500)
 
@@ -2,40 +2,15 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from events import publish
+from presence import tracker
 import datetime
-import os
 
 client_bp = Blueprint('client', __name__, url_prefix='/client')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @client_bp.route('/register', methods=['POST'])
 def register_client():
     """Register client baru ke sistem - support multiple connections dari IP yang sama"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -62,15 +37,9 @@ def register_client():
 
         if existing:
             # Update last activity untuk connection yang sudah ada
-            update_query = """
-            UPDATE client_connections
-            SET last_activity = %s
-            WHERE id_connection = %s
-            """
-            cursor.execute(update_query, (datetime.datetime.now(), existing[0]))  # type: ignore
-            connection.commit()
             cursor.close()
             connection.close()
+            tracker.touch(connection_id=existing[0])  # type: ignore
 
             return jsonify({
                 'status': 'success',
@@ -93,6 +62,10 @@ def register_client():
         cursor.close()
         connection.close()
 
+        tracker.register(connection_id, client_ip, hostname, now)
+        publish('presence', {'id_connection': connection_id, 'client_ip': client_ip,
+                             'hostname': hostname, 'status': 'Terhubung'})
+
         return jsonify({
             'status': 'success',
             'message': 'Client berhasil terdaftar',
@@ -136,8 +109,14 @@ def disconnect_client():
         
         cursor.execute(query, params)
         connection.commit()
+        disconnected = cursor.rowcount
         cursor.close()
         connection.close()
+
+        tracker.remove(connection_id=connection_id, client_ip=client_ip)
+        if disconnected:
+            publish('presence', {'id_connection': connection_id, 'client_ip': client_ip,
+                                 'status': 'Terputus'})
         
         return jsonify({
             'status': 'success',
@@ -148,54 +127,26 @@ def disconnect_client():
 
 @client_bp.route('/heartbeat', methods=['POST'])
 def client_heartbeat():
-    """Update heartbeat client untuk menandakan masih aktif"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
+    """Update heartbeat client untuk menandakan masih aktif.
+
+    Hanya dicatat di memori; last_activity ditulis ke database secara batch
+    oleh presence tracker (lihat presence.py).
+    """
     data = request.json
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'status': 'error', 'message': 'Database error'}), 500
-    
+
     try:
         connection_id = data.get('connection_id')
         client_ip = data.get('client_ip')
-        
-        cursor = connection.cursor()
-        
-        if connection_id:
-            # Update berdasarkan connection ID
-            query = """
-            UPDATE client_connections 
-            SET last_activity = %s 
-            WHERE id_connection = %s AND status = 'Terhubung'
-            """
-            params = (datetime.datetime.now(), connection_id)
-        elif client_ip:
-            # Update berdasarkan IP
-            query = """
-            UPDATE client_connections 
-            SET last_activity = %s 
-            WHERE client_ip = %s AND status = 'Terhubung'
-            """
-            params = (datetime.datetime.now(), client_ip)
-        else:
+
+        if not connection_id and not client_ip:
             return jsonify({'status': 'error', 'message': 'Connection ID atau Client IP required'}), 400
-        
-        cursor.execute(query, params)
-        connection.commit()
-        
-        if cursor.rowcount > 0:
-            cursor.close()
-            connection.close()
+
+        if tracker.touch(connection_id=connection_id, client_ip=client_ip):
             return jsonify({
                 'status': 'success',
                 'message': 'Heartbeat updated'
             })
         else:
-            cursor.close()
-            connection.close()
             return jsonify({
                 'status': 'error',
                 'message': 'Client connection tidak ditemukan atau tidak aktif'
@@ -203,13 +154,38 @@ def client_heartbeat():
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@client_bp.route('/heartbeat/batch', methods=['POST'])
+def client_heartbeat_batch():
+    """Heartbeat beberapa client sekaligus (diteruskan oleh server registrasi lokal)"""
+    data = request.json or {}
+
+    try:
+        heartbeats = data.get('heartbeats') or []
+        if not isinstance(heartbeats, list):
+            return jsonify({'status': 'error', 'message': 'heartbeats harus berupa list'}), 400
+
+        updated = 0
+        missing = []
+        for item in heartbeats:
+            connection_id = item.get('connection_id')
+            client_ip = item.get('client_ip')
+            if not connection_id and not client_ip:
+                continue
+            if tracker.touch(connection_id=connection_id, client_ip=client_ip):
+                updated += 1
+            else:
+                missing.append({'connection_id': connection_id, 'client_ip': client_ip})
+
+        return jsonify({
+            'status': 'success',
+            'data': {'updated': updated, 'missing': missing}
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @client_bp.route('/messages', methods=['GET'])
 def get_client_messages():
     """Ambil pesan untuk client"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -253,10 +229,6 @@ def get_client_messages():
 @client_bp.route('/send-message', methods=['POST'])
 def send_client_message():
     """Kirim pesan dari client"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -301,23 +273,16 @@ def send_client_message():
 @client_bp.route('/active', methods=['GET'])
 def get_active_clients():
     """Ambil daftar client yang sedang aktif"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
-    connection = get_db_connection()
-    if not connection:
-        return jsonify({'status': 'error', 'message': 'Database error'}), 500
-
     try:
-        cursor = connection.cursor(dictionary=True)
-
-        # Menggunakan view yang sudah ada
-        query = "SELECT * FROM v_active_clients ORDER BY last_activity DESC"
-        cursor.execute(query)
-        result = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        # Dari presence tracker, kolom sama dengan view v_active_clients
+        now = datetime.datetime.now()
+        result = [{
+            'client_ip': s['client_ip'],
+            'hostname': s['hostname'],
+            'connect_time': s['connect_time'],
+            'last_activity': s['last_activity'],
+            'minutes_inactive': int((now - s['last_activity']).total_seconds() // 60),
+        } for s in tracker.active_sessions()]
 
         return jsonify({
             'status': 'success',
@@ -329,10 +294,6 @@ def get_active_clients():
 @client_bp.route('/connections/history', methods=['GET'])
 def get_client_connections_history():
     """Ambil semua riwayat koneksi client (aktif dan terputus)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -1,43 +1,19 @@
 # Path: api/routes/dokumen_routes.py
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, g, jsonify, request, send_file
 from config import get_db_connection
+from pagination import KeysetPaginator, is_cursor_request
+from sync import apply_sync
+from chunked_upload import upload_store, UploadError, CHUNK_SIZE
+from blob_store import blob_store, blob_lock, release_blob
 import datetime
 import os
 
 dokumen_bp = Blueprint('dokumen', __name__, url_prefix='/dokumen')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    """Check if API is enabled - default to True if file doesn't exist"""
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        # Default to True jika file tidak ada
-        return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        # Default to True jika ada error
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @dokumen_bp.route('/files', methods=['GET'])
 def get_files():
     """Ambil semua data file/dokumen"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -55,34 +31,133 @@ def get_files():
         FROM dokumen d
         LEFT JOIN admin a ON d.uploaded_by_admin = a.id_admin
         """
+        conditions = []
         params = []
 
         if kategori_file:
-            query += " WHERE d.kategori_file = %s"
+            conditions.append("d.kategori_file = %s")
             params.append(kategori_file)
 
-        query += " ORDER BY d.upload_date DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'dokumen', cursor, conditions, params, 'd.updated_at')
+
+        # Mode cursor (opt-in): seek di idx_dokumen_upload_date, bukan OFFSET
+        paginator = None
+        if is_cursor_request(request.args):
+            paginator = KeysetPaginator('d.upload_date', 'd.id_dokumen', descending=True)
+            keyset_sql, keyset_params = paginator.condition(request.args.get('cursor'))
+            if keyset_sql:
+                conditions.append(keyset_sql)
+                params.extend(keyset_params)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        if paginator:
+            query += paginator.order_by() + " LIMIT %s"
+            params.append(limit + 1)
+        elif sync:
+            query += " ORDER BY d.upload_date DESC"
+        else:
+            query += " ORDER BY d.upload_date DESC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
         
         cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
         
-        return jsonify({
+        response = {
             'status': 'success',
             'data': result
-        })
+        }
+        if paginator:
+            response['data'], response['next_cursor'] = paginator.finalize(result, limit)
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def _file_ext(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else 'bin'
+
+def _insert_dokumen(connection, metadata, file_path, file_size, file_hash):
+    """Simpan record dokumen baru yang mereferensikan blob file_hash, return id_dokumen"""
+    cursor = connection.cursor()
+    with blob_lock(cursor, file_hash):
+        # Blob bisa saja baru dihapus GC sebelum lock didapat
+        if not blob_store.find(file_hash):
+            raise FileNotFoundError(f'Blob {file_hash} tidak ditemukan')
+        doc_id = _insert_dokumen_row(cursor, connection, metadata, file_path, file_size, file_hash)
+    cursor.close()
+    return doc_id
+
+def _insert_dokumen_row(cursor, connection, metadata, file_path, file_size, file_hash):
+    # Disable foreign key check untuk insert (akan re-enable setelah)
+    cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+    try:
+        return _execute_dokumen_insert(cursor, connection, metadata, file_path, file_size, file_hash)
+    finally:
+        # Selalu re-enable, juga jika INSERT gagal: koneksi kembali ke pool dan
+        # dipakai request lain dengan variabel sesi yang sama
+        cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+
+def _execute_dokumen_insert(cursor, connection, metadata, file_path, file_size, file_hash):
+
+    # Insert ke database - include uploaded_by_admin if provided
+    uploaded_by_admin = metadata.get('uploaded_by_admin')
+    if uploaded_by_admin:
+        query = """
+        INSERT INTO dokumen (nama_dokumen, bentuk_dokumen, kategori_file, file_path, file_hash, ukuran_file, keterangan, upload_date, uploaded_by_admin)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), %s)
+        """
+        params = (
+            metadata['nama_dokumen'],
+            metadata['bentuk_dokumen'],
+            metadata['kategori_file'],
+            file_path,
+            file_hash,
+            file_size,
+            metadata['keterangan'],
+            uploaded_by_admin
+        )
+    else:
+        query = """
+        INSERT INTO dokumen (nama_dokumen, bentuk_dokumen, kategori_file, file_path, file_hash, ukuran_file, keterangan, upload_date)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+        """
+        params = (
+            metadata['nama_dokumen'],
+            metadata['bentuk_dokumen'],
+            metadata['kategori_file'],
+            file_path,
+            file_hash,
+            file_size,
+            metadata['keterangan']
+        )
+    cursor.execute(query, params)
+    doc_id = cursor.lastrowid
+    connection.commit()
+    return doc_id
+
+def _dokumen_metadata(source, filename):
+    """Ambil metadata dokumen dari form/JSON"""
+    bentuk_dokumen = source.get('bentuk_dokumen', 'Lainnya')
+    return {
+        'nama_dokumen': source.get('nama_dokumen', filename),
+        'bentuk_dokumen': bentuk_dokumen,
+        'kategori_file': source.get('kategori_file', bentuk_dokumen),
+        'keterangan': source.get('keterangan', ''),
+        'uploaded_by_admin': source.get('uploaded_by_admin'),  # Optional admin ID
+        'filename': filename,
+    }
+
 @dokumen_bp.route('/upload', methods=['POST'])
 def upload_file():
     """Upload file/dokumen baru - sesuai pola struktur_dpp"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     # Check file exists
     if 'file' not in request.files:
         return jsonify({'success': False, 'data': 'Tidak ada file yang diupload'}), 400
@@ -91,79 +166,21 @@ def upload_file():
     if not file.filename or file.filename == '':
         return jsonify({'success': False, 'data': 'Tidak ada file yang dipilih'}), 400
 
+    connection = None
     try:
         # Ambil metadata dari form
-        nama_dokumen = request.form.get('nama_dokumen', file.filename)
-        bentuk_dokumen = request.form.get('bentuk_dokumen', 'Lainnya')
-        kategori_file = request.form.get('kategori_file', bentuk_dokumen)
-        keterangan = request.form.get('keterangan', '')
-        uploaded_by_admin = request.form.get('uploaded_by_admin')  # Optional admin ID
+        metadata = _dokumen_metadata(request.form, file.filename)
 
         # Connection ke database
         connection = get_db_connection()
         if not connection:
             return jsonify({'success': False, 'data': 'Database error'}), 500
 
-        # Disable foreign key check untuk insert (akan re-enable setelah)
-        cursor = connection.cursor()
-        cursor.execute("SET FOREIGN_KEY_CHECKS=0")
-
-        # Baca file dan hitung size
-        file_content = file.read()
-        file_size = len(file_content)
-        file.seek(0)
-
-        # Buat direktori uploads jika belum ada
-        import uuid
-        from datetime import datetime
-        upload_dir = 'uploads/dokumen'
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # Generate unique filename sesuai pola struktur
-        file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'bin'  # type: ignore
-        unique_filename = f"dokumen_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}"
-        file_path = os.path.join(upload_dir, unique_filename)
-
-        # Save file ke disk
-        file.save(file_path)
-
-        # Insert ke database - include uploaded_by_admin if provided
-        if uploaded_by_admin:
-            query = """
-            INSERT INTO dokumen (nama_dokumen, bentuk_dokumen, kategori_file, file_path, ukuran_file, keterangan, upload_date, uploaded_by_admin)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW(), %s)
-            """
-            params = (
-                nama_dokumen,
-                bentuk_dokumen,
-                kategori_file,
-                file_path,
-                file_size,
-                keterangan,
-                uploaded_by_admin
-            )
-        else:
-            query = """
-            INSERT INTO dokumen (nama_dokumen, bentuk_dokumen, kategori_file, file_path, ukuran_file, keterangan, upload_date)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-            """
-            params = (
-                nama_dokumen,
-                bentuk_dokumen,
-                kategori_file,
-                file_path,
-                file_size,
-                keterangan
-            )
-        cursor.execute(query, params)
-        connection.commit()
-
-        # Re-enable foreign key check
-        cursor.execute("SET FOREIGN_KEY_CHECKS=1")
-        connection.commit()
+        # Simpan ke blob store secara streaming; isi yang sudah ada tidak disimpan ulang
+        file_hash, file_path, created = blob_store.put_stream(file.stream, _file_ext(file.filename))
+        file_size = os.path.getsize(file_path)
 
-        doc_id = cursor.lastrowid
-        cursor.close()
+        doc_id = _insert_dokumen(connection, metadata, file_path, file_size, file_hash)
         connection.close()
 
         return jsonify({
@@ -171,7 +188,9 @@ def upload_file():
             'data': {
                 'file_id': doc_id,
                 'message': 'File berhasil diupload',
-                'file_path': file_path
+                'file_path': file_path,
+                'sha256': file_hash,
+                'deduplicated': not created
             }
         })
     except Exception as e:
@@ -185,13 +204,131 @@ def upload_file():
             pass
         return jsonify({'success': False, 'data': f'Upload error: {str(e)}'}), 500
 
+def _upload_error_response(e):
+    body = {'success': False, 'data': e.message}
+    body.update(e.extra)
+    return jsonify(body), e.status
+
+def _upload_state_response(state):
+    return jsonify({
+        'success': True,
+        'data': {
+            'upload_id': state['upload_id'],
+            'received': state['received'],
+            'total_size': state['total_size'],
+            'chunk_size': CHUNK_SIZE
+        }
+    })
+
+@dokumen_bp.route('/uploads', methods=['POST'])
+def init_chunked_upload():
+    """Mulai upload chunked (lihat chunked_upload.py)"""
+    # Init/chunk/batal tidak mengubah tabel dokumen: data_changed hanya setelah commit
+    g.skip_data_change = True
+    data = request.json or {}
+    filename = data.get('filename')
+    if not filename:
+        return jsonify({'success': False, 'data': 'filename wajib diisi'}), 400
+
+    metadata = _dokumen_metadata(data, filename)
+
+    # Deduplikasi hanya di commit, setelah server sendiri menghitung hash isi
+    # yang diupload (hash dari client tidak dipercaya)
+    total_size = data.get('total_size')
+    try:
+        total_size = int(total_size) if total_size is not None else None
+        state = upload_store.create(metadata, total_size)
+    except ValueError:
+        return jsonify({'success': False, 'data': 'total_size tidak valid'}), 400
+    except UploadError as e:
+        return _upload_error_response(e)
+
+    return _upload_state_response(state), 201
+
+@dokumen_bp.route('/uploads/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    """Status upload chunked - dipakai client untuk melanjutkan upload"""
+    try:
+        return _upload_state_response(upload_store.get(upload_id))
+    except UploadError as e:
+        return _upload_error_response(e)
+
+@dokumen_bp.route('/uploads/<upload_id>', methods=['PUT'])
+def put_upload_chunk(upload_id):
+    """Terima satu chunk (body mentah) pada offset tertentu"""
+    g.skip_data_change = True
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return jsonify({'success': False, 'data': 'Parameter offset wajib diisi'}), 400
+
+    try:
+        state = upload_store.append(upload_id, offset, request.stream, request.headers.get('X-Chunk-SHA256'))
+        return _upload_state_response(state)
+    except UploadError as e:
+        return _upload_error_response(e)
+    except Exception as e:
+        # Koneksi putus di tengah chunk: data chunk sudah di-truncate, client bisa resume
+        print(f"[UPLOAD] Chunk {upload_id}@{offset} gagal: {e}")
+        return jsonify({'success': False, 'data': f'Chunk gagal diterima: {str(e)}'}), 400
+
+@dokumen_bp.route('/uploads/<upload_id>/commit', methods=['POST'])
+def commit_chunked_upload(upload_id):
+    """Selesaikan upload chunked dan simpan sebagai dokumen"""
+    data = request.json or {}
+    # Koneksi diambil dulu: jika database tidak tersedia, upload tetap utuh untuk dicoba lagi
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'data': 'Database error'}), 500
+    try:
+        with upload_store.finish(upload_id, data.get('sha256')) as (commit_path, file_size, checksum, metadata):
+            if commit_path:
+                file_path, created = blob_store.put_file(commit_path, checksum, _file_ext(metadata['filename']))
+            else:
+                # Retry setelah INSERT gagal: file sudah ada di blob store
+                file_path, created = blob_store.find(checksum), False
+                if not file_path:
+                    raise UploadError('File upload sudah tidak tersedia, ulangi upload', 410)
+                os.utime(file_path)
+            # Jika insert gagal, blob dibiarkan: commit ulang memakai blob ini,
+            # dan GC berkala menghapusnya jika tidak jadi direferensikan
+            doc_id = _insert_dokumen(connection, metadata, file_path, file_size, checksum)
+        connection.close()
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'file_id': doc_id,
+                'message': 'File berhasil diupload',
+                'file_path': file_path,
+                'ukuran_file': file_size,
+                'sha256': checksum,
+                'deduplicated': not created
+            }
+        })
+    except UploadError as e:
+        return _upload_error_response(e)
+    except Exception as e:
+        print(f"Error commit upload dokumen: {e}")
+        try:
+            if connection and connection.is_connected():
+                connection.close()
+        except:
+            pass
+        return jsonify({'success': False, 'data': f'Upload error: {str(e)}'}), 500
+
+@dokumen_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_chunked_upload(upload_id):
+    """Batalkan upload chunked"""
+    g.skip_data_change = True
+    try:
+        upload_store.discard(upload_id)
+    except UploadError as e:
+        return _upload_error_response(e)
+    return jsonify({'success': True, 'data': 'Upload dibatalkan'})
+
 @dokumen_bp.route('/files/<int:file_id>', methods=['GET'])
 def get_file_by_id(file_id):
     """Ambil data file berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -226,10 +363,6 @@ def get_file_by_id(file_id):
 @dokumen_bp.route('/files/<int:file_id>', methods=['PUT'])
 def update_file(file_id):
     """Update metadata file"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -271,10 +404,6 @@ def update_file(file_id):
 @dokumen_bp.route('/files/<int:file_id>', methods=['DELETE'])
 def delete_file(file_id):
     """Hapus file/dokumen"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -282,7 +411,7 @@ def delete_file(file_id):
     try:
         # Ambil info file untuk hapus file fisik jika perlu
         cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT file_path FROM dokumen WHERE id_dokumen = %s", (file_id,))
+        cursor.execute("SELECT file_path, file_hash FROM dokumen WHERE id_dokumen = %s", (file_id,))
         file_info = cursor.fetchone()
 
         if not file_info:
@@ -297,9 +426,11 @@ def delete_file(file_id):
         cursor.execute("DELETE FROM dokumen WHERE id_dokumen = %s", (file_id,))
         connection.commit()
 
-        # Hapus file fisik jika ada dan exists
+        # Blob dihapus hanya jika tidak ada row lain yang memakai isi yang sama
         file_path = file_info['file_path']  # type: ignore
-        if file_path and os.path.exists(str(file_path)):  # type: ignore
+        if file_info['file_hash']:  # type: ignore
+            release_blob(connection, file_info['file_hash'])  # type: ignore
+        elif file_path and os.path.exists(str(file_path)):  # type: ignore
             try:
                 os.remove(str(file_path))  # type: ignore
             except Exception as e:
@@ -318,10 +449,6 @@ def delete_file(file_id):
 @dokumen_bp.route('/files/<int:file_id>/download', methods=['GET'])
 def download_file(file_id):
     """Download actual file content"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -350,17 +477,17 @@ def download_file(file_id):
                 'message': f'File tidak ditemukan di server: {file_path}'
             }), 404
 
-        # Read file content
+        # Stream file dari disk (tanpa memuat ke memori). conditional=True
+        # mengaktifkan Range/206, If-Range, serta ETag/Last-Modified (304)
         try:
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-
-            # Send file as binary data
             return send_file(
                 file_path,
                 as_attachment=True,
                 download_name=nama_dokumen,
-                mimetype='application/octet-stream'
+                mimetype='application/octet-stream',
+                conditional=True,
+                etag=True,
+                max_age=0
             )
         except Exception as e:
             return jsonify({
@@ -0,0 +1,124 @@
+# Path: api/routes/event_routes.py
+# Push event ke client: Server-Sent Events dengan fallback long-poll.
+#
+# GET /events/stream   text/event-stream. Resume dengan header Last-Event-ID
+#                      (dikirim otomatis oleh client SSE) atau ?last_event_id=.
+# GET /events/poll     long-poll JSON: ?after=<id>&timeout=<detik>, kembali
+#                      segera jika ada event, atau kosong setelah timeout.
+# Keduanya menerima ?types=broadcast,presence,data_changed.
+#
+# Tanpa last_event_id client mulai dari event terbaru (tidak memutar ulang
+# riwayat). Event `reset` berarti ada event yang sudah dibuang (retensi),
+# client sebaiknya memuat ulang datanya. Koneksi database hanya dipakai
+# sebentar saat membaca event, tidak selama menunggu.
+
+import json
+import time
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from events import EVENT_TYPES, WATCH_INTERVAL, bus, fetch_events
+
+event_bp = Blueprint('events', __name__, url_prefix='/events')
+
+HEARTBEAT_SECONDS = 15
+# Stream ditutup berkala supaya worker/proxy tidak menahan koneksi selamanya;
+# client SSE otomatis reconnect dengan Last-Event-ID
+STREAM_MAX_SECONDS = 300
+RETRY_MS = 3000
+MAX_POLL_TIMEOUT = 30
+
+
+def _parse_types(value):
+    if not value:
+        return None
+    types = [t.strip() for t in value.split(',') if t.strip()]
+    unknown = [t for t in types if t not in EVENT_TYPES]
+    if unknown:
+        raise ValueError(f"Tipe event tidak dikenal: {', '.join(unknown)}")
+    return types
+
+
+def _parse_event_id(value):
+    if value in (None, ''):
+        return None
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        raise ValueError('Event id tidak valid')
+
+
+def _sse(event_id, event_type, data):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+@event_bp.route('/stream', methods=['GET'])
+def event_stream():
+    """Stream event (Server-Sent Events)"""
+    try:
+        types = _parse_types(request.args.get('types'))
+        last_id = _parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+        if last_id is None:
+            last_id = bus.latest()
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    def generate(last_id):
+        started = time.monotonic()
+        yield f"retry: {RETRY_MS}\n".encode('utf-8')
+        yield _sse(last_id, 'ready', {'last_event_id': last_id})
+        while time.monotonic() - started < STREAM_MAX_SECONDS:
+            latest = bus.wait(last_id, HEARTBEAT_SECONDS)
+            if latest <= last_id:
+                yield b": ping\n\n"
+                continue
+            events, reset, scanned_id = fetch_events(last_id, types)
+            if reset:
+                yield _sse(None, 'reset', {'last_event_id': scanned_id})
+            for event in events:
+                yield _sse(event['id'], event['type'], event['data'])
+            if scanned_id == last_id:
+                # Event berikutnya belum commit: tunggu sebentar, jangan berputar
+                time.sleep(WATCH_INTERVAL)
+            last_id = scanned_id
+
+    headers = {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx: jangan buffer stream
+    }
+    return Response(stream_with_context(generate(last_id)), mimetype='text/event-stream', headers=headers)
+
+
+@event_bp.route('/poll', methods=['GET'])
+def event_poll():
+    """Long-poll event untuk client yang tidak bisa memakai SSE"""
+    try:
+        types = _parse_types(request.args.get('types'))
+        after = _parse_event_id(request.args.get('after'))
+        timeout = max(0, min(request.args.get('timeout', 25, type=int), MAX_POLL_TIMEOUT))
+
+        if after is None:
+            # Poll pertama: hanya posisi awal
+            return jsonify({'status': 'success', 'data': [], 'last_event_id': bus.latest()})
+
+        deadline = time.monotonic() + timeout
+        while True:
+            latest = bus.wait(after, max(0, deadline - time.monotonic()))
+            if latest > after:
+                events, reset, scanned_id = fetch_events(after, types)
+                if scanned_id > after or reset:
+                    return jsonify({'status': 'success', 'data': events, 'last_event_id': scanned_id,
+                                    'reset': reset})
+            if time.monotonic() >= deadline:
+                return jsonify({'status': 'success', 'data': [], 'last_event_id': after})
+            # Event berikutnya belum commit
+            time.sleep(WATCH_INTERVAL)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -0,0 +1,400 @@
+# Path: api/routes/export_routes.py
+# Export CSV/XLSX yang di-stream langsung dari database.
+#
+# GET /export/<entity>?format=csv|xlsx
+# POST /export/<entity>?format=...      sama, dengan body JSON {"ids": [...]}:
+#                        hanya baris dengan primary key tersebut (mis. baris
+#                        yang sedang tampil di grid desktop)
+#   columns=a,b,c        kolom yang diekspor (default semua kolom tabel)
+#   labels=A,B,C         judul kolom (default nama kolom)
+#                        kolom virtual: `no` (nomor urut), `saldo` (keuangan),
+#                        `dibuat_oleh` (jemaat)
+#   <kolom>=nilai        filter sama dengan, untuk kolom mana pun di tabel
+#   <kolom>__contains=x  filter LIKE '%x%'
+#   date_from, date_to   rentang tanggal pada kolom tanggal entity
+#   search               hanya jemaat, memakai indeks jemaat_search
+#   summary=1            keuangan: tambahkan ringkasan total di akhir file
+#   user_id, is_admin    isolasi data user seperti endpoint list
+#
+# Row dibaca per batch dengan keyset di primary key (tidak pernah seluruh
+# tabel sekaligus) dan langsung ditulis ke response, sehingga memori server
+# dan desktop tetap konstan berapa pun jumlah barisnya. CSV dikompres gzip
+# jika client mengirim Accept-Encoding: gzip. XLSX ditulis dengan openpyxl
+# mode write-only ke file sementara lalu di-stream.
+
+import bisect
+import csv
+import datetime
+import io
+import os
+import tempfile
+import zlib
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from config import get_db_connection
+from jemaat_search import match_subquery
+
+export_bp = Blueprint('export', __name__, url_prefix='/export')
+
+# entity -> konfigurasi tabel. owner: kolom pemilik untuk isolasi user,
+# date: kolom untuk date_from/date_to, saldo: (kolom jenis, kolom jumlah)
+# untuk kolom virtual `saldo` (saldo berjalan urut primary key),
+# lookup: kolom virtual -> (LEFT JOIN, ekspresi SQL)
+EXPORT_ENTITIES = {
+    'jemaat': {'table': 'jemaat', 'pk': 'id_jemaat', 'owner': 'created_by_pengguna', 'date': 'created_at',
+               'lookup': {'dibuat_oleh': ("LEFT JOIN pengguna pembuat ON pembuat.id_pengguna = t.created_by_pengguna",
+                                          "COALESCE(pembuat.nama_lengkap, pembuat.username, 'System')")}},
+    'kegiatan': {'table': 'kegiatan', 'pk': 'id_kegiatan', 'owner': 'created_by_pengguna', 'date': 'tanggal_kegiatan'},
+    'kegiatan_wr': {'table': 'kegiatan_wr', 'pk': 'id_kegiatan_wr', 'owner': 'user_id', 'date': 'tanggal_pelaksanaan'},
+    'keuangan': {'table': 'keuangan', 'pk': 'id_keuangan', 'owner': 'created_by_pengguna', 'date': 'tanggal',
+                 'saldo': ('kategori', 'jumlah')},
+    'keuangan_kategorial': {'table': 'keuangan_kategorial', 'pk': 'id_keuangan_kategorial', 'date': 'tanggal',
+                            'saldo': ('jenis', 'jumlah')},
+    'pengumuman': {'table': 'pengumuman', 'pk': 'id_pengumuman', 'date': 'created_at'},
+    'dokumen': {'table': 'dokumen', 'pk': 'id_dokumen', 'date': 'upload_date'},
+    'aset': {'table': 'aset', 'pk': 'id_aset', 'date': 'created_at'},
+    'struktur': {'table': 'struktur', 'pk': 'id_struktur', 'date': 'created_at'},
+    'program_kerja': {'table': 'program_kerja', 'pk': 'id_program_kerja', 'date': 'created_at'},
+    'program_kerja_wr': {'table': 'program_kerja_wr', 'pk': 'id_program_kerja_wr', 'date': 'created_at'},
+    'program_kerja_k_kategorial': {'table': 'program_kerja_k_kategorial', 'pk': 'id_program_kerja_k_kategorial',
+                                   'date': 'created_at'},
+    'buku_kronik': {'table': 'buku_kronik', 'pk': 'id_kronik', 'date': 'tanggal'},
+    'kategorial': {'table': 'kategorial', 'pk': 'id_kategorial', 'date': 'created_at'},
+    'binaan': {'table': 'k_binaan', 'pk': 'id_binaan', 'date': 'created_at'},
+    'wr': {'table': 'wilayah_rohani', 'pk': 'id_wilayah', 'date': 'created_at'},
+    'tim_pembina': {'table': 'tim_pembina_peserta', 'pk': 'id_tim_pembina', 'date': 'created_at'},
+    'pengguna': {'table': 'pengguna', 'pk': 'id_pengguna', 'date': 'created_at'},
+    'log_aktivitas': {'table': 'log_aktivitas', 'pk': 'id_log', 'date': 'timestamp'},
+}
+
+# Kolom yang tidak pernah ikut diekspor
+HIDDEN_COLUMNS = {'password'}
+
+# Parameter query yang bukan filter kolom
+RESERVED_ARGS = {'format', 'columns', 'labels', 'date_from', 'date_to', 'search', 'summary', 'user_id', 'is_admin'}
+
+EXPORT_BATCH_SIZE = 1000
+XLSX_CHUNK_SIZE = 64 * 1024
+
+MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _table_columns(cursor, table):
+    cursor.execute(f"SHOW COLUMNS FROM `{table}`")
+    return [row[0] for row in cursor.fetchall() if row[0] not in HIDDEN_COLUMNS]
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime.datetime) else value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        # Kolom TIME dikembalikan mysql-connector sebagai timedelta
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return value
+
+
+def _xlsx_value(value):
+    if isinstance(value, datetime.timedelta):
+        return _csv_value(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+class ExportPlan:
+    """Query dan kolom satu export, divalidasi sebelum response mulai di-stream"""
+
+    def __init__(self, entity, args, cursor, ids=None):
+        if entity not in EXPORT_ENTITIES:
+            raise ExportError(f'Entity tidak dikenal: {entity}')
+        cfg = EXPORT_ENTITIES[entity]
+        self.entity = entity
+        self.table = cfg['table']
+        self.pk = cfg['pk']
+        self.saldo = cfg.get('saldo')
+
+        available = _table_columns(cursor, self.table)
+        requested = [c.strip() for c in args.get('columns', '').split(',') if c.strip()]
+        self.columns = requested or list(available)
+        lookup = cfg.get('lookup', {})
+        virtual = {'no'} | set(lookup) | ({'saldo'} if self.saldo else set())
+        unknown = [c for c in self.columns if c not in available and c not in virtual]
+        if unknown:
+            raise ExportError(f"Kolom tidak dikenal: {', '.join(unknown)}")
+
+        labels = [label.strip() for label in args.get('labels', '').split(',')] if args.get('labels') else []
+        if labels and len(labels) != len(self.columns):
+            raise ExportError('Jumlah labels harus sama dengan jumlah columns')
+        self.headers = labels or list(self.columns)
+
+        # Kolom yang dibaca dari database: pk (untuk keyset) + kolom asli
+        # + kolom lookup + kolom yang dibutuhkan untuk menghitung saldo
+        self.summary = bool(self.saldo) and args.get('summary', '0').lower() in ('1', 'true')
+        self.totals = {'Pemasukan': 0.0, 'Pengeluaran': 0.0}
+        self.select = [self.pk] + [c for c in self.columns if c in available]
+        if 'saldo' in self.columns or self.summary:
+            self.select += [c for c in self.saldo if c not in self.select]
+        self.expressions = [f"t.`{c}`" for c in self.select]
+        self.join = ''
+        for column in self.columns:
+            if column in lookup and column not in available:
+                join_sql, expression = lookup[column]
+                self.join += f" {join_sql}"
+                self.select.append(column)
+                self.expressions.append(expression)
+        self.positions = {column: index for index, column in enumerate(self.select)}
+
+        self.join_params = []
+        self.conditions = []
+        self.params = []
+
+        # Daftar primary key (terurut) jika export dibatasi ke baris tertentu
+        self.ids = None
+        if ids is not None:
+            try:
+                self.ids = sorted({int(value) for value in ids})
+            except (TypeError, ValueError):
+                raise ExportError('ids harus berupa daftar angka')
+
+        search = args.get('search', '')
+        if search:
+            if entity != 'jemaat':
+                raise ExportError('Parameter search hanya tersedia untuk jemaat')
+            match = match_subquery(search)
+            if match:
+                match_sql, self.join_params = match
+                self.join += f" JOIN ({match_sql}) pencarian ON pencarian.hasil_id = t.`{self.pk}`"
+            else:
+                self.conditions.append("1 = 0")
+
+        for arg, value in args.items():
+            if arg in RESERVED_ARGS:
+                continue
+            column, _, operator = arg.partition('__')
+            if column not in available or operator not in ('', 'contains'):
+                raise ExportError(f"Filter tidak dikenal: {arg}")
+            if operator == 'contains':
+                escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                self.conditions.append(f"t.`{column}` LIKE %s")
+                self.params.append(f"%{escaped}%")
+            else:
+                self.conditions.append(f"t.`{column}` = %s")
+                self.params.append(value)
+
+        date_column = cfg.get('date')
+        for arg, operator in (('date_from', '>='), ('date_to', '<=')):
+            value = args.get(arg)
+            if not value:
+                continue
+            if date_column not in available:
+                raise ExportError(f'Filter tanggal tidak tersedia untuk {entity}')
+            try:
+                day = datetime.date.fromisoformat(value)
+            except ValueError:
+                raise ExportError(f'Format {arg} tidak valid, gunakan YYYY-MM-DD')
+            self.conditions.append(f"DATE(t.`{date_column}`) {operator} %s")
+            self.params.append(day)
+
+        user_id = args.get('user_id', type=int)
+        is_admin = args.get('is_admin', 'false').lower() == 'true'
+        if cfg.get('owner') and not is_admin and user_id:
+            self.conditions.append(f"(t.`{cfg['owner']}` = %s OR t.`{cfg['owner']}` IS NULL)")
+            self.params.append(user_id)
+
+    def batch_query(self, last_pk):
+        """Query satu batch setelah last_pk (keyset di primary key), None jika ids sudah habis"""
+        columns = ', '.join(self.expressions)
+        if self.ids is None:
+            conditions = self.conditions + [f"t.`{self.pk}` > %s"]
+            keyset_params = [last_pk]
+        else:
+            start = bisect.bisect_right(self.ids, last_pk)
+            keyset_params = self.ids[start:start + EXPORT_BATCH_SIZE]
+            if not keyset_params:
+                return None
+            conditions = self.conditions + [f"t.`{self.pk}` IN ({', '.join(['%s'] * len(keyset_params))})"]
+        query = (f"SELECT {columns} FROM `{self.table}` t{self.join}"
+                 f" WHERE {' AND '.join(conditions)}"
+                 f" ORDER BY t.`{self.pk}` LIMIT %s")
+        return query, self.join_params + self.params + keyset_params + [EXPORT_BATCH_SIZE]
+
+    def rows(self):
+        """Generator row (list nilai sesuai self.columns), dibaca per batch"""
+        connection = get_db_connection()
+        if not connection:
+            raise RuntimeError('Database error')
+        try:
+            cursor = connection.cursor()
+            last_pk = 0
+            number = 0
+            saldo = 0.0
+            while True:
+                query = self.batch_query(last_pk)
+                if query is None:
+                    break
+                cursor.execute(*query)
+                batch = cursor.fetchall()
+                for raw in batch:
+                    number += 1
+                    row = []
+                    if self.saldo and self.saldo[0] in self.positions:
+                        jenis = raw[self.positions[self.saldo[0]]]
+                        jumlah = float(raw[self.positions[self.saldo[1]]] or 0)
+                        saldo += jumlah if jenis == 'Pemasukan' else -jumlah
+                        if jenis in self.totals:
+                            self.totals[jenis] += jumlah
+                    for column in self.columns:
+                        if column in self.positions:
+                            row.append(raw[self.positions[column]])
+                        else:
+                            row.append(saldo if column == 'saldo' else number)
+                    yield row
+                if self.ids is None:
+                    if len(batch) < EXPORT_BATCH_SIZE:
+                        break
+                    last_pk = batch[-1][0]
+                else:
+                    # Id yang sudah terhapus tidak mengembalikan baris; lanjut ke potongan id berikutnya
+                    start = bisect.bisect_right(self.ids, last_pk)
+                    last_pk = self.ids[min(start + EXPORT_BATCH_SIZE, len(self.ids)) - 1]
+            cursor.close()
+        finally:
+            connection.close()
+
+    def footer(self):
+        """Baris ringkasan setelah data (hanya jika summary diminta)"""
+        if not self.summary:
+            return []
+        pemasukan = self.totals['Pemasukan']
+        pengeluaran = self.totals['Pengeluaran']
+        return [
+            [],
+            ['RINGKASAN:'],
+            ['Total Pemasukan:', pemasukan],
+            ['Total Pengeluaran:', pengeluaran],
+            ['Saldo Akhir:', pemasukan - pengeluaran],
+        ]
+
+    def filename(self, fmt):
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"{self.entity}_{timestamp}.{fmt}"
+
+
+def _csv_stream(plan, compress):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def flush():
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(plan.headers)
+    count = 0
+    for row in plan.rows():
+        writer.writerow([_csv_value(value) for value in row])
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            chunk = flush()
+            if chunk:
+                yield chunk
+    writer.writerows(plan.footer())
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+    print(f"[EXPORT] {plan.entity}: {count} baris (csv{', gzip' if compress else ''})")
+
+
+def _xlsx_stream(plan):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(plan.entity[:31])
+    header_font = Font(bold=True)
+    header = []
+    for title in plan.headers:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+
+    count = 0
+    for row in plan.rows():
+        sheet.append([_xlsx_value(value) for value in row])
+        count += 1
+    for row in plan.footer():
+        sheet.append(row)
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(XLSX_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+    print(f"[EXPORT] {plan.entity}: {count} baris (xlsx)")
+
+
+@export_bp.route('/<entity>', methods=['GET', 'POST'])
+def export_entity(entity):
+    """Stream export satu entity sebagai CSV atau XLSX (POST: dibatasi ke body ids)"""
+    ids = None
+    if request.method == 'POST':
+        ids = (request.get_json(silent=True) or {}).get('ids')
+        if not isinstance(ids, list):
+            return jsonify({'status': 'error', 'message': 'Body harus berisi ids (list)'}), 400
+
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in MIMETYPES:
+        return jsonify({'status': 'error', 'message': 'format harus csv atau xlsx'}), 400
+    if fmt == 'xlsx':
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return jsonify({'status': 'error', 'message': 'Export XLSX membutuhkan openpyxl di server'}), 501
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+    try:
+        cursor = connection.cursor()
+        plan = ExportPlan(entity, request.args, cursor, ids)
+        cursor.close()
+    except ExportError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
+
+    headers = {'Content-Disposition': f'attachment; filename="{plan.filename(fmt)}"'}
+    if fmt == 'csv':
+        compress = 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
+        body = _csv_stream(plan, compress)
+    else:
+        body = _xlsx_stream(plan)
+
+    return Response(stream_with_context(body), mimetype=MIMETYPES[fmt], headers=headers)
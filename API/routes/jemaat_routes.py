@@ -1,41 +1,17 @@
 # Path: api/routes/jemaat_routes.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, g, jsonify, request
 from config import get_db_connection
-import datetime
-import os
+from jemaat_import import ImportFileError, ImportOptions, run_import
+from pagination import KeysetPaginator, is_cursor_request
+from sync import apply_sync
+from jemaat_search import match_subquery, safe_reindex
 
 jemaat_bp = Blueprint('jemaat', __name__, url_prefix='/jemaat')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'success': False,
-            'data': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @jemaat_bp.route('/my', methods=['GET'])
 def get_my_jemaat():
     """Ambil data jemaat user sendiri saja"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     user_id = request.args.get('user_id', type=int)
     if not user_id:
         return jsonify({'success': False, 'data': 'user_id required'}), 400
@@ -46,23 +22,28 @@ def get_my_jemaat():
 
     try:
         cursor = connection.cursor(dictionary=True)
-        query = "SELECT * FROM jemaat WHERE created_by_pengguna = %s ORDER BY created_at DESC"
-        cursor.execute(query, (user_id,))
+        conditions = ["created_by_pengguna = %s"]
+        params = [user_id]
+        sync = apply_sync(request.args, 'jemaat', cursor, conditions, params)
+
+        query = "SELECT * FROM jemaat WHERE " + " AND ".join(conditions) + " ORDER BY created_at DESC"
+        cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
 
-        return jsonify({'success': True, 'data': result})
+        response = {'success': True, 'data': result}
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'success': False, 'data': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'data': str(e)}), 500
 
 @jemaat_bp.route('', methods=['GET'])
 def get_jemaat():
     """Ambil semua data jemaat"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -79,45 +60,109 @@ def get_jemaat():
         is_admin = request.args.get('is_admin', 'false').lower() == 'true'
         
         # Build query dengan filter search dan user isolation
-        query = "SELECT * FROM jemaat"
+        query = "SELECT jemaat.* FROM jemaat"
         params = []
         conditions = []
         
+        # Pencarian lewat indeks token (jemaat_search.py), diurutkan berdasarkan skor
+        ranked = False
         if search:
-            conditions.append("(nama_lengkap LIKE %s OR alamat LIKE %s OR no_telepon LIKE %s OR email LIKE %s)")
-            search_term = f"%{search}%"
-            params.extend([search_term, search_term, search_term, search_term])
+            match = match_subquery(search)
+            if match:
+                match_sql, match_params = match
+                query += f" JOIN ({match_sql}) pencarian ON pencarian.hasil_id = jemaat.id_jemaat"
+                params.extend(match_params)
+                ranked = True
+            else:
+                conditions.append("1 = 0")
         
         # User isolation: non-admin only see their own data
         if not is_admin and user_id:
             conditions.append("(created_by_pengguna = %s OR created_by_pengguna IS NULL)")
             params.append(user_id)
         
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'jemaat', cursor, conditions, params)
+
+        # Mode cursor (opt-in): seek di idx_jemaat_nama, bukan OFFSET
+        paginator = None
+        if is_cursor_request(request.args):
+            paginator = KeysetPaginator('nama_lengkap', 'id_jemaat')
+            keyset_sql, keyset_params = paginator.condition(request.args.get('cursor'))
+            if keyset_sql:
+                conditions.append(keyset_sql)
+                params.extend(keyset_params)
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY nama_lengkap LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if paginator:
+            query += paginator.order_by() + " LIMIT %s"
+            params.append(limit + 1)
+        elif sync:
+            # Sync mengirim semua perubahan, watermark tidak boleh melompati baris
+            query += " ORDER BY nama_lengkap"
+        elif ranked:
+            query += " ORDER BY pencarian.skor DESC, nama_lengkap LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
+        else:
+            query += " ORDER BY nama_lengkap LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
         
         cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
 
-        return jsonify({
+        response = {
             'success': True,
             'data': result
-        })
+        }
+        if paginator:
+            response['data'], response['next_cursor'] = paginator.finalize(result, limit)
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'success': False, 'data': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'data': str(e)}), 500
+
+@jemaat_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_jemaat():
+    """Saran nama jemaat (awal kata di nama_lengkap) dengan payload kecil"""
+    q = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 20))
+
+    match = match_subquery(q, columns=('nama_lengkap',), prefix_only=True)
+    if not match:
+        return jsonify({'success': True, 'data': []})
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'data': 'Database error'}), 500
+
+    try:
+        match_sql, params = match
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT jemaat.id_jemaat, jemaat.nama_lengkap, jemaat.wilayah_rohani
+            FROM jemaat
+            JOIN ({match_sql}) pencarian ON pencarian.hasil_id = jemaat.id_jemaat
+            ORDER BY pencarian.skor DESC, jemaat.nama_lengkap
+            LIMIT %s
+        """, params + [limit])
+        result = cursor.fetchall()
+        cursor.close()
+        connection.close()
+        return jsonify({'success': True, 'data': result})
     except Exception as e:
+        connection.close()
         return jsonify({'success': False, 'data': str(e)}), 500
 
 @jemaat_bp.route('', methods=['POST'])
 def add_jemaat():
     """Tambah data jemaat baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -203,6 +248,7 @@ def add_jemaat():
 
             jemaat_id = cursor.lastrowid
             cursor.close()
+            safe_reindex(connection, jemaat_id)
             connection.close()
 
             return jsonify({
@@ -243,13 +289,47 @@ def add_jemaat():
     except Exception as e:
         return jsonify({'success': False, 'data': str(e)}), 500
 
+@jemaat_bp.route('/import', methods=['POST'])
+def import_jemaat():
+    """Import massal jemaat dari CSV/XLSX/JSON lines (lihat jemaat_import.py).
+
+    Body = isi file mentah. Query: user_id (wajib), format=csv|xlsx|jsonl (atau dari
+    Content-Type / filename), dry_run, on_error=skip|abort, wilayah_rohani (default
+    untuk baris kosong), allow_new_wilayah, encoding, delimiter, sheet, batch_size.
+    """
+    user_id = request.args.get('user_id', type=int)
+    if not user_id:
+        return jsonify({'success': False, 'data': 'user_id is required'}), 400
+    try:
+        options = ImportOptions.from_request(request.args, request.content_type)
+    except ImportFileError as e:
+        return jsonify({'success': False, 'data': e.message}), e.status
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'data': 'Database error'}), 500
+    try:
+        report = run_import(connection, request.stream, options, user_id)
+    except ImportFileError as e:
+        report = e.extra.get('report') or {}
+        if not report.get('inserted'):
+            g.skip_data_change = True
+        return jsonify({'success': False, 'data': e.message, 'report': report}), e.status
+    except Exception as e:
+        print(f"[IMPORT] Error: {e}")
+        g.skip_data_change = True
+        return jsonify({'success': False, 'data': f'Database error: {e}'}), 500
+    finally:
+        connection.close()
+
+    # Dry run / tidak ada yang tersimpan: client tidak perlu refresh
+    if not report['committed'] or not report['inserted']:
+        g.skip_data_change = True
+    return jsonify({'success': True, 'data': report})
+
 @jemaat_bp.route('/<int:jemaat_id>', methods=['GET'])
 def get_jemaat_by_id(jemaat_id):
     """Ambil data jemaat berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'success': False, 'data': 'Database error'}), 500
@@ -278,10 +358,6 @@ def get_jemaat_by_id(jemaat_id):
 @jemaat_bp.route('/<int:jemaat_id>', methods=['PUT'])
 def update_jemaat(jemaat_id):
     """Update data jemaat"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -357,9 +433,8 @@ def update_jemaat(jemaat_id):
                 'data': 'Tidak ada field untuk diupdate'
             }), 400
 
-        # Add updated_at timestamp
-        set_clauses.append("updated_at = %s")
-        params.append(datetime.datetime.now())
+        # Add updated_at timestamp (jam database, konsisten dengan watermark sync)
+        set_clauses.append("updated_at = NOW()")
 
         # Add ID for WHERE clause
         params.append(jemaat_id)
@@ -371,6 +446,7 @@ def update_jemaat(jemaat_id):
 
             if cursor.rowcount > 0:
                 cursor.close()
+                safe_reindex(connection, jemaat_id)
                 connection.close()
                 return jsonify({
                     'success': True,
@@ -404,10 +480,6 @@ def update_jemaat(jemaat_id):
 @jemaat_bp.route('/<int:jemaat_id>', methods=['DELETE'])
 def delete_jemaat(jemaat_id):
     """Hapus data jemaat"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'success': False, 'data': 'Database error'}), 500
@@ -420,6 +492,7 @@ def delete_jemaat(jemaat_id):
 
         if cursor.rowcount > 0:
             cursor.close()
+            safe_reindex(connection, jemaat_id, removed=True)
             connection.close()
             return jsonify({
                 'success': True,
@@ -438,10 +511,6 @@ def delete_jemaat(jemaat_id):
 @jemaat_bp.route('/statistics', methods=['GET'])
 def get_jemaat_statistics():
     """Ambil statistik jemaat"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'success': False, 'data': 'Database error'}), 500
@@ -2,40 +2,14 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from sync import apply_sync
 import datetime
-import os
 
 kategorial_bp = Blueprint('kategorial', __name__, url_prefix='/kategorial')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error',
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @kategorial_bp.route('', methods=['GET'])
 def get_kategorial():
     """Ambil semua data pengurus komunitas kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -43,8 +17,14 @@ def get_kategorial():
     try:
         cursor = connection.cursor(dictionary=True)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        conditions = []
+        params = []
+        sync = apply_sync(request.args, 'kategorial', cursor, conditions, params)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
         # Ambil semua data kategorial
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT
                 id_kategorial,
                 kelompok_kategorial,
@@ -61,17 +41,22 @@ def get_kategorial():
                 foto_path,
                 created_at,
                 updated_at
-            FROM kategorial
+            FROM kategorial{where}
             ORDER BY created_at DESC
-        """)
+        """, params)
 
         data = cursor.fetchall()
 
-        return jsonify({
+        response = {
             'status': 'success',
             'data': data
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
 
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"Error getting kategorial data: {e}")
         return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
@@ -82,10 +67,6 @@ def get_kategorial():
 @kategorial_bp.route('', methods=['POST'])
 def add_kategorial():
     """Tambah pengurus komunitas kategorial baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -155,10 +136,6 @@ def add_kategorial():
 @kategorial_bp.route('/<int:kategorial_id>', methods=['PUT'])
 def update_kategorial(kategorial_id):
     """Update data pengurus komunitas kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -226,10 +203,6 @@ def update_kategorial(kategorial_id):
 @kategorial_bp.route('/<int:kategorial_id>', methods=['DELETE'])
 def delete_kategorial(kategorial_id):
     """Hapus pengurus komunitas kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -260,10 +233,6 @@ def delete_kategorial(kategorial_id):
 @kategorial_bp.route('/statistics', methods=['GET'])
 def get_kategorial_statistics():
     """Ambil statistik komunitas kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
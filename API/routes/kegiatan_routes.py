@@ -2,40 +2,13 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
-import datetime
-import os
+from sync import apply_sync
 
 kegiatan_bp = Blueprint('kegiatan', __name__, url_prefix='/kegiatan')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @kegiatan_bp.route('/my', methods=['GET'])
 def get_my_kegiatan():
     """Ambil data kegiatan user sendiri saja"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     user_id = request.args.get('user_id', type=int)
     if not user_id:
         return jsonify({'status': 'error', 'message': 'user_id required'}), 400
@@ -59,18 +32,22 @@ def get_my_kegiatan():
         has_user_id = col_check.get('col_exists', 0) > 0 if col_check else False  # type: ignore
 
         if has_user_id:
+            conditions = ["k.user_id = %s"]
+            params = [user_id]
+            sync = apply_sync(request.args, 'kegiatan', cursor, conditions, params, 'k.updated_at')
+
             query = """
                 SELECT k.*,
                        COALESCE(p.username, 'system') as username,
                        COALESCE(p.nama_lengkap, 'System') as nama_lengkap
                 FROM kegiatan k
                 LEFT JOIN pengguna p ON k.user_id = p.id_pengguna
-                WHERE k.user_id = %s
-                ORDER BY k.tanggal_kegiatan DESC
             """
-            cursor.execute(query, (user_id,))
+            query += " WHERE " + " AND ".join(conditions) + " ORDER BY k.tanggal_kegiatan DESC"
+            cursor.execute(query, params)
         else:
             # Fallback: return empty if user_id column doesn't exist
+            sync = apply_sync(request.args, 'kegiatan', cursor, [], [])
             query = "SELECT * FROM kegiatan WHERE 1=0"
             cursor.execute(query)
 
@@ -93,7 +70,12 @@ def get_my_kegiatan():
             if row.get('updated_at') and hasattr(row['updated_at'], 'isoformat'):  # type: ignore
                 row['updated_at'] = row['updated_at'].isoformat()  # type: ignore
 
-        return jsonify({'status': 'success', 'data': result})
+        response = {'status': 'success', 'data': result}
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -103,10 +85,6 @@ def get_my_kegiatan():
 @kegiatan_bp.route('', methods=['GET'])
 def get_kegiatan():
     """Ambil semua data kegiatan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -174,11 +152,17 @@ def get_kegiatan():
             conditions.append("k.user_id = %s")
             params.append(user_id)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'kegiatan', cursor, conditions, params, 'k.updated_at')
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
-        query += " ORDER BY k.tanggal_kegiatan DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if sync:
+            query += " ORDER BY k.tanggal_kegiatan DESC"
+        else:
+            query += " ORDER BY k.tanggal_kegiatan DESC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
         cursor.execute(query, params)
         result = cursor.fetchall()
@@ -200,10 +184,15 @@ def get_kegiatan():
             if row.get('updated_at') and hasattr(row['updated_at'], 'isoformat'):  # type: ignore
                 row['updated_at'] = row['updated_at'].isoformat()  # type: ignore
 
-        return jsonify({
+        response = {
             'status': 'success',
             'data': result
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -213,10 +202,6 @@ def get_kegiatan():
 @kegiatan_bp.route('', methods=['POST'])
 def add_kegiatan():
     """Tambah kegiatan baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Request body is required'}), 400
@@ -328,10 +313,6 @@ def add_kegiatan():
 @kegiatan_bp.route('/<int:kegiatan_id>', methods=['GET'])
 def get_kegiatan_by_id(kegiatan_id):
     """Ambil kegiatan berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -367,10 +348,6 @@ def get_kegiatan_by_id(kegiatan_id):
 @kegiatan_bp.route('/<int:kegiatan_id>', methods=['PUT'])
 def update_kegiatan(kegiatan_id):
     """Update kegiatan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     if not data:
         return jsonify({'status': 'error', 'message': 'Request body is required'}), 400
@@ -400,7 +377,7 @@ def update_kegiatan(kegiatan_id):
             nama_kegiatan = %s, lokasi = %s, tanggal_kegiatan = %s,
             waktu_kegiatan = %s, penanggung_jawab = %s, kategori = %s,
             status = %s, biaya = %s, keterangan = %s, sasaran_kegiatan = %s,
-            updated_at = %s
+            updated_at = NOW()
         WHERE id_kegiatan = %s
         """
         params = (
@@ -414,7 +391,6 @@ def update_kegiatan(kegiatan_id):
             biaya,
             keterangan,
             sasaran_kegiatan,
-            datetime.datetime.now(),
             kegiatan_id
         )
         cursor.execute(query, params)
@@ -448,10 +424,6 @@ def update_kegiatan(kegiatan_id):
 @kegiatan_bp.route('/<int:kegiatan_id>', methods=['DELETE'])
 def delete_kegiatan(kegiatan_id):
     """Hapus kegiatan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -491,10 +463,6 @@ def delete_kegiatan(kegiatan_id):
 @kegiatan_bp.route('/mendatang', methods=['GET'])
 def get_kegiatan_mendatang():
     """Ambil kegiatan mendatang menggunakan view"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -526,10 +494,6 @@ def get_kegiatan_mendatang():
 @kegiatan_bp.route('/wr/all', methods=['GET'])
 def get_kegiatan_wr_all():
     """Ambil semua kegiatan dari WR (Warga/Client) dengan informasi user"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
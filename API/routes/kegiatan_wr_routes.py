@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 import mysql.connector
 from config import get_db_connection
+from sync import apply_sync
 from datetime import datetime
 
 kegiatan_wr_bp = Blueprint('kegiatan_wr', __name__, url_prefix='/kegiatan-wr')
@@ -20,6 +21,10 @@ def get_my_kegiatan_wr():
     try:
         cursor = conn.cursor(dictionary=True)
 
+        conditions = ["kw.user_id = %s"]
+        params = [user_id]
+        sync = apply_sync(request.args, 'kegiatan_wr', cursor, conditions, params, 'kw.updated_at')
+
         query = """
             SELECT
                 kw.*,
@@ -27,11 +32,10 @@ def get_my_kegiatan_wr():
                 p.nama_lengkap
             FROM kegiatan_wr kw
             LEFT JOIN pengguna p ON kw.user_id = p.id_pengguna
-            WHERE kw.user_id = %s
-            ORDER BY kw.tanggal_pelaksanaan DESC
         """
+        query += " WHERE " + " AND ".join(conditions) + " ORDER BY kw.tanggal_pelaksanaan DESC"
 
-        cursor.execute(query, (user_id,))
+        cursor.execute(query, params)
         result = cursor.fetchall()
 
         # Convert timedelta to HH:MM format
@@ -49,8 +53,13 @@ def get_my_kegiatan_wr():
             if row.get('updated_at'):  # type: ignore
                 row['updated_at'] = row['updated_at'].isoformat()  # type: ignore
 
-        return jsonify({"success": True, "data": result}), 200
+        response = {"success": True, "data": result}
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except mysql.connector.Error as e:
         import traceback
         print(f"Database error in get_my_kegiatan_wr: {traceback.format_exc()}")
@@ -77,6 +86,10 @@ def get_all_kegiatan_wr():
     try:
         cursor = conn.cursor(dictionary=True)
 
+        conditions = []
+        params = []
+        sync = apply_sync(request.args, 'kegiatan_wr', cursor, conditions, params, 'kw.updated_at')
+
         query = """
             SELECT
                 kw.*,
@@ -84,10 +97,12 @@ def get_all_kegiatan_wr():
                 p.nama_lengkap
             FROM kegiatan_wr kw
             LEFT JOIN pengguna p ON kw.user_id = p.id_pengguna
-            ORDER BY kw.tanggal_pelaksanaan DESC
         """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY kw.tanggal_pelaksanaan DESC"
 
-        cursor.execute(query)
+        cursor.execute(query, params)
         result = cursor.fetchall()
 
         # Convert timedelta to HH:MM format
@@ -105,8 +120,16 @@ def get_all_kegiatan_wr():
             if row.get('updated_at'):  # type: ignore
                 row['updated_at'] = row['updated_at'].isoformat()  # type: ignore
 
+        if sync:
+            # Response lama berupa list; mode sync butuh object untuk watermark
+            response = {"success": True, "data": result}
+            response.update(sync.payload())
+            return jsonify(response), 200
+
         return jsonify(result), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except mysql.connector.Error as e:
         import traceback
         print(f"Database error in get_all_kegiatan_wr: {traceback.format_exc()}")
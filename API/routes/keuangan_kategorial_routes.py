@@ -2,40 +2,15 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from sync import apply_sync
+from finance_rollup import RollupLockError, rollup_transaction, get_saldo as get_rollup_saldo, get_laporan_bulanan as get_rollup_laporan
 import datetime
-import os
 
 keuangan_kategorial_bp = Blueprint('keuangan_kategorial', __name__, url_prefix='/keuangan-kategorial')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error',
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @keuangan_kategorial_bp.route('', methods=['GET'])
 def get_keuangan_kategorial():
     """Ambil semua data keuangan kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -46,6 +21,11 @@ def get_keuangan_kategorial():
 
         cursor = connection.cursor(dictionary=True)
 
+        conditions = []
+        params = []
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'keuangan_kategorial', cursor, conditions, params, 'k.updated_at')
+
         query = """
         SELECT k.id_keuangan_kategorial, k.tanggal, k.jenis, k.kategori,
                k.keterangan, k.jumlah, k.created_at, k.updated_at,
@@ -54,21 +34,30 @@ def get_keuangan_kategorial():
                COALESCE(a.nama_lengkap, 'System') as nama_admin
         FROM keuangan_kategorial k
         LEFT JOIN admin a ON k.created_by_admin = a.id_admin
-        ORDER BY k.tanggal DESC, k.created_at DESC
-        LIMIT %s OFFSET %s
         """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY k.tanggal DESC, k.created_at DESC"
+        if not sync:
+            query += " LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
         print(f"[DEBUG API] GET /keuangan-kategorial - limit: {limit}, offset: {offset}")
-        cursor.execute(query, (limit, offset))
+        cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
 
         print(f"[DEBUG API] GET /keuangan-kategorial - returned {len(result)} records")
-        return jsonify({
+        response = {
             'status': 'success',
             'data': result
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"[ERROR API] GET /keuangan-kategorial failed: {str(e)}")
         import traceback
@@ -78,10 +67,6 @@ def get_keuangan_kategorial():
 @keuangan_kategorial_bp.route('', methods=['POST'])
 def add_keuangan_kategorial():
     """Tambah data keuangan kategorial baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     print(f"[DEBUG API] POST /keuangan-kategorial - received data: {data}")
 
@@ -112,10 +97,11 @@ def add_keuangan_kategorial():
         )
 
         print(f"[DEBUG API] Inserting keuangan kategorial: {params}")
-        cursor.execute(query, params)
-        connection.commit()
+        with rollup_transaction(connection, 'keuangan_kategorial') as change:
+            cursor.execute(query, params)
+            change.record_id = cursor.lastrowid
 
-        keuangan_id = cursor.lastrowid
+        keuangan_id = change.record_id
         cursor.close()
         connection.close()
 
@@ -125,6 +111,8 @@ def add_keuangan_kategorial():
             'message': 'Data keuangan kategorial berhasil ditambahkan',
             'id': keuangan_id
         })
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         print(f"[ERROR API] POST /keuangan-kategorial failed: {str(e)}")
         import traceback
@@ -134,10 +122,6 @@ def add_keuangan_kategorial():
 @keuangan_kategorial_bp.route('/<int:keuangan_id>', methods=['GET'])
 def get_keuangan_kategorial_by_id(keuangan_id):
     """Ambil data keuangan kategorial berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -178,10 +162,6 @@ def get_keuangan_kategorial_by_id(keuangan_id):
 @keuangan_kategorial_bp.route('/<int:keuangan_id>', methods=['PUT'])
 def update_keuangan_kategorial(keuangan_id):
     """Update data keuangan kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -194,7 +174,7 @@ def update_keuangan_kategorial(keuangan_id):
         UPDATE keuangan_kategorial SET
             tanggal = %s, jenis = %s, kategori = %s,
             keterangan = %s, jumlah = %s,
-            updated_at = %s
+            updated_at = NOW()
         WHERE id_keuangan_kategorial = %s
         """
         params = (
@@ -203,14 +183,14 @@ def update_keuangan_kategorial(keuangan_id):
             data.get('kategori'),  # Kolekte, Donasi, dll
             data.get('keterangan'),
             data.get('jumlah'),
-            datetime.datetime.now(),
             keuangan_id
         )
 
-        cursor.execute(query, params)
-        connection.commit()
+        with rollup_transaction(connection, 'keuangan_kategorial', keuangan_id):
+            cursor.execute(query, params)
+            updated = cursor.rowcount
 
-        if cursor.rowcount > 0:
+        if updated > 0:
             cursor.close()
             connection.close()
             return jsonify({
@@ -224,6 +204,8 @@ def update_keuangan_kategorial(keuangan_id):
                 'status': 'error',
                 'message': 'Data keuangan kategorial tidak ditemukan'
             }), 404
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         print(f"[ERROR API] PUT /keuangan-kategorial/{keuangan_id} failed: {str(e)}")
         import traceback
@@ -233,10 +215,6 @@ def update_keuangan_kategorial(keuangan_id):
 @keuangan_kategorial_bp.route('/<int:keuangan_id>', methods=['DELETE'])
 def delete_keuangan_kategorial(keuangan_id):
     """Hapus data keuangan kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -244,10 +222,11 @@ def delete_keuangan_kategorial(keuangan_id):
     try:
         cursor = connection.cursor()
         query = "DELETE FROM keuangan_kategorial WHERE id_keuangan_kategorial = %s"
-        cursor.execute(query, (keuangan_id,))
-        connection.commit()
+        with rollup_transaction(connection, 'keuangan_kategorial', keuangan_id):
+            cursor.execute(query, (keuangan_id,))
+            deleted = cursor.rowcount
 
-        if cursor.rowcount > 0:
+        if deleted > 0:
             cursor.close()
             connection.close()
             return jsonify({
@@ -261,8 +240,58 @@ def delete_keuangan_kategorial(keuangan_id):
                 'status': 'error',
                 'message': 'Data keuangan kategorial tidak ditemukan'
             }), 404
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         print(f"[ERROR API] DELETE /keuangan-kategorial/{keuangan_id} failed: {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@keuangan_kategorial_bp.route('/laporan-bulanan', methods=['GET'])
+def get_laporan_bulanan_kategorial():
+    """Ambil laporan keuangan kategorial bulanan dari tabel rollup"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        year = request.args.get('year', datetime.datetime.now().year, type=int)
+        month = request.args.get('month', datetime.datetime.now().month, type=int)
+        admin_id = request.args.get('admin_id', type=int)
+
+        cursor = connection.cursor(dictionary=True)
+        result = get_rollup_laporan(cursor, 'keuangan_kategorial', year, month, owner_id=admin_id)
+        cursor.close()
+        connection.close()
+
+        return jsonify({
+            'status': 'success',
+            'data': result
+        })
+    except Exception as e:
+        print(f"[ERROR API] GET /keuangan-kategorial/laporan-bulanan failed: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@keuangan_kategorial_bp.route('/saldo', methods=['GET'])
+def get_saldo_kategorial():
+    """Hitung total saldo keuangan kategorial (dari tabel rollup)"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        admin_id = request.args.get('admin_id', type=int)
+
+        cursor = connection.cursor(dictionary=True)
+        saldo = get_rollup_saldo(cursor, 'keuangan_kategorial', owner_id=admin_id)
+        cursor.close()
+        connection.close()
+
+        return jsonify({
+            'status': 'success',
+            'data': saldo
+        })
+    except Exception as e:
+        print(f"[ERROR API] GET /keuangan-kategorial/saldo failed: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
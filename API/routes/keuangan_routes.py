@@ -2,40 +2,16 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from pagination import KeysetPaginator, is_cursor_request
+from sync import apply_sync
+from finance_rollup import RollupLockError, rollup_transaction, get_saldo as get_rollup_saldo, get_laporan_bulanan as get_rollup_laporan
 import datetime
-import os
 
 keuangan_bp = Blueprint('keuangan', __name__, url_prefix='/keuangan')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @keuangan_bp.route('/my', methods=['GET'])
 def get_my_keuangan():
     """Ambil data keuangan user sendiri saja"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     user_id = request.args.get('user_id', type=int)
     print(f"[DEBUG API] /keuangan/my called with user_id: {user_id}")
 
@@ -51,6 +27,10 @@ def get_my_keuangan():
     try:
         cursor = connection.cursor(dictionary=True)
 
+        conditions = ["k.created_by_pengguna = %s"]
+        params = [user_id]
+        sync = apply_sync(request.args, 'keuangan', cursor, conditions, params, 'k.updated_at')
+
         # Query dengan backward compatibility - tidak include deskripsi jika tidak ada
         query = """
             SELECT k.id_keuangan, k.tanggal, k.kategori as jenis, k.sub_kategori as kategori,
@@ -59,12 +39,11 @@ def get_my_keuangan():
                    COALESCE(p.nama_lengkap, 'System') as nama_user
             FROM keuangan k
             LEFT JOIN pengguna p ON k.created_by_pengguna = p.id_pengguna
-            WHERE k.created_by_pengguna = %s
-            ORDER BY k.tanggal DESC
         """
+        query += " WHERE " + " AND ".join(conditions) + " ORDER BY k.tanggal DESC"
 
         print(f"[DEBUG API] Executing query for user_id: {user_id}")
-        cursor.execute(query, (user_id,))
+        cursor.execute(query, params)
         result = cursor.fetchall()
 
         print(f"[DEBUG API] Query returned {len(result)} records")
@@ -75,9 +54,13 @@ def get_my_keuangan():
         connection.close()
 
         response = {'status': 'success', 'data': result}
+        if sync:
+            response.update(sync.payload())
         print(f"[DEBUG API] Returning response with {len(result)} records")
         return jsonify(response)
 
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"[ERROR API] Exception in get_my_keuangan: {str(e)}")
         import traceback
@@ -87,10 +70,6 @@ def get_my_keuangan():
 @keuangan_bp.route('', methods=['GET'])
 def get_keuangan():
     """Ambil semua data keuangan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -145,11 +124,29 @@ def get_keuangan():
             conditions.append("k.created_by_pengguna = %s")
             params.append(user_id)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'keuangan', cursor, conditions, params, 'k.updated_at')
+
+        # Mode cursor (opt-in): seek di idx_keuangan_tanggal, bukan OFFSET
+        paginator = None
+        if is_cursor_request(request.args):
+            paginator = KeysetPaginator('k.tanggal', 'k.id_keuangan', descending=True)
+            keyset_sql, keyset_params = paginator.condition(request.args.get('cursor'))
+            if keyset_sql:
+                conditions.append(keyset_sql)
+                params.extend(keyset_params)
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
-        query += " ORDER BY k.tanggal DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if paginator:
+            query += paginator.order_by() + " LIMIT %s"
+            params.append(limit + 1)
+        elif sync:
+            query += " ORDER BY k.tanggal DESC"
+        else:
+            query += " ORDER BY k.tanggal DESC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
         print(f"[DEBUG API] Executing query: {query}")
         print(f"[DEBUG API] Params: {params}")
@@ -159,10 +156,17 @@ def get_keuangan():
         connection.close()
 
         print(f"[DEBUG API] Query returned {len(result)} records")
-        return jsonify({
+        response = {
             'status': 'success',
             'data': result
-        })
+        }
+        if paginator:
+            response['data'], response['next_cursor'] = paginator.finalize(result, limit)
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"[ERROR API] get_keuangan failed: {str(e)}")
         import traceback
@@ -172,10 +176,6 @@ def get_keuangan():
 @keuangan_bp.route('', methods=['POST'])
 def add_keuangan():
     """Tambah data keuangan baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -207,11 +207,11 @@ def add_keuangan():
         )
 
         print(f"[DEBUG API] Inserting keuangan: {params}")
-        cursor.execute(query, params)
-
-        connection.commit()
+        with rollup_transaction(connection, 'keuangan') as change:
+            cursor.execute(query, params)
+            change.record_id = cursor.lastrowid
 
-        keuangan_id = cursor.lastrowid
+        keuangan_id = change.record_id
         cursor.close()
         connection.close()
 
@@ -222,6 +222,8 @@ def add_keuangan():
             'message': 'Data keuangan berhasil ditambahkan',
             'id': keuangan_id
         })
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         print(f"[ERROR] add_keuangan failed: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -229,10 +231,6 @@ def add_keuangan():
 @keuangan_bp.route('/<int:keuangan_id>', methods=['GET'])
 def get_keuangan_by_id(keuangan_id):
     """Ambil data keuangan berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -268,10 +266,6 @@ def get_keuangan_by_id(keuangan_id):
 @keuangan_bp.route('/<int:keuangan_id>', methods=['PUT'])
 def update_keuangan(keuangan_id):
     """Update data keuangan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -285,7 +279,7 @@ def update_keuangan(keuangan_id):
         UPDATE keuangan SET
             tanggal = %s, kategori = %s, sub_kategori = %s,
             jumlah = %s, keterangan = %s,
-            updated_at = %s
+            updated_at = NOW()
         WHERE id_keuangan = %s
         """
         params = (
@@ -294,16 +288,15 @@ def update_keuangan(keuangan_id):
             data.get('sub_kategori'),
             data.get('jumlah'),
             data.get('keterangan'),  # Hanya keterangan
-            datetime.datetime.now(),
             keuangan_id
         )
 
         print(f"[DEBUG API] Updating keuangan ID {keuangan_id}: {params}")
-        cursor.execute(query, params)
+        with rollup_transaction(connection, 'keuangan', keuangan_id):
+            cursor.execute(query, params)
+            updated = cursor.rowcount
 
-        connection.commit()
-
-        if cursor.rowcount > 0:
+        if updated > 0:
             cursor.close()
             connection.close()
             print(f"[DEBUG] Keuangan updated successfully: ID={keuangan_id}")
@@ -318,6 +311,8 @@ def update_keuangan(keuangan_id):
                 'status': 'error',
                 'message': 'Data keuangan tidak ditemukan'
             }), 404
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         print(f"[ERROR] update_keuangan failed: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -325,10 +320,6 @@ def update_keuangan(keuangan_id):
 @keuangan_bp.route('/<int:keuangan_id>', methods=['DELETE'])
 def delete_keuangan(keuangan_id):
     """Hapus data keuangan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -336,10 +327,11 @@ def delete_keuangan(keuangan_id):
     try:
         cursor = connection.cursor()
         query = "DELETE FROM keuangan WHERE id_keuangan = %s"
-        cursor.execute(query, (keuangan_id,))
-        connection.commit()
+        with rollup_transaction(connection, 'keuangan', keuangan_id):
+            cursor.execute(query, (keuangan_id,))
+            deleted = cursor.rowcount
         
-        if cursor.rowcount > 0:
+        if deleted > 0:
             cursor.close()
             connection.close()
             return jsonify({
@@ -353,16 +345,14 @@ def delete_keuangan(keuangan_id):
                 'status': 'error',
                 'message': 'Data keuangan tidak ditemukan'
             }), 404
+    except RollupLockError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @keuangan_bp.route('/laporan-bulanan', methods=['GET'])
 def get_laporan_bulanan():
-    """Ambil laporan keuangan bulanan menggunakan view"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
+    """Ambil laporan keuangan bulanan dari tabel rollup"""
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -370,17 +360,10 @@ def get_laporan_bulanan():
     try:
         year = request.args.get('year', datetime.datetime.now().year, type=int)
         month = request.args.get('month', datetime.datetime.now().month, type=int)
+        user_id = request.args.get('user_id', type=int)
         
         cursor = connection.cursor(dictionary=True)
-        
-        if year and month:
-            query = "SELECT * FROM v_laporan_keuangan_bulanan WHERE tahun = %s AND bulan = %s"
-            cursor.execute(query, (year, month))
-        else:
-            query = "SELECT * FROM v_laporan_keuangan_bulanan ORDER BY tahun DESC, bulan DESC LIMIT 12"
-            cursor.execute(query)
-        
-        result = cursor.fetchall()
+        result = get_rollup_laporan(cursor, 'keuangan', year, month, owner_id=user_id)
         cursor.close()
         connection.close()
         
@@ -393,43 +376,22 @@ def get_laporan_bulanan():
 
 @keuangan_bp.route('/saldo', methods=['GET'])
 def get_saldo():
-    """Hitung total saldo berdasarkan pemasukan dan pengeluaran"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
+    """Hitung total saldo berdasarkan pemasukan dan pengeluaran (dari tabel rollup)"""
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
 
     try:
-        cursor = connection.cursor(dictionary=True)
-
-        # Hitung total pemasukan
-        cursor.execute("SELECT COALESCE(SUM(jumlah), 0) as total FROM keuangan WHERE kategori = 'Pemasukan'")
-        pemasukan_result = cursor.fetchone()
-        pemasukan = pemasukan_result.get('total', 0) if pemasukan_result else 0  # type: ignore
-
-        # Hitung total pengeluaran
-        cursor.execute("SELECT COALESCE(SUM(jumlah), 0) as total FROM keuangan WHERE kategori = 'Pengeluaran'")
-        pengeluaran_result = cursor.fetchone()
-        pengeluaran = pengeluaran_result.get('total', 0) if pengeluaran_result else 0  # type: ignore
-
-        # Convert to float safely
-        pemasukan_float = float(pemasukan) if pemasukan is not None else 0.0  # type: ignore
-        pengeluaran_float = float(pengeluaran) if pengeluaran is not None else 0.0  # type: ignore
-        saldo = pemasukan_float - pengeluaran_float
+        user_id = request.args.get('user_id', type=int)
 
+        cursor = connection.cursor(dictionary=True)
+        saldo = get_rollup_saldo(cursor, 'keuangan', owner_id=user_id)
         cursor.close()
         connection.close()
 
         return jsonify({
             'status': 'success',
-            'data': {
-                'total_pemasukan': pemasukan_float,
-                'total_pengeluaran': pengeluaran_float,
-                'saldo': saldo
-            }
+            'data': saldo
         })
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
\ No newline at end of file
+        return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -2,40 +2,14 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from pagination import KeysetPaginator, is_cursor_request
 import datetime
-import os
 
 log_bp = Blueprint('log', __name__, url_prefix='/log')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @log_bp.route('/activities', methods=['GET'])
 def get_log_activities():
     """Ambil log aktivitas"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -67,31 +41,50 @@ def get_log_activities():
             conditions.append("l.id_pengguna = %s")
             params.append(pengguna_id)
         
+        # Mode cursor (opt-in): seek di idx_log_timestamp, bukan OFFSET
+        paginator = None
+        if is_cursor_request(request.args):
+            paginator = KeysetPaginator('l.timestamp', 'l.id_log', descending=True)
+            keyset_sql, keyset_params = paginator.condition(request.args.get('cursor'))
+            if keyset_sql:
+                conditions.append(keyset_sql)
+                params.extend(keyset_params)
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY l.timestamp DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if paginator:
+            query += paginator.order_by() + " LIMIT %s"
+            params.append(limit + 1)
+        else:
+            query += " ORDER BY l.timestamp DESC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
         
         cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
         
+        if paginator:
+            result, next_cursor = paginator.finalize(result, limit)
+            return jsonify({
+                'status': 'success',
+                'data': result,
+                'next_cursor': next_cursor
+            })
+
         return jsonify({
             'status': 'success',
             'data': result
         })
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @log_bp.route('/activities', methods=['POST'])
 def add_log_activity():
     """Tambah log aktivitas baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -129,10 +122,6 @@ def add_log_activity():
 @log_bp.route('/activities/recent', methods=['GET'])
 def get_recent_activities():
     """Ambil aktivitas terbaru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -167,10 +156,6 @@ def get_recent_activities():
 @log_bp.route('/activities/admin/<int:admin_id>', methods=['GET'])
 def get_admin_activities(admin_id):
     """Ambil aktivitas admin tertentu"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -202,10 +187,6 @@ def get_admin_activities(admin_id):
 @log_bp.route('/activities/stats', methods=['GET'])
 def get_activity_stats():
     """Ambil statistik aktivitas"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
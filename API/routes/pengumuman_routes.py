@@ -2,40 +2,13 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
-import datetime
-import os
+from sync import apply_sync
 
 pengumuman_bp = Blueprint('pengumuman', __name__, url_prefix='/pengumuman')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @pengumuman_bp.route('', methods=['GET'])
 def get_pengumuman():
     """Ambil semua data pengumuman"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -72,31 +45,41 @@ def get_pengumuman():
             conditions.append("sasaran = %s")
             params.append(sasaran)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync = apply_sync(request.args, 'pengumuman', cursor, conditions, params)
+        if sync and active_only:
+            # Pengumuman yang baru dinonaktifkan harus hilang dari client
+            sync.mark_filtered_out(cursor, "is_active = 1")
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
-        query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if sync:
+            query += " ORDER BY created_at DESC"
+        else:
+            query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
 
         cursor.execute(query, params)
         result = cursor.fetchall()
         cursor.close()
         connection.close()
 
-        return jsonify({
+        response = {
             'status': 'success',
             'data': result
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @pengumuman_bp.route('', methods=['POST'])
 def add_pengumuman():
     """Tambah pengumuman baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -136,10 +119,6 @@ def add_pengumuman():
 @pengumuman_bp.route('/<int:pengumuman_id>', methods=['GET'])
 def get_pengumuman_by_id(pengumuman_id):
     """Ambil pengumuman berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -168,10 +147,6 @@ def get_pengumuman_by_id(pengumuman_id):
 @pengumuman_bp.route('/<int:pengumuman_id>', methods=['PUT'])
 def update_pengumuman(pengumuman_id):
     """Update pengumuman"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -187,7 +162,7 @@ def update_pengumuman(pengumuman_id):
             sasaran = %s,
             penanggung_jawab = %s,
             is_active = %s,
-            updated_at = %s
+            updated_at = NOW()
         WHERE id_pengumuman = %s
         """
 
@@ -197,7 +172,6 @@ def update_pengumuman(pengumuman_id):
             data.get('sasaran', 'Umum'),
             data.get('penanggung_jawab'),
             data.get('is_active', True),
-            datetime.datetime.now(),
             pengumuman_id
         )
         cursor.execute(query, params)
@@ -223,10 +197,6 @@ def update_pengumuman(pengumuman_id):
 @pengumuman_bp.route('/<int:pengumuman_id>', methods=['DELETE'])
 def delete_pengumuman(pengumuman_id):
     """Hapus pengumuman"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -257,10 +227,6 @@ def delete_pengumuman(pengumuman_id):
 @pengumuman_bp.route('/aktif', methods=['GET'])
 def get_pengumuman_aktif():
     """Ambil pengumuman aktif"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -2,40 +2,14 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from events import publish
 import datetime
-import os
 
 pesan_bp = Blueprint('pesan', __name__, url_prefix='/pesan')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @pesan_bp.route('', methods=['GET'])
 def get_pesan():
     """Ambil semua pesan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -88,10 +62,6 @@ def get_pesan():
 @pesan_bp.route('', methods=['POST'])
 def send_pesan():
     """Kirim pesan baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -130,6 +100,15 @@ def send_pesan():
         pesan_id = cursor.lastrowid
         cursor.close()
         connection.close()
+
+        if is_broadcast:
+            publish('broadcast', {
+                'id_pesan': pesan_id,
+                'pesan': pesan,
+                'pengirim_admin': pengirim_admin,
+                'broadcast_type': broadcast_type,
+                'target': target,
+            })
         
         return jsonify({
             'status': 'success',
@@ -142,10 +121,6 @@ def send_pesan():
 @pesan_bp.route('/<int:pesan_id>', methods=['GET'])
 def get_pesan_by_id(pesan_id):
     """Ambil pesan berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -181,10 +156,6 @@ def get_pesan_by_id(pesan_id):
 @pesan_bp.route('/<int:pesan_id>/status', methods=['PUT'])
 def update_pesan_status(pesan_id):
     """Update status pesan (misalnya dari Terkirim ke Dibaca)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     data = request.json
     connection = get_db_connection()
     if not connection:
@@ -218,10 +189,6 @@ def update_pesan_status(pesan_id):
 @pesan_bp.route('/<int:pesan_id>', methods=['DELETE'])
 def delete_pesan(pesan_id):
     """Hapus pesan"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -252,10 +219,6 @@ def delete_pesan(pesan_id):
 @pesan_bp.route('/broadcast', methods=['GET'])
 def get_broadcast_messages():
     """Ambil semua pesan broadcast"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -289,10 +252,6 @@ def get_broadcast_messages():
 @pesan_bp.route('/recent', methods=['GET'])
 def get_recent_messages():
     """Ambil pesan terbaru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-    
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
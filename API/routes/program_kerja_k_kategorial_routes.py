@@ -4,38 +4,12 @@
 from flask import Blueprint, request, jsonify
 from typing import Tuple, Dict, Any
 import datetime
-import os
+from sync import apply_sync
 
 # Blueprint
 program_kerja_k_kategorial_bp = Blueprint('program_kerja_k_kategorial', __name__, url_prefix='/program-kerja-k-kategorial')
 
-API_STATUS_FILE = 'api_status.txt'
-
 # ========== HELPER FUNCTIONS ==========
-def get_api_status():
-    """Get API enabled/disabled status"""
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-
-def check_api_enabled():
-    """Check if API is enabled"""
-    if not get_api_status():
-        return jsonify({
-            'status': 'error',
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
-
 def success_response(data=None, message="Success"):
     """Return success response"""
     return jsonify({
@@ -44,7 +18,6 @@ def success_response(data=None, message="Success"):
         "message": message
     }), 200
 
-
 def error_response(message="Error", status_code=400):
     """Return error response"""
     return jsonify({
@@ -52,16 +25,11 @@ def error_response(message="Error", status_code=400):
         "data": message
     }), status_code
 
-
 # ========== ROUTES ==========
 
 @program_kerja_k_kategorial_bp.route('', methods=['GET'])
 def get_program_kerja_k_kategorial_list():
     """Get list of program kerja K. Kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     try:
         from config import get_db_connection
         connection = get_db_connection()
@@ -102,9 +70,16 @@ def get_program_kerja_k_kategorial_list():
             query += " AND (program_kerja LIKE %s OR subyek_sasaran LIKE %s)"
             params.extend([f"%{search}%", f"%{search}%"])
 
+        cursor = connection.cursor(dictionary=True)
+
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'program_kerja_k_kategorial', cursor, sync_conditions, params)
+        for condition in sync_conditions:
+            query += " AND " + condition
+
         query += " ORDER BY created_at DESC"
 
-        cursor = connection.cursor(dictionary=True)
         cursor.execute(query, params)
         rows = cursor.fetchall()
 
@@ -148,12 +123,17 @@ def get_program_kerja_k_kategorial_list():
         cursor.close()
         connection.close()
 
-        return jsonify({
+        response = {
             "status": "success",
             "data": {"data": programs},
             "message": "Program kerja K. Kategorial berhasil dimuat"
-        }), 200
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response), 200
 
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Error: {str(e)}", 500)
 
@@ -246,10 +226,6 @@ def get_program_evaluation(program_id):
 @program_kerja_k_kategorial_bp.route('', methods=['POST'])
 def add_program_kerja_k_kategorial():
     """Add new program kerja K. Kategorial with budget and evaluation"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     try:
         from config import get_db_connection
         connection = get_db_connection()
@@ -372,10 +348,6 @@ def add_program_kerja_k_kategorial():
 @program_kerja_k_kategorial_bp.route('/<int:program_id>', methods=['PUT'])
 def update_program_kerja_k_kategorial(program_id):
     """Update program kerja K. Kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     try:
         from config import get_db_connection
         connection = get_db_connection()
@@ -504,10 +476,6 @@ def update_program_kerja_k_kategorial(program_id):
 @program_kerja_k_kategorial_bp.route('/<int:program_id>', methods=['DELETE'])
 def delete_program_kerja_k_kategorial(program_id):
     """Delete program kerja K. Kategorial"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     try:
         from config import get_db_connection
         connection = get_db_connection()
@@ -2,31 +2,14 @@
 
 from flask import Blueprint, request, jsonify
 from config import get_db_connection
+from sync import apply_sync
 import datetime
 
 program_kerja_bp = Blueprint('program_kerja', __name__, url_prefix='/program-kerja')
 
-def check_api_enabled():
-    """Check if API is enabled"""
-    import os
-    try:
-        if os.path.exists('api_status.txt'):
-            with open('api_status.txt', 'r') as f:
-                content = f.read().strip()
-                if content != 'enabled':
-                    return jsonify({'kategori': 'error', 'message': 'API sedang dinonaktifkan'}), 503
-        return None
-    except Exception as e:
-        print(f"Error checking API status: {e}")
-        return None
-
 @program_kerja_bp.route('', methods=['GET'])
 def get_program_kerja():
     """Get list of work programs"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'kategori': 'error', 'message': 'Database error'}), 500
@@ -73,6 +56,12 @@ def get_program_kerja():
             base_query += " AND YEAR(estimasi_waktu) = %s"
             params.append(year)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'program_kerja', cursor, sync_conditions, params)
+        for condition in sync_conditions:
+            base_query += " AND " + condition
+
         base_query += " ORDER BY estimasi_waktu ASC"
         
         cursor.execute(base_query, params)
@@ -87,12 +76,17 @@ def get_program_kerja():
             if program.get('updated_at'):
                 program['updated_at'] = program['updated_at'].isoformat()  # type: ignore
         
-        return jsonify({
+        response = {
             'kategori': 'success',
             'data': program_list,
             'total': len(program_list)
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
         
+    except ValueError as e:
+        return jsonify({'kategori': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"Error getting program kerja: {e}")
         return jsonify({'kategori': 'error', 'message': f'Error: {str(e)}'}), 500
@@ -103,10 +97,6 @@ def get_program_kerja():
 @program_kerja_bp.route('', methods=['POST'])
 def add_program_kerja():
     """Add new work program"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'kategori': 'error', 'message': 'Database error'}), 500
@@ -162,10 +152,6 @@ def add_program_kerja():
 @program_kerja_bp.route('/<int:program_id>', methods=['PUT'])
 def update_program_kerja(program_id):
     """Update work program"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'kategori': 'error', 'message': 'Database error'}), 500
@@ -218,10 +204,6 @@ def update_program_kerja(program_id):
 @program_kerja_bp.route('/<int:program_id>', methods=['DELETE'])
 def delete_program_kerja(program_id):
     """Delete work program"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'kategori': 'error', 'message': 'Database error'}), 500
@@ -256,10 +238,6 @@ def delete_program_kerja(program_id):
 @program_kerja_bp.route('/statistics', methods=['GET'])
 def get_program_statistics():
     """Get work program statistics"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'kategori': 'error', 'message': 'Database error'}), 500
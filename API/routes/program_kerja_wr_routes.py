@@ -3,6 +3,7 @@
 
 from flask import Blueprint, request, jsonify
 from config import get_db_connection, close_db_connection
+from sync import apply_sync
 
 program_kerja_wr_bp = Blueprint('program_kerja_wr', __name__)
 
@@ -39,6 +40,12 @@ def get_program_kerja_wr():
             query += " AND (pkw.judul LIKE %s OR pkw.keterangan LIKE %s)"
             params.extend([f"%{search}%", f"%{search}%"])
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'program_kerja_wr', cursor, sync_conditions, params, 'pkw.updated_at')
+        for condition in sync_conditions:
+            query += " AND " + condition
+
         query += " ORDER BY pkw.created_at DESC"
 
         cursor.execute(query, params)
@@ -47,8 +54,13 @@ def get_program_kerja_wr():
         cursor.close()
         close_db_connection(conn)
 
-        return jsonify({"status": "success", "data": data}), 200
+        response = {"status": "success", "data": data}
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response), 200
 
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
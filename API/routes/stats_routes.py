@@ -0,0 +1,202 @@
+# Path: api/routes/stats_routes.py
+# Ringkasan statistik dashboard yang dihitung dengan agregat SQL.
+#
+# Menggantikan perhitungan di sisi admin yang sebelumnya mengunduh seluruh
+# tabel jemaat/keuangan/kegiatan/pengumuman hanya untuk len() dan sum().
+
+import datetime
+from flask import Blueprint, jsonify, request
+from config import get_db_connection
+from finance_rollup import ROLLUP_TABLE, get_saldo as get_rollup_saldo
+
+stats_bp = Blueprint('stats', __name__, url_prefix='/stats')
+
+# Kategori umur yang ditampilkan di chart dashboard (urutan tampilan)
+KATEGORI_JEMAAT = ('Balita', 'Anak-anak', 'Remaja', 'OMK', 'KBK', 'KIK', 'Lansia')
+
+MAX_MONTHS = 60
+
+# Sama dengan aturan lama di StatisticsChart.update_data: sakramen dianggap
+# sudah jika status 'sudah' atau tanggalnya terisi
+SAKRAMEN_CONDITIONS = {
+    'baptis': "LOWER(status_babtis) = 'sudah' OR tanggal_babtis IS NOT NULL",
+    'ekaristi': "LOWER(status_ekaristi) = 'sudah' OR tanggal_komuni IS NOT NULL",
+    'krisma': "LOWER(status_krisma) = 'sudah' OR tanggal_krisma IS NOT NULL",
+    'perkawinan': "LOWER(status_perkawinan) = 'sudah' OR tanggal_perkawinan IS NOT NULL",
+}
+
+
+def _number(value):
+    return float(value) if value is not None else 0.0
+
+
+def _count(value):
+    return int(value) if value is not None else 0
+
+
+def _month_start(year, month, months_back):
+    """Tanggal 1 dari bulan `months_back` bulan sebelum year/month"""
+    index = year * 12 + (month - 1) - months_back
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _jemaat_summary(cursor):
+    sakramen_columns = ",\n".join(
+        f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) AS sakramen_{name}"
+        for name, condition in SAKRAMEN_CONDITIONS.items()
+    )
+    cursor.execute(f"""
+        SELECT
+            COUNT(*) AS total,
+            COUNT(DISTINCT NULLIF(TRIM(no_kk), '')) AS keluarga,
+            COUNT(DISTINCT NULLIF(TRIM(wilayah_rohani), '')) AS wilayah_rohani,
+            SUM(CASE WHEN LOWER(jenis_kelamin) IN ('laki-laki', 'l', 'male') THEN 1 ELSE 0 END) AS laki_laki,
+            SUM(CASE WHEN LOWER(jenis_kelamin) IN ('perempuan', 'p', 'female') THEN 1 ELSE 0 END) AS perempuan,
+            {sakramen_columns}
+        FROM jemaat
+    """)
+    row = cursor.fetchone() or {}
+    total = _count(row.get('total'))
+
+    cursor.execute("SELECT kategori, COUNT(*) AS jumlah FROM jemaat GROUP BY kategori")
+    kategori = {name: 0 for name in KATEGORI_JEMAAT}
+    for item in cursor.fetchall():
+        if item['kategori']:
+            kategori[item['kategori']] = _count(item['jumlah'])
+
+    sakramen = {}
+    for name in SAKRAMEN_CONDITIONS:
+        sudah = _count(row.get(f'sakramen_{name}'))
+        sakramen[name] = {'sudah': sudah, 'belum': total - sudah}
+
+    return {
+        'total': total,
+        'keluarga': _count(row.get('keluarga')),
+        'wilayah_rohani': _count(row.get('wilayah_rohani')),
+        'laki_laki': _count(row.get('laki_laki')),
+        'perempuan': _count(row.get('perempuan')),
+        'kategori': kategori,
+        'sakramen': sakramen,
+    }
+
+
+def _keuangan_summary(cursor, year, month, months):
+    # Semua angka keuangan dibaca dari tabel rollup (lihat finance_rollup.py)
+    totals = get_rollup_saldo(cursor, 'keuangan')
+
+    # Saldo per bulan untuk `months` bulan terakhir s/d year/month
+    start = _month_start(year, month, months - 1)
+    cursor.execute(f"""
+        SELECT tahun, bulan, jenis AS kategori, COALESCE(SUM(total), 0) AS total
+        FROM {ROLLUP_TABLE}
+        WHERE sumber = 'keuangan'
+          AND tahun * 12 + bulan BETWEEN %s AND %s
+        GROUP BY tahun, bulan, jenis
+    """, (start.year * 12 + start.month, year * 12 + month))
+
+    bulanan = {}
+    for offset in range(months - 1, -1, -1):
+        day = _month_start(year, month, offset)
+        bulanan[(day.year, day.month)] = {
+            'tahun': day.year,
+            'bulan': day.month,
+            'total_pemasukan': 0.0,
+            'total_pengeluaran': 0.0,
+            'saldo_bulan': 0.0,
+        }
+    for row in cursor.fetchall():
+        entry = bulanan.get((row['tahun'], row['bulan']))
+        if entry is None:
+            continue
+        if row['kategori'] == 'Pemasukan':
+            entry['total_pemasukan'] = _number(row['total'])
+        elif row['kategori'] == 'Pengeluaran':
+            entry['total_pengeluaran'] = _number(row['total'])
+    for entry in bulanan.values():
+        entry['saldo_bulan'] = entry['total_pemasukan'] - entry['total_pengeluaran']
+
+    # Rincian per sub kategori
+    cursor.execute(f"""
+        SELECT jenis AS kategori, COALESCE(NULLIF(sub_kategori, ''), 'Lainnya') AS sub_kategori,
+               SUM(jumlah_transaksi) AS jumlah_transaksi, COALESCE(SUM(total), 0) AS total
+        FROM {ROLLUP_TABLE}
+        WHERE sumber = 'keuangan'
+        GROUP BY jenis, COALESCE(NULLIF(sub_kategori, ''), 'Lainnya')
+        ORDER BY jenis, total DESC
+    """)
+    per_sub_kategori = [{
+        'kategori': row['kategori'],
+        'sub_kategori': row['sub_kategori'],
+        'jumlah_transaksi': _count(row['jumlah_transaksi']),
+        'total': _number(row['total']),
+    } for row in cursor.fetchall()]
+
+    return {
+        'total_pemasukan': totals['total_pemasukan'],
+        'total_pengeluaran': totals['total_pengeluaran'],
+        'saldo': totals['saldo'],
+        'bulan_ini': bulanan[(year, month)],
+        'bulanan': list(bulanan.values()),
+        'per_sub_kategori': per_sub_kategori,
+    }
+
+
+def _counts(cursor, year, month):
+    start = datetime.date(year, month, 1)
+    end = _month_start(year, month, -1)
+
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM jemaat) AS total_jemaat,
+            (SELECT COUNT(*) FROM kegiatan
+             WHERE tanggal_kegiatan >= %s AND tanggal_kegiatan < %s) AS kegiatan_paroki,
+            (SELECT COUNT(*) FROM kegiatan_wr
+             WHERE tanggal_pelaksanaan >= %s AND tanggal_pelaksanaan < %s) AS kegiatan_wr,
+            (SELECT COUNT(*) FROM pengumuman WHERE is_active = 1) AS pengumuman_aktif,
+            (SELECT COUNT(*) FROM client_connections WHERE status = 'Terhubung') AS sesi_aktif
+    """, (start, end, start, end))
+    row = cursor.fetchone() or {}
+
+    return {
+        'total_jemaat': _count(row.get('total_jemaat')),
+        'total_kegiatan_bulan_ini': _count(row.get('kegiatan_paroki')) + _count(row.get('kegiatan_wr')),
+        'total_pengumuman_aktif': _count(row.get('pengumuman_aktif')),
+        'sesi_aktif': _count(row.get('sesi_aktif')),
+    }
+
+
+@stats_bp.route('/summary', methods=['GET'])
+def get_stats_summary():
+    """Ringkasan dashboard: jumlah data, statistik jemaat dan saldo keuangan.
+
+    Parameter opsional: year, month (default bulan berjalan) dan months
+    (jumlah bulan pada deret saldo bulanan, default 12).
+    """
+    now = datetime.datetime.now()
+    year = request.args.get('year', now.year, type=int)
+    month = request.args.get('month', now.month, type=int)
+    months = request.args.get('months', 12, type=int)
+
+    if not 1 <= month <= 12 or not 1900 <= year <= 9999:
+        return jsonify({'status': 'error', 'message': 'Parameter year/month tidak valid'}), 400
+    months = max(1, min(months, MAX_MONTHS))
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+        data = {
+            'periode': {'tahun': year, 'bulan': month},
+            'counts': _counts(cursor, year, month),
+            'jemaat': _jemaat_summary(cursor),
+            'keuangan': _keuangan_summary(cursor, year, month, months),
+        }
+        cursor.close()
+
+        return jsonify({'status': 'success', 'data': data})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
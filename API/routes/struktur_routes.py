@@ -2,40 +2,23 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
+from sync import apply_sync
+from blob_store import blob_store, release_blob, hash_from_path
 import datetime
 import os
 
 struktur_bp = Blueprint('struktur', __name__, url_prefix='/struktur')
 
-API_STATUS_FILE = 'api_status.txt'
+ALLOWED_PHOTO_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
 
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error', 
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
+def _photo_url(file_path):
+    """URL publik foto (disajikan statis dari folder uploads)"""
+    base_url = os.getenv('HOST', '')
+    return f"{base_url}/{file_path.replace(os.sep, '/')}"
 
 @struktur_bp.route('', methods=['GET'])
 def get_struktur():
     """Ambil semua data struktur organisasi"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -69,6 +52,14 @@ def get_struktur():
             base_query += " AND status_aktif = %s"
             params.append(status_aktif)
         
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'struktur', cursor, sync_conditions, params)
+        for condition in sync_conditions:
+            base_query += " AND " + condition
+        if sync and status_aktif and status_aktif != 'Semua':
+            sync.mark_filtered_out(cursor, "status_aktif = %s", (status_aktif,))
+        
         base_query += " ORDER BY nama_lengkap ASC"
         
         cursor.execute(base_query, params)
@@ -81,12 +72,17 @@ def get_struktur():
             if struktur.get('updated_at'):
                 struktur['updated_at'] = struktur['updated_at'].isoformat()  # type: ignore
         
-        return jsonify({
+        response = {
             'status': 'success',
             'data': struktur_list,
             'total': len(struktur_list)
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
         
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"Error getting struktur: {e}")
         return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
@@ -97,10 +93,6 @@ def get_struktur():
 @struktur_bp.route('', methods=['POST'])
 def add_struktur():
     """Tambah data struktur baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -122,9 +114,9 @@ def add_struktur():
         insert_query = """
         INSERT INTO struktur (
             nama_lengkap, jenis_kelamin, wilayah_rohani,
-            jabatan_utama, status_aktif, email, telepon, periode, foto_path
+            jabatan_utama, status_aktif, email, telepon, periode, foto_path, foto_hash
         ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
         )
         """
 
@@ -137,7 +129,8 @@ def add_struktur():
             data.get('email'),
             data.get('telepon'),
             data.get('periode'),
-            data.get('foto_path')
+            data.get('foto_path'),
+            hash_from_path(data.get('foto_path'))
         )
         
         cursor.execute(insert_query, params)
@@ -161,10 +154,6 @@ def add_struktur():
 @struktur_bp.route('/<int:struktur_id>', methods=['GET'])
 def get_struktur_by_id(struktur_id):
     """Ambil data struktur berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -198,10 +187,6 @@ def get_struktur_by_id(struktur_id):
 @struktur_bp.route('/<int:struktur_id>', methods=['PUT'])
 def update_struktur(struktur_id):
     """Update data struktur"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -212,15 +197,18 @@ def update_struktur(struktur_id):
         cursor = connection.cursor()
         
         # Check if struktur exists
-        cursor.execute("SELECT id_struktur FROM struktur WHERE id_struktur = %s", (struktur_id,))
-        if not cursor.fetchone():
+        cursor.execute("SELECT id_struktur, foto_hash FROM struktur WHERE id_struktur = %s", (struktur_id,))
+        existing = cursor.fetchone()
+        if not existing:
             return jsonify({'status': 'error', 'message': 'Data struktur tidak ditemukan'}), 404
+        old_hash = existing[1]  # type: ignore
+        new_hash = hash_from_path(data.get('foto_path'))
         
         update_query = """
         UPDATE struktur SET
             nama_lengkap = %s, jenis_kelamin = %s, wilayah_rohani = %s,
             jabatan_utama = %s, status_aktif = %s, email = %s,
-            telepon = %s, periode = %s, foto_path = %s, updated_at = NOW()
+            telepon = %s, periode = %s, foto_path = %s, foto_hash = %s, updated_at = NOW()
         WHERE id_struktur = %s
         """
 
@@ -234,11 +222,15 @@ def update_struktur(struktur_id):
             data.get('telepon'),
             data.get('periode'),
             data.get('foto_path'),
+            new_hash,
             struktur_id
         )
         
         cursor.execute(update_query, params)
         connection.commit()
+
+        if old_hash and old_hash != new_hash:
+            release_blob(connection, old_hash)
         
         return jsonify({
             'status': 'success',
@@ -255,10 +247,6 @@ def update_struktur(struktur_id):
 @struktur_bp.route('/<int:struktur_id>', methods=['DELETE'])
 def delete_struktur(struktur_id):
     """Hapus data struktur"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -267,13 +255,16 @@ def delete_struktur(struktur_id):
         cursor = connection.cursor()
         
         # Check if struktur exists
-        cursor.execute("SELECT nama_lengkap FROM struktur WHERE id_struktur = %s", (struktur_id,))
+        cursor.execute("SELECT nama_lengkap, foto_hash FROM struktur WHERE id_struktur = %s", (struktur_id,))
         struktur = cursor.fetchone() # type: ignore
         if not struktur:
             return jsonify({'status': 'error', 'message': 'Data struktur tidak ditemukan'}), 404
         
         cursor.execute("DELETE FROM struktur WHERE id_struktur = %s", (struktur_id,))
         connection.commit()
+
+        if struktur[1]:  # type: ignore
+            release_blob(connection, struktur[1])  # type: ignore
         
         return jsonify({
             'status': 'success',
@@ -290,10 +281,6 @@ def delete_struktur(struktur_id):
 @struktur_bp.route('/<int:struktur_id>/upload-photo', methods=['POST'])
 def upload_struktur_photo(struktur_id):
     """Upload foto untuk struktur tertentu"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -301,7 +288,7 @@ def upload_struktur_photo(struktur_id):
     try:
         # Check if struktur exists
         cursor = connection.cursor()
-        cursor.execute("SELECT id_struktur, nama_lengkap FROM struktur WHERE id_struktur = %s", (struktur_id,))
+        cursor.execute("SELECT id_struktur, nama_lengkap, foto_hash FROM struktur WHERE id_struktur = %s", (struktur_id,))
         struktur = cursor.fetchone()
         if not struktur:
             return jsonify({'status': 'error', 'message': 'Struktur tidak ditemukan'}), 404
@@ -315,37 +302,27 @@ def upload_struktur_photo(struktur_id):
             return jsonify({'status': 'error', 'message': 'Tidak ada file yang dipilih'}), 400
 
         # Validate file type
-        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
         filename = file.filename  # Already validated as not None above
-        if not ('.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+        if not ('.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_PHOTO_EXTENSIONS):
             return jsonify({'status': 'error', 'message': 'Tipe file tidak diizinkan. Gunakan: PNG, JPG, JPEG, GIF, BMP'}), 400
 
-        # Create upload directory if not exists
-        import os
-        upload_dir = 'uploads/struktur'
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # Generate unique filename
-        import uuid
-        from datetime import datetime
+        # Simpan ke blob store (foto yang sama tidak disimpan dua kali)
         file_ext = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"struktur_{struktur_id}_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file
-        file.save(file_path)
+        foto_hash, file_path, _ = blob_store.put_stream(file.stream, file_ext)
         
         # Update database with photo path
         cursor.execute(
-            "UPDATE struktur SET foto_path = %s, updated_at = NOW() WHERE id_struktur = %s", 
-            (file_path, struktur_id)
+            "UPDATE struktur SET foto_path = %s, foto_hash = %s, updated_at = NOW() WHERE id_struktur = %s", 
+            (file_path, foto_hash, struktur_id)
         )
         connection.commit()
+
+        old_hash = struktur[2]  # type: ignore
+        if old_hash and old_hash != foto_hash:
+            release_blob(connection, old_hash)
         
         # Generate full photo URL with domain
-        import os
-        base_url = os.getenv('HOST', '')
-        photo_url = f"{base_url}/uploads/struktur/{unique_filename}"
+        photo_url = _photo_url(file_path)
         
         return jsonify({
             'status': 'success',
@@ -364,10 +341,6 @@ def upload_struktur_photo(struktur_id):
 @struktur_bp.route('/upload-photo', methods=['POST'])
 def upload_struktur_photo_new():
     """Upload foto untuk struktur baru (sebelum disimpan)"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     try:
         # Check if file is uploaded
         if 'photo' not in request.files:
@@ -378,30 +351,17 @@ def upload_struktur_photo_new():
             return jsonify({'status': 'error', 'message': 'Tidak ada file yang dipilih'}), 400
 
         # Validate file type
-        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
         filename = file.filename  # Already validated as not None above
-        if not ('.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+        if not ('.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_PHOTO_EXTENSIONS):
             return jsonify({'status': 'error', 'message': 'Tipe file tidak diizinkan. Gunakan: PNG, JPG, JPEG, GIF, BMP'}), 400
 
-        # Create upload directory if not exists
-        import os
-        upload_dir = 'uploads/struktur'
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # Generate unique filename
-        import uuid
-        from datetime import datetime
+        # Simpan ke blob store; referensi dibuat saat data struktur disimpan
+        # (foto_path berisi path blob, foto_hash diambil dari path tersebut)
         file_ext = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"struktur_new_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file
-        file.save(file_path)
+        _, file_path, _ = blob_store.put_stream(file.stream, file_ext)
         
         # Generate full photo URL with domain
-        import os
-        base_url = os.getenv('HOST', '')
-        photo_url = f"{base_url}/uploads/struktur/{unique_filename}"
+        photo_url = _photo_url(file_path)
         
         return jsonify({
             'status': 'success',
@@ -417,10 +377,6 @@ def upload_struktur_photo_new():
 @struktur_bp.route('/statistics', methods=['GET'])
 def get_struktur_statistics():
     """Ambil statistik struktur organisasi"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-        
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -0,0 +1,86 @@
+# Path: api/routes/sync_routes.py
+# Endpoint pendukung sync incremental (lihat sync.py)
+
+from flask import Blueprint, jsonify, request
+from config import get_db_connection
+from sync import SYNC_TABLES, TOMBSTONE_RETENTION_DAYS, parse_watermark, format_watermark, read_watermark
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/sync')
+
+@sync_bp.route('/entities', methods=['GET'])
+def get_sync_entities():
+    """Daftar entity yang mendukung parameter updated_since"""
+    return jsonify({
+        'status': 'success',
+        'data': {entity: {'table': table, 'pk': pk} for entity, (table, pk) in SYNC_TABLES.items()},
+        'retention_days': TOMBSTONE_RETENTION_DAYS
+    })
+
+@sync_bp.route('/tombstones', methods=['GET'])
+def get_tombstones():
+    """Ambil id yang dihapus untuk satu entity sejak watermark tertentu"""
+    entity = request.args.get('entity', '')
+    if entity not in SYNC_TABLES:
+        return jsonify({'status': 'error', 'message': f'Entity tidak dikenal: {entity}'}), 400
+
+    try:
+        since = parse_watermark(request.args.get('since', ''))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    if since is None:
+        return jsonify({'status': 'error', 'message': 'Parameter since wajib diisi'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        table, _ = SYNC_TABLES[entity]
+        cursor = connection.cursor(dictionary=True)
+        watermark = read_watermark(cursor)
+        cursor.execute(
+            "SELECT DISTINCT record_id FROM sync_tombstone WHERE table_name = %s AND deleted_at >= %s",
+            (table, since)
+        )
+        deleted = [row['record_id'] for row in cursor.fetchall()]
+        cursor.close()
+
+        return jsonify({
+            'status': 'success',
+            'entity': entity,
+            'deleted': deleted,
+            'watermark': format_watermark(watermark)
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
+
+@sync_bp.route('/purge-tombstones', methods=['POST'])
+def purge_tombstones():
+    """Hapus tombstone yang lebih lama dari masa retensi"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'status': 'error', 'message': 'Database error'}), 500
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "DELETE FROM sync_tombstone WHERE deleted_at < NOW() - INTERVAL %s DAY",
+            (TOMBSTONE_RETENTION_DAYS,)
+        )
+        purged = cursor.rowcount
+        connection.commit()
+        cursor.close()
+
+        print(f"[SYNC] {purged} tombstone dihapus (retensi {TOMBSTONE_RETENTION_DAYS} hari)")
+        return jsonify({
+            'status': 'success',
+            'message': f'{purged} tombstone dihapus',
+            'purged': purged
+        })
+    except Exception as e:
+        connection.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        connection.close()
@@ -3,39 +3,14 @@
 
 from flask import Blueprint, jsonify, request
 from config import get_db_connection
-import os
+from sync import apply_sync
+from jemaat_search import match_subquery
 
 tim_pembina_bp = Blueprint('tim_pembina', __name__, url_prefix='/tim-pembina')
 
-API_STATUS_FILE = 'api_status.txt'
-
-def get_api_status():
-    try:
-        if os.path.exists(API_STATUS_FILE):
-            with open(API_STATUS_FILE, 'r') as f:
-                content = f.read().strip()
-                return content == 'enabled'
-        else:
-            return True
-    except Exception as e:
-        print(f"Error reading API status: {e}")
-        return True
-
-def check_api_enabled():
-    if not get_api_status():
-        return jsonify({
-            'status': 'error',
-            'message': 'API sedang dinonaktifkan'
-        }), 503
-    return None
-
 @tim_pembina_bp.route('', methods=['GET'])
 def get_tim_pembina():
     """Ambil semua data tim pembina peserta"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -83,6 +58,12 @@ def get_tim_pembina():
             base_query += " AND tahun = %s"
             params.append(tahun_filter)
 
+        # Sync incremental (opt-in): hanya baris yang berubah sejak updated_since
+        sync_conditions = []
+        sync = apply_sync(request.args, 'tim_pembina', cursor, sync_conditions, params)
+        for condition in sync_conditions:
+            base_query += " AND " + condition
+
         base_query += " ORDER BY tahun DESC, nama_peserta ASC"
 
         cursor.execute(base_query, params)
@@ -100,12 +81,17 @@ def get_tim_pembina():
             if 'is_manual_entry' in tim_pembina:
                 tim_pembina['is_manual_entry'] = 1 if tim_pembina['is_manual_entry'] else 0  # type: ignore
 
-        return jsonify({
+        response = {
             'status': 'success',
             'data': tim_pembina_list,
             'total': len(tim_pembina_list)
-        })
+        }
+        if sync:
+            response.update(sync.payload())
+        return jsonify(response)
 
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         print(f"Error getting tim pembina: {e}")
         return jsonify({'status': 'error', 'message': f'Error: {str(e)}'}), 500
@@ -116,10 +102,6 @@ def get_tim_pembina():
 @tim_pembina_bp.route('', methods=['POST'])
 def add_tim_pembina():
     """Tambah data tim pembina peserta baru"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -193,10 +175,6 @@ def add_tim_pembina():
 @tim_pembina_bp.route('/<int:tim_pembina_id>', methods=['GET'])
 def get_tim_pembina_by_id(tim_pembina_id):
     """Ambil data tim pembina peserta berdasarkan ID"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -235,10 +213,6 @@ def get_tim_pembina_by_id(tim_pembina_id):
 @tim_pembina_bp.route('/<int:tim_pembina_id>', methods=['PUT'])
 def update_tim_pembina(tim_pembina_id):
     """Update data tim pembina peserta"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -305,10 +279,6 @@ def update_tim_pembina(tim_pembina_id):
 @tim_pembina_bp.route('/<int:tim_pembina_id>', methods=['DELETE'])
 def delete_tim_pembina(tim_pembina_id):
     """Hapus data tim pembina peserta"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -342,10 +312,6 @@ def delete_tim_pembina(tim_pembina_id):
 @tim_pembina_bp.route('/statistics', methods=['GET'])
 def get_tim_pembina_statistics():
     """Ambil statistik tim pembina"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -421,10 +387,6 @@ def get_tim_pembina_statistics():
 @tim_pembina_bp.route('/search-jemaat', methods=['GET'])
 def search_jemaat():
     """Cari umat berdasarkan nama untuk field Nama Peserta"""
-    status_check = check_api_enabled()
-    if status_check:
-        return status_check
-
     connection = get_db_connection()
     if not connection:
         return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -435,17 +397,22 @@ def search_jemaat():
         cursor = connection.cursor(dictionary=True)
 
         # If search is empty, return all jemaat with limit
-        # Otherwise, filter by search keyword
-        if search and len(search) >= 1:
-            query = """
-            SELECT id_jemaat, nama_lengkap, wilayah_rohani
+        # Otherwise, cari lewat indeks token nama_lengkap (lihat jemaat_search.py)
+        match = match_subquery(search, columns=('nama_lengkap',)) if search else None
+        if search and not match:
+            # Ada kata kunci tetapi tanpa huruf/angka (mis. "!!"): tidak ada yang cocok
+            jemaat_list = []
+        elif match:
+            match_sql, match_params = match
+            query = f"""
+            SELECT jemaat.id_jemaat, jemaat.nama_lengkap, jemaat.wilayah_rohani
             FROM jemaat
-            WHERE nama_lengkap LIKE %s
-            ORDER BY nama_lengkap ASC
+            JOIN ({match_sql}) pencarian ON pencarian.hasil_id = jemaat.id_jemaat
+            ORDER BY pencarian.skor DESC, jemaat.nama_lengkap ASC
             LIMIT 50
             """
-            search_param = f'%{search}%'
-            cursor.execute(query, (search_param,))
+            cursor.execute(query, match_params)
+            jemaat_list = cursor.fetchall()
         else:
             # No search keyword - return all jemaat
             query = """
@@ -455,8 +422,7 @@ def search_jemaat():
             LIMIT 100
             """
             cursor.execute(query)
-
-        jemaat_list = cursor.fetchall()
+            jemaat_list = cursor.fetchall()
 
         return jsonify({
             'status': 'success',
@@ -0,0 +1,185 @@
+# Path: API/sync.py
+# Incremental "changed since" sync untuk endpoint list.
+#
+# Client mengirim `updated_since=<watermark>` (kosong untuk sync pertama).
+# Response berisi hanya baris yang berubah sejak watermark tersebut, daftar id
+# yang dihapus (`deleted`, dari tabel sync_tombstone) dan `watermark` baru
+# untuk request berikutnya.
+
+import datetime
+
+# Entity yang bisa di-sync: nama entity -> (tabel, primary key)
+SYNC_TABLES = {
+    'jemaat': ('jemaat', 'id_jemaat'),
+    'kegiatan': ('kegiatan', 'id_kegiatan'),
+    'kegiatan_wr': ('kegiatan_wr', 'id_kegiatan_wr'),
+    'keuangan': ('keuangan', 'id_keuangan'),
+    'keuangan_kategorial': ('keuangan_kategorial', 'id_keuangan_kategorial'),
+    'pengumuman': ('pengumuman', 'id_pengumuman'),
+    'dokumen': ('dokumen', 'id_dokumen'),
+    'aset': ('aset', 'id_aset'),
+    'struktur': ('struktur', 'id_struktur'),
+    'program_kerja': ('program_kerja', 'id_program_kerja'),
+    'program_kerja_wr': ('program_kerja_wr', 'id_program_kerja_wr'),
+    'program_kerja_k_kategorial': ('program_kerja_k_kategorial', 'id_program_kerja_k_kategorial'),
+    'buku_kronik': ('buku_kronik', 'id_kronik'),
+    'kategorial': ('kategorial', 'id_kategorial'),
+    'binaan': ('k_binaan', 'id_binaan'),
+    'wr': ('wilayah_rohani', 'id_wilayah'),
+    'tim_pembina': ('tim_pembina_peserta', 'id_tim_pembina'),
+}
+
+# Tombstone lebih lama dari ini boleh dihapus; client dengan watermark lebih
+# lama dari retensi menerima snapshot penuh (response berisi reset=True)
+TOMBSTONE_RETENTION_DAYS = 30
+
+WATERMARK_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# updated_at diisi saat statement dijalankan, tetapi baris baru terlihat setelah
+# transaksinya commit. Watermark dimundurkan sejauh ini (dan ke awal transaksi
+# tulis tertua yang masih terbuka) supaya baris yang commit belakangan tidak
+# terlewat; baris yang terkirim dua kali diserap upsert di client.
+WATERMARK_SAFETY_SECONDS = 300
+
+_trx_view_available = True  # False jika user DB tidak punya akses INNODB_TRX (privilege PROCESS)
+
+
+def parse_watermark(value):
+    """Parse watermark dari client. Kosong -> None (sync penuh). Raise ValueError jika format salah."""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('T', ' ').replace('Z', ''))
+    except ValueError:
+        raise ValueError('Format updated_since tidak valid, gunakan YYYY-MM-DD HH:MM:SS')
+
+
+def format_watermark(value):
+    return value.strftime(WATERMARK_FORMAT)
+
+
+def _scalar(row, key):
+    if row is None:
+        return None
+    if isinstance(row, dict):
+        return row.get(key)
+    return row[0]
+
+
+def _oldest_write_transaction(cursor):
+    """Waktu mulai transaksi tertua (koneksi lain) yang sudah menulis tetapi belum commit, atau None"""
+    global _trx_view_available
+    if not _trx_view_available:
+        return None
+    try:
+        cursor.execute("""
+            SELECT MIN(trx_started) AS oldest FROM information_schema.INNODB_TRX
+            WHERE trx_mysql_thread_id <> CONNECTION_ID() AND (trx_rows_modified > 0 OR trx_rows_locked > 0)
+        """)
+        return _scalar(cursor.fetchone(), 'oldest')
+    except Exception as e:
+        _trx_view_available = False
+        print(f"[SYNC] INNODB_TRX tidak bisa dibaca, watermark hanya memakai margin tetap: {e}")
+        return None
+
+
+def read_watermark(cursor):
+    """Watermark untuk sync berikutnya: NOW() dikurangi WATERMARK_SAFETY_SECONDS,
+    atau awal transaksi tulis tertua yang masih terbuka jika lebih awal"""
+    cursor.execute("SELECT NOW() AS watermark")
+    watermark = _scalar(cursor.fetchone(), 'watermark') - datetime.timedelta(seconds=WATERMARK_SAFETY_SECONDS)
+    oldest_trx = _oldest_write_transaction(cursor)
+    if oldest_trx is not None and oldest_trx < watermark:
+        return oldest_trx
+    return watermark
+
+
+class SyncRequest:
+    """State sync untuk satu request list.
+
+    Pemakaian di route (lihat juga apply_sync):
+        sync = apply_sync(request.args, 'jemaat', cursor, conditions, params)
+        ...
+        if sync:
+            response.update(sync.payload())
+
+    `reset` di payload berarti data adalah snapshot penuh: client mengganti
+    seluruh data lokalnya, bukan menggabungkan.
+    """
+
+    def __init__(self, entity, since):
+        if entity not in SYNC_TABLES:
+            raise KeyError(entity)
+        self.entity = entity
+        self.table, self.pk = SYNC_TABLES[entity]
+        self.since = since
+        self.watermark = None
+        self.deleted = []
+
+    @classmethod
+    def from_args(cls, args, entity):
+        """Return SyncRequest jika client mengirim `updated_since`, selain itu None"""
+        if 'updated_since' not in args:
+            return None
+        return cls(entity, parse_watermark(args.get('updated_since')))
+
+    def begin(self, cursor):
+        """Ambil watermark baru dan tombstone sejak watermark lama.
+
+        Watermark diambil dengan read_watermark(): baris yang updated_at-nya
+        sebelum NOW() tetapi commit setelah query data tetap terkirim di sync
+        berikutnya. Baris yang terkirim dua kali aman karena client melakukan
+        upsert berdasarkan primary key.
+        """
+        self.watermark = read_watermark(cursor)
+
+        if self.since is None:
+            return
+
+        oldest_allowed = self.watermark - datetime.timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        if self.since < oldest_allowed:
+            # Tombstone sudah mungkin terhapus: kirim snapshot penuh
+            self.since = None
+            return
+
+        cursor.execute(
+            "SELECT DISTINCT record_id FROM sync_tombstone WHERE table_name = %s AND deleted_at >= %s",
+            (self.table, self.since)
+        )
+        self.deleted = [_scalar(row, 'record_id') for row in cursor.fetchall()]
+
+    def mark_filtered_out(self, cursor, condition, params=()):
+        """Baris yang berubah tetapi tidak lagi lolos filter list (mis. is_active = 1) dikirim sebagai deleted"""
+        if self.since is None:
+            return
+        cursor.execute(
+            f"SELECT {self.pk} FROM {self.table} WHERE updated_at >= %s AND NOT ({condition})",
+            (self.since, *params)
+        )
+        self.deleted.extend(_scalar(row, self.pk) for row in cursor.fetchall())
+
+    def condition(self, column='updated_at'):
+        """Return (sql, params) untuk filter baris yang berubah, atau (None, []) untuk sync penuh"""
+        if self.since is None:
+            return None, []
+        return f"{column} >= %s", [self.since]
+
+    def payload(self):
+        return {
+            'watermark': format_watermark(self.watermark) if self.watermark else None,
+            'deleted': self.deleted,
+            'reset': self.since is None,
+        }
+
+
+def apply_sync(args, entity, cursor, conditions, params, column='updated_at'):
+    """Aktifkan sync jika diminta: tambahkan filter ke conditions/params dan return SyncRequest (atau None)"""
+    sync = SyncRequest.from_args(args, entity)
+    if sync is None:
+        return None
+    sync.begin(cursor)
+    sync_sql, sync_params = sync.condition(column)
+    if sync_sql:
+        conditions.append(sync_sql)
+        params.extend(sync_params)
+    return sync
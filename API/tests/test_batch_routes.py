@@ -0,0 +1,68 @@
+# Path: API/tests/test_batch_routes.py
+# Jalankan dari folder API: python -m unittest discover -s tests
+
+import os
+import sys
+import unittest
+from contextlib import nullcontext
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Blueprint, Flask, g, jsonify, request  # noqa: E402
+from routes import batch_routes  # noqa: E402
+
+
+def _make_app(seen):
+    app = Flask(__name__)
+    probe_bp = Blueprint('probe', __name__, url_prefix='/probe')
+
+    @probe_bp.route('/dry-run', methods=['POST'])
+    def dry_run():
+        # Seperti upload chunk / import dry run: tidak mengubah data
+        g.skip_data_change = True
+        return jsonify({'status': 'success'})
+
+    @probe_bp.route('/write', methods=['POST'])
+    def write():
+        return jsonify({'status': 'success'})
+
+    @app.after_request
+    def record_skip_flag(response):
+        # Sama dengan yang dibaca bump_table_versions / publish_data_change
+        seen.append((request.path, bool(g.get('skip_data_change'))))
+        return response
+
+    app.register_blueprint(probe_bp)
+    app.register_blueprint(batch_routes.batch_bp)
+    return app
+
+
+class BatchIsolationTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(batch_routes, 'shared_connection', lambda: nullcontext())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.seen = []
+        self.client = _make_app(self.seen).test_client()
+
+    def test_skip_flag_does_not_leak_to_later_write(self):
+        response = self.client.post('/batch', json={'requests': [
+            {'id': 'dry', 'method': 'POST', 'path': '/probe/dry-run'},
+            {'id': 'write', 'method': 'POST', 'path': '/probe/write'},
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(data['dry']['status'], 200)
+        self.assertEqual(data['write']['status'], 200)
+        self.assertEqual(self.seen, [
+            ('/probe/dry-run', True),
+            ('/probe/write', False),
+            ('/batch', False),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
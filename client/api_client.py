@@ -1,8 +1,13 @@
 # Path: client/api_client.py
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import os
 import socket
+import hashlib
+import time
+import threading
 from dotenv import load_dotenv
 import json
 from datetime import datetime
@@ -13,6 +18,22 @@ load_dotenv()
 BASE_URL = os.getenv('API_BASE_URL', 'https://enternal.my.id/flask')  # Server production
 REMOTE_URL = 'https://enternal.my.id/flask'  # Production URL
 
+# Jumlah response GET (body + ETag) yang disimpan untuk revalidasi If-None-Match
+ETAG_CACHE_SIZE = 100
+
+# Server yang dicoba saat startup, urut prioritas
+SERVER_CANDIDATES = [
+    'https://enternal.my.id/flask',  # Production server (prioritas utama)
+    'http://localhost:5000',  # Flask local development fallback
+    'http://127.0.0.1:5000',  # IPv4 localhost Flask
+    'http://localhost:8000',  # Server HTTP lokal
+    'http://localhost:3000',  # Express default
+]
+PROBE_TIMEOUT = 3
+
+# Server terakhir yang berhasil dipakai, supaya startup berikutnya tidak menunggu probe
+ENDPOINT_CACHE_PATH = os.path.join(os.path.expanduser("~"), '.gereja_client_endpoint.json')
+
 class ApiClient:
     
     def __init__(self):
@@ -28,35 +49,111 @@ class ApiClient:
         self.user_data = None
         self.device_info = self.get_device_info()
 
+        # Body list terakhir per URL + ETag-nya (lihat _get_json)
+        self._etag_cache = {}
+        self._etag_lock = threading.Lock()
+
+        # Satu session untuk semua request: koneksi TCP/TLS dipakai ulang (keep-alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Auto-detect best server
         self._detect_best_server()
-    
+
     def _detect_best_server(self):
-        """Auto-detect apakah menggunakan production atau local server"""
-        # List server untuk dicoba - prioritaskan production server
-        servers_to_try = [
-            'https://enternal.my.id/flask',  # Production server (prioritas utama)
-            'http://localhost:5000',  # Flask local development fallback
-            'http://127.0.0.1:5000',  # IPv4 localhost Flask
-            'http://localhost:8000',  # Server HTTP lokal
-            'http://localhost:3000',  # Express default
-        ]
-        
+        """Auto-detect apakah menggunakan production atau local server.
+
+        Jika ada server terakhir yang berhasil (ENDPOINT_CACHE_PATH), server itu
+        langsung dipakai dan diverifikasi di background. Tanpa cache, semua
+        kandidat dicoba bersamaan.
+        """
+        cached = self._load_cached_endpoint()
+        if cached:
+            self.base_url = cached
+            print(f"Memakai server terakhir: {cached} (verifikasi di background)")
+            threading.Thread(target=self._verify_cached_server, args=(cached,),
+                             daemon=True, name='server-probe').start()
+            return
+        self._probe_servers()
+
+    def _verify_cached_server(self, cached):
+        """Pindah server hanya jika server dari cache sendiri gagal di-probe.
+
+        Selama sesi berjalan base_url tidak diganti hanya karena kandidat dengan
+        prioritas lebih tinggi ikut hidup, dan tidak jatuh ke BASE_URL jika
+        tidak ada kandidat lain yang menjawab.
+        """
+        if self._probe(cached):
+            return
+        print(f"Server terakhir {cached} tidak merespons")
+        self._probe_servers(keep_current=True)
+
+    def _probe_servers(self, keep_current=False):
+        """Coba semua kandidat bersamaan. Server yang hidup dipakai segera setelah
+        semua kandidat dengan prioritas lebih tinggi dipastikan gagal.
+
+        keep_current: jika semua gagal, base_url tetap (dipakai dari background).
+        """
         print("Mencari server yang tersedia...")
-        for server_url in servers_to_try:
-            try:
-                print(f"  Testing: {server_url}")
-                response = requests.get(server_url, timeout=3)
-                if response.status_code in [200, 404]:  # 404 juga OK, artinya server hidup
-                    self.base_url = server_url
-                    print(f"Server ditemukan: {server_url}")
-                    return
-            except:
-                continue
-        
+        alive = [None] * len(SERVER_CANDIDATES)
+        executor = ThreadPoolExecutor(max_workers=len(SERVER_CANDIDATES), thread_name_prefix='probe')
+        futures = {executor.submit(self._probe, url): i for i, url in enumerate(SERVER_CANDIDATES)}
+        pending = set(futures)
+        chosen = None
+        try:
+            while pending and chosen is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    alive[futures[future]] = future.result()
+                for i, url in enumerate(SERVER_CANDIDATES):
+                    if alive[i] is None:
+                        break  # kandidat lebih prioritas belum selesai
+                    if alive[i]:
+                        chosen = url
+                        break
+        finally:
+            executor.shutdown(wait=False)
+
+        if chosen:
+            if chosen != self.base_url:
+                print(f"Server ditemukan: {chosen}")
+            self.base_url = chosen
+            self._save_cached_endpoint(chosen)
+            return
+
+        if keep_current:
+            print(f"Tidak ada server lain yang tersedia, tetap memakai: {self.base_url}")
+            return
+
         # Jika semua gagal, gunakan default
         print(f"Tidak ada server yang tersedia, menggunakan default: {BASE_URL}")
         self.base_url = BASE_URL
+
+    def _probe(self, server_url):
+        try:
+            response = self.session.get(server_url, timeout=PROBE_TIMEOUT)
+            return response.status_code in [200, 404]  # 404 juga OK, artinya server hidup
+        except Exception:
+            return False
+
+    @staticmethod
+    def _load_cached_endpoint():
+        try:
+            with open(ENDPOINT_CACHE_PATH, 'r', encoding='utf-8') as f:
+                url = json.load(f).get('base_url')
+            return url if url in SERVER_CANDIDATES else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def _save_cached_endpoint(url):
+        try:
+            with open(ENDPOINT_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({'base_url': url, 'saved_at': datetime.now().isoformat()}, f)
+        except OSError as e:
+            print(f"Gagal menyimpan server terakhir: {e}")
     
     def get_client_ip(self):
         try:
@@ -129,10 +226,10 @@ class ApiClient:
             # Coba registrasi ke server lokal (opsional, untuk admin tracking)
             try:
                 # Coba ke server lokal dulu
-                local_response = requests.post("http://localhost:8080/client/register",
-                                             json=data,
-                                             timeout=5,
-                                             headers={'Content-Type': 'application/json'})
+                local_response = self.session.post("http://localhost:8080/client/register",
+                                                 json=data,
+                                                 timeout=5,
+                                                 headers={'Content-Type': 'application/json'})
 
                 if local_response.status_code == 200:
                     local_result = local_response.json()
@@ -145,10 +242,10 @@ class ApiClient:
             
             # WAJIB: Registrasi ke API remote (production/database)
             try:
-                response = requests.post(f"{self.base_url}/client/register",
-                                       json=data,
-                                       timeout=self.timeout,
-                                       headers={'Content-Type': 'application/json'})
+                response = self.session.post(f"{self.base_url}/client/register",
+                                           json=data,
+                                           timeout=self.timeout,
+                                           headers={'Content-Type': 'application/json'})
 
                 if response.status_code == 200:
                     result = response.json()
@@ -200,10 +297,10 @@ class ApiClient:
                 }
                 # Coba disconnect dari server lokal dulu
                 try:
-                    local_response = requests.post("http://localhost:8080/client/disconnect",
-                                                 json=data,
-                                                 timeout=3,
-                                                 headers={'Content-Type': 'application/json'})
+                    local_response = self.session.post("http://localhost:8080/client/disconnect",
+                                                     json=data,
+                                                     timeout=3,
+                                                     headers={'Content-Type': 'application/json'})
                     if local_response.status_code == 200:
                         self.session_id = None
                         self.connection_id = None
@@ -212,10 +309,10 @@ class ApiClient:
                     pass  # Continue to remote
 
                 # Fallback ke remote API
-                response = requests.post(f"{self.base_url}/client/disconnect",
-                                       json=data,
-                                       timeout=self.timeout,
-                                       headers={'Content-Type': 'application/json'})
+                response = self.session.post(f"{self.base_url}/client/disconnect",
+                                           json=data,
+                                           timeout=self.timeout,
+                                           headers={'Content-Type': 'application/json'})
                 response.raise_for_status()
                 self.session_id = None
                 self.connection_id = None
@@ -245,10 +342,10 @@ class ApiClient:
             # Coba kirim heartbeat ke server lokal terlebih dahulu
             try:
                 # Coba local server dulu
-                local_response = requests.post("http://localhost:8080/client/heartbeat",
-                                             json=data,
-                                             timeout=3,
-                                             headers={'Content-Type': 'application/json'})
+                local_response = self.session.post("http://localhost:8080/client/heartbeat",
+                                                 json=data,
+                                                 timeout=3,
+                                                 headers={'Content-Type': 'application/json'})
 
                 if local_response.status_code == 200:
                     local_result = local_response.json()
@@ -259,10 +356,10 @@ class ApiClient:
             
             # Fallback ke remote API
             try:
-                response = requests.post(f"{self.base_url}/client/heartbeat", 
-                                       json=data, 
-                                       timeout=5,  # Timeout singkat untuk heartbeat
-                                       headers={'Content-Type': 'application/json'})
+                response = self.session.post(f"{self.base_url}/client/heartbeat", 
+                                           json=data, 
+                                           timeout=5,  # Timeout singkat untuk heartbeat
+                                           headers={'Content-Type': 'application/json'})
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -279,7 +376,7 @@ class ApiClient:
     
     def check_server_connection(self):
         try:
-            response = requests.get(self.base_url, timeout=self.timeout)
+            response = self.session.get(self.base_url, timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -291,10 +388,10 @@ class ApiClient:
                 'username': username,
                 'password': password
             }
-            response = requests.post(f"{self.base_url}/auth/login", 
-                                   json=data, 
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/auth/login", 
+                                       json=data, 
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             result = response.json()
             
@@ -307,6 +404,46 @@ class ApiClient:
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal login: {e}"}
     
+    def _get_json(self, url, params=None):
+        """GET JSON dengan revalidasi ETag: jika server menjawab 304 (data tidak
+        berubah), body dari request sebelumnya dipakai lagi tanpa diunduh ulang.
+        Raise requests.exceptions.RequestException seperti requests.get."""
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            return json.loads(cached[1])
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._etag_lock:
+                self._etag_cache.pop(key, None)
+                self._etag_cache[key] = (etag, response.content)
+                while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.pop(next(iter(self._etag_cache)))
+        return response.json()
+
+    def batch(self, sub_requests, parallel=True):
+        """Beberapa request dalam satu round-trip (POST /batch).
+        sub_requests: list dict {'id', 'method', 'path', 'params', 'body'};
+        data hasil: {id: {'status', 'body'}}"""
+        try:
+            response = self.session.post(f"{self.base_url}/batch",
+                                       json={'requests': sub_requests, 'parallel': parallel},
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
+            response.raise_for_status()
+            result = response.json()
+            if result.get('status') != 'success':
+                return {"success": False, "data": result.get('message', 'Batch gagal')}
+            return {"success": True, "data": result.get('data', {})}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "data": f"Gagal menjalankan batch: {e}"}
+
     def get_jemaat(self):
         try:
             if not self.user_data:
@@ -317,9 +454,7 @@ class ApiClient:
                 return {"success": False, "data": "User ID not found"}
 
             params = {'user_id': user_id}
-            response = requests.get(f"{self.base_url}/jemaat/my", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(f"{self.base_url}/jemaat/my", params)
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data jemaat: {e}"}
     
@@ -338,10 +473,10 @@ class ApiClient:
             if 'user_id' not in data or data['user_id'] is None:
                 return {"success": False, "data": "user_id is missing - user may not be logged in"}
 
-            response = requests.post(f"{self.base_url}/jemaat",
-                                   json=data,
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/jemaat",
+                                       json=data,
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -349,10 +484,10 @@ class ApiClient:
     
     def update_jemaat(self, jemaat_id, jemaat_data):
         try:
-            response = requests.put(f"{self.base_url}/jemaat/{jemaat_id}", 
-                                  json=jemaat_data, 
-                                  timeout=self.timeout,
-                                  headers={'Content-Type': 'application/json'})
+            response = self.session.put(f"{self.base_url}/jemaat/{jemaat_id}", 
+                                      json=jemaat_data, 
+                                      timeout=self.timeout,
+                                      headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -360,7 +495,7 @@ class ApiClient:
     
     def delete_jemaat(self, jemaat_id):
         try:
-            response = requests.delete(f"{self.base_url}/jemaat/{jemaat_id}", timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/jemaat/{jemaat_id}", timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -375,9 +510,7 @@ class ApiClient:
             user_id = self.user_data.get('id_pengguna')
             params = {'user_id': user_id}
 
-            response = requests.get(f"{self.base_url}/kegiatan/my", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/kegiatan/my", params)}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data kegiatan: {e}"}
 
@@ -390,9 +523,7 @@ class ApiClient:
             user_id = self.user_data.get('id_pengguna')
             params = {'user_id': user_id}
 
-            response = requests.get(f"{self.base_url}/kegiatan", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/kegiatan", params)}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data kegiatan: {e}"}
 
@@ -410,10 +541,10 @@ class ApiClient:
             print(f"[DEBUG] Sending kegiatan data: {data}")
             print(f"[DEBUG] URL: {self.base_url}/kegiatan")
 
-            response = requests.post(f"{self.base_url}/kegiatan",
-                                   json=data,
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/kegiatan",
+                                       json=data,
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
 
             # Debug response
             print(f"[DEBUG] Response status: {response.status_code}")
@@ -447,7 +578,7 @@ class ApiClient:
             if not self.user_data:
                 return {"success": False, "data": "User not logged in"}
 
-            response = requests.put(f"{self.base_url}/kegiatan/{kegiatan_id}", json=data, timeout=self.timeout)
+            response = self.session.put(f"{self.base_url}/kegiatan/{kegiatan_id}", json=data, timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -459,7 +590,7 @@ class ApiClient:
             if not self.user_data:
                 return {"success": False, "data": "User not logged in"}
 
-            response = requests.delete(f"{self.base_url}/kegiatan/{kegiatan_id}", timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/kegiatan/{kegiatan_id}", timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -475,9 +606,7 @@ class ApiClient:
             user_id = self.user_data.get('id_pengguna')
             params = {'user_id': user_id}
 
-            response = requests.get(f"{self.base_url}/kegiatan-wr/my", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            response_data = response.json()
+            response_data = self._get_json(f"{self.base_url}/kegiatan-wr/my", params)
 
             # Handle berbagai format response
             if isinstance(response_data, dict):
@@ -507,10 +636,10 @@ class ApiClient:
 
             print(f"[DEBUG] Mengirim kegiatan_wr data: {data}")
 
-            response = requests.post(f"{self.base_url}/kegiatan-wr",
-                                   json=data,
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/kegiatan-wr",
+                                       json=data,
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
 
             print(f"[DEBUG] Response status: {response.status_code}")
             response.raise_for_status()
@@ -537,7 +666,7 @@ class ApiClient:
             if not self.user_data:
                 return {"success": False, "data": "User not logged in"}
 
-            response = requests.put(f"{self.base_url}/kegiatan-wr/{kegiatan_id}", json=data, timeout=self.timeout)
+            response = self.session.put(f"{self.base_url}/kegiatan-wr/{kegiatan_id}", json=data, timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -549,7 +678,7 @@ class ApiClient:
             if not self.user_data:
                 return {"success": False, "data": "User not logged in"}
 
-            response = requests.delete(f"{self.base_url}/kegiatan-wr/{kegiatan_id}", timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/kegiatan-wr/{kegiatan_id}", timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -567,11 +696,7 @@ class ApiClient:
             if wilayah_id:
                 params['wilayah_id'] = wilayah_id
 
-            response = requests.get(f"{self.base_url}/program-kerja-wr",
-                                  params=params,
-                                  timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/program-kerja-wr", params)}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data program kerja WR: {e}"}
 
@@ -582,10 +707,10 @@ class ApiClient:
             if self.user_data:
                 data['user_id'] = self.user_data.get('id_pengguna')
 
-            response = requests.post(f"{self.base_url}/program-kerja-wr",
-                                   json=data,
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/program-kerja-wr",
+                                       json=data,
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.HTTPError as e:
@@ -606,10 +731,10 @@ class ApiClient:
             if self.user_data:
                 data['user_id'] = self.user_data.get('id_pengguna')
 
-            response = requests.put(f"{self.base_url}/program-kerja-wr/{program_id}",
-                                  json=data,
-                                  timeout=self.timeout,
-                                  headers={'Content-Type': 'application/json'})
+            response = self.session.put(f"{self.base_url}/program-kerja-wr/{program_id}",
+                                      json=data,
+                                      timeout=self.timeout,
+                                      headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.HTTPError as e:
@@ -630,9 +755,9 @@ class ApiClient:
             if self.user_data:
                 params['user_id'] = self.user_data.get('id_pengguna')
 
-            response = requests.delete(f"{self.base_url}/program-kerja-wr/{program_id}",
-                                     params=params,
-                                     timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/program-kerja-wr/{program_id}",
+                                         params=params,
+                                         timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.HTTPError as e:
@@ -648,15 +773,13 @@ class ApiClient:
 
     def get_pengumuman(self):
         try:
-            response = requests.get(f"{self.base_url}/pengumuman?active_only=true", timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/pengumuman", {'active_only': 'true'})}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data pengumuman: {e}"}
 
     def add_pengumuman(self, data):
         try:
-            response = requests.post(f"{self.base_url}/pengumuman", json=data, timeout=self.timeout)
+            response = self.session.post(f"{self.base_url}/pengumuman", json=data, timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -664,7 +787,7 @@ class ApiClient:
 
     def update_pengumuman(self, pengumuman_id, data):
         try:
-            response = requests.put(f"{self.base_url}/pengumuman/{pengumuman_id}", json=data, timeout=self.timeout)
+            response = self.session.put(f"{self.base_url}/pengumuman/{pengumuman_id}", json=data, timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -672,7 +795,7 @@ class ApiClient:
 
     def delete_pengumuman(self, pengumuman_id):
         try:
-            response = requests.delete(f"{self.base_url}/pengumuman/{pengumuman_id}", timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/pengumuman/{pengumuman_id}", timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -688,9 +811,7 @@ class ApiClient:
                 return {"success": False, "data": "User ID not found"}
 
             params = {'user_id': user_id}
-            response = requests.get(f"{self.base_url}/keuangan/my", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/keuangan/my", params)}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil data keuangan: {e}"}
     
@@ -706,10 +827,10 @@ class ApiClient:
             if self.user_data:
                 data['user_id'] = self.user_data.get('id_pengguna')
 
-            response = requests.post(f"{self.base_url}/keuangan",
-                                   json=data,
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/keuangan",
+                                       json=data,
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -717,10 +838,10 @@ class ApiClient:
     
     def update_keuangan(self, keuangan_id, keuangan_data):
         try:
-            response = requests.put(f"{self.base_url}/keuangan/{keuangan_id}", 
-                                  json=keuangan_data, 
-                                  timeout=self.timeout,
-                                  headers={'Content-Type': 'application/json'})
+            response = self.session.put(f"{self.base_url}/keuangan/{keuangan_id}", 
+                                      json=keuangan_data, 
+                                      timeout=self.timeout,
+                                      headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -728,27 +849,66 @@ class ApiClient:
     
     def delete_keuangan(self, keuangan_id):
         try:
-            response = requests.delete(f"{self.base_url}/keuangan/{keuangan_id}", timeout=self.timeout)
+            response = self.session.delete(f"{self.base_url}/keuangan/{keuangan_id}", timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal hapus data keuangan: {e}"}
     
-    def upload_file(self, file_path, kategori="Lainnya", keterangan=""):
+    def upload_file(self, file_path, kategori="Lainnya", keterangan="", progress_callback=None, max_retries=5):
+        """Upload file per chunk (init / put-chunk / commit) ke /dokumen/uploads.
+
+        Setiap chunk dikirim dengan checksum SHA-256; jika koneksi putus, posisi
+        terakhir diambil dari server dan upload dilanjutkan dari sana.
+        """
         try:
+            total_size = os.path.getsize(file_path)
+            file_digest = hashlib.sha256()
             with open(file_path, 'rb') as f:
-                files = {'file': (os.path.basename(file_path), f)}
-                data = {
-                    'kategori': kategori,
-                    'keterangan': keterangan,
-                    'uploaded_by_pengguna': self.user_data.get('id_pengguna') if self.user_data else None
-                }
-                response = requests.post(f"{self.base_url}/upload", 
-                                       files=files,
-                                       data=data,
-                                       timeout=60)
-                response.raise_for_status()
-                return {"success": True, "data": response.json()}
+                for block in iter(lambda: f.read(64 * 1024), b''):
+                    file_digest.update(block)
+
+            init = {
+                'filename': os.path.basename(file_path),
+                'total_size': total_size,
+                'kategori_file': kategori,
+                'bentuk_dokumen': kategori,
+                'keterangan': keterangan
+            }
+            response = self.session.post(f"{self.base_url}/dokumen/uploads", json=init, timeout=self.timeout)
+            response.raise_for_status()
+            upload = response.json()['data']
+            upload_url = f"{self.base_url}/dokumen/uploads/{upload['upload_id']}"
+
+            offset = 0
+            failures = 0
+            with open(file_path, 'rb') as f:
+                while offset < total_size:
+                    f.seek(offset)
+                    chunk = f.read(upload['chunk_size'])
+                    try:
+                        response = self.session.put(upload_url, params={'offset': offset}, data=chunk,
+                                                    headers={'Content-Type': 'application/octet-stream',
+                                                             'X-Chunk-SHA256': hashlib.sha256(chunk).hexdigest()},
+                                                    timeout=60)
+                        response.raise_for_status()
+                        offset = response.json()['data']['received']
+                        failures = 0
+                        if progress_callback:
+                            progress_callback(offset, total_size)
+                    except requests.exceptions.RequestException:
+                        failures += 1
+                        if failures > max_retries:
+                            raise
+                        # Sinkronkan posisi dengan server lalu lanjutkan
+                        time.sleep(min(2 ** failures, 10))
+                        status = self.session.get(upload_url, timeout=self.timeout)
+                        status.raise_for_status()
+                        offset = status.json()['data']['received']
+
+            response = self.session.post(f"{upload_url}/commit", json={'sha256': file_digest.hexdigest()}, timeout=60)
+            response.raise_for_status()
+            return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal upload file: {e}"}
         except Exception as e:
@@ -756,20 +916,71 @@ class ApiClient:
     
     def get_files(self):
         try:
-            response = requests.get(f"{self.base_url}/dokumen/files", timeout=self.timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": self._get_json(f"{self.base_url}/dokumen/files")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal mengambil daftar file: {e}"}
     
     def download_file(self, file_id):
         try:
-            response = requests.get(f"{self.base_url}/dokumen/files/{file_id}/download",
-                                  timeout=self.timeout, stream=True)
+            response = self.session.get(f"{self.base_url}/dokumen/files/{file_id}/download",
+                                      timeout=self.timeout, stream=True)
             response.raise_for_status()
             return {"success": True, "data": response.content, "headers": response.headers}
         except requests.exceptions.RequestException as e:
             return {"success": False, "data": f"Gagal download file: {e}"}
+
+    def download_file_to(self, file_id, save_path, progress_callback=None, chunk_size=64 * 1024):
+        """Download file langsung ke disk secara streaming, dengan resume (Range + If-Range)
+        jika koneksi putus. progress_callback(received, total) dipanggil setiap chunk."""
+        url = f"{self.base_url}/dokumen/files/{file_id}/download"
+        part_path = f"{save_path}.part"
+        received = 0
+        total = None
+        validator = None
+        last_error = None
+
+        for attempt in range(3):
+            headers = {'Accept-Encoding': 'identity'}
+            if received and validator:
+                headers['Range'] = f"bytes={received}-"
+                headers['If-Range'] = validator
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    if response.status_code == 206:
+                        mode = 'ab'
+                    else:
+                        mode = 'wb'
+                        received = 0
+                        length = response.headers.get('Content-Length')
+                        total = int(length) if length else None
+                    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            received += len(chunk)
+                            if progress_callback:
+                                progress_callback(received, total)
+
+                if total is not None and received < total:
+                    raise requests.exceptions.ChunkedEncodingError(f"Koneksi terputus setelah {received}/{total} bytes")
+
+                os.replace(part_path, save_path)
+                return {"success": True, "data": save_path, "size": received}
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                last_error = e
+                continue
+            except (requests.exceptions.RequestException, OSError) as e:
+                last_error = e
+                break
+
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        return {"success": False, "data": f"Gagal download file: {last_error}"}
     
     def get_messages(self, limit=50, since=None):
         try:
@@ -777,9 +988,9 @@ class ApiClient:
             if since:
                 params['since'] = since
                 
-            response = requests.get(f"{self.base_url}/client/messages", 
-                                  params=params, 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/client/messages", 
+                                      params=params, 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -792,10 +1003,10 @@ class ApiClient:
                 'pesan': message,
                 'target': 'admin'
             }
-            response = requests.post(f"{self.base_url}/client/send-message", 
-                                   json=data, 
-                                   timeout=self.timeout,
-                                   headers={'Content-Type': 'application/json'})
+            response = self.session.post(f"{self.base_url}/client/send-message", 
+                                       json=data, 
+                                       timeout=self.timeout,
+                                       headers={'Content-Type': 'application/json'})
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -803,8 +1014,8 @@ class ApiClient:
     
     def get_broadcast_messages(self, limit=20):
         try:
-            response = requests.get(f"{self.base_url}/pesan/broadcast?limit={limit}", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/pesan/broadcast?limit={limit}", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -812,8 +1023,8 @@ class ApiClient:
     
     def get_recent_messages(self, limit=50, hours=24):
         try:
-            response = requests.get(f"{self.base_url}/pesan/recent?limit={limit}&hours={hours}", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/pesan/recent?limit={limit}&hours={hours}", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -821,8 +1032,8 @@ class ApiClient:
     
     def get_active_clients(self):
         try:
-            response = requests.get(f"{self.base_url}/client/active", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/client/active", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -832,8 +1043,8 @@ class ApiClient:
     def get_broadcast_jemaat(self):
         """Get jemaat data that has been broadcast by admin"""
         try:
-            response = requests.get(f"{self.base_url}/broadcast/jemaat", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/broadcast/jemaat", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -842,8 +1053,8 @@ class ApiClient:
     def get_broadcast_kegiatan(self):
         """Get kegiatan data that has been broadcast by admin"""
         try:
-            response = requests.get(f"{self.base_url}/broadcast/kegiatan", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/broadcast/kegiatan", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -852,8 +1063,8 @@ class ApiClient:
     def get_broadcast_keuangan(self):
         """Get keuangan data that has been broadcast by admin"""
         try:
-            response = requests.get(f"{self.base_url}/broadcast/keuangan", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/broadcast/keuangan", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -862,8 +1073,8 @@ class ApiClient:
     def get_broadcast_dokumen(self):
         """Get dokumen data that has been broadcast by admin"""
         try:
-            response = requests.get(f"{self.base_url}/broadcast/dokumen", 
-                                  timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/broadcast/dokumen", 
+                                      timeout=self.timeout)
             response.raise_for_status()
             return {"success": True, "data": response.json()}
         except requests.exceptions.RequestException as e:
@@ -879,7 +1090,7 @@ class ApiClient:
                 'new_password': new_password
             }
             
-            response = requests.post(url, json=data, timeout=self.timeout)
+            response = self.session.post(url, json=data, timeout=self.timeout)
             
             try:
                 result = response.json()
@@ -897,10 +1108,10 @@ class ApiClient:
         try:
             if self.session_id:
                 data = {"session_id": self.session_id}
-                response = requests.post(f"{self.base_url}/logout", 
-                                       json=data,
-                                       headers={'Content-Type': 'application/json'},
-                                       timeout=self.timeout)
+                response = self.session.post(f"{self.base_url}/logout", 
+                                           json=data,
+                                           headers={'Content-Type': 'application/json'},
+                                           timeout=self.timeout)
                 response.raise_for_status()
             
             # Clear session data
@@ -931,7 +1142,7 @@ class ApiClient:
             save_path = os.path.join(save_dir, filename)
             
             # Download
-            response = requests.get(url, timeout=self.timeout, stream=True)
+            response = self.session.get(url, timeout=self.timeout, stream=True)
             if response.status_code == 200:
                 with open(save_path, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=8192):
@@ -957,10 +1168,10 @@ class ApiClient:
                 files = {'file': (os.path.basename(file_path), f)}
                 data = {'user_id': user_id}
                 
-                response = requests.post(f"{self.base_url}/auth/upload-photo", 
-                                       files=files,
-                                       data=data,
-                                       timeout=60)
+                response = self.session.post(f"{self.base_url}/auth/upload-photo", 
+                                           files=files,
+                                           data=data,
+                                           timeout=60)
                 
                 if response.status_code == 200:
                     return {"success": True, "data": response.json()}
@@ -976,9 +1187,9 @@ class ApiClient:
             if 'source_table' not in data and self.user_data:
                 data['source_table'] = self.user_data.get('source_table')
                 
-            response = requests.put(f"{self.base_url}/pengguna/{user_id}", 
-                                  json=data,
-                                  timeout=self.timeout)
+            response = self.session.put(f"{self.base_url}/pengguna/{user_id}", 
+                                      json=data,
+                                      timeout=self.timeout)
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
@@ -1431,12 +1431,8 @@ class DashboardComponent(QWidget):
         """Load initial dashboard data"""
         self.update_user_info()
         self.update_connection_status()
-        self.load_recent_activity()
         self.update_system_info()
-        self.load_schedule_data()
-        self.load_announcements_data()
-        self.load_statistics_data()
-        self.load_financial_data()
+        self.load_batch_data()
     
     def update_user_info(self):
         """Update user information display"""
@@ -1528,8 +1524,8 @@ class DashboardComponent(QWidget):
         self.system_info_card[1].setText(system_info)
         self.system_info_card[1].setStyleSheet("color: #20c997; font-size: 14px; font-weight: bold; font-family: 'Segoe UI', Arial, sans-serif;")
     
-    def load_recent_activity(self):
-        """Load recent activity data"""
+    def load_recent_activity(self, api_activities=None):
+        """Load recent activity data (api_activities: log aktivitas dari /batch)"""
         # Clear existing activity
         for i in reversed(range(self.activity_list.count())):
             child = self.activity_list.itemAt(i).widget()
@@ -1578,20 +1574,14 @@ class DashboardComponent(QWidget):
                         }
                     ])
                 
-                # Try to get additional activities from API if available
-                try:
-                    result = self.api_client.get("/api/activities/recent")
-                    if result.get("success"):
-                        api_activities = result.get("data", [])
-                        for activity in api_activities[:2]:  # Add up to 2 API activities
-                            activities.append({
-                                "icon": activity.get("icon", "📋"),
-                                "title": activity.get("title", "Activity"),
-                                "time": activity.get("time", current_time.strftime("%H:%M")),
-                                "color": activity.get("color", "#6c757d")
-                            })
-                except:
-                    pass  # Continue with existing activities if API call fails
+                # Add up to 2 activities from the server log
+                for activity in (api_activities or [])[:2]:
+                    activities.append({
+                        "icon": "📋",
+                        "title": f"{activity.get('user_name', 'System')}: {activity.get('aktivitas', 'Activity')}",
+                        "time": str(activity.get("timestamp") or current_time.strftime("%H:%M")),
+                        "color": "#6c757d"
+                    })
                 
                 if activities:
                     for activity in activities:
@@ -1678,37 +1668,22 @@ class DashboardComponent(QWidget):
     
     def update_dashboard_info(self):
         """Update dashboard information periodically"""
-        self.update_connection_status()
+        if not self.is_connected:
+            self.update_connection_status()
         
-        # Periodically refresh data sections if connected
-        if self.is_connected:
-            # Refresh every 5 minutes to avoid overloading the server
-            current_time = datetime.datetime.now()
-            if not hasattr(self, '_last_data_refresh') or \
-               (current_time - self._last_data_refresh).total_seconds() > 300:
-                self.load_schedule_data()
-                self.load_announcements_data()
-                self.load_statistics_data() 
-                self.load_financial_data()
-                self._last_data_refresh = current_time
-        
-        # Update data count if connected
+        # Refresh all data sections in one round-trip; a successful batch
+        # also confirms the connection
         if self.is_connected:
-            try:
-                # Refresh all data sections
-                self.load_schedule_data()
-                self.load_announcements_data() 
-                self.load_statistics_data()
-                self.load_financial_data()
-                
+            if self.load_batch_data():
                 # Update last sync time
                 current_time = datetime.datetime.now()
                 sync_time = current_time.strftime("%H:%M")
                 self.last_sync_card[1].setText(f"Synced {sync_time}")
                 self.last_sync_card[1].setStyleSheet("color: #6f42c1; font-size: 12px; font-weight: bold; font-family: 'Segoe UI', Arial, sans-serif;")
-            except:
+            else:
                 self.last_sync_card[1].setText("Sync Error")
                 self.last_sync_card[1].setStyleSheet("color: #dc3545; font-size: 12px; font-weight: bold; font-family: 'Segoe UI', Arial, sans-serif;")
+                self.update_connection_status()
     
     def update_time_display(self):
         """Update time-based displays"""
@@ -1739,22 +1714,54 @@ class DashboardComponent(QWidget):
         """Refresh all dashboard data"""
         self.load_dashboard_data()
     
-    def load_schedule_data(self):
-        """Load upcoming schedule data from API"""
+    def dashboard_requests(self):
+        """Sub-request /batch untuk satu refresh dashboard"""
+        user_id = (self.user_data or {}).get('id_pengguna')
+        return [
+            {'id': 'schedule', 'path': '/kegiatan/mendatang', 'params': {'limit': 5}},
+            {'id': 'announcements', 'path': '/pengumuman/aktif', 'params': {'limit': 3}},
+            {'id': 'statistics', 'path': '/jemaat/statistics'},
+            {'id': 'finance', 'path': '/keuangan/saldo', 'params': {'user_id': user_id} if user_id else {}},
+            {'id': 'activities', 'path': '/log/activities/recent', 'params': {'limit': 2}},
+        ]
+    
+    def load_batch_data(self):
+        """Load schedule, announcements, statistics, finance and activity data
+        from the API in one round-trip (POST /batch). Return True on success."""
+        results = {}
+        success = False
         try:
             if self.api_client and self.is_connected:
-                # Make API call to get upcoming schedule
-                result = self.api_client.get("/api/jadwal/upcoming")
-                if result.get("success"):
-                    schedule_data = result.get("data", [])
-                    self.update_schedule_table(schedule_data)
+                result = self.api_client.batch(self.dashboard_requests())
+                success = result.get("success", False)
+                if success:
+                    results = result.get("data", {})
                 else:
-                    self.update_schedule_table([])
-            else:
-                self.update_schedule_table([])
+                    print(f"Error loading dashboard data: {result.get('data')}")
         except Exception as e:
-            print(f"Error loading schedule data: {str(e)}")
-            self.update_schedule_table([])
+            print(f"Error loading dashboard data: {str(e)}")
+        
+        def section(key, default):
+            sub = results.get(key) or {}
+            body = sub.get('body') if 200 <= (sub.get('status') or 0) < 300 else None
+            data = body.get('data') if isinstance(body, dict) else None
+            return data if isinstance(data, type(default)) else default
+        
+        schedule_data = [dict(row, tanggal=row.get('tanggal') or row.get('tanggal_mulai') or '-')
+                         for row in section('schedule', [])]
+        self.update_schedule_table(schedule_data)
+        self.update_announcements_list(section('announcements', []))
+        
+        stats = section('statistics', {})
+        self.update_statistics_display({
+            'total_jemaat': stats.get('total_jemaat', 0),
+            'total_keluarga': stats.get('total_keluarga', 0),
+            'laki_laki': stats.get('laki_laki', stats.get('total_laki', 0)),
+            'perempuan': stats.get('perempuan', stats.get('total_perempuan', 0)),
+        })
+        self.update_financial_display(section('finance', {}))
+        self.load_recent_activity(section('activities', []))
+        return success
     
     def update_schedule_table(self, schedule_data):
         """Update schedule table with data"""
@@ -1782,23 +1789,6 @@ class DashboardComponent(QWidget):
                 self.schedule_table.setItem(row, 1, QTableWidgetItem(schedule.get('nama_kegiatan', '-')))
                 self.schedule_table.setItem(row, 2, QTableWidgetItem(schedule.get('waktu_mulai', '-')))
     
-    def load_announcements_data(self):
-        """Load latest announcements data from API"""
-        try:
-            if self.api_client and self.is_connected:
-                # Make API call to get latest announcements
-                result = self.api_client.get("/api/pengumuman/latest")
-                if result.get("success"):
-                    announcements_data = result.get("data", [])
-                    self.update_announcements_list(announcements_data)
-                else:
-                    self.update_announcements_list([])
-            else:
-                self.update_announcements_list([])
-        except Exception as e:
-            print(f"Error loading announcements data: {str(e)}")
-            self.update_announcements_list([])
-    
     def update_announcements_list(self, announcements_data):
         """Update announcements list with data"""
         # Clear existing announcements
@@ -1893,23 +1883,6 @@ class DashboardComponent(QWidget):
         
         self.announcements_layout.addWidget(item_frame)
     
-    def load_statistics_data(self):
-        """Load congregation statistics data from API"""
-        try:
-            if self.api_client and self.is_connected:
-                # Make API call to get statistics
-                result = self.api_client.get("/api/jemaat/statistics")
-                if result.get("success"):
-                    stats_data = result.get("data", {})
-                    self.update_statistics_display(stats_data)
-                else:
-                    self.update_statistics_display({})
-            else:
-                self.update_statistics_display({})
-        except Exception as e:
-            print(f"Error loading statistics data: {str(e)}")
-            self.update_statistics_display({})
-    
     def update_statistics_display(self, stats_data):
         """Update statistics display with data"""
         # Update each statistic item
@@ -1918,23 +1891,6 @@ class DashboardComponent(QWidget):
         self.stat_items["laki_laki"].value_label.setText(str(stats_data.get("laki_laki", 0)))
         self.stat_items["perempuan"].value_label.setText(str(stats_data.get("perempuan", 0)))
     
-    def load_financial_data(self):
-        """Load financial data from API"""
-        try:
-            if self.api_client and self.is_connected:
-                # Make API call to get financial summary
-                result = self.api_client.get("/api/keuangan/summary")
-                if result.get("success"):
-                    finance_data = result.get("data", {})
-                    self.update_financial_display(finance_data)
-                else:
-                    self.update_financial_display({})
-            else:
-                self.update_financial_display({})
-        except Exception as e:
-            print(f"Error loading financial data: {str(e)}")
-            self.update_financial_display({})
-    
     def update_financial_display(self, finance_data):
         """Update financial display with data"""
         def format_currency(amount):
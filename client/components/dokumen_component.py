@@ -271,21 +271,16 @@ class DokumenComponent(QWidget):
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
 
-        try:
-            self.progress_bar.setValue(25)
+        def update_progress(received, total):
+            if total:
+                self.progress_bar.setValue(int(received * 100 / total))
             QApplication.processEvents()
 
-            result = self.api_client.download_file(file_id)
-
-            self.progress_bar.setValue(75)
-            QApplication.processEvents()
+        try:
+            # Streaming langsung ke file tujuan, tidak ditampung di memori
+            result = self.api_client.download_file_to(file_id, save_path, update_progress)
 
             if result["success"]:
-                file_content = result["data"]
-
-                with open(save_path, 'wb') as f:
-                    f.write(file_content)
-
                 self.progress_bar.setValue(100)
                 QApplication.processEvents()
 
@@ -1,7 +1,7 @@
 # Path: client/components/jemaat_component.py
 
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-                             QTableWidgetItem, QLabel, QPushButton, QFrame,
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                             QLabel, QPushButton, QFrame,
                              QMessageBox, QHeaderView, QLineEdit, QComboBox,
                              QDialog, QFormLayout, QDateEdit, QTextEdit, QSpinBox,
                              QScrollArea, QGroupBox, QFileDialog, QAbstractItemView)
@@ -12,6 +12,8 @@ import json
 import os
 from datetime import datetime, date
 
+from .jemaat_model import JemaatTableModel, JemaatFilterProxyModel
+
 class WordWrapHeaderView(QHeaderView):
     """Custom header view with word wrap and center alignment support"""
     def __init__(self, orientation, parent=None):
@@ -1149,20 +1151,20 @@ class JemaatClientComponent(QWidget):
         if not self.table_widget.geometry().contains(event.pos()):
             self.table_widget.clearSelection()
             # Reset to NoSelection mode to prevent accidental selection
-            self.table_widget.setSelectionMode(QTableWidget.NoSelection)
+            self.table_widget.setSelectionMode(QAbstractItemView.NoSelection)
         super().mousePressEvent(event)
 
     def on_table_double_clicked(self, index):
         """Handle double click on table to select row"""
         if index.isValid():
             # Temporarily enable selection to select the row
-            self.table_widget.setSelectionMode(QTableWidget.SingleSelection)
+            self.table_widget.setSelectionMode(QAbstractItemView.SingleSelection)
             self.table_widget.selectRow(index.row())
 
     def on_vertical_header_clicked(self, row):
         """Handle click on vertical header (row number) to select row"""
         # Temporarily enable selection to select the row
-        self.table_widget.setSelectionMode(QTableWidget.SingleSelection)
+        self.table_widget.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table_widget.selectRow(row)
 
     def setup_ui(self):
@@ -1203,7 +1205,12 @@ class JemaatClientComponent(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Cari nama jemaat...")
         self.search_input.setFixedWidth(250)
-        self.search_input.textChanged.connect(self.filter_data)  # type: ignore
+        # Debounce: filter dijalankan setelah user berhenti mengetik
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.filter_data)  # type: ignore
+        self.search_input.textChanged.connect(self.search_timer.start)  # type: ignore
 
         # Filter Wilayah Rohani
         wilayah_label = QLabel("Filter Wilayah:")
@@ -1266,10 +1273,17 @@ class JemaatClientComponent(QWidget):
 
         layout.addLayout(toolbar_layout)
 
-        # Table dengan 38 kolom (tanpa No column) - sesuai server dengan No. KK, NIK, No. Telepon, dan Created By
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(38)
-        self.table_widget.setRowCount(0)
+        # Model/view yang sama dengan admin (jemaat_model.py): sel diformat lazy,
+        # filter dan sort lewat proxy
+        self.jemaat_model = JemaatTableModel(
+            self,
+            search_fields=('nama_lengkap', 'nama_keluarga', 'alamat', 'wilayah_rohani'),
+            parent=self
+        )
+        self.jemaat_proxy = JemaatFilterProxyModel(parent=self)
+        self.jemaat_proxy.setSourceModel(self.jemaat_model)
+
+        self.table_widget = QTableView()
 
         # Gunakan header kustom agar tampilan sama dengan struktur.py
         custom_header = WordWrapHeaderView(Qt.Horizontal, self.table_widget)
@@ -1303,15 +1317,16 @@ class JemaatClientComponent(QWidget):
 
         # Table behavior settings
         self.table_widget.setAlternatingRowColors(False)
-        self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table_widget.setSelectionMode(QTableWidget.NoSelection)  # Disable default selection
-        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)  # Read-only
+        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_widget.setSelectionMode(QAbstractItemView.NoSelection)  # Disable default selection
+        self.table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Read-only
 
         # Connect double click and vertical header click for selection
         self.table_widget.doubleClicked.connect(self.on_table_double_clicked)  # type: ignore
         self.table_widget.verticalHeader().sectionClicked.connect(self.on_vertical_header_clicked)  # type: ignore
 
-        # Enable sorting
+        # Enable sorting (lewat proxy; tanpa indikator awal supaya urutan API dipertahankan)
+        self.table_widget.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table_widget.setSortingEnabled(True)
 
         # Add button above table on the right side
@@ -1424,26 +1439,8 @@ class JemaatClientComponent(QWidget):
         return button
 
     def setup_table_headers(self):
-        """Setup header kolom tanpa No column - sesuai server (38 kolom data) dengan No. KK, NIK, No. Telepon, dan Created By"""
-        headers = [
-            # DATA PRIBADI (0-18) - added No. KK, NIK, and No. Telepon
-            "Wilayah Rohani", "Nama Keluarga", "No. KK", "Nama Lengkap", "NIK", "Tempat Lahir",
-            "Tanggal Lahir", "Umur", "Status Kekatolikan", "Kategori", "J. Kelamin",
-            "Hubungan Keluarga", "Pend. Terakhir", "Status Menikah", "Status Pekerjaan",
-            "Detail Pekerjaan", "Alamat", "Email", "No. Telepon",
-            # SAKRAMEN BABTIS (19-22)
-            "Status Babtis", "Tempat Babtis", "Tanggal Babtis", "Nama Babtis",
-            # SAKRAMEN EKARISTI (23-25)
-            "Status Ekaristi", "Tempat Komuni", "Tanggal Komuni",
-            # SAKRAMEN KRISMA (26-28)
-            "Status Krisma", "Tempat Krisma", "Tanggal Krisma",
-            # SAKRAMEN PERKAWINAN (29-34)
-            "Status Perkawinan", "Keuskupan", "Paroki", "Kota", "Tanggal Perkawinan", "Status Perkawinan Detail",
-            # STATUS (35-37) - TOTAL 38 COLUMNS
-            "Status Keanggotaan", "WR Tujuan", "Paroki Tujuan", "Created By Pengguna"
-        ]
-
-        self.table_widget.setHorizontalHeaderLabels(headers)
+        """Pasang model ke tabel; judul kolom sesuai server ada di jemaat_model.JEMAAT_COLUMNS"""
+        self.table_widget.setModel(self.jemaat_proxy)
 
     def setup_column_widths(self):
         """Set up column widths for better display (38 columns total with No. KK, NIK, No. Telepon, and Created By)"""
@@ -1509,7 +1506,7 @@ class JemaatClientComponent(QWidget):
         header.setMaximumSectionSize(500)
 
         self.table_widget.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #d4d4d4;
                 background-color: white;
                 border: 1px solid #d4d4d4;
@@ -1518,16 +1515,16 @@ class JemaatClientComponent(QWidget):
                 font-size: 9pt;
                 outline: none;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border: none;
                 padding: 4px 6px;
                 min-height: 18px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #cce7ff;
                 color: black;
             }
-            QTableWidget::item:focus {
+            QTableView::item:focus {
                 border: 2px solid #0078d4;
                 background-color: white;
             }
@@ -1594,13 +1591,10 @@ class JemaatClientComponent(QWidget):
                 error_msg = result.get('data', 'Unknown error')
                 self.log_message.emit(f"Failed to load data: {error_msg}")  # type: ignore
 
-            self.filtered_data = self.jemaat_data.copy()
             self.update_table()
-            self.update_statistics()
 
         except Exception as e:
             self.jemaat_data = []
-            self.filtered_data = []
             self.update_table()
             self.log_message.emit(f"Error loading jemaat data from API: {str(e)}")  # type: ignore
 
@@ -1698,18 +1692,13 @@ class JemaatClientComponent(QWidget):
     def edit_jemaat(self):
         """Edit selected jemaat"""
         try:
-            current_row = self.table_widget.currentRow()
+            current_row = self.table_widget.currentIndex().row()
             if current_row < 0:
                 QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan diedit")
                 return
 
-            # Get data dari item yang disimpan, bukan dari filtered_data index
-            item = self.table_widget.item(current_row, 0)
-            if not item:
-                QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan diedit")
-                return
-
-            selected_data = item.data(Qt.UserRole)
+            # Ambil data lewat proxy (urutan tampilan bisa berbeda dari data sumber)
+            selected_data = self.jemaat_proxy.row_data(current_row)
             if not selected_data:
                 QMessageBox.warning(self, "Warning", "Data tidak ditemukan")
                 return
@@ -1811,18 +1800,13 @@ class JemaatClientComponent(QWidget):
     def delete_jemaat(self):
         """Delete selected jemaat"""
         try:
-            current_row = self.table_widget.currentRow()
+            current_row = self.table_widget.currentIndex().row()
             if current_row < 0:
                 QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan dihapus")
                 return
 
-            # Get data dari item yang disimpan, bukan dari filtered_data index
-            item = self.table_widget.item(current_row, 0)
-            if not item:
-                QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan dihapus")
-                return
-
-            selected_data = item.data(Qt.UserRole)
+            # Ambil data lewat proxy (urutan tampilan bisa berbeda dari data sumber)
+            selected_data = self.jemaat_proxy.row_data(current_row)
             if not selected_data:
                 QMessageBox.warning(self, "Warning", "Data tidak ditemukan")
                 return
@@ -1858,22 +1842,18 @@ class JemaatClientComponent(QWidget):
     def view_jemaat(self):
         """View selected jemaat details"""
         try:
-            current_row = self.table_widget.currentRow()
+            current_row = self.table_widget.currentIndex().row()
             if current_row < 0:
                 QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan dilihat")
                 return
 
-            # Get data dari item yang disimpan, bukan dari filtered_data index
-            item = self.table_widget.item(current_row, 0)
-            if item:
-                selected_data = item.data(Qt.UserRole)
-                if selected_data:
-                    dialog = JemaatViewDialog(self, selected_data)
-                    dialog.exec_()
-                else:
-                    QMessageBox.warning(self, "Warning", "Data tidak ditemukan")
+            # Ambil data lewat proxy (urutan tampilan bisa berbeda dari data sumber)
+            selected_data = self.jemaat_proxy.row_data(current_row)
+            if selected_data:
+                dialog = JemaatViewDialog(self, selected_data)
+                dialog.exec_()
             else:
-                QMessageBox.warning(self, "Warning", "Pilih data jemaat yang akan dilihat")
+                QMessageBox.warning(self, "Warning", "Data tidak ditemukan")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error saat menampilkan detail jemaat: {str(e)}")
             self.log_message.emit(f"Exception viewing jemaat details: {str(e)}")  # type: ignore
@@ -1902,124 +1882,26 @@ class JemaatClientComponent(QWidget):
                 self.log_message.emit(f"Error export data: {str(e)}")  # type: ignore
 
     def update_table(self):
-        """Update table with filtered data"""
-        # Disable sorting while updating
-        self.table_widget.setSortingEnabled(False)
-
-        # Set row count untuk data saja (tanpa header rows)
-        self.table_widget.setRowCount(len(self.filtered_data))
-
-        # Populate data starting from row 0 (tanpa No column)
-        for index, jemaat in enumerate(self.filtered_data):
-            row_pos = index  # Start from row 0
-
-            # All data columns (0-37) matching server structure - tanpa No column (TOTAL 38 COLUMNS with No. KK and NIK)
-            data_items = [
-                # DATA PRIBADI (columns 0-18) - added No. KK, NIK, and No. Telepon
-                self.format_display(jemaat.get('wilayah_rohani')),  # Column 0: Wilayah Rohani
-                self.format_display(jemaat.get('nama_keluarga')),  # Column 1: Nama Keluarga
-                self.format_numeric(jemaat.get('no_kk')),  # Column 2: No. KK (numeric only)
-                self.format_display(jemaat.get('nama_lengkap')),  # Column 3: Nama Lengkap
-                self.format_numeric(jemaat.get('nik')),  # Column 4: NIK (numeric only)
-                self.format_display(jemaat.get('tempat_lahir')),
-                self.format_date(jemaat.get('tanggal_lahir')),
-                self.format_display(jemaat.get('umur')),
-                self.format_display(jemaat.get('status_kekatolikan')),
-                self.format_display(jemaat.get('kategori')),
-                self.format_gender(jemaat.get('jenis_kelamin')),
-                self.format_display(jemaat.get('hubungan_keluarga')),
-                self.format_display(jemaat.get('pendidikan_terakhir')),
-                self.format_display(jemaat.get('status_menikah')),  # Status Menikah
-                self.format_display(jemaat.get('jenis_pekerjaan')),
-                self.format_display(jemaat.get('detail_pekerjaan')),
-                self.format_display(jemaat.get('alamat')),
-                self.format_display(jemaat.get('email')),
-                self.format_display(jemaat.get('no_telepon')),
-                # SAKRAMEN BABTIS (columns 19-22)
-                self.format_display(jemaat.get('status_babtis')),
-                self.format_display(jemaat.get('tempat_babtis')),
-                self.format_date(jemaat.get('tanggal_babtis')),
-                self.format_display(jemaat.get('nama_babtis')),
-                # SAKRAMEN EKARISTI (columns 23-25)
-                self.format_display(jemaat.get('status_ekaristi')),
-                self.format_display(jemaat.get('tempat_komuni')),
-                self.format_date(jemaat.get('tanggal_komuni')),
-                # SAKRAMEN KRISMA (columns 26-28)
-                self.format_display(jemaat.get('status_krisma')),
-                self.format_display(jemaat.get('tempat_krisma')),
-                self.format_date(jemaat.get('tanggal_krisma')),
-                # SAKRAMEN PERKAWINAN (columns 29-34)
-                self.format_display(jemaat.get('status_perkawinan')),
-                self.format_display(jemaat.get('keuskupan')),
-                self.format_display(jemaat.get('paroki')),
-                self.format_display(jemaat.get('kota_perkawinan')),
-                self.format_date(jemaat.get('tanggal_perkawinan')),
-                self.format_display(jemaat.get('status_perkawinan_detail')),
-                # STATUS (columns 35-37) - TOTAL 38 COLUMNS
-                self.format_display(jemaat.get('status_keanggotaan', 'Aktif')),
-                self.format_display(jemaat.get('wr_tujuan')),
-                self.format_display(jemaat.get('paroki_tujuan')),
-                self.get_creator_display(jemaat)  # Column 37: Created By Pengguna
-            ]
-
-            # Add data to columns 0-37 (total 38 data columns)
-            for col, item_text in enumerate(data_items):
-                item = QTableWidgetItem(item_text)
-                # Center align certain columns for better readability
-                if col in [7, 8, 9, 10, 18, 19, 22, 23, 25, 26, 28, 34]:  # Status and categorical columns
-                    item.setTextAlignment(Qt.AlignCenter)
-                else:
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-                # Simpan full jemaat data di UserRole pada kolom pertama saja
-                if col == 0:
-                    item.setData(Qt.UserRole, jemaat)
-
-                self.table_widget.setItem(row_pos, col, item)
-
-        # Re-enable sorting after updating
-        self.table_widget.setSortingEnabled(True)
+        """Serahkan data ke model lalu terapkan filter yang aktif"""
+        # Incremental: hanya baris yang berubah sejak load sebelumnya yang diindeks ulang
+        self.jemaat_model.sync_rows(self.jemaat_data)
+        self.filter_data()
 
     def filter_data(self):
         """Filter data based on search, dropdown filters, and status filter"""
-        search_text = self.search_input.text().lower()
         filter_wilayah = self.filter_wilayah.currentText() if hasattr(self, 'filter_wilayah') else "Semua"
         filter_kategori = self.filter_kategori.currentText() if hasattr(self, 'filter_kategori') else "Semua"
-        status_filter = self.status_filter.currentText()
-
-        self.filtered_data = []
 
-        for jemaat in self.jemaat_data:
-            # Apply Wilayah Rohani filter
-            if filter_wilayah != "Semua":
-                wilayah_value = (jemaat.get('wilayah_rohani') or '').strip()
-                if wilayah_value != filter_wilayah:
-                    continue
-
-            # Apply Kategori filter
-            if filter_kategori != "Semua":
-                kategori_value = (jemaat.get('kategori') or '').strip()
-                if kategori_value != filter_kategori:
-                    continue
-
-            # Search filter
-            nama = jemaat.get('nama_lengkap', '').lower()
-            nama_keluarga = jemaat.get('nama_keluarga', '').lower()
-            alamat = jemaat.get('alamat', '').lower()
-            wilayah_rohani = jemaat.get('wilayah_rohani', '').lower()
+        self.search_timer.stop()
 
-            if search_text and search_text not in nama and search_text not in nama_keluarga and search_text not in alamat and search_text not in wilayah_rohani:
-                continue
-
-            # Status filter (using status_keanggotaan field)
-            status = jemaat.get('status_keanggotaan', '') or ''
-            if status_filter != "Semua":
-                if status.lower() != status_filter.lower():
-                    continue
-
-            self.filtered_data.append(jemaat)
+        # Proxy hanya menyembunyikan baris (lewat search index); tabel tidak dibangun ulang
+        self.jemaat_proxy.set_filters(
+            search=self.search_input.text(),
+            equals={'wilayah_rohani': filter_wilayah, 'kategori': filter_kategori},
+            equals_ci={'status_keanggotaan': self.status_filter.currentText()}
+        )
 
-        self.update_table()
+        self.filtered_data = self.jemaat_proxy.visible_rows()
         self.update_statistics()
 
     def update_statistics(self):
@@ -0,0 +1,333 @@
+# Path: client/components/jemaat_model.py
+# Model/view untuk grid Database Umat (39 kolom).
+#
+# JemaatTableModel hanya menyimpan list dict jemaat; teks sel diformat saat
+# view memintanya di data() dan disimpan per baris, sehingga hanya baris yang
+# terlihat yang pernah diformat. Model juga memelihara JemaatSearchIndex
+# (jemaat_search.py): dibangun saat load penuh, diperbarui incremental oleh
+# sync_rows(). Filter wilayah/kategori (facet), status dan pencarian dijalankan
+# JemaatFilterProxyModel tanpa membangun ulang grid, dan sorting lewat SortRole
+# (tanggal diurutkan sebagai tanggal, umur sebagai angka).
+#
+# Formatter adalah komponen pemilik tabel: cukup menyediakan format_display,
+# format_numeric, format_date, format_gender dan get_creator_display
+# (JemaatComponent di admin dan JemaatClientComponent di client).
+# Salinan server/components/jemaat_model.py (client dibangun terpisah); jaga agar tetap sama.
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+
+from .jemaat_search import JemaatSearchIndex
+
+# (judul kolom, field jemaat, jenis format)
+JEMAAT_COLUMNS = [
+    # DATA PRIBADI (0-18)
+    ("Wilayah Rohani", 'wilayah_rohani', 'text'),
+    ("Nama Keluarga", 'nama_keluarga', 'text'),
+    ("No. KK", 'no_kk', 'numeric'),
+    ("Nama Lengkap", 'nama_lengkap', 'text'),
+    ("NIK", 'nik', 'numeric'),
+    ("Tempat Lahir", 'tempat_lahir', 'text'),
+    ("Tanggal Lahir", 'tanggal_lahir', 'date'),
+    ("Umur", 'umur', 'number'),
+    ("Status Kekatolikan", 'status_kekatolikan', 'text'),
+    ("Kategori", 'kategori', 'text'),
+    ("J. Kelamin", 'jenis_kelamin', 'gender'),
+    ("Hubungan Keluarga", 'hubungan_keluarga', 'text'),
+    ("Pend. Terakhir", 'pendidikan_terakhir', 'text'),
+    ("Status Menikah", 'status_menikah', 'text'),
+    ("Status Pekerjaan", 'jenis_pekerjaan', 'text'),
+    ("Detail Pekerjaan", 'detail_pekerjaan', 'text'),
+    ("Alamat", 'alamat', 'text'),
+    ("Email", 'email', 'text'),
+    ("No. Telepon", 'no_telepon', 'text'),
+    # SAKRAMEN BABTIS (19-22)
+    ("Status Babtis", 'status_babtis', 'text'),
+    ("Tempat Babtis", 'tempat_babtis', 'text'),
+    ("Tanggal Babtis", 'tanggal_babtis', 'date'),
+    ("Nama Babtis", 'nama_babtis', 'text'),
+    # SAKRAMEN EKARISTI (23-25)
+    ("Status Ekaristi", 'status_ekaristi', 'text'),
+    ("Tempat Komuni", 'tempat_komuni', 'text'),
+    ("Tanggal Komuni", 'tanggal_komuni', 'date'),
+    # SAKRAMEN KRISMA (26-28)
+    ("Status Krisma", 'status_krisma', 'text'),
+    ("Tempat Krisma", 'tempat_krisma', 'text'),
+    ("Tanggal Krisma", 'tanggal_krisma', 'date'),
+    # SAKRAMEN PERKAWINAN (29-34)
+    ("Status Perkawinan", 'status_perkawinan', 'text'),
+    ("Keuskupan", 'keuskupan', 'text'),
+    ("Paroki", 'paroki', 'text'),
+    ("Kota", 'kota_perkawinan', 'text'),
+    ("Tanggal Perkawinan", 'tanggal_perkawinan', 'date'),
+    ("Status Perkawinan Detail", 'status_perkawinan_detail', 'text'),
+    # STATUS (35-38)
+    ("Status Keanggotaan", 'status_keanggotaan', 'text'),
+    ("WR Tujuan", 'wr_tujuan', 'text'),
+    ("Paroki Tujuan", 'paroki_tujuan', 'text'),
+    ("Created By Pengguna", None, 'creator'),
+]
+
+# Default jika field tidak ada sama sekali di data API
+FIELD_DEFAULTS = {'status_keanggotaan': 'Aktif'}
+
+# Kolom status/kategorikal yang ditampilkan rata tengah
+CENTER_COLUMNS = {7, 8, 9, 10, 18, 19, 22, 23, 25, 26, 28, 34}
+
+# Field yang dicari oleh kotak "Cari" di admin
+DEFAULT_SEARCH_FIELDS = (
+    'nama_lengkap', 'wilayah_rohani', 'nama_keluarga', 'tempat_lahir', 'kategori',
+    'jenis_kelamin', 'hubungan_keluarga', 'alamat', 'email', 'status_keanggotaan',
+)
+
+RowDataRole = Qt.UserRole
+SortRole = Qt.UserRole + 1
+
+# Lebih dari ini baris berubah dalam satu sync_rows -> reset model saja
+SYNC_MAX_CHANGES = 200
+
+
+class JemaatTableModel(QAbstractTableModel):
+    """Model read-only di atas list dict jemaat dengan format sel lazy"""
+
+    def __init__(self, formatter, search_fields=DEFAULT_SEARCH_FIELDS, parent=None):
+        super().__init__(parent)
+        self.formatter = formatter
+        self.search_index = JemaatSearchIndex(search_fields)
+        self._rows = []
+        self._docs = []  # baris -> id dokumen di search_index
+        self._display = {}  # id dokumen -> list teks sel yang sudah diformat
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows or [])
+        self._docs = self.search_index.build(self._rows)
+        self._display = {}
+        self.endResetModel()
+        # Trigram dibangun setelah tabel sempat tampil
+        QTimer.singleShot(0, self.search_index.warm_up)
+
+    def sync_rows(self, rows, key_field='id_jemaat'):
+        """Terapkan hasil load ulang secara incremental berdasarkan key_field.
+
+        Baris yang hilang dihapus, yang berubah diperbarui dan yang baru ditambahkan
+        di akhir; indeks pencarian ikut diperbarui per baris. Jika perubahan terlalu
+        banyak atau ada record tanpa key, model di-reset lewat set_rows().
+        """
+        rows = list(rows or [])
+        new_by_key = {}
+        for record in rows:
+            key = record.get(key_field)
+            if key is None or key in new_by_key:
+                return self.set_rows(rows)
+            new_by_key[key] = record
+
+        old_keys = [record.get(key_field) for record in self._rows]
+        old_key_set = set(old_keys)
+        removed = [row for row, key in enumerate(old_keys) if key not in new_by_key]
+        added = [record for record in rows if record.get(key_field) not in old_key_set]
+        changed = []
+        for row, key in enumerate(old_keys):
+            new = new_by_key.get(key)
+            old = self._rows[row]
+            if new is not None and new is not old and new != old:
+                changed.append((row, new))
+
+        if (not self._rows or None in old_key_set
+                or len(removed) + len(added) + len(changed) > SYNC_MAX_CHANGES):
+            return self.set_rows(rows)
+
+        # Perbarui indeks dulu baru kirim dataChanged, supaya proxy cukup sekali
+        # menjalankan ulang pencarian
+        for row, record in changed:
+            doc = self._docs[row]
+            self._rows[row] = record
+            self.search_index.update(doc, record)
+            self._display.pop(doc, None)
+        last_column = len(JEMAAT_COLUMNS) - 1
+        for row, _ in changed:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+        for row in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            doc = self._docs.pop(row)
+            del self._rows[row]
+            self.search_index.remove(doc)
+            self._display.pop(doc, None)
+            self.endRemoveRows()
+
+        if added:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for record in added:
+                self._rows.append(record)
+                self._docs.append(self.search_index.add(record))
+            self.endInsertRows()
+
+    def rows(self):
+        return self._rows
+
+    def row_data(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def doc_for_row(self, row):
+        return self._docs[row]
+
+    def refresh_display(self):
+        """Buang cache teks (mis. setelah lookup nama pembuat berubah)"""
+        self._display = {}
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self._rows) - 1, len(JEMAAT_COLUMNS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(JEMAAT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if 0 <= section < len(JEMAAT_COLUMNS):
+                return JEMAAT_COLUMNS[section][0]
+            return None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole or role == Qt.ToolTipRole:
+            return self.display_text(row, column)
+        if role == Qt.TextAlignmentRole:
+            if column in CENTER_COLUMNS:
+                return Qt.AlignCenter
+            return Qt.AlignLeft | Qt.AlignVCenter
+        if role == RowDataRole:
+            return self._rows[row]
+        if role == SortRole:
+            return self.sort_key(row, column)
+        return None
+
+    def display_text(self, row, column):
+        doc = self._docs[row]
+        cached = self._display.get(doc)
+        if cached is None:
+            cached = [None] * len(JEMAAT_COLUMNS)
+            self._display[doc] = cached
+        if cached[column] is None:
+            cached[column] = self._format(self._rows[row], column)
+        return cached[column]
+
+    def _format(self, row_data, column):
+        _, key, kind = JEMAAT_COLUMNS[column]
+        fmt = self.formatter
+        if kind == 'creator':
+            return fmt.get_creator_display(row_data)
+
+        value = row_data.get(key, FIELD_DEFAULTS.get(key))
+        if kind == 'numeric':
+            return fmt.format_numeric(value)
+        if kind == 'date':
+            return fmt.format_date(value)
+        if kind == 'gender':
+            return fmt.format_gender(value)
+        return fmt.format_display(value)
+
+    def sort_key(self, row, column):
+        text = self.display_text(row, column)
+        if text == '-':
+            return ''
+        kind = JEMAAT_COLUMNS[column][2]
+        if kind == 'date':
+            parts = text.split('/')
+            if len(parts) == 3:
+                return f"{parts[2]}{parts[1]}{parts[0]}"
+        elif kind == 'number':
+            try:
+                return f"{int(float(text)):05d}"
+            except ValueError:
+                pass
+        return text.lower()
+
+
+class JemaatFilterProxyModel(QSortFilterProxyModel):
+    """Filter facet/status + pencarian teks (lewat search_index) dan sorting untuk JemaatTableModel"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._search = ''
+        self._facets = {}  # field facet di search_index -> nilai
+        self._equals = {}  # field lain -> nilai yang harus sama persis
+        self._equals_ci = {}  # field -> nilai (tanpa beda huruf besar/kecil)
+        self._accepted = None  # set id dokumen hasil search_index, None = semua
+        self._accepted_version = None
+        self.setSortRole(SortRole)
+
+    def set_filters(self, search='', equals=None, equals_ci=None):
+        """Set semua filter sekaligus. Nilai None/'Semua' berarti tanpa filter."""
+        facet_fields = self.sourceModel().search_index.facet_fields
+        equals = {field: value for field, value in (equals or {}).items()
+                  if value and value != "Semua"}
+
+        self._search = (search or '').strip()
+        self._facets = {field: value for field, value in equals.items() if field in facet_fields}
+        self._equals = {field: value for field, value in equals.items() if field not in facet_fields}
+        self._equals_ci = {field: value.lower() for field, value in (equals_ci or {}).items()
+                           if value and value != "Semua"}
+        self._accepted_version = None
+        self.invalidateFilter()
+
+    def _accepted_docs(self):
+        # Dihitung ulang sekali setiap kali filter atau isi indeks berubah
+        index = self.sourceModel().search_index
+        if self._accepted_version != index.version:
+            if self._search or self._facets:
+                self._accepted = index.search(self._search, self._facets)
+            else:
+                self._accepted = None
+            self._accepted_version = index.version
+        return self._accepted
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        row_data = model.row_data(source_row)
+        if row_data is None:
+            return False
+
+        accepted = self._accepted_docs()
+        if accepted is not None and model.doc_for_row(source_row) not in accepted:
+            return False
+
+        for field, value in self._equals.items():
+            if (row_data.get(field) or '').strip() != value:
+                return False
+        for field, value in self._equals_ci.items():
+            if (row_data.get(field) or '').lower() != value:
+                return False
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        # Nomor baris mengikuti urutan tampilan, bukan urutan data sumber
+        if orientation == Qt.Vertical and role == Qt.DisplayRole:
+            return str(section + 1)
+        return super().headerData(section, orientation, role)
+
+    def row_data(self, row):
+        source_index = self.mapToSource(self.index(row, 0))
+        return self.sourceModel().row_data(source_index.row())
+
+    def visible_rows(self):
+        """List dict jemaat sesuai filter dan urutan tampilan"""
+        model = self.sourceModel()
+        return [model.row_data(self.mapToSource(self.index(row, 0)).row())
+                for row in range(self.rowCount())]
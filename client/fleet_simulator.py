@@ -0,0 +1,811 @@
+# Path: client/fleet_simulator.py
+# Simulasi banyak desktop client (MainClientApp) tanpa GUI untuk uji kapasitas API.
+#
+# Setiap virtual desktop mengikuti pola request ApiClient dan MainClientApp:
+#   login          POST /auth/login
+#   register       POST /client/register (payload sama dengan register_client)
+#   refresh awal   refresh_all_data: jemaat, keuangan, program kerja WR,
+#                  kegiatan WR, pengumuman, dokumen (paralel, seperti worker tiap tab)
+#   dashboard      POST /batch dengan sub-request DashboardComponent.dashboard_requests,
+#                  setiap DASHBOARD_REFRESH_INTERVAL
+#   heartbeat      POST /client/heartbeat setiap HEARTBEAT_INTERVAL
+#   periodic       periodic_update: refresh tab yang sedang dibuka,
+#                  setiap PERIODIC_UPDATE_INTERVAL
+#   event stream   GET /events/stream (SSE) terbuka terus; event data_changed untuk
+#                  tab yang sedang dibuka memicu refresh tab itu (seperti on_server_event)
+#   disconnect     POST /client/disconnect saat simulasi selesai
+# GET list dikirim dengan If-None-Match dari cache ETag per desktop (_get_json).
+# Server registrasi lokal (:8080) tidak disimulasikan; desktop langsung ke API.
+#
+# Jumlah desktop dinaikkan bertahap (--steps 50,100,200,400). Di setiap
+# tahap dicatat throughput yang ditawarkan vs tercapai, latency p50/p99 per
+# endpoint, error rate, koneksi TCP yang terbuka (termasuk stream SSE) dan
+# statistik pool database server (GET /admin/db-pool). Tahap pertama yang
+# melewati --slo-ms (p99), --max-error-rate, atau throughput-nya tertinggal
+# dari yang ditawarkan dilaporkan sebagai titik saturasi.
+#
+# --speedup N membagi semua interval dengan N: 100 desktop dengan speedup 10
+# memberi beban request setara 1000 desktop (tetapi hanya 100 koneksi SSE).
+#
+# Memakai asyncio dengan klien HTTP/1.1 kecil di bawah (tanpa dependensi
+# tambahan), sehingga ratusan desktop cukup satu thread. Contoh:
+#   python fleet_simulator.py --url http://127.0.0.1:5000 --steps 50,100,200 --step-duration 60
+# Akun default sama dengan data benchmark API (API/benchmark/seed.py).
+
+import argparse
+import asyncio
+import datetime
+import gzip
+import json
+import math
+import os
+import platform
+import random
+import ssl
+import sys
+import time
+import uuid
+import zlib
+from urllib.parse import urlencode, urlsplit
+
+# Interval timer aplikasi client (detik)
+HEARTBEAT_INTERVAL = 30  # MainClientApp.setup_timers
+PERIODIC_UPDATE_INTERVAL = 120  # MainClientApp.setup_timers
+DASHBOARD_REFRESH_INTERVAL = 30  # DashboardComponent.setup_timers
+
+REQUEST_TIMEOUT = 10  # ApiClient.timeout
+HEARTBEAT_TIMEOUT = 5
+CONNECT_TIMEOUT = 10
+SSE_READ_TIMEOUT = 45  # client/event_stream.py
+SSE_RETRY_SECONDS = 3
+MAX_IDLE_CONNECTIONS = 10  # HTTPAdapter(pool_maxsize=10) di ApiClient
+ETAG_CACHE_SIZE = 100
+
+EVENT_TYPES = 'broadcast,data_changed'
+EVENT_ENTITY_TABS = {
+    'jemaat': 1,
+    'keuangan': 2,
+    'program_kerja_wr': 3,
+    'kegiatan_wr': 4,
+    'pengumuman': 5,
+    'dokumen': 6,
+}
+# Tab -> (label, path, pakai user_id, params tambahan); sama dengan method ApiClient per tab
+TAB_REQUESTS = {
+    1: ('GET /jemaat/my', '/jemaat/my', True, {}),
+    2: ('GET /keuangan/my', '/keuangan/my', True, {}),
+    3: ('GET /program-kerja-wr', '/program-kerja-wr', True, {}),
+    4: ('GET /kegiatan-wr/my', '/kegiatan-wr/my', True, {}),
+    5: ('GET /pengumuman', '/pengumuman', False, {'active_only': 'true'}),
+    6: ('GET /dokumen/files', '/dokumen/files', False, {}),
+}
+
+DEFAULT_USERNAME_PREFIX = 'bench_user_'
+DEFAULT_PASSWORD = 'bench123'
+
+
+class HttpError(Exception):
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind  # 'timeout', 'connect', 'protocol'
+
+
+# ---------------------------------------------------------------------------
+# Klien HTTP/1.1 asyncio
+# ---------------------------------------------------------------------------
+
+class _Connection:
+    """Satu koneksi TCP (keep-alive)"""
+
+    def __init__(self, target, usage):
+        self.target = target
+        self.usage = usage
+        self.reader = None
+        self.writer = None
+        self.reusable = False
+
+    async def open(self):
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.target.host, self.target.port, ssl=self.target.ssl_context,
+                                        server_hostname=self.target.host if self.target.ssl_context else None,
+                                        limit=1024 * 1024),
+                CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HttpError('timeout', 'Timeout membuka koneksi')
+        except OSError as e:
+            raise HttpError('connect', f'Gagal membuka koneksi: {e}')
+        self.usage.opened()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.usage.closed()
+
+    async def send(self, method, target, headers, body):
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.target.host_header}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        if body is not None or method in ('POST', 'PUT'):
+            lines.append(f"Content-Length: {len(body or b'')}")
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await self.writer.drain()
+
+    async def read_head(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError('Koneksi ditutup server')
+        parts = line.decode('latin-1').split(' ', 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise HttpError('protocol', f'Status line tidak valid: {line!r}')
+        version, status = parts[0], int(parts[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        self.reusable = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        return status, headers
+
+    async def read_body(self, method, status, headers):
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            return b''
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            self.reusable = False
+
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        return body
+
+
+class _Target:
+    def __init__(self, base_url):
+        url = urlsplit(base_url.rstrip('/'))
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.prefix = url.path
+        self.ssl_context = ssl.create_default_context() if url.scheme == 'https' else None
+        default_port = 443 if url.scheme == 'https' else 80
+        self.host_header = self.host if self.port == default_port else f"{self.host}:{self.port}"
+
+
+class ConnectionUsage:
+    """Jumlah koneksi TCP yang terbuka dari seluruh fleet"""
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+        self.total_opened = 0
+        self.streams = 0
+
+    def opened(self):
+        self.open += 1
+        self.total_opened += 1
+        self.peak = max(self.peak, self.open)
+
+    def closed(self):
+        self.open -= 1
+
+    def reset_peak(self):
+        self.peak = self.open
+
+
+class HttpSession:
+    """Pool koneksi keep-alive per desktop, seperti requests.Session di ApiClient"""
+
+    def __init__(self, target, usage):
+        self.target = target
+        self.usage = usage
+        self._idle = []
+
+    def url(self, path, params=None):
+        query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+        return f"{self.target.prefix}{path}" + (f"?{query}" if query else '')
+
+    async def request(self, method, path, params=None, json_body=None, headers=None, timeout=REQUEST_TIMEOUT):
+        """Return (status, headers, body). Raise HttpError saat timeout/gagal koneksi."""
+        body = json.dumps(json_body).encode('utf-8') if json_body is not None else None
+        send_headers = {'Accept-Encoding': 'gzip, deflate', 'Accept': '*/*', 'Connection': 'keep-alive'}
+        if body is not None:
+            send_headers['Content-Type'] = 'application/json'
+        send_headers.update(headers or {})
+        target = self.url(path, params)
+
+        for attempt in range(2):
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else _Connection(self.target, self.usage)
+            try:
+                if not reused:
+                    await connection.open()
+                status, response_headers, response_body = await asyncio.wait_for(
+                    self._exchange(connection, method, target, send_headers, body), timeout)
+            except asyncio.TimeoutError:
+                connection.close()
+                raise HttpError('timeout', f'Timeout {method} {path}')
+            except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+                connection.close()
+                # Koneksi keep-alive yang sudah ditutup server: coba sekali lagi dengan koneksi baru
+                if reused and attempt == 0:
+                    continue
+                raise HttpError('connect', f'{method} {path}: {e}')
+            except HttpError:
+                connection.close()
+                raise
+            if connection.reusable and len(self._idle) < MAX_IDLE_CONNECTIONS:
+                self._idle.append(connection)
+            else:
+                connection.close()
+            return status, response_headers, response_body
+
+    async def _exchange(self, connection, method, target, headers, body):
+        await connection.send(method, target, headers, body)
+        status, response_headers = await connection.read_head()
+        response_body = await connection.read_body(method, status, response_headers)
+        return status, response_headers, response_body
+
+    async def open_stream(self, path, params=None, headers=None):
+        """Buka koneksi khusus untuk stream (SSE), return (connection, status, headers)"""
+        connection = _Connection(self.target, self.usage)
+        await connection.open()
+        send_headers = {'Accept': 'text/event-stream', 'Connection': 'keep-alive'}
+        send_headers.update(headers or {})
+        try:
+            await asyncio.wait_for(connection.send('GET', self.url(path, params), send_headers, None), CONNECT_TIMEOUT)
+            status, response_headers = await asyncio.wait_for(connection.read_head(), CONNECT_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+            connection.close()
+            raise HttpError('connect', f'Gagal membuka stream: {e}')
+        return connection, status, response_headers
+
+    def close(self):
+        for connection in self._idle:
+            connection.close()
+        self._idle = []
+
+
+# ---------------------------------------------------------------------------
+# Statistik
+# ---------------------------------------------------------------------------
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1]
+
+
+class FleetStats:
+    """Latency dan error per endpoint untuk satu tahap"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.latencies = {}
+        self.errors = {}
+        self.failures = {}  # jenis kegagalan -> jumlah
+        self.not_modified = 0
+        self.events = 0
+
+    def record(self, label, seconds, status=None, failure=None):
+        self.latencies.setdefault(label, []).append(seconds)
+        if failure or status is None or status >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            kind = failure or f"http_{status}"
+            self.failures[kind] = self.failures.get(kind, 0) + 1
+        elif status == 304:
+            self.not_modified += 1
+
+    def summary(self):
+        seconds = max(0.001, time.monotonic() - self.started)
+        endpoints = {}
+        all_latencies = []
+        total_errors = 0
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            all_latencies.extend(values)
+            errors = self.errors.get(label, 0)
+            total_errors += errors
+            endpoints[label] = {
+                'count': len(values),
+                'rps': round(len(values) / seconds, 2),
+                'p50_ms': round(_percentile(values, 0.5) * 1000, 1),
+                'p99_ms': round(_percentile(values, 0.99) * 1000, 1),
+                'error_rate': round(errors / len(values), 4),
+            }
+        all_latencies.sort()
+        count = len(all_latencies)
+        return {
+            'seconds': round(seconds, 1),
+            'count': count,
+            'rps': round(count / seconds, 2),
+            'p50_ms': round(_percentile(all_latencies, 0.5) * 1000, 1),
+            'p99_ms': round(_percentile(all_latencies, 0.99) * 1000, 1),
+            'error_rate': round(total_errors / count, 4) if count else 0.0,
+            'failures': dict(self.failures),
+            'not_modified': self.not_modified,
+            'events': self.events,
+            'endpoints': endpoints,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Virtual desktop
+# ---------------------------------------------------------------------------
+
+class VirtualDesktop:
+    def __init__(self, index, fleet):
+        self.index = index
+        self.fleet = fleet
+        self.args = fleet.args
+        self.rng = random.Random(f"{self.args.seed}-{index}")
+        self.http = HttpSession(fleet.target, fleet.usage)
+        self.stream_http = HttpSession(fleet.target, fleet.usage)
+        self.username = f"{self.args.username_prefix}{index % self.args.users + 1:03d}"
+        self.client_ip = f"10.{100 + index // 250 % 100}.{index % 250}.{self.rng.randint(2, 254)}"
+        self.hostname = f"SIM-DESKTOP-{index:04d}-CLIENT"
+        self.session_id = None
+        self.connection_id = None
+        self.user_data = None
+        self.current_tab = self.rng.choice(list(TAB_REQUESTS))
+        self.stale_tabs = set()
+        self.last_event_id = None
+        self._etags = {}
+        self._tasks = []
+        self._stream = None
+        self.running = False
+
+    # -- request helper ----------------------------------------------------
+
+    async def _call(self, label, method, path, params=None, json_body=None, timeout=REQUEST_TIMEOUT):
+        started = time.perf_counter()
+        try:
+            status, headers, body = await self.fleet.http_request(self.http, method, path, params, json_body, None, timeout)
+        except HttpError as e:
+            self.fleet.stats.record(label, time.perf_counter() - started, failure=e.kind)
+            return None, None
+        self.fleet.stats.record(label, time.perf_counter() - started, status)
+        try:
+            return status, json.loads(body) if body else None
+        except ValueError:
+            return status, None
+
+    async def _get_json(self, label, path, params=None):
+        """GET dengan revalidasi ETag, seperti ApiClient._get_json"""
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._etags.get(key)
+        headers = {'If-None-Match': cached} if cached else None
+        started = time.perf_counter()
+        try:
+            status, response_headers, _ = await self.fleet.http_request(self.http, 'GET', path, params, None, headers,
+                                                                        REQUEST_TIMEOUT)
+        except HttpError as e:
+            self.fleet.stats.record(label, time.perf_counter() - started, failure=e.kind)
+            return None
+        self.fleet.stats.record(label, time.perf_counter() - started, status)
+        etag = response_headers.get('etag')
+        if status == 200 and etag:
+            self._etags.pop(key, None)
+            self._etags[key] = etag
+            while len(self._etags) > ETAG_CACHE_SIZE:
+                self._etags.pop(next(iter(self._etags)))
+        return status
+
+    # -- pola MainClientApp ------------------------------------------------
+
+    async def login(self):
+        status, result = await self._call('POST /auth/login', 'POST', '/auth/login',
+                                          json_body={'username': self.username, 'password': self.args.password})
+        if status == 200 and result and result.get('status') == 'success':
+            self.user_data = result.get('user')
+        return self.user_data is not None
+
+    async def register(self):
+        self.session_id = str(uuid.uuid4())
+        now = datetime.datetime.now().isoformat()
+        status, result = await self._call('POST /client/register', 'POST', '/client/register', json_body={
+            'client_ip': self.client_ip,
+            'hostname': self.hostname,
+            'connect_time': now,
+            'last_activity': now,
+            'status': 'connected',
+            'user_data': self.user_data,
+            'device_info': self.fleet.device_info,
+            'client_type': 'desktop_client',
+            'session_id': self.session_id,
+        })
+        if status == 200 and result and result.get('status') == 'success':
+            self.connection_id = result.get('connection_id')
+        return self.connection_id is not None
+
+    async def heartbeat(self):
+        await self._call('POST /client/heartbeat', 'POST', '/client/heartbeat', timeout=HEARTBEAT_TIMEOUT, json_body={
+            'connection_id': self.connection_id or self.session_id,
+            'client_ip': self.client_ip,
+            'hostname': self.hostname,
+            'last_activity': datetime.datetime.now().isoformat(),
+            'status': 'active',
+            'user_data': self.user_data,
+        })
+
+    async def disconnect(self):
+        if not (self.connection_id or self.session_id):
+            return
+        await self._call('POST /client/disconnect', 'POST', '/client/disconnect', json_body={
+            'connection_id': self.connection_id or self.session_id,
+            'client_ip': self.client_ip,
+            'hostname': self.hostname,
+            'disconnect_time': datetime.datetime.now().isoformat(),
+            'status': 'disconnected',
+        })
+
+    async def refresh_tab(self, tab):
+        label, path, with_user, extra = TAB_REQUESTS[tab]
+        params = dict(extra)
+        if with_user:
+            params['user_id'] = (self.user_data or {}).get('id_pengguna')
+        await self._get_json(label, path, params)
+        self.stale_tabs.discard(tab)
+
+    async def refresh_all_data(self):
+        await asyncio.gather(*(self.refresh_tab(tab) for tab in TAB_REQUESTS))
+
+    def dashboard_requests(self):
+        """Sama dengan DashboardComponent.dashboard_requests"""
+        user_id = (self.user_data or {}).get('id_pengguna')
+        return [
+            {'id': 'schedule', 'path': '/kegiatan/mendatang', 'params': {'limit': 5}},
+            {'id': 'announcements', 'path': '/pengumuman/aktif', 'params': {'limit': 3}},
+            {'id': 'statistics', 'path': '/jemaat/statistics'},
+            {'id': 'finance', 'path': '/keuangan/saldo', 'params': {'user_id': user_id} if user_id else {}},
+            {'id': 'activities', 'path': '/log/activities/recent', 'params': {'limit': 2}},
+        ]
+
+    async def refresh_dashboard(self):
+        await self._call('POST /batch (dashboard)', 'POST', '/batch',
+                         json_body={'requests': self.dashboard_requests(), 'parallel': True})
+
+    async def periodic_update(self):
+        # Sesekali pengguna pindah tab; tab yang basi dimuat ulang saat dibuka
+        if self.rng.random() < 0.2:
+            self.current_tab = self.rng.choice(list(TAB_REQUESTS))
+            if self.current_tab in self.stale_tabs:
+                await self.refresh_tab(self.current_tab)
+        if self.current_tab in (1, 2, 4, 5):
+            await self.refresh_tab(self.current_tab)
+
+    # -- siklus hidup ------------------------------------------------------
+
+    async def start(self):
+        self.running = True
+        if not await self.login() or not await self.register():
+            self.fleet.failed_starts += 1
+            self.running = False
+            return False
+        await self.refresh_all_data()
+        await self.refresh_dashboard()
+        speedup = self.args.speedup
+        self._tasks = [
+            asyncio.ensure_future(self._every(HEARTBEAT_INTERVAL / speedup, self.heartbeat)),
+            asyncio.ensure_future(self._every(DASHBOARD_REFRESH_INTERVAL / speedup, self.refresh_dashboard)),
+            asyncio.ensure_future(self._every(PERIODIC_UPDATE_INTERVAL / speedup, self.periodic_update)),
+        ]
+        if not self.args.no_events:
+            self._tasks.append(asyncio.ensure_future(self._event_stream()))
+        return True
+
+    async def _every(self, interval, action):
+        # Timer Qt di thread UI: tick berikutnya dihitung setelah handler selesai
+        await asyncio.sleep(self.rng.uniform(0, interval))
+        while self.running:
+            await action()
+            await asyncio.sleep(interval)
+
+    async def _event_stream(self):
+        params = {'types': EVENT_TYPES}
+        while self.running:
+            headers = {'Last-Event-ID': str(self.last_event_id)} if self.last_event_id is not None else None
+            connection = None
+            try:
+                connection, status, response_headers = await self.stream_http.open_stream('/events/stream', params, headers)
+                self._stream = connection
+                if status != 200 or not response_headers.get('content-type', '').startswith('text/event-stream'):
+                    self.fleet.stats.record('GET /events/stream', 0.0, status)
+                    raise HttpError('protocol', f'Stream status {status}')
+                self.fleet.usage.streams += 1
+                try:
+                    await self._read_events(connection, response_headers)
+                finally:
+                    self.fleet.usage.streams -= 1
+            except (HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, OSError, ValueError):
+                pass
+            finally:
+                self._stream = None
+                if connection is not None:
+                    connection.close()
+            if self.running:
+                await asyncio.sleep(SSE_RETRY_SECONDS)
+
+    async def _read_events(self, connection, headers):
+        chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+        buffer = b''
+        event_id, event_type, data = None, 'message', []
+        while self.running:
+            if chunked:
+                size_line = await asyncio.wait_for(connection.reader.readline(), SSE_READ_TIMEOUT)
+                size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    return
+                block = await connection.reader.readexactly(size)
+                await connection.reader.readline()
+            else:
+                block = await asyncio.wait_for(connection.reader.read(65536), SSE_READ_TIMEOUT)
+                if not block:
+                    return
+            buffer += block
+            while b'\n' in buffer:
+                raw, buffer = buffer.split(b'\n', 1)
+                line = raw.decode('utf-8', 'replace').rstrip('\r')
+                if line == '':
+                    if data:
+                        await self._dispatch(event_id, event_type, '\n'.join(data))
+                    event_id, event_type, data = None, 'message', []
+                    continue
+                if line.startswith(':'):
+                    continue
+                field, _, value = line.partition(':')
+                value = value[1:] if value.startswith(' ') else value
+                if field == 'id':
+                    event_id = value
+                elif field == 'event':
+                    event_type = value
+                elif field == 'data':
+                    data.append(value)
+
+    async def _dispatch(self, event_id, event_type, raw):
+        if event_id:
+            try:
+                self.last_event_id = int(event_id)
+            except ValueError:
+                pass
+        if event_type in ('ready', 'broadcast'):
+            return
+        self.fleet.stats.events += 1
+        if event_type == 'reset':
+            await self.refresh_all_data()
+            return
+        if event_type == 'data_changed':
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                return
+            tab = EVENT_ENTITY_TABS.get(data.get('entity')) if isinstance(data, dict) else None
+            if tab is None:
+                return
+            if tab == self.current_tab:
+                await self.refresh_tab(tab)
+            else:
+                self.stale_tabs.add(tab)
+
+    async def stop(self):
+        self.running = False
+        if self._stream is not None:
+            self._stream.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.disconnect()
+        self.http.close()
+        self.stream_http.close()
+
+
+# ---------------------------------------------------------------------------
+# Fleet
+# ---------------------------------------------------------------------------
+
+class Fleet:
+    def __init__(self, args):
+        self.args = args
+        self.target = _Target(args.url)
+        self.usage = ConnectionUsage()
+        self.stats = FleetStats()
+        self.desktops = []
+        self.failed_starts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.control = HttpSession(self.target, ConnectionUsage())
+        self.device_info = {
+            'platform': platform.system(),
+            'platform_version': platform.release(),
+            'architecture': platform.machine(),
+            'processor': platform.processor(),
+            'python_version': platform.python_version(),
+            'hostname': 'fleet-simulator',
+            'username': 'simulator',
+        }
+
+    async def http_request(self, session, method, path, params, json_body, headers, timeout):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await session.request(method, path, params, json_body, headers, timeout)
+        finally:
+            self.in_flight -= 1
+
+    def offered_rps(self, desktops):
+        """Request per detik yang seharusnya dikirim desktop sebanyak ini (tanpa event)"""
+        speedup = self.args.speedup
+        periodic_requests = 0.2 * 0.5 + 4 / len(TAB_REQUESTS)  # pindah tab (tab basi) + refresh tab aktif
+        per_desktop = speedup * (1 / HEARTBEAT_INTERVAL + 1 / DASHBOARD_REFRESH_INTERVAL
+                                 + periodic_requests / PERIODIC_UPDATE_INTERVAL)
+        return desktops * per_desktop
+
+    async def scale_to(self, count, ramp):
+        new = [VirtualDesktop(index, self) for index in range(len(self.desktops), count)]
+        if not new:
+            return
+        delay = ramp / len(new)
+
+        async def start(desktop, offset):
+            await asyncio.sleep(offset)
+            await desktop.start()
+
+        self.desktops.extend(new)
+        await asyncio.gather(*(start(desktop, i * delay) for i, desktop in enumerate(new)))
+
+    async def server_stats(self):
+        try:
+            status, _, body = await self.control.request('GET', '/admin/db-pool', timeout=REQUEST_TIMEOUT)
+            if status == 200:
+                return json.loads(body).get('data') or {}
+        except (HttpError, ValueError):
+            pass
+        return {}
+
+    async def shutdown(self):
+        await asyncio.gather(*(desktop.stop() for desktop in self.desktops), return_exceptions=True)
+        self.control.close()
+
+
+def _saturation_reasons(step, args):
+    reasons = []
+    if step['p99_ms'] > args.slo_ms:
+        reasons.append(f"p99 {step['p99_ms']:.0f} ms > {args.slo_ms:.0f} ms")
+    if step['error_rate'] > args.max_error_rate:
+        reasons.append(f"error {step['error_rate'] * 100:.1f}% > {args.max_error_rate * 100:.1f}%")
+    if step['offered_rps'] and step['rps'] < step['offered_rps'] * 0.9:
+        reasons.append(f"throughput {step['rps']:.1f} < 90% dari {step['offered_rps']:.1f} req/detik")
+    if step['failed_starts']:
+        reasons.append(f"{step['failed_starts']} desktop gagal login/register")
+    return reasons
+
+
+def _print_step(step):
+    pool = step['db_pool']
+    pool_text = (f"pool in_use {pool.get('in_use', '-')}/{pool.get('size', '-')} peak {pool.get('peak_in_use', '-')} "
+                 f"exhausted {pool.get('exhausted', '-')} wait {pool.get('wait_seconds_total', '-')}s") if pool else 'pool -'
+    print(f"[FLEET] {step['desktops']:>5} desktop | offered {step['offered_rps']:>7.1f} rps | achieved {step['rps']:>7.1f} rps | "
+          f"p50 {step['p50_ms']:>7.1f} ms | p99 {step['p99_ms']:>8.1f} ms | error {step['error_rate'] * 100:>5.1f}% | "
+          f"tcp {step['connections_open']} (peak {step['connections_peak']}, sse {step['sse_streams']}) | "
+          f"in-flight peak {step['in_flight_peak']} | {pool_text}")
+    if step['failures']:
+        print(f"[FLEET]        kegagalan: {step['failures']}")
+
+
+def _print_endpoints(step):
+    print(f"[FLEET] Per endpoint pada {step['desktops']} desktop:")
+    print(f"{'endpoint':<32} {'count':>7} {'rps':>8} {'p50':>8} {'p99':>9} {'err%':>6}")
+    for label, r in step['endpoints'].items():
+        print(f"{label:<32} {r['count']:>7} {r['rps']:>8.2f} {r['p50_ms']:>8.1f} {r['p99_ms']:>9.1f} {r['error_rate'] * 100:>6.1f}")
+
+
+async def run_fleet(args):
+    fleet = Fleet(args)
+    steps = []
+    saturated = None
+    try:
+        for count in args.steps:
+            print(f"[FLEET] Menaikkan jumlah desktop ke {count} (ramp {args.ramp:.0f} detik)...")
+            fleet.failed_starts = 0
+            await fleet.scale_to(count, args.ramp)
+            fleet.stats.reset()
+            fleet.usage.reset_peak()
+            fleet.peak_in_flight = fleet.in_flight
+            await asyncio.sleep(args.step_duration)
+
+            step = fleet.stats.summary()
+            step.update({
+                'desktops': count,
+                'offered_rps': round(fleet.offered_rps(count), 2),
+                'connections_open': fleet.usage.open,
+                'connections_peak': fleet.usage.peak,
+                'sse_streams': fleet.usage.streams,
+                'in_flight_peak': fleet.peak_in_flight,
+                'failed_starts': fleet.failed_starts,
+                'db_pool': await fleet.server_stats(),
+            })
+            step['saturation'] = _saturation_reasons(step, args)
+            steps.append(step)
+            _print_step(step)
+            if step['saturation']:
+                saturated = step
+                print(f"[FLEET] SATURASI pada {count} desktop: {'; '.join(step['saturation'])}")
+                if not args.continue_after_saturation:
+                    break
+    finally:
+        print("[FLEET] Menghentikan desktop (disconnect)...")
+        await fleet.shutdown()
+
+    if steps:
+        _print_endpoints(saturated or steps[-1])
+    healthy = [step['desktops'] for step in steps if not step['saturation']]
+    if saturated:
+        print(f"[FLEET] Kapasitas: {healthy[-1] if healthy else 'kurang dari ' + str(steps[0]['desktops'])} desktop "
+              f"tanpa saturasi; saturasi mulai {saturated['desktops']} desktop (speedup {args.speedup:g})")
+    elif steps:
+        print(f"[FLEET] Tidak ada saturasi sampai {steps[-1]['desktops']} desktop (speedup {args.speedup:g})")
+    return {'config': {k: v for k, v in vars(args).items() if k != 'password'}, 'steps': steps,
+            'saturation_desktops': saturated['desktops'] if saturated else None}
+
+
+def _parse_steps(value):
+    try:
+        steps = sorted({int(part) for part in value.split(',') if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError('steps harus berupa daftar angka, mis. 50,100,200')
+    if not steps or steps[0] <= 0:
+        raise argparse.ArgumentTypeError('steps harus berisi angka > 0')
+    return steps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulasi fleet desktop client untuk uji kapasitas API')
+    parser.add_argument('--url', default=os.getenv('API_BASE_URL', 'http://127.0.0.1:5000'), help='URL API')
+    parser.add_argument('--steps', type=_parse_steps, default=[25, 50, 100, 200],
+                        help='jumlah desktop per tahap, mis. 50,100,200,400')
+    parser.add_argument('--step-duration', type=float, default=60, help='detik pengukuran per tahap')
+    parser.add_argument('--ramp', type=float, default=10, help='detik untuk menyalakan desktop baru per tahap')
+    parser.add_argument('--speedup', type=float, default=1.0, help='bagi semua interval timer dengan angka ini')
+    parser.add_argument('--users', type=int, default=20, help='jumlah akun pengguna yang dipakai bergantian')
+    parser.add_argument('--username-prefix', default=DEFAULT_USERNAME_PREFIX)
+    parser.add_argument('--password', default=DEFAULT_PASSWORD)
+    parser.add_argument('--no-events', action='store_true', help='jangan buka event stream (SSE) per desktop')
+    parser.add_argument('--slo-ms', type=float, default=2000, help='batas p99 sebelum dianggap saturasi')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--continue-after-saturation', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='simpan hasil per tahap ke file JSON')
+    args = parser.parse_args(argv)
+    if args.speedup <= 0:
+        parser.error('--speedup harus > 0')
+
+    result = asyncio.run(run_fleet(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"[FLEET] Hasil disimpan: {args.json}")
+    return 1 if result['saturation_desktops'] is not None else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
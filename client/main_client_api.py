@@ -20,6 +20,7 @@ from PyQt5.QtGui import QFont, QIcon
 # Use absolute imports with type ignore to suppress warnings
 from api_client import ApiClient  # type: ignore
 from threading_utils import Worker, AsyncAPICall  # type: ignore
+from event_stream import EventStreamThread  # type: ignore
 from components.login_dialog import LoginDialog  # type: ignore
 from components.pengumuman_component import PengumumanComponent  # type: ignore
 from components.dokumen_component import DokumenComponent  # type: ignore
@@ -30,6 +31,16 @@ from components.kegiatan_component import KegiatanClientComponent  # type: ignor
 from components.profile_dialog import ProfileDialog  # type: ignore
 from components.activity_dialog import ActivityDialog  # type: ignore
 
+# Entity pada event data_changed (lihat API/events.py) -> index tab
+EVENT_ENTITY_TABS = {
+    'jemaat': 1,
+    'keuangan': 2,
+    'program_kerja_wr': 3,
+    'kegiatan_wr': 4,
+    'pengumuman': 5,
+    'dokumen': 6,
+}
+
 # ============================================================================
 # CLIENT CONFIG - Pindah dari config.py ke sini untuk menghindari PyInstaller issues
 # ============================================================================
@@ -92,6 +103,8 @@ class ClientMainWindow(QMainWindow):
         self.is_connected = False
         self.config = ClientConfig.load_settings()
         # self.last_message_count = 0
+        self.event_stream = None
+        self.stale_tabs = set()  # tab yang datanya berubah saat tidak tampil
 
         # Initialize status bar early
         self.status_bar: QStatusBar = QStatusBar()
@@ -522,7 +535,8 @@ class ClientMainWindow(QMainWindow):
         # Timer untuk check koneksi dan update data
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.periodic_update)
-        self.update_timer.start(15000)  # Update setiap 15 detik
+        # Perubahan data datang lewat event stream; timer ini hanya cadangan
+        self.update_timer.start(120000)
         
         # Timer untuk heartbeat ke server
         self.heartbeat_timer = QTimer()
@@ -724,6 +738,10 @@ class ClientMainWindow(QMainWindow):
 
     def on_tab_changed(self, index):
         """Refresh data when tab changes"""
+        if index in self.stale_tabs:
+            self.stale_tabs.discard(index)
+            self.refresh_tab(index)
+            return
         if self.api_client.user_data:
             if index == 1:  # Database Umat tab
                 self.jemaat_component.load_user_jemaat_data()
@@ -806,6 +824,7 @@ class ClientMainWindow(QMainWindow):
 
         # Start timers untuk heartbeat
         self.heartbeat_timer.start()
+        self.start_event_stream()
 
         # Log activity
         if self.activity_dialog:
@@ -842,7 +861,65 @@ class ClientMainWindow(QMainWindow):
         # Stop timers
         self.heartbeat_timer.stop()
         # self.broadcast_timer.stop()
+        self.stop_event_stream()
     
+    def start_event_stream(self):
+        """Terima broadcast dan perubahan data dari API tanpa polling"""
+        if self.event_stream:
+            return
+        self.event_stream = EventStreamThread(self.api_client.base_url,
+                                              types=('broadcast', 'data_changed'), parent=self)
+        self.event_stream.event_received.connect(self.on_server_event)
+        self.event_stream.reset_required.connect(self.refresh_all_data)
+        self.event_stream.status_changed.connect(self.on_event_stream_status)
+        self.event_stream.start()
+
+    def stop_event_stream(self):
+        if self.event_stream:
+            self.event_stream.stop()
+            self.event_stream = None
+
+    def on_event_stream_status(self, status):
+        if status == 'sse':
+            self.add_log("Terhubung ke event stream API")
+        elif status == 'poll':
+            self.add_log("Event stream tidak tersedia, memakai long-poll")
+        elif status == 'disconnected':
+            self.add_log("Event stream terputus, mencoba menyambung ulang...")
+
+    def on_server_event(self, event_type, data):
+        if event_type == 'broadcast':
+            pesan = data.get('pesan', '')
+            self.add_log(f"[Broadcast Admin]: {pesan}")
+            if hasattr(self, 'tray_icon'):
+                self.tray_icon.showMessage("Pesan dari Admin", pesan,
+                                           QSystemTrayIcon.Information, 5000)
+        elif event_type == 'data_changed':
+            index = EVENT_ENTITY_TABS.get(data.get('entity'))
+            if index is None:
+                return
+            if index == self.tab_widget.currentIndex():
+                self.refresh_tab(index)
+            else:
+                self.stale_tabs.add(index)
+
+    def refresh_tab(self, index):
+        """Muat ulang data satu tab"""
+        if not self.is_connected:
+            return
+        if index == 1:
+            self.jemaat_component.load_user_jemaat_data()
+        elif index == 2:
+            self.keuangan_component.load_user_keuangan_data()
+        elif index == 3 and hasattr(self.proker_component, 'load_data'):
+            self.proker_component.load_data()
+        elif index == 4 and hasattr(self.kegiatan_component, 'load_kegiatan_data'):
+            self.kegiatan_component.load_kegiatan_data()
+        elif index == 5:
+            self.pengumuman_component.load_pengumuman()
+        elif index == 6 and hasattr(self.dokumen_component, 'load_files'):
+            self.dokumen_component.load_files()
+
     def send_heartbeat(self):
         """Kirim heartbeat ke server untuk update status"""
         if self.is_connected and self.api_client.session_id:
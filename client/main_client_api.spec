@@ -16,13 +16,16 @@ a = Analysis(
         'components.pengumuman_component',
         'components.dokumen_component',
         'components.jemaat_component',
+        'components.jemaat_model',
+        'components.jemaat_search',
         'components.keuangan_component',
         'components.kegiatan_component',
         'components.profile_dialog',
         'components.activity_dialog',
         'components.dashboard_component',
         'components.placeholder_component',
-        'client_http'
+        'client_http',
+        'event_stream'
     ],
     hookspath=[],
     hooksconfig={},
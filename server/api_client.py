@@ -6,59 +6,106 @@ from dotenv import load_dotenv
 import json
 import datetime
 import time
+import threading
+import hashlib
+from contextlib import contextmanager
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
-from requests.exceptions import RequestException, ConnectionError, Timeout
+from requests.exceptions import RequestException, ConnectionError, Timeout, ChunkedEncodingError
 
 # Force reload .env to get latest configuration
 import pathlib
 dotenv_path = pathlib.Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path, override=True)
 
-# Auto-detect API server: prioritize production server
+PRODUCTION_API = 'https://enternal.my.id/flask'
+LOCAL_API = 'http://localhost:5000'
+PROBE_TIMEOUT = 2
+# Lama request pertama menunggu hasil deteksi server sebelum memakai URL default
+RESOLVE_WAIT = PROBE_TIMEOUT + 1
+
 def get_api_base_url():
     """
-    Auto-detect best API server:
-    1. Check .env API_BASE_URL setting (recommended: https://enternal.my.id/flask for production)
-    2. Try production server (https://enternal.my.id/flask)
-    3. Fallback to local Flask server (http://localhost:5000)
+    URL API awal tanpa request jaringan:
+    1. API_BASE_URL dari .env (recommended: https://enternal.my.id/flask for production)
+    2. Server produksi; dipastikan oleh EndpointResolver di background
     """
-    # Re-read .env to ensure we have latest values
-    import pathlib
-    dotenv_path = pathlib.Path(__file__).parent.parent / '.env'
-    load_dotenv(dotenv_path, override=True)
-
-    # Check .env first
     env_url = os.getenv('API_BASE_URL')
     if env_url and env_url.strip():
         print(f"[API] Using API_BASE_URL from .env: {env_url}")
         return env_url.strip()
+    return PRODUCTION_API
+
+
+class EndpointResolver:
+    """Deteksi server API di thread terpisah supaya import dan login dialog tidak
+    menunggu jaringan: produksi jika bisa dihubungi, selain itu Flask lokal.
+    Request yang dibuat sebelum deteksi selesai menunggu paling lama RESOLVE_WAIT."""
+
+    def __init__(self, default_url):
+        self._url = default_url
+        self._done = threading.Event()
+        if os.getenv('API_BASE_URL', '').strip():
+            self._done.set()
+        else:
+            threading.Thread(target=self._probe, name='api-endpoint-probe', daemon=True).start()
+
+    def _probe(self):
+        try:
+            requests.get(PRODUCTION_API, timeout=PROBE_TIMEOUT)
+            print(f"[API] Production server detected at {PRODUCTION_API}")
+            self._url = PRODUCTION_API
+        except requests.exceptions.ConnectionError:
+            print(f"[API] Production server not available at {PRODUCTION_API}")
+            self._url = LOCAL_API
+        except requests.exceptions.Timeout:
+            print(f"[API] Production server timeout at {PRODUCTION_API}")
+            self._url = LOCAL_API
+        except Exception as e:
+            print(f"[API] Error checking production server: {e}")
+            self._url = LOCAL_API
+        finally:
+            if self._url == LOCAL_API:
+                print(f"[API] Using fallback local API: {LOCAL_API}")
+            self._done.set()
+
+    def is_resolved(self):
+        return self._done.is_set()
+
+    def get(self):
+        self._done.wait(RESOLVE_WAIT)
+        return self._url
 
-    # Try production server first
-    production_api = 'https://enternal.my.id/flask'
-    try:
-        response = requests.get(production_api, timeout=2)
-        print(f"[API] Production server detected at {production_api}")
-        return production_api
-    except requests.exceptions.ConnectionError:
-        print(f"[API] Production server not available at {production_api}")
-    except requests.exceptions.Timeout:
-        print(f"[API] Production server timeout at {production_api}")
-    except Exception as e:
-        print(f"[API] Error checking production server: {e}")
-
-    # Fallback to local Flask development
-    local_api = 'http://localhost:5000'
-    print(f"[API] Using fallback local API: {local_api}")
-    return local_api
-
-# Get initial URL on startup
+
+# URL awal (tanpa jaringan); URL yang dipakai request lihat get_base_url()
 BASE_URL = get_api_base_url()
 
+_resolver = None
+_resolver_lock = threading.Lock()
+
+def start_endpoint_resolution():
+    """Mulai deteksi server (sekali per proses), return resolver-nya"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = EndpointResolver(BASE_URL)
+        return _resolver
+
+def get_base_url():
+    """URL API hasil deteksi (menunggu deteksi selesai jika perlu)"""
+    return start_endpoint_resolution().get()
+
+# Hasil prefetch (lihat ApiClient.prefetching) dibuang jika tidak dipakai dalam waktu ini
+PREFETCH_TTL = 60
+
+# Jumlah response GET (body + ETag) yang disimpan untuk revalidasi If-None-Match
+ETAG_CACHE_SIZE = 200
+
 class ApiClient:
     
     def __init__(self):
-        self.base_url = BASE_URL
+        # Deteksi server berjalan di background selama login dialog tampil
+        start_endpoint_resolution()
         self.timeout = 10
         
         # Setup session with retry strategy
@@ -75,17 +122,107 @@ class ApiClient:
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-    
+
+        # Salinan lokal list endpoint untuk sync incremental (lihat _sync_get)
+        self._sync_state = {}
+        self._sync_lock = threading.Lock()
+
+        # Hasil GET yang diambil lebih dulu oleh worker thread (lihat prefetching)
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_local = threading.local()
+
+        # Body GET terakhir per URL + ETag-nya: server menjawab 304 jika data
+        # tidak berubah sehingga body tidak perlu diunduh ulang
+        self._etag_cache = {}
+        self._etag_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return get_base_url()
+
+    @contextmanager
+    def prefetching(self):
+        """Tandai GET di thread ini sebagai prefetch.
+
+        Hasil GET yang berhasil disimpan sekali-pakai: GET berikutnya dengan URL
+        dan parameter yang sama dari thread lain (GUI) langsung memakai hasil
+        tersebut tanpa round-trip. Dipakai PageDataLoader untuk mengambil data
+        halaman di background lalu mengisi tabel di GUI thread.
+        """
+        self._prefetch_local.active = True
+        try:
+            yield
+        finally:
+            self._prefetch_local.active = False
+
+    def _is_prefetching(self):
+        return getattr(self._prefetch_local, 'active', False)
+
+    @staticmethod
+    def _request_key(kind, url, params):
+        return (kind, url, tuple(sorted((params or {}).items())))
+
+    def _store_prefetched(self, key, result):
+        if result.get("success"):
+            with self._prefetch_lock:
+                self._prefetched[key] = (time.monotonic(), result)
+
+    def _take_prefetched(self, key):
+        now = time.monotonic()
+        with self._prefetch_lock:
+            if not self._prefetched:
+                return None
+            for stale_key in [k for k, (t, _) in self._prefetched.items() if now - t > PREFETCH_TTL]:
+                del self._prefetched[stale_key]
+            entry = self._prefetched.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear_prefetched(self):
+        with self._prefetch_lock:
+            self._prefetched.clear()
+
     def _make_request(self, method, url, **kwargs):
+        """Make HTTP request; GET memakai hasil prefetch jika tersedia"""
+        if method.upper() != 'GET':
+            # Data bisa berubah: jangan sajikan hasil prefetch yang mungkin basi
+            self.clear_prefetched()
+            return self._send_request(method, url, **kwargs)
+
+        key = self._request_key('GET', url, kwargs.get('params'))
+        if self._is_prefetching():
+            result = self._send_request(method, url, **kwargs)
+            self._store_prefetched(key, result)
+            return result
+
+        prefetched = self._take_prefetched(key)
+        if prefetched is not None:
+            return prefetched
+        return self._send_request(method, url, **kwargs)
+
+    def _send_request(self, method, url, **kwargs):
         """Make HTTP request with improved error handling"""
         # Validasi URL tidak kosong atau None
         if not url or not isinstance(url, str) or url.strip() == '':
             return {"success": False, "data": f"URL tidak valid atau kosong: '{url}'. Pastikan API_BASE_URL dikonfigurasi dengan benar di .env file (API_BASE_URL=http://localhost:5000)"}
 
+        etag_key = None
+        cached = None
+        if method.upper() == 'GET' and 'updated_since' not in (kwargs.get('params') or {}):
+            etag_key = self._request_key('GET', url, kwargs.get('params'))
+            with self._etag_lock:
+                cached = self._etag_cache.get(etag_key)
+            if cached:
+                kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'If-None-Match': cached[0]})
+
         for attempt in range(2):  # Reduced from 3 to 2
             try:
                 if method.upper() == 'GET':
                     response = self.session.get(url, timeout=self.timeout, **kwargs)
+                    if response.status_code == 304 and cached:
+                        return {"success": True, "data": json.loads(cached[1]) if cached[1] else None}
+                    if etag_key and response.ok and response.headers.get('ETag'):
+                        self._store_etag(etag_key, response.headers['ETag'], response.content)
                 elif method.upper() == 'POST':
                     response = self.session.post(url, timeout=self.timeout, **kwargs)
                 elif method.upper() == 'PUT':
@@ -122,6 +259,148 @@ class ApiClient:
 
         return {"success": False, "data": "Gagal terhubung setelah 3 kali percobaan"}
 
+    def _store_etag(self, key, etag, content):
+        with self._etag_lock:
+            self._etag_cache.pop(key, None)
+            self._etag_cache[key] = (etag, content)
+            while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                self._etag_cache.pop(next(iter(self._etag_cache)))
+
+    def _sync_get(self, url, pk, params=None):
+        """GET list endpoint secara incremental dengan parameter updated_since.
+
+        Request pertama mengambil snapshot penuh; request berikutnya hanya
+        menerima baris yang berubah dan id yang dihapus sejak watermark terakhir,
+        lalu digabung ke salinan lokal. Return format sama dengan _make_request.
+        """
+        prefetch_key = self._request_key('SYNC', url, params)
+        prefetching = self._is_prefetching()
+        if not prefetching:
+            prefetched = self._take_prefetched(prefetch_key)
+            if prefetched is not None:
+                return prefetched
+
+        result = self._send_request('GET', url, params=self._sync_query(url, params))
+        result = self._sync_merge(url, pk, params, result)
+        if prefetching:
+            self._store_prefetched(prefetch_key, result)
+        return result
+
+    def _sync_query(self, url, params):
+        """Parameter request sync: params + watermark salinan lokal"""
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._sync_lock:
+            state = self._sync_state.get(key)
+        query = dict(params or {})
+        query['updated_since'] = state['watermark'] if state else ''
+        return query
+
+    def _sync_merge(self, url, pk, params, result):
+        """Gabungkan response sync ke salinan lokal, return format _make_request"""
+        body = result["data"]
+        if not result["success"] or not isinstance(body, dict) or 'watermark' not in body:
+            # Server lama tanpa dukungan sync: pakai response apa adanya
+            return result
+
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._sync_lock:
+            state = self._sync_state.get(key)
+
+        rows = body.get('data') or []
+        if body.get('reset') or not state:
+            merged = list(rows)
+        else:
+            deleted = set(body.get('deleted') or [])
+            changed = {row.get(pk): row for row in rows}
+            merged = [changed.pop(row.get(pk), row) for row in state['rows'] if row.get(pk) not in deleted]
+            # Baris baru di depan, sesuai urutan terbaru dari server
+            merged = [row for row in changed.values() if row.get(pk) not in deleted] + merged
+
+        with self._sync_lock:
+            self._sync_state[key] = {'watermark': body['watermark'], 'rows': merged}
+
+        return {"success": True, "data": dict(body, data=list(merged))}
+
+    def batch(self, sub_requests, parallel=True):
+        """Kirim beberapa request dalam satu round-trip (POST /batch).
+
+        sub_requests: list dict {'id', 'method', 'path', 'params', 'body', 'etag'}
+        dengan path relatif terhadap base_url. Return format _make_request
+        dengan data {id: {'status', 'etag', 'body'}}.
+        """
+        result = self._send_request('POST', f"{self.base_url}/batch",
+                                    json={'requests': sub_requests, 'parallel': parallel},
+                                    headers={'Content-Type': 'application/json'})
+        body = result["data"]
+        if result["success"] and isinstance(body, dict) and body.get("status") == "success":
+            return {"success": True, "data": body.get("data") or {}}
+        if result["success"]:
+            return {"success": False, "data": body.get("message", "Response batch tidak valid") if isinstance(body, dict) else body}
+        return result
+
+    def prefetch_batch(self, items):
+        """Ambil beberapa GET sekaligus lewat /batch dan simpan hasilnya sebagai
+        hasil prefetch (lihat prefetching): get_* berikutnya dengan URL dan
+        parameter yang sama langsung memakai hasil tersebut tanpa round-trip.
+
+        items: list (url, params, pk); pk diisi untuk endpoint _sync_get dan
+        None untuk GET biasa. Jika /batch tidak tersedia (API versi lama),
+        setiap item diambil sendiri. Return True jika batch berhasil.
+        """
+        base = self.base_url
+        subs = []
+        for index, (url, params, pk) in enumerate(items):
+            sub = {'id': str(index), 'method': 'GET', 'path': url[len(base):]}
+            if pk:
+                sub['params'] = self._sync_query(url, params)
+            else:
+                sub['params'] = dict(params or {})
+                with self._etag_lock:
+                    cached = self._etag_cache.get(self._request_key('GET', url, params))
+                if cached:
+                    sub['etag'] = cached[0]
+            subs.append(sub)
+
+        result = self.batch(subs) if all(url.startswith(base) for url, _, _ in items) else {"success": False, "data": "URL di luar base_url"}
+        if not result["success"]:
+            print(f"[API] Batch gagal ({result['data']}), request dikirim satu per satu")
+            for url, params, pk in items:
+                if pk:
+                    self._sync_get(url, pk, params)
+                else:
+                    self._make_request('GET', url, params=params)
+            return False
+
+        for index, (url, params, pk) in enumerate(items):
+            sub = result["data"].get(str(index)) or {}
+            status = sub.get('status') or 0
+            etag_key = self._request_key('GET', url, params)
+            if status == 304 and not pk:
+                with self._etag_lock:
+                    cached = self._etag_cache.get(etag_key)
+                if not cached:
+                    continue
+                response = {"success": True, "data": json.loads(cached[1]) if cached[1] else None}
+            elif 200 <= status < 300:
+                response = {"success": True, "data": sub.get('body')}
+                if not pk and sub.get('etag'):
+                    self._store_etag(etag_key, sub['etag'], json.dumps(sub.get('body')).encode('utf-8'))
+            else:
+                # Biarkan pemanggilan berikutnya mengulang request biasa
+                continue
+
+            if pk:
+                self._store_prefetched(self._request_key('SYNC', url, params),
+                                       self._sync_merge(url, pk, params, response))
+            else:
+                self._store_prefetched(etag_key, response)
+        return True
+
+    def reset_sync_cache(self):
+        """Buang salinan lokal sehingga request berikutnya mengambil snapshot penuh"""
+        with self._sync_lock:
+            self._sync_state.clear()
+
     def check_server_connection(self):
         return self._make_request('GET', self.base_url)
     
@@ -194,7 +473,7 @@ class ApiClient:
     
     # ========== JEMAAT METHODS ==========
     def get_jemaat(self):
-        return self._make_request('GET', f"{self.base_url}/jemaat")
+        return self._sync_get(f"{self.base_url}/jemaat", 'id_jemaat')
     
     def add_jemaat(self, data):
         return self._make_request('POST', f"{self.base_url}/jemaat", 
@@ -208,10 +487,52 @@ class ApiClient:
     
     def delete_jemaat(self, jemaat_id):
         return self._make_request('DELETE', f"{self.base_url}/jemaat/{jemaat_id}")
+
+    # Content-Type per format file import jemaat
+    IMPORT_CONTENT_TYPES = {
+        'csv': 'text/csv',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'jsonl': 'application/x-ndjson',
+    }
+
+    def import_jemaat(self, file_path, user_id, dry_run=True, on_error='skip', wilayah_rohani=None,
+                      allow_new_wilayah=False, encoding=None):
+        """Import massal jemaat (POST /jemaat/import), file dikirim streaming sebagai body.
+
+        data hasil: laporan import (total_rows, valid_rows, inserted, failed, rows, ...).
+        Untuk error file (400/501) laporan sementara ada di key "report".
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        fmt = {'.xlsx': 'xlsx', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(ext, 'csv')
+        params = {'user_id': user_id, 'format': fmt, 'on_error': on_error,
+                  'filename': os.path.basename(file_path)}
+        if dry_run:
+            params['dry_run'] = 'true'
+        if wilayah_rohani:
+            params['wilayah_rohani'] = wilayah_rohani
+        if allow_new_wilayah:
+            params['allow_new_wilayah'] = 'true'
+        if encoding:
+            params['encoding'] = encoding
+        try:
+            self.clear_prefetched()
+            with open(file_path, 'rb') as f:
+                # Ribuan baris bisa butuh lebih lama dari timeout biasa
+                response = self.session.post(f"{self.base_url}/jemaat/import", params=params, data=f,
+                                             headers={'Content-Type': self.IMPORT_CONTENT_TYPES[fmt]},
+                                             timeout=(self.timeout, max(self.timeout, 600)))
+            try:
+                result = response.json()
+            except ValueError:
+                return {"success": False, "data": f"HTTP {response.status_code}", "report": None}
+            return {"success": bool(result.get('success')) and response.ok, "data": result.get('data'),
+                    "report": result.get('report')}
+        except (RequestException, OSError) as e:
+            return {"success": False, "data": f"Gagal import jemaat: {e}", "report": None}
     
     # ========== KEGIATAN METHODS ==========
     def get_kegiatan(self):
-        return self._make_request('GET', f"{self.base_url}/kegiatan")
+        return self._sync_get(f"{self.base_url}/kegiatan", 'id_kegiatan')
     
     def add_kegiatan(self, data):
         return self._make_request('POST', f"{self.base_url}/kegiatan", 
@@ -232,7 +553,7 @@ class ApiClient:
 
     # ========== PENGUMUMAN METHODS ==========
     def get_pengumuman(self):
-        return self._make_request('GET', f"{self.base_url}/pengumuman")
+        return self._sync_get(f"{self.base_url}/pengumuman", 'id_pengumuman')
     
     def add_pengumuman(self, data):
         return self._make_request('POST', f"{self.base_url}/pengumuman", 
@@ -250,8 +571,35 @@ class ApiClient:
     # ========== KEUANGAN METHODS ==========
     def get_keuangan(self):
         # Server admin request - tambahkan parameter is_admin=true untuk mendapatkan semua data dengan user info
-        return self._make_request('GET', f"{self.base_url}/keuangan?is_admin=true&limit=1000")
+        return self._sync_get(f"{self.base_url}/keuangan", 'id_keuangan', {'is_admin': 'true'})
     
+    def get_stats_summary(self, year=None, month=None, months=None):
+        """Ringkasan dashboard (jumlah data, statistik jemaat, saldo) yang dihitung di server"""
+        params = {}
+        if year:
+            params['year'] = year
+        if month:
+            params['month'] = month
+        if months:
+            params['months'] = months
+        return self._make_request('GET', f"{self.base_url}/stats/summary", params=params)
+
+    def prefetch_dashboard(self, include_lists=True):
+        """Prefetch data dashboard dalam satu request /batch (lihat prefetch_batch).
+        include_lists: ikut ambil list kegiatan, kegiatan WR dan pengumuman yang
+        ditampilkan di dashboard."""
+        items = [
+            (f"{self.base_url}/stats/summary", None, None),
+            (f"{self.base_url}/pesan/recent?limit=5", None, None),
+        ]
+        if include_lists:
+            items += [
+                (f"{self.base_url}/kegiatan", None, 'id_kegiatan'),
+                (f"{self.base_url}/kegiatan-wr", None, None),
+                (f"{self.base_url}/pengumuman", None, 'id_pengumuman'),
+            ]
+        return self.prefetch_batch(items)
+
     def add_keuangan(self, data):
         return self._make_request('POST', f"{self.base_url}/keuangan", 
                                json=data, 
@@ -268,7 +616,7 @@ class ApiClient:
     # ========== KEUANGAN KATEGORIAL METHODS ==========
     def get_keuangan_kategorial(self):
         """Get all keuangan_kategorial records"""
-        return self._make_request('GET', f"{self.base_url}/keuangan-kategorial?limit=1000")
+        return self._sync_get(f"{self.base_url}/keuangan-kategorial", 'id_keuangan_kategorial')
 
     def add_keuangan_kategorial(self, data, admin_id=None):
         """Add new keuangan_kategorial record"""
@@ -291,45 +639,59 @@ class ApiClient:
 
     # ========== FILES METHODS ==========
     def get_files(self):
-        return self._make_request('GET', f"{self.base_url}/dokumen/files")
+        return self._sync_get(f"{self.base_url}/dokumen/files", 'id_dokumen')
     
-    def upload_file(self, file_path, document_name=None, document_type=None, keterangan=None, bentuk=None, admin_id=None):
-        """Upload file with improved error handling"""
-        for attempt in range(3):
-            try:
-                with open(file_path, 'rb') as f:
-                    files = {'file': f}
+    # File lebih besar dari ini dikirim dengan protokol upload chunked
+    CHUNKED_UPLOAD_THRESHOLD = 4 * 1024 * 1024
 
-                    # Prepare form data - MUST match API expectations
-                    data = {}
-                    # Nama dokumen
-                    if document_name:
-                        data['nama_dokumen'] = document_name
-
-                    # Kategori dokumen (required by API - maps to kategori_file)
-                    if document_type:
-                        data['kategori_file'] = document_type
-                    else:
-                        data['kategori_file'] = 'Lainnya'  # Default
+    def upload_file(self, file_path, document_name=None, document_type=None, keterangan=None, bentuk=None, admin_id=None, progress_callback=None):
+        """Upload file with improved error handling"""
+        # Prepare form data - MUST match API expectations
+        data = {}
+        # Nama dokumen
+        if document_name:
+            data['nama_dokumen'] = document_name
+
+        # Kategori dokumen (required by API - maps to kategori_file)
+        if document_type:
+            data['kategori_file'] = document_type
+        else:
+            data['kategori_file'] = 'Lainnya'  # Default
+
+        # Bentuk dokumen (required by API)
+        if bentuk:
+            data['bentuk_dokumen'] = bentuk
+        else:
+            data['bentuk_dokumen'] = 'Lainnya'
+
+        # Keterangan (optional)
+        if keterangan:
+            data['keterangan'] = keterangan
+        else:
+            data['keterangan'] = ''
+
+        # Admin ID (optional - who uploaded the file)
+        if admin_id:
+            data['uploaded_by_admin'] = admin_id
 
-                    # Bentuk dokumen (required by API)
-                    if bentuk:
-                        data['bentuk_dokumen'] = bentuk
-                    else:
-                        data['bentuk_dokumen'] = 'Lainnya'
+        # Debug logging untuk upload
+        print(f"Upload API - nama: {document_name}, kategori: {document_type or 'Lainnya'}, bentuk: {bentuk or 'Lainnya'}, admin_id: {admin_id}, keterangan: {keterangan}")
 
-                    # Keterangan (optional)
-                    if keterangan:
-                        data['keterangan'] = keterangan
-                    else:
-                        data['keterangan'] = ''
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError as e:
+            return {"success": False, "data": f"Error reading file: {e}"}
 
-                    # Admin ID (optional - who uploaded the file)
-                    if admin_id:
-                        data['uploaded_by_admin'] = admin_id
+        if file_size > self.CHUNKED_UPLOAD_THRESHOLD:
+            result = self.upload_file_chunked(file_path, data, progress_callback)
+            if result.get("status_code") != 404:
+                return result
+            print("Upload API - Server belum mendukung upload chunked, memakai upload biasa")
 
-                    # Debug logging untuk upload
-                    print(f"Upload API - nama: {document_name}, kategori: {document_type or 'Lainnya'}, bentuk: {bentuk or 'Lainnya'}, admin_id: {admin_id}, keterangan: {keterangan}")
+        for attempt in range(3):
+            try:
+                with open(file_path, 'rb') as f:
+                    files = {'file': f}
 
                     # Use longer timeout for file upload (up to 60 seconds for large files)
                     upload_timeout = 60
@@ -359,7 +721,76 @@ class ApiClient:
                 return {"success": False, "data": f"Error reading file: {e}"}
 
         return {"success": False, "data": "Gagal upload file setelah 3 kali percobaan"}
-    
+
+    def upload_file_chunked(self, file_path, metadata, progress_callback=None, max_retries=5):
+        """Upload file per chunk (init / put-chunk / commit) dengan checksum per chunk.
+
+        Jika koneksi putus, posisi terakhir diambil dari server lalu upload
+        dilanjutkan dari sana. progress_callback(sent, total) dipanggil setiap chunk.
+        """
+        total_size = os.path.getsize(file_path)
+        file_hash = self._file_sha256(file_path)
+        init = dict(metadata, filename=os.path.basename(file_path), total_size=total_size)
+        result = self._upload_request('POST', f"{self.base_url}/dokumen/uploads", json=init)
+        if not result["success"]:
+            return result
+
+        upload_id = result["data"]["data"]["upload_id"]
+        chunk_size = result["data"]["data"]["chunk_size"]
+        upload_url = f"{self.base_url}/dokumen/uploads/{upload_id}"
+        offset = 0
+        failures = 0
+
+        with open(file_path, 'rb') as f:
+            while offset < total_size:
+                f.seek(offset)
+                chunk = f.read(chunk_size)
+                result = self._upload_request(
+                    'PUT', upload_url, params={'offset': offset}, data=chunk,
+                    headers={'Content-Type': 'application/octet-stream',
+                             'X-Chunk-SHA256': hashlib.sha256(chunk).hexdigest()})
+                if result["success"]:
+                    offset = result["data"]["data"]["received"]
+                    failures = 0
+                    if progress_callback:
+                        progress_callback(offset, total_size)
+                    continue
+
+                failures += 1
+                if failures > max_retries or result.get("status_code") == 404:
+                    return result
+                # Sinkronkan posisi dengan server lalu lanjutkan dari sana
+                time.sleep(min(2 ** failures, 10))
+                status = self._upload_request('GET', upload_url)
+                if not status["success"]:
+                    return status
+                offset = status["data"]["data"]["received"]
+
+        return self._upload_request('POST', f"{upload_url}/commit", json={'sha256': file_hash})
+
+    def _upload_request(self, method, url, **kwargs):
+        """Request protokol upload chunked. Return dict dengan status_code untuk error HTTP."""
+        try:
+            response = self.session.request(method, url, timeout=60, **kwargs)
+        except RequestException as e:
+            return {"success": False, "data": f"Gagal upload file: {e}"}
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if response.status_code >= 400:
+            message = body.get('data') if isinstance(body, dict) else f"HTTP {response.status_code}"
+            return {"success": False, "data": f"Gagal upload file: {message}", "status_code": response.status_code}
+        return {"success": True, "data": body}
+
+    @staticmethod
+    def _file_sha256(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
     def delete_file(self, file_id):
         return self._make_request('DELETE', f"{self.base_url}/dokumen/files/{file_id}")
 # ========== LOG METHODS ==========
@@ -413,6 +844,121 @@ class ApiClient:
                 return {"success": False, "data": f"Gagal download file: {e}"}
 
         return {"success": False, "data": "Gagal download file setelah 3 kali percobaan"}
+
+    def download_file_to(self, file_id, save_path, progress_callback=None, chunk_size=64 * 1024):
+        """Download file langsung ke disk secara streaming (memori konstan).
+
+        Data ditulis ke <save_path>.part lalu di-rename setelah lengkap. Jika
+        koneksi putus, download dilanjutkan dari byte terakhir dengan Range +
+        If-Range; jika file di server berubah, server mengirim ulang file penuh.
+        progress_callback(received, total) dipanggil setiap chunk (total bisa None).
+        """
+        url = f"{self.base_url}/dokumen/files/{file_id}/download"
+        part_path = f"{save_path}.part"
+        received = 0
+        total = None
+        validator = None
+        last_error = None
+
+        for attempt in range(3):
+            headers = {'Accept-Encoding': 'identity'}
+            if received and validator:
+                headers['Range'] = f"bytes={received}-"
+                headers['If-Range'] = validator
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    if response.status_code >= 400:
+                        try:
+                            message = response.json().get('message', f"HTTP {response.status_code}")
+                        except Exception:
+                            message = f"HTTP {response.status_code}"
+                        return {"success": False, "data": message}
+
+                    if response.status_code == 206:
+                        mode = 'ab'
+                    else:
+                        # Request pertama, atau file berubah sejak percobaan sebelumnya
+                        mode = 'wb'
+                        received = 0
+                        length = response.headers.get('Content-Length')
+                        total = int(length) if length else None
+                    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            received += len(chunk)
+                            if progress_callback:
+                                progress_callback(received, total)
+
+                if total is not None and received < total:
+                    raise ChunkedEncodingError(f"Koneksi terputus setelah {received}/{total} bytes")
+
+                os.replace(part_path, save_path)
+                print(f"Download API - File {file_id} disimpan ke {save_path} ({received} bytes)")
+                return {"success": True, "data": save_path, "size": received}
+
+            except (ConnectionError, Timeout, ChunkedEncodingError) as e:
+                last_error = e
+                if attempt < 2:
+                    print(f"Download API - Koneksi terputus di {received} bytes, melanjutkan: {e}")
+                    time.sleep(2 ** attempt)
+                    continue
+            except (RequestException, OSError) as e:
+                last_error = e
+                break
+
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        return {"success": False, "data": f"Gagal download file: {last_error}"}
+
+    def download_export(self, entity, save_path, fmt='csv', params=None, progress_callback=None,
+                        chunk_size=64 * 1024, ids=None):
+        """Download export /export/<entity> langsung ke disk secara streaming.
+
+        params berisi filter/kolom export (lihat API/routes/export_routes.py).
+        ids (opsional) membatasi export ke primary key tersebut (dikirim lewat POST).
+        CSV dikirim ter-gzip dan didekompresi otomatis oleh requests.
+        progress_callback(received) dipanggil setiap chunk.
+        """
+        url = f"{self.base_url}/export/{entity}"
+        query = dict(params or {})
+        query['format'] = fmt
+        part_path = f"{save_path}.part"
+        received = 0
+        try:
+            # XLSX baru mulai dikirim setelah workbook selesai ditulis di server
+            if ids is None:
+                request_args = {'method': 'GET'}
+            else:
+                request_args = {'method': 'POST', 'json': {'ids': list(ids)}}
+            with self.session.request(url=url, params=query, stream=True,
+                                      timeout=(self.timeout, max(self.timeout, 300)), **request_args) as response:
+                if response.status_code >= 400:
+                    try:
+                        message = response.json().get('message', f"HTTP {response.status_code}")
+                    except Exception:
+                        message = f"HTTP {response.status_code}"
+                    return {"success": False, "data": message}
+
+                with open(part_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        received += len(chunk)
+                        if progress_callback:
+                            progress_callback(received)
+
+            os.replace(part_path, save_path)
+            print(f"Export API - {entity} disimpan ke {save_path} ({received} bytes)")
+            return {"success": True, "data": save_path, "size": received}
+        except (RequestException, OSError) as e:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+            return {"success": False, "data": f"Gagal export {entity}: {e}"}
     # ========== PESAN METHODS ==========
     def get_recent_messages(self, limit=50):
         return self._make_request('GET', f"{self.base_url}/pesan/recent?limit={limit}")
@@ -427,7 +973,7 @@ class ApiClient:
     
     # ========== STRUKTUR METHODS ==========
     def get_struktur(self):
-        return self._make_request('GET', f"{self.base_url}/struktur")
+        return self._sync_get(f"{self.base_url}/struktur", 'id_struktur')
     
     def add_struktur(self, data):
         return self._make_request('POST', f"{self.base_url}/struktur", 
@@ -474,7 +1020,7 @@ class ApiClient:
 
     # ========== KATEGORIAL METHODS ==========
     def get_kategorial(self):
-        return self._make_request('GET', f"{self.base_url}/kategorial")
+        return self._sync_get(f"{self.base_url}/kategorial", 'id_kategorial')
 
     def add_kategorial(self, data):
         return self._make_request('POST', f"{self.base_url}/kategorial",
@@ -491,7 +1037,7 @@ class ApiClient:
 
     # ========== WILAYAH ROHANI METHODS ==========
     def get_wr(self):
-        return self._make_request('GET', f"{self.base_url}/wr")
+        return self._sync_get(f"{self.base_url}/wr", 'id_wilayah')
 
     def add_wr(self, data):
         return self._make_request('POST', f"{self.base_url}/wr", json=data)
@@ -504,7 +1050,7 @@ class ApiClient:
 
     # ========== K. BINAAN METHODS ==========
     def get_binaan(self):
-        return self._make_request('GET', f"{self.base_url}/binaan")
+        return self._sync_get(f"{self.base_url}/binaan", 'id_binaan')
 
     def add_binaan(self, data):
         return self._make_request('POST', f"{self.base_url}/binaan", json=data)
@@ -631,7 +1177,7 @@ class ApiClient:
 
     # ========== ASET METHODS ==========
     def get_aset(self):
-        return self._make_request('GET', f"{self.base_url}/aset")
+        return self._sync_get(f"{self.base_url}/aset", 'id_aset')
 
     def add_aset(self, data):
         return self._make_request('POST', f"{self.base_url}/aset",
@@ -1,10 +1,167 @@
 # Path: server/client_handler.py
+# Server registrasi client lokal (port 8080).
+#
+# Request dilayani oleh thread pool berukuran tetap sehingga satu panggilan
+# lambat ke Flask API tidak menahan client lain. Jika semua worker sibuk dan
+# antrean penuh, request langsung dijawab 503 + Retry-After (backpressure)
+# daripada menumpuk. Semua panggilan ke API memakai satu requests.Session
+# dengan connection pool. Heartbeat tidak diteruskan satu per satu: dicatat
+# lalu dikirim bersama ke /client/heartbeat/batch setiap beberapa detik.
 
 import json
 import threading
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
+import requests
+from requests.adapters import HTTPAdapter
+
+UPSTREAM_URL = "http://localhost:5000"
+UPSTREAM_TIMEOUT = (3, 5)  # (connect, read) detik
+MAX_WORKERS = 16
+MAX_PENDING = 64  # request yang sedang diproses + menunggu worker
+HEARTBEAT_FLUSH_INTERVAL = 10
+RETRY_AFTER = 2
+
+
+class UpstreamClient:
+    """Panggilan ke Flask API dengan connection pool bersama"""
+
+    def __init__(self, base_url=UPSTREAM_URL, pool_size=MAX_WORKERS):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, path, data):
+        return self.session.post(f"{self.base_url}{path}", json=data, timeout=UPSTREAM_TIMEOUT)
+
+    def close(self):
+        self.session.close()
+
+
+class HeartbeatBatcher:
+    """Kumpulkan heartbeat client lalu teruskan ke API dalam satu request"""
+
+    def __init__(self, upstream, interval=HEARTBEAT_FLUSH_INTERVAL):
+        self.upstream = upstream
+        self.interval = interval
+        self.database_manager = None
+        self._lock = threading.Lock()
+        self._pending = {}  # kunci client -> data heartbeat terakhir
+        self._missing = set()  # client yang tidak dikenal API (perlu register ulang)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _key(connection_id, client_ip):
+        return f"id:{connection_id}" if connection_id else f"ip:{client_ip}"
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='heartbeat-batcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=UPSTREAM_TIMEOUT[0] + UPSTREAM_TIMEOUT[1])
+        self.flush()
+
+    def add(self, connection_id, client_ip):
+        """Catat heartbeat. Return False jika API sudah menyatakan client tidak aktif."""
+        key = self._key(connection_id, client_ip)
+        with self._lock:
+            if key in self._missing:
+                self._missing.discard(key)
+                return False
+            self._pending[key] = {'connection_id': connection_id, 'client_ip': client_ip}
+        return True
+
+    def forget(self, connection_id, client_ip):
+        with self._lock:
+            for key in (self._key(connection_id, None), self._key(None, client_ip)):
+                self._pending.pop(key, None)
+                self._missing.discard(key)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        try:
+            response = self.upstream.post('/client/heartbeat/batch', {'heartbeats': list(batch.values())})
+            if response.status_code != 200:
+                raise requests.exceptions.RequestException(f"HTTP {response.status_code}")
+            missing = response.json().get('data', {}).get('missing', [])
+            with self._lock:
+                for item in missing:
+                    self._missing.add(self._key(item.get('connection_id'), item.get('client_ip')))
+        except requests.exceptions.ConnectionError:
+            # Fallback ke database manager lokal
+            print("[CLIENT HANDLER] Cannot connect to Flask API, using local heartbeat update")
+            if self.database_manager:
+                for item in batch.values():
+                    self.database_manager.update_client_activity(item['connection_id'], item['client_ip'])
+        except Exception as e:
+            print(f"[CLIENT HANDLER] Gagal meneruskan {len(batch)} heartbeat: {e}")
+            # Coba lagi pada flush berikutnya kecuali sudah ada heartbeat yang lebih baru
+            with self._lock:
+                for key, item in batch.items():
+                    self._pending.setdefault(key, item)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer dengan thread pool berukuran tetap dan antrean terbatas"""
+
+    def __init__(self, server_address, handler_class, max_workers=MAX_WORKERS, max_pending=MAX_PENDING):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='client-handler')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        try:
+            self.executor.submit(self._process, request, client_address)
+        except RuntimeError:
+            # Executor sudah dimatikan (server sedang berhenti)
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _reject(self, request):
+        body = json.dumps({"status": "error", "message": "Server sibuk, coba lagi"}).encode('utf-8')
+        try:
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Retry-After: {RETRY_AFTER}\r\nContent-Length: {len(body)}\r\n".encode('ascii')
+                + b"Connection: close\r\n\r\n" + body
+            )
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
 
 class ClientRegistrationHandler(BaseHTTPRequestHandler):
     
@@ -52,8 +209,6 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
         try:
             # Forward registration to remote Flask API to ensure data is persisted in database
             # This is critical because local memory storage alone doesn't create database records
-            import requests
-
             client_ip = data.get('client_ip')
             hostname = data.get('hostname', '')
             session_id = data.get('session_id', '')
@@ -76,18 +231,18 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
             try:
                 # Try to register with remote Flask API
                 # This ensures the client is stored in the database
-                api_response = requests.post(
-                    "http://localhost:5000/client/register",
-                    json=api_data,
-                    timeout=5,
-                    headers={'Content-Type': 'application/json'}
-                )
+                api_response = self.server.upstream.post('/client/register', api_data)
 
-                if api_response.status_code == 200:
+                try:
                     api_result = api_response.json()
+                except ValueError:
+                    api_result = {'message': f"HTTP {api_response.status_code}"}
+
+                if api_response.status_code == 200:
                     if api_result.get('status') == 'success':
                         # Get the real connection_id from API
                         connection_id = api_result.get('connection_id')
+                        self.server.heartbeats.forget(connection_id, client_ip)
 
                         # Also register locally for memory cache
                         if hasattr(self.server, 'database_manager') and self.server.database_manager:
@@ -152,10 +307,8 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
             self.send_json_response(500, response)
     
     def handle_client_heartbeat(self, data):
-        """Handle client heartbeat - forward to database to update last_activity"""
+        """Handle client heartbeat - dicatat lalu diteruskan ke API secara batch"""
         try:
-            import requests
-
             connection_id = data.get('connection_id')
             client_ip = data.get('client_ip')
 
@@ -167,48 +320,19 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
                 self.send_json_response(400, response)
                 return
 
-            try:
-                # Try to update heartbeat via Flask API for database persistence
-                heartbeat_response = requests.post(
-                    "http://localhost:5000/client/heartbeat",
-                    json=data,
-                    timeout=5,
-                    headers={'Content-Type': 'application/json'}
-                )
-
-                if heartbeat_response.status_code == 200:
-                    result = heartbeat_response.json()
-                    response = {
-                        "status": result.get('status', 'success'),
-                        "message": result.get('message', 'Heartbeat updated')
-                    }
-                    self.send_json_response(200, response)
-                else:
-                    response = {
-                        "status": "error",
-                        "message": f"Flask API heartbeat failed: {heartbeat_response.status_code}"
-                    }
-                    self.send_json_response(heartbeat_response.status_code, response)
-
-            except requests.exceptions.ConnectionError:
-                # Fallback to local database manager
-                print("[CLIENT HANDLER] Cannot connect to Flask API, using local heartbeat update")
-
-                if hasattr(self.server, 'database_manager') and self.server.database_manager:
-                    db_manager = self.server.database_manager
-                    success, message = db_manager.update_client_activity(connection_id, client_ip)
-
-                    response = {
-                        "status": "success" if success else "error",
-                        "message": message
-                    }
-                    self.send_json_response(200, response)
-                else:
-                    response = {
-                        "status": "error",
-                        "message": "Database manager not available"
-                    }
-                    self.send_json_response(500, response)
+            if self.server.heartbeats.add(connection_id, client_ip):
+                response = {
+                    "status": "success",
+                    "message": "Heartbeat diterima"
+                }
+                self.send_json_response(200, response)
+            else:
+                # API sudah memutus koneksi ini (timeout), client perlu register ulang
+                response = {
+                    "status": "error",
+                    "message": "Client connection tidak ditemukan atau tidak aktif"
+                }
+                self.send_json_response(404, response)
 
         except Exception as e:
             print(f"Error in handle_client_heartbeat: {e}")
@@ -217,12 +341,10 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
                 "message": f"Heartbeat error: {str(e)}"
             }
             self.send_json_response(500, response)
-    
+
     def handle_client_disconnect(self, data):
         """Handle client disconnection - forward to database to mark as disconnected"""
         try:
-            import requests
-
             connection_id = data.get('connection_id')
             client_ip = data.get('client_ip')
 
@@ -234,14 +356,11 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
                 self.send_json_response(400, response)
                 return
 
+            self.server.heartbeats.forget(connection_id, client_ip)
+
             try:
                 # Try to disconnect via Flask API for database persistence
-                disconnect_response = requests.post(
-                    "http://localhost:5000/client/disconnect",
-                    json=data,
-                    timeout=5,
-                    headers={'Content-Type': 'application/json'}
-                )
+                disconnect_response = self.server.upstream.post('/client/disconnect', data)
 
                 if disconnect_response.status_code == 200:
                     result = disconnect_response.json()
@@ -343,26 +462,32 @@ class ClientRegistrationHandler(BaseHTTPRequestHandler):
         pass
 
 class ClientRegistrationServer:
-    def __init__(self, port=8080):
+    def __init__(self, port=8080, upstream_url=UPSTREAM_URL):
         self.port = port
         self.server = None
         self.thread = None
         self.database_manager = None
+        self.upstream = UpstreamClient(upstream_url)
+        self.heartbeats = HeartbeatBatcher(self.upstream)
     
     def set_database_manager(self, database_manager):
         """Set database manager for handling client operations"""
         self.database_manager = database_manager
+        self.heartbeats.database_manager = database_manager
         if self.server:
             self.server.database_manager = database_manager
     
     def start(self):
         """Start the HTTP server in a separate thread"""
         try:
-            self.server = HTTPServer(('localhost', self.port), ClientRegistrationHandler)
+            self.server = PooledHTTPServer(('localhost', self.port), ClientRegistrationHandler)
             self.server.database_manager = self.database_manager
+            self.server.upstream = self.upstream
+            self.server.heartbeats = self.heartbeats
             
             self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.thread.start()
+            self.heartbeats.start()
             
             print(f"[CLIENT HANDLER] Server started on http://localhost:{self.port}")
             return True
@@ -376,8 +501,10 @@ class ClientRegistrationServer:
         if self.server:
             self.server.shutdown()
             self.server.server_close()
+            self.heartbeats.stop()
+            self.upstream.close()
             print("[CLIENT HANDLER] Server stopped")
     
     def is_running(self):
         """Check if server is running"""
-        return self.server is not None and self.thread is not None and self.thread.is_alive()
\ No newline at end of file
+        return self.server is not None and self.thread is not None and self.thread.is_alive()
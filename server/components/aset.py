@@ -138,9 +138,7 @@ class AsetComponent(QWidget):
     def set_database_manager(self, db_manager):
         """Set database manager."""
         self.db_manager = db_manager
-        # Auto load data setelah database manager di-set
-        if self.db_manager:
-            self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def set_current_admin(self, admin_data):
         """Set the current admin data."""
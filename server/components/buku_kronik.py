@@ -103,7 +103,6 @@ class BukuKronikComponent(QWidget):
         self.db_manager = None
         self.peristiwa_list = []
         self.selected_peristiwa_id = None
-        self.data_loaded = False  # Flag untuk track apakah data sudah pernah di-load
         self.current_admin = None
         self.setup_ui()
 
@@ -112,11 +111,8 @@ class BukuKronikComponent(QWidget):
         self.api_client = api_client
 
     def set_database_manager(self, db_manager):
-        """Set database manager - ini yang trigger initial load"""
+        """Set database manager (data dimuat oleh PageDataLoader saat halaman dibuka)"""
         self.db_manager = db_manager
-        if db_manager and not self.data_loaded:
-            self.load_data()
-            self.data_loaded = True
 
     def set_current_admin(self, admin_data):
         """Set the current admin data."""
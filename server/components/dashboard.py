@@ -121,6 +121,28 @@ class StatisticsChart(QWidget):
                     self.sakramen_data['perkawinan']['belum'] += 1
 
         self.update()  # Trigger repaint
+
+    def update_from_summary(self, jemaat_summary):
+        """Update data statistik dari ringkasan /stats/summary (dihitung di server)"""
+        total_jemaat = jemaat_summary.get('total', 0)
+        self.jemaat_data['total'] = total_jemaat
+        keluarga = jemaat_summary.get('keluarga', 0)
+        self.jemaat_data['keluarga'] = keluarga if keluarga else max(1, total_jemaat // 4)
+        self.jemaat_data['wilayah_rohani'] = jemaat_summary.get('wilayah_rohani', 0)
+        self.jemaat_data['laki_laki'] = jemaat_summary.get('laki_laki', 0)
+        self.jemaat_data['perempuan'] = jemaat_summary.get('perempuan', 0)
+
+        kategori_summary = jemaat_summary.get('kategori', {})
+        for kategori in self.jemaat_data['kategori']:
+            self.jemaat_data['kategori'][kategori] = kategori_summary.get(kategori, 0)
+
+        sakramen_summary = jemaat_summary.get('sakramen', {})
+        for sakramen in self.sakramen_data:
+            counts = sakramen_summary.get(sakramen, {})
+            self.sakramen_data[sakramen]['sudah'] = counts.get('sudah', 0)
+            self.sakramen_data[sakramen]['belum'] = counts.get('belum', 0)
+
+        self.update()  # Trigger repaint
     
     def paintEvent(self, event):
         """Draw the statistics chart"""
@@ -555,8 +577,18 @@ class DashboardComponent(QWidget):
         try:
             # Update statistik jemaat - labels are now handled in the chart
             
-            # Update statistics chart with actual data
-            self.statistics_chart.update_data(jemaat_data if jemaat_data else [])
+            # Statistik chart diambil dari /stats/summary; hitung dari data lokal
+            # hanya jika endpoint tidak tersedia (mis. API versi lama)
+            summary = None
+            if db_manager and hasattr(db_manager, 'get_stats_summary'):
+                success, result = db_manager.get_stats_summary()
+                if success and isinstance(result, dict):
+                    summary = result
+
+            if summary and summary.get('jemaat'):
+                self.statistics_chart.update_from_summary(summary['jemaat'])
+            else:
+                self.statistics_chart.update_data(jemaat_data if jemaat_data else [])
             
             # Update jadwal hari ini
             self.update_today_schedule(kegiatan_data)
@@ -4,9 +4,11 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                             QLineEdit, QTextEdit, QDateEdit, QTimeEdit, QComboBox, QGroupBox,
                             QDialogButtonBox, QPushButton, QLabel, QDoubleSpinBox, QWidget, QScrollArea,
                             QMessageBox, QListWidget, QListWidgetItem)
-from PyQt5.QtCore import QDate, QTime, QLocale, Qt
+from PyQt5.QtCore import QDate, QTime, QLocale, Qt, QTimer
 from PyQt5.QtGui import QFont, QStandardItemModel, QStandardItem, QColor
 
+from .jemaat_search import JemaatSearchIndex
+
 class JemaatDialog(QDialog):
     """Dialog untuk menambah/edit data jemaat"""
     def __init__(self, parent=None, jemaat_data=None):
@@ -2990,6 +2992,7 @@ class PilihJemaatDialog(QDialog):
         self.db_manager = db_manager
         self.selected_jemaat = None
         self.all_jemaat = []  # Initialize to avoid AttributeError
+        self.search_index = JemaatSearchIndex(('nama_lengkap',), facet_fields=())
         self.setWindowTitle("Pilih Jemaat")
         self.setModal(True)
         self.setFixedSize(500, 400)
@@ -3003,7 +3006,12 @@ class PilihJemaatDialog(QDialog):
         search_label = QLabel("Cari:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Ketik nama untuk mencari...")
-        self.search_input.textChanged.connect(self.filter_jemaat_list)
+        # Debounce: daftar difilter setelah user berhenti mengetik
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.filter_jemaat_list(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
@@ -3081,6 +3089,7 @@ class PilihJemaatDialog(QDialog):
                 else:
                     self.all_jemaat = []
 
+                self.search_index.build(self.all_jemaat)
                 self.display_jemaat_list(self.all_jemaat)
                 # Update status label
                 if self.all_jemaat:
@@ -3118,7 +3127,7 @@ class PilihJemaatDialog(QDialog):
                 if self.all_jemaat:
                     self.status_label.setText(f"Total: {len(self.all_jemaat)} jemaat ditemukan")
             else:
-                filtered = [j for j in self.all_jemaat if text.lower() in j.get('nama_lengkap', '').lower()]
+                filtered = self.search_index.records(self.search_index.search(text))
                 self.display_jemaat_list(filtered)
                 if filtered:
                     self.status_label.setText(f"Hasil pencarian: {len(filtered)} jemaat")
@@ -336,7 +336,7 @@ class DokumenComponent(QWidget):
     def set_database_manager(self, database_manager):
         self.database_manager = database_manager
         self.load_user_cache()  # Load user cache saat database manager di-set
-        self.load_data()
+        # Data dokumen dimuat oleh PageDataLoader saat halaman dibuka
 
     def set_current_admin(self, admin_data):
         """Set the current admin data."""
@@ -1312,34 +1312,23 @@ class DokumenComponent(QWidget):
                 
                 try:
                     if self.database_manager:
-                        self.progress_bar.setValue(25)
-                        QApplication.processEvents()
-                        
-                        success, result = self.database_manager.download_file_from_api(doc_id)
-                        
-                        self.progress_bar.setValue(75)
-                        QApplication.processEvents()
-                        
+                        def update_progress(received, total):
+                            if total:
+                                self.progress_bar.setValue(int(received * 100 / total))
+                            QApplication.processEvents()
+
+                        # Streaming langsung ke file tujuan, tidak ditampung di memori
+                        success, result = self.database_manager.download_file_to_path(
+                            doc_id, save_path, update_progress
+                        )
+
                         if success:
-                            file_content = result.get('content')
-                            if file_content and isinstance(file_content, bytes):
-                                try:
-                                    with open(save_path, 'wb') as f:
-                                        f.write(file_content)
-                                    
-                                    self.progress_bar.setValue(100)
-                                    QApplication.processEvents()
-                                    
-                                    QMessageBox.information(self, "Download", 
-                                        f"File berhasil didownload ke: {save_path}")
-                                    self.log_message.emit(f"File berhasil didownload: {doc_name}")
-                                    
-                                except Exception as e:
-                                    self.log_message.emit(f"Error saving file: {str(e)}")
-                                    QMessageBox.critical(self, "Error", f"Gagal menyimpan file: {str(e)}")
-                            else:
-                                self.log_message.emit(f"ERROR: Invalid file content - type: {type(file_content)}")
-                                QMessageBox.critical(self, "Error", "Format file tidak valid dari server")
+                            self.progress_bar.setValue(100)
+                            QApplication.processEvents()
+
+                            QMessageBox.information(self, "Download", 
+                                f"File berhasil didownload ke: {save_path}")
+                            self.log_message.emit(f"File berhasil didownload: {doc_name}")
                         else:
                             QMessageBox.critical(self, "Error", f"Gagal download dokumen: {result}")
                             self.log_message.emit(f"Error download dokumen: {result}")
@@ -1,7 +1,7 @@
 # Path: server/components/jemaat.py
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                            QPushButton, QLineEdit, QTableWidget, QTableWidgetItem,
+                            QPushButton, QLineEdit, QTableView,
                             QHeaderView, QMessageBox, QFileDialog, QAbstractItemView, QFrame,
                             QScrollArea, QSplitter)
 from PyQt5.QtCore import QObject, pyqtSignal, Qt, QSize, QRect, QTimer
@@ -9,6 +9,8 @@ from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPainter
 
 # Import dialog secara langsung untuk menghindari circular import
 from .dialogs import JemaatDialog
+from .jemaat_model import JemaatTableModel, JemaatFilterProxyModel, JEMAAT_COLUMNS
+from .jemaat_import import JemaatImportWizard
 
 class WordWrapHeaderView(QHeaderView):
     """Custom header view with word wrap and center alignment support"""
@@ -86,7 +88,7 @@ class JemaatComponent(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.jemaat_data = []
+        self.all_jemaat_data = []
         self.db_manager = None
         self.current_admin = None  # Tambahkan ini
         self._pengguna_lookup = {}
@@ -131,7 +133,7 @@ class JemaatComponent(QWidget):
     def show_context_menu(self, position):
         """Tampilkan context menu untuk edit/hapus"""
         sender = self.sender()
-        if sender.rowCount() == 0:
+        if self.jemaat_proxy.rowCount() == 0:
             return
             
         from PyQt5.QtWidgets import QMenu
@@ -162,8 +164,12 @@ class JemaatComponent(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Cari umat...")
         self.search_input.setFixedWidth(300)
-        # Gunakan textChanged untuk real-time search seperti di struktur
-        self.search_input.textChanged.connect(self.filter_data)
+        # Real-time search, di-debounce supaya pencarian jalan setelah user berhenti mengetik
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.filter_data)
+        self.search_input.textChanged.connect(self.search_timer.start)
         header_layout.addWidget(self.search_input)
 
         # Filter Wilayah Rohani menggunakan QComboBox
@@ -233,6 +239,9 @@ class JemaatComponent(QWidget):
         delete_button = self.create_button("Hapus", "#c0392b", self.delete_jemaat, "server/assets/hapus.png")
         action_layout.addWidget(delete_button)
 
+        import_button = self.create_button("Import", "#8e44ad", self.import_jemaat, "server/assets/upload.png")
+        action_layout.addWidget(import_button)
+
         export_button = self.create_button(".CSV", "#16a085", self.export_jemaat, "server/assets/export.png")
         action_layout.addWidget(export_button)
 
@@ -294,7 +303,6 @@ class JemaatComponent(QWidget):
             if success:
                 # Simpan ke all_jemaat_data untuk filtering
                 self.all_jemaat_data = result.copy() if result else []
-                self.jemaat_data = result if result else []
 
                 # Reset filter dropdowns ke "Semua"
                 if hasattr(self, 'filter_wilayah'):
@@ -308,23 +316,27 @@ class JemaatComponent(QWidget):
                     self.filter_kategori.blockSignals(False)
 
                 self.populate_table()
-                self.log_message.emit(f"Data jemaat berhasil dimuat: {len(self.jemaat_data)} record")
+                self.log_message.emit(f"Data jemaat berhasil dimuat: {len(self.all_jemaat_data)} record")
                 self.data_updated.emit()
             else:
                 self.all_jemaat_data = []
-                self.jemaat_data = []
+                self.populate_table()
                 self.log_message.emit(f"Error loading jemaat data: {result}")
                 QMessageBox.warning(self, "Error", f"Gagal memuat data jemaat: {result}")
         except Exception as e:
             self.all_jemaat_data = []
-            self.jemaat_data = []
+            self.populate_table()
             self.log_message.emit(f"Exception loading jemaat data: {str(e)}")
             QMessageBox.critical(self, "Error", f"Error loading jemaat data: {str(e)}")
     
     def create_spreadsheet_grid(self, layout):
         """Create table with custom header view for proper word wrap"""
-        # Create table with 38 columns (without No column) - added No. KK and NIK, start with 0 data rows
-        self.jemaat_table = QTableWidget(0, 38)
+        # Model/view: sel diformat lazy oleh model, filter dan sort lewat proxy
+        self.jemaat_model = JemaatTableModel(self, parent=self)
+        self.jemaat_proxy = JemaatFilterProxyModel(parent=self)
+        self.jemaat_proxy.setSourceModel(self.jemaat_model)
+
+        self.jemaat_table = QTableView()
 
         # Set custom header with word wrap and center alignment
         custom_header = WordWrapHeaderView(Qt.Horizontal, self.jemaat_table)
@@ -333,7 +345,7 @@ class JemaatComponent(QWidget):
         # Show row numbers like Excel
         self.jemaat_table.verticalHeader().setVisible(True)
 
-        # Set up single-row headers (resizable)
+        # Header kolom berasal dari model (JEMAAT_COLUMNS)
         self.setup_table_headers()
 
         # Configure table styling
@@ -349,6 +361,10 @@ class JemaatComponent(QWidget):
         header.setStretchLastSection(True)  # Stretch last column
         header.setSectionsMovable(False)  # Disable column reordering
 
+        # Sorting lewat proxy; tanpa indikator awal supaya urutan API dipertahankan
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.jemaat_table.setSortingEnabled(True)
+
         # Update header height when column is resized
         header.sectionResized.connect(self.update_header_height)
 
@@ -392,29 +408,8 @@ class JemaatComponent(QWidget):
             header.setFixedHeight(max_height)
 
     def setup_table_headers(self):
-        """Set up table headers like struktur.py with proper column names"""
-        # Define all column headers in order (without No column - 38 columns total)
-        # Added No. KK after Nama Keluarga dan NIK after Nama Lengkap
-        column_headers = [
-            # DATA PRIBADI (columns 0-17)
-            "Wilayah Rohani", "Nama Keluarga", "No. KK", "Nama Lengkap", "NIK", "Tempat Lahir",
-            "Tanggal Lahir", "Umur", "Status Kekatolikan", "Kategori", "J. Kelamin",
-            "Hubungan Keluarga", "Pend. Terakhir", "Status Menikah", "Status Pekerjaan",
-            "Detail Pekerjaan", "Alamat", "Email", "No. Telepon",
-            # SAKRAMEN BABTIS (columns 19-22)
-            "Status Babtis", "Tempat Babtis", "Tanggal Babtis", "Nama Babtis",
-            # SAKRAMEN EKARISTI (columns 22-24)
-            "Status Ekaristi", "Tempat Komuni", "Tanggal Komuni",
-            # SAKRAMEN KRISMA (columns 25-27)
-            "Status Krisma", "Tempat Krisma", "Tanggal Krisma",
-            # SAKRAMEN PERKAWINAN (columns 29-34)
-            "Status Perkawinan", "Keuskupan", "Paroki", "Kota", "Tanggal Perkawinan", "Status Perkawinan Detail",
-            # STATUS (columns 35-38) - TOTAL 39 COLUMNS
-            "Status Keanggotaan", "WR Tujuan", "Paroki Tujuan", "Created By Pengguna"
-        ]
-
-        # Set column headers
-        self.jemaat_table.setHorizontalHeaderLabels(column_headers)
+        """Pasang model ke tabel; judul 39 kolom didefinisikan di jemaat_model.JEMAAT_COLUMNS"""
+        self.jemaat_table.setModel(self.jemaat_proxy)
 
         # Set initial column widths
         self.setup_column_widths()
@@ -450,7 +445,7 @@ class JemaatComponent(QWidget):
 
         # Excel-style table body styling
         table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #d4d4d4;
                 background-color: white;
                 border: 1px solid #d4d4d4;
@@ -459,16 +454,16 @@ class JemaatComponent(QWidget):
                 font-size: 9pt;
                 outline: none;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border: none;
                 padding: 4px 6px;
                 min-height: 18px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #cce7ff;
                 color: black;
             }
-            QTableWidget::item:focus {
+            QTableView::item:focus {
                 border: 2px solid #0078d4;
                 background-color: white;
             }
@@ -537,73 +532,11 @@ class JemaatComponent(QWidget):
         self.jemaat_table.setColumnWidth(38, 160)
 
     def populate_table(self):
-        """Populate table with data rows (using normal headers)"""
-        # Set row count: only data rows (headers are in QHeaderView)
-        self.jemaat_table.setRowCount(len(self.jemaat_data))
-
-        # Populate data starting from row 0
-        for index, row_data in enumerate(self.jemaat_data):
-            row_pos = index  # Start from row 0
-
-            # All data columns (0-37, tanpa kolom No) - TOTAL 38 COLUMNS with No. KK and NIK
-            data_items = [
-                # DATA PRIBADI (columns 0-17) - added No. KK and NIK
-                self.format_display(row_data.get('wilayah_rohani')),  # Column 0: Wilayah Rohani (from dropdown)
-                self.format_display(row_data.get('nama_keluarga')),  # Column 1: Nama Keluarga
-                self.format_numeric(row_data.get('no_kk')),  # Column 2: No. KK (numeric only)
-                self.format_display(row_data.get('nama_lengkap')),  # Column 3: Nama Lengkap
-                self.format_numeric(row_data.get('nik')),  # Column 4: NIK (numeric only)
-                self.format_display(row_data.get('tempat_lahir')),
-                self.format_date(row_data.get('tanggal_lahir')),
-                self.format_display(row_data.get('umur')),
-                self.format_display(row_data.get('status_kekatolikan')),
-                self.format_display(row_data.get('kategori')),
-                self.format_gender(row_data.get('jenis_kelamin')),
-                self.format_display(row_data.get('hubungan_keluarga')),
-                self.format_display(row_data.get('pendidikan_terakhir')),
-                self.format_display(row_data.get('status_menikah')),  # Status Menikah
-                self.format_display(row_data.get('jenis_pekerjaan')),
-                self.format_display(row_data.get('detail_pekerjaan')),
-                self.format_display(row_data.get('alamat')),
-                self.format_display(row_data.get('email')),
-                self.format_display(row_data.get('no_telepon')),
-                # SAKRAMEN BABTIS (columns 19-22)
-                self.format_display(row_data.get('status_babtis')),
-                self.format_display(row_data.get('tempat_babtis')),
-                self.format_date(row_data.get('tanggal_babtis')),
-                self.format_display(row_data.get('nama_babtis')),
-                # SAKRAMEN EKARISTI (columns 23-25)
-                self.format_display(row_data.get('status_ekaristi')),
-                self.format_display(row_data.get('tempat_komuni')),
-                self.format_date(row_data.get('tanggal_komuni')),
-                # SAKRAMEN KRISMA (columns 26-28)
-                self.format_display(row_data.get('status_krisma')),
-                self.format_display(row_data.get('tempat_krisma')),
-                self.format_date(row_data.get('tanggal_krisma')),
-                # SAKRAMEN PERKAWINAN (columns 29-34)
-                self.format_display(row_data.get('status_perkawinan')),
-                self.format_display(row_data.get('keuskupan')),
-                self.format_display(row_data.get('paroki')),
-                self.format_display(row_data.get('kota_perkawinan')),
-                self.format_date(row_data.get('tanggal_perkawinan')),
-                self.format_display(row_data.get('status_perkawinan_detail')),
-                # STATUS (columns 35-38) - TOTAL 39 COLUMNS
-                self.format_display(row_data.get('status_keanggotaan', 'Aktif')),
-                self.format_display(row_data.get('wr_tujuan')),
-                self.format_display(row_data.get('paroki_tujuan')),
-                self.get_creator_display(row_data)
-            ]
+        """Serahkan data ke model; sel diformat saat ditampilkan, filter aktif tetap berlaku"""
+        # Incremental: hanya baris yang berubah sejak load sebelumnya yang diindeks ulang
+        self.jemaat_model.sync_rows(self.all_jemaat_data)
+        self.filter_data()
 
-            # Add data to columns 0-37 (total 38 columns tanpa kolom No)
-            for col, item_text in enumerate(data_items):
-                item = QTableWidgetItem(item_text)
-                # Center align certain columns for better readability
-                if col in [7, 8, 9, 10, 18, 19, 22, 23, 25, 26, 28, 34]:  # Status and categorical columns
-                    item.setTextAlignment(Qt.AlignCenter)
-                else:
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                self.jemaat_table.setItem(row_pos, col, item)
-    
     def format_numeric(self, value, default='-'):
         """Format numeric value (NIK, NO_KK) untuk display, hanya menampilkan angka saja"""
         if value is None:
@@ -985,26 +918,30 @@ class JemaatComponent(QWidget):
             self.log_message.emit(f"Exception adding jemaat: {error_str}")
     
     def get_selected_row(self):
-        """Get currently selected row index"""
-        current_row = self.jemaat_table.currentRow()
-        # No adjustment needed with normal headers
-        if current_row >= 0:
-            return current_row
+        """Get currently selected row index (urutan tampilan)"""
+        current = self.jemaat_table.currentIndex()
+        if current.isValid():
+            return current.row()
         return -1  # Invalid selection
+
+    def get_selected_jemaat(self):
+        """Data jemaat pada baris terpilih, None jika tidak ada"""
+        current_row = self.get_selected_row()
+        if current_row < 0:
+            return None
+        return self.jemaat_proxy.row_data(current_row)
     
     def edit_jemaat(self):
         """Edit jemaat terpilih"""
-        current_row = self.get_selected_row()
-        if current_row < 0:
+        if self.get_selected_row() < 0:
             QMessageBox.warning(self, "Warning", "Pilih jemaat yang akan diedit")
             return
         
-        if current_row >= len(self.jemaat_data):
+        jemaat_data = self.get_selected_jemaat()
+        if not jemaat_data:
             QMessageBox.warning(self, "Error", "Data tidak valid")
             return
         
-        jemaat_data = self.jemaat_data[current_row]
-        
         dialog = JemaatDialog(self, jemaat_data)
         if dialog.exec_() == dialog.Accepted:
             data = dialog.get_data()
@@ -1106,16 +1043,14 @@ class JemaatComponent(QWidget):
     
     def delete_jemaat(self):
         """Hapus jemaat terpilih"""
-        current_row = self.get_selected_row()
-        if current_row < 0:
+        if self.get_selected_row() < 0:
             QMessageBox.warning(self, "Warning", "Pilih jemaat yang akan dihapus")
             return
         
-        if current_row >= len(self.jemaat_data):
+        jemaat_data = self.get_selected_jemaat()
+        if not jemaat_data:
             QMessageBox.warning(self, "Error", "Data tidak valid")
             return
-        
-        jemaat_data = self.jemaat_data[current_row]
         nama = jemaat_data.get('nama_lengkap', 'Unknown')
         
         reply = QMessageBox.question(self, 'Konfirmasi',
@@ -1149,154 +1084,96 @@ class JemaatComponent(QWidget):
     
     def filter_data(self):
         """Filter data jemaat berdasarkan keyword pencarian dan dropdown filters"""
-        search_text = self.search_input.text().lower().strip()
+        search_text = self.search_input.text()
 
         # Get selected filter values from comboboxes
         filter_wilayah = self.filter_wilayah.currentText() if hasattr(self, 'filter_wilayah') else "Semua"
         filter_kategori = self.filter_kategori.currentText() if hasattr(self, 'filter_kategori') else "Semua"
 
-        # Simpan data asli jika belum disimpan
-        if not hasattr(self, 'all_jemaat_data') or not self.all_jemaat_data:
-            self.all_jemaat_data = self.jemaat_data.copy() if self.jemaat_data else []
-
-        # Mulai dengan semua data
-        filtered_data = self.all_jemaat_data.copy()
-
-        # Filter berdasarkan Wilayah Rohani jika dipilih
-        if filter_wilayah != "Semua":
-            filtered_data = [data for data in filtered_data
-                           if (data.get('wilayah_rohani') or '').strip() == filter_wilayah]
-
-        # Filter berdasarkan Kategori jika dipilih
-        if filter_kategori != "Semua":
-            filtered_data = [data for data in filtered_data
-                           if (data.get('kategori') or '').strip() == filter_kategori]
-
-        # Filter berdasarkan keyword pencarian jika ada
-        if search_text:
-            search_filtered = []
-            for data in filtered_data:
-                # Cari di berbagai field - handle None values
-                nama_lengkap = (data.get('nama_lengkap') or '').lower()
-                wilayah_rohani = (data.get('wilayah_rohani') or '').lower()
-                nama_keluarga = (data.get('nama_keluarga') or '').lower()
-                tempat_lahir = (data.get('tempat_lahir') or '').lower()
-                kategori = (data.get('kategori') or '').lower()
-                jenis_kelamin = (data.get('jenis_kelamin') or '').lower()
-                hubungan_keluarga = (data.get('hubungan_keluarga') or '').lower()
-                alamat = (data.get('alamat') or '').lower()
-                email = (data.get('email') or '').lower()
-                status_keanggotaan = (data.get('status_keanggotaan') or '').lower()
-
-                # Search di semua field yang relevan
-                if (search_text in nama_lengkap or
-                    search_text in wilayah_rohani or
-                    search_text in nama_keluarga or
-                    search_text in tempat_lahir or
-                    search_text in kategori or
-                    search_text in jenis_kelamin or
-                    search_text in hubungan_keluarga or
-                    search_text in alamat or
-                    search_text in email or
-                    search_text in status_keanggotaan):
-                    search_filtered.append(data)
-
-            filtered_data = search_filtered
-
-        # Update display dengan data yang difilter
-        self.jemaat_data = filtered_data
-        self.populate_table()
+        self.search_timer.stop()
+
+        # Proxy hanya menyembunyikan baris (lewat search index); grid tidak dibangun ulang
+        self.jemaat_proxy.set_filters(
+            search=search_text,
+            equals={'wilayah_rohani': filter_wilayah, 'kategori': filter_kategori}
+        )
 
     
     def export_jemaat(self):
-        """Export data jemaat ke file CSV"""
-        if not self.jemaat_data:
+        """Export data jemaat (sesuai filter aktif) ke CSV/XLSX, di-stream dari server"""
+        if self.jemaat_proxy.rowCount() == 0:
             QMessageBox.warning(self, "Warning", "Tidak ada data untuk diekspor")
             return
         
         try:
-            import csv
-            
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "Export Data Jemaat", "data_jemaat.csv", "CSV Files (*.csv)"
+            filename, selected_filter = QFileDialog.getSaveFileName(
+                self, "Export Data Jemaat", "data_jemaat.csv",
+                "CSV Files (*.csv);;Excel Files (*.xlsx)"
             )
             
             if filename:
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = [
-                        'Nama Lengkap', 'Wilayah Rohani', 'Nama Keluarga', 'Tempat Lahir',
-                        'Tanggal Lahir', 'Umur', 'Status Kekatolikan', 'Jenis Kelamin', 'Hubungan Keluarga', 'Pendidikan Terakhir',
-                        'Jenis Pekerjaan', 'Detail Pekerjaan', 'Status Menikah', 'Alamat', 'Email', 'No. Telepon',
-                        'Status Babtis', 'Tempat Babtis', 'Tanggal Babtis', 'Nama Babtis',
-                        'Status Ekaristi', 'Tempat Komuni', 'Tanggal Komuni',
-                        'Status Krisma', 'Tempat Krisma', 'Tanggal Krisma',
-                        'Status Perkawinan', 'Keuskupan', 'Paroki', 'Kota Perkawinan',
-                        'Tanggal Perkawinan', 'Status Perkawinan Detail', 'Status Keanggotaan',
-                        'WR Tujuan', 'Paroki Tujuan',
-                        'Created By Pengguna'
-                    ]
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for data in self.jemaat_data:
-                        writer.writerow({
-                            'Nama Lengkap': self.format_display(data.get('nama_lengkap')),
-                            'Wilayah Rohani': self.format_display(data.get('wilayah_rohani')),
-                            'Nama Keluarga': self.format_display(data.get('nama_keluarga')),
-                            'Tempat Lahir': self.format_display(data.get('tempat_lahir')),
-                            'Tanggal Lahir': self.format_date(data.get('tanggal_lahir')),
-                            'Umur': self.format_display(data.get('umur')),
-                            'Status Kekatolikan': self.format_display(data.get('status_kekatolikan')),
-                            'Jenis Kelamin': self.format_gender(data.get('jenis_kelamin')),
-                            'Hubungan Keluarga': self.format_display(data.get('hubungan_keluarga')),
-                            'Pendidikan Terakhir': self.format_display(data.get('pendidikan_terakhir')),
-                            'Jenis Pekerjaan': self.format_display(data.get('jenis_pekerjaan')),
-                            'Detail Pekerjaan': self.format_display(data.get('detail_pekerjaan')),
-                            'Status Menikah': self.format_display(data.get('status_menikah')),  # Status Menikah
-                            'Alamat': self.format_display(data.get('alamat')),
-                            'Email': self.format_display(data.get('email')),
-                            'No. Telepon': self.format_display(data.get('no_telepon')),
-                            'Status Babtis': self.format_display(data.get('status_babtis')),
-                            'Tempat Babtis': self.format_display(data.get('tempat_babtis')),
-                            'Tanggal Babtis': self.format_date(data.get('tanggal_babtis')),
-                            'Nama Babtis': self.format_display(data.get('nama_babtis')),
-                            'Status Ekaristi': self.format_display(data.get('status_ekaristi')),
-                            'Tempat Komuni': self.format_display(data.get('tempat_komuni')),
-                            'Tanggal Komuni': self.format_date(data.get('tanggal_komuni')),
-                            'Status Krisma': self.format_display(data.get('status_krisma')),
-                            'Tempat Krisma': self.format_display(data.get('tempat_krisma')),
-                            'Tanggal Krisma': self.format_date(data.get('tanggal_krisma')),
-                            'Status Perkawinan': self.format_display(data.get('status_perkawinan')),
-                            'Keuskupan': self.format_display(data.get('keuskupan')),
-                            'Paroki': self.format_display(data.get('paroki')),
-                            'Kota Perkawinan': self.format_display(data.get('kota_perkawinan')),
-                            'Tanggal Perkawinan': self.format_date(data.get('tanggal_perkawinan')),
-                            'Status Perkawinan Detail': self.format_display(data.get('status_perkawinan_detail')),
-                            'Status Keanggotaan': self.format_display(data.get('status_keanggotaan')),
-                            'WR Tujuan': self.format_display(data.get('wr_tujuan')),
-                            'Paroki Tujuan': self.format_display(data.get('paroki_tujuan')),
-                            'Created By Pengguna': self.get_creator_display(data)
-                        })
-                
-                QMessageBox.information(self, "Sukses", f"Data berhasil diekspor ke {filename}")
-                self.log_message.emit(f"Data jemaat diekspor ke: {filename}")
+                fmt = 'xlsx' if filename.lower().endswith('.xlsx') or 'xlsx' in selected_filter else 'csv'
+
+                # Kolom sama dengan grid
+                columns = [field or 'dibuat_oleh' for _, field, _ in JEMAAT_COLUMNS]
+                labels = [header for header, _, _ in JEMAAT_COLUMNS]
+                params = {'columns': ','.join(columns), 'labels': ','.join(labels), 'is_admin': 'true'}
+                ids = None
+                if self.search_input.text().strip():
+                    # Pencarian grid (substring di semua DEFAULT_SEARCH_FIELDS) tidak sama dengan
+                    # indeks token server: export tepat baris yang sedang tampil
+                    ids = [row.get('id_jemaat') for row in self.jemaat_proxy.visible_rows()
+                           if row.get('id_jemaat') is not None]
+                else:
+                    for field, combo in (('wilayah_rohani', 'filter_wilayah'), ('kategori', 'filter_kategori')):
+                        value = getattr(self, combo).currentText() if hasattr(self, combo) else "Semua"
+                        if value and value != "Semua":
+                            params[field] = value
+
+                success, result = self.db_manager.export_to_file('jemaat', filename, fmt, params, ids=ids)
+                if success:
+                    QMessageBox.information(self, "Sukses", f"Data berhasil diekspor ke {filename}")
+                    self.log_message.emit(f"Data jemaat diekspor ke: {filename}")
+                else:
+                    QMessageBox.critical(self, "Error", f"Error export data: {result}")
+                    self.log_message.emit(f"Error exporting jemaat: {result}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error export data: {str(e)}")
             self.log_message.emit(f"Exception exporting jemaat: {str(e)}")
     
     
+    def import_jemaat(self):
+        """Import massal jemaat dari CSV/XLSX/JSON lines lewat wizard (validasi dulu, lalu simpan)"""
+        if not self.db_manager:
+            QMessageBox.warning(self, "Error", "Database tidak tersedia")
+            return
+        admin_id = self.current_admin.get('id_admin') if self.current_admin else None
+        if not admin_id:
+            QMessageBox.critical(self, "Error", "Data admin tidak ditemukan. Silakan login ulang.")
+            return
+
+        wilayah_list = [self.filter_wilayah.itemText(i) for i in range(1, self.filter_wilayah.count())]
+        wilayah_list += [row.get('wilayah_rohani') for row in self.all_jemaat_data if row.get('wilayah_rohani')]
+        wizard = JemaatImportWizard(self.db_manager, admin_id, wilayah_list, self)
+        wizard.imported.connect(self.on_jemaat_imported)
+        wizard.exec_()
+
+    def on_jemaat_imported(self, report):
+        self.log_message.emit(f"Import jemaat: {report.get('inserted', 0)} data tersimpan, "
+                              f"{report.get('failed', 0)} baris gagal")
+        if report.get('inserted'):
+            self.load_data()
+
     def view_jemaat_details(self):
         """View detailed information of selected jemaat"""
-        current_row = self.get_selected_row()
-        if current_row < 0:
+        if self.get_selected_row() < 0:
             QMessageBox.warning(self, "Warning", "Pilih jemaat untuk melihat detail")
             return
         
-        if current_row >= len(self.jemaat_data):
+        jemaat_data = self.get_selected_jemaat()
+        if not jemaat_data:
             QMessageBox.warning(self, "Error", "Data tidak valid")
             return
-        
-        jemaat_data = self.jemaat_data[current_row]
         nama = jemaat_data.get('nama_lengkap', 'Unknown')
         
         # Create detailed view dialog
@@ -1373,5 +1250,5 @@ class JemaatComponent(QWidget):
         dialog.exec_()
     
     def get_data(self):
-        """Ambil data jemaat untuk komponen lain"""
-        return self.jemaat_data
+        """Ambil data jemaat (yang sedang tampil) untuk komponen lain"""
+        return self.jemaat_proxy.visible_rows()
@@ -0,0 +1,297 @@
+# Path: server/components/jemaat_import.py
+# Wizard import massal jemaat (CSV/XLSX/JSON lines) lewat POST /jemaat/import.
+#
+# Langkah: 1) pilih file dan opsi, 2) validasi di server tanpa menyimpan
+# (dry run) dan tampilkan error/peringatan per baris, 3) import sungguhan.
+# Request berjalan di QThread supaya UI tidak membeku selama ribuan baris
+# divalidasi/disimpan.
+
+import csv
+
+from PyQt5.QtWidgets import (QWizard, QWizardPage, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel,
+                             QLineEdit, QPushButton, QComboBox, QCheckBox, QRadioButton, QButtonGroup,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox,
+                             QProgressBar, QAbstractItemView)
+from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtGui import QColor
+
+DEFAULT_WILAYAH_TEXT = "(sesuai kolom di file)"
+ENCODINGS = [("UTF-8", None), ("Windows-1252 (CSV Excel lama)", "cp1252")]
+
+# Worker yang masih berjalan setelah halaman/wizard ditutup tetap direferensikan
+# sampai selesai (QThread yang terhapus saat berjalan membuat aplikasi crash)
+_running_workers = set()
+
+
+class ImportWorker(QThread):
+    """Jalankan satu request import di background"""
+    done = pyqtSignal(bool, object, object)  # success, laporan/pesan, laporan sementara
+
+    def __init__(self, db_manager, file_path, user_id, dry_run, options):
+        super().__init__()
+        self.db_manager = db_manager
+        self.file_path = file_path
+        self.user_id = user_id
+        self.dry_run = dry_run
+        self.options = options
+
+    def run(self):
+        try:
+            success, data, report = self.db_manager.import_jemaat(self.file_path, self.user_id,
+                                                                  dry_run=self.dry_run, **self.options)
+        except Exception as e:
+            success, data, report = False, str(e), None
+        self.done.emit(success, data, report)
+
+
+def _fill_report_table(table, rows):
+    table.setRowCount(len(rows))
+    for index, row in enumerate(rows):
+        errors = row.get('errors') or []
+        warnings = row.get('warnings') or []
+        items = [
+            QTableWidgetItem(str(row.get('row', ''))),
+            QTableWidgetItem(row.get('nama_lengkap') or '-'),
+            QTableWidgetItem('Error' if errors else 'Peringatan'),
+            QTableWidgetItem('; '.join(errors + warnings)),
+        ]
+        color = QColor('#fdecea') if errors else QColor('#fff8e1')
+        for column, item in enumerate(items):
+            item.setBackground(color)
+            table.setItem(index, column, item)
+
+
+def _report_table():
+    table = QTableWidget(0, 4)
+    table.setHorizontalHeaderLabels(["Baris", "Nama Lengkap", "Jenis", "Keterangan"])
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    table.verticalHeader().setVisible(False)
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+    header.setSectionResizeMode(1, QHeaderView.Interactive)
+    header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+    header.setSectionResizeMode(3, QHeaderView.Stretch)
+    table.setColumnWidth(1, 200)
+    return table
+
+
+class FilePage(QWizardPage):
+    def __init__(self, wilayah_list, parent=None):
+        super().__init__(parent)
+        self.setTitle("Pilih File")
+        self.setSubTitle("File CSV, XLSX, atau JSON lines dengan header kolom (sama dengan hasil export .CSV). "
+                         "Kolom Nama Lengkap wajib ada; NIK dan No. KK ditulis sebagai teks 16 digit.")
+
+        layout = QFormLayout(self)
+
+        file_row = QHBoxLayout()
+        self.file_input = QLineEdit()
+        self.file_input.setReadOnly(True)
+        self.file_input.setPlaceholderText("Belum ada file dipilih")
+        browse_button = QPushButton("Pilih...")
+        browse_button.clicked.connect(self.browse)
+        file_row.addWidget(self.file_input)
+        file_row.addWidget(browse_button)
+        layout.addRow("File:", file_row)
+        self.registerField("file_path*", self.file_input)
+
+        self.encoding_input = QComboBox()
+        for label, _ in ENCODINGS:
+            self.encoding_input.addItem(label)
+        layout.addRow("Encoding CSV:", self.encoding_input)
+
+        self.wilayah_input = QComboBox()
+        self.wilayah_input.setEditable(True)
+        self.wilayah_input.addItem(DEFAULT_WILAYAH_TEXT)
+        self.wilayah_input.addItems(wilayah_list)
+        layout.addRow("Wilayah Rohani default:", self.wilayah_input)
+
+        self.allow_new_wilayah = QCheckBox("Terima wilayah rohani yang belum terdaftar")
+        layout.addRow("", self.allow_new_wilayah)
+
+        self.skip_errors = QRadioButton("Simpan baris yang valid, lewati baris yang error")
+        self.abort_on_error = QRadioButton("Batalkan seluruh import jika ada satu baris error")
+        self.skip_errors.setChecked(True)
+        mode_group = QButtonGroup(self)
+        mode_group.addButton(self.skip_errors)
+        mode_group.addButton(self.abort_on_error)
+        layout.addRow("Jika ada error:", self.skip_errors)
+        layout.addRow("", self.abort_on_error)
+
+    def browse(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Pilih File Import Jemaat", "",
+            "Data Jemaat (*.csv *.xlsx *.jsonl *.ndjson);;CSV Files (*.csv);;Excel Files (*.xlsx);;JSON Lines (*.jsonl *.ndjson)"
+        )
+        if filename:
+            self.file_input.setText(filename)
+
+    def import_options(self):
+        wilayah = self.wilayah_input.currentText().strip()
+        return {
+            'on_error': 'abort' if self.abort_on_error.isChecked() else 'skip',
+            'wilayah_rohani': wilayah if wilayah and wilayah != DEFAULT_WILAYAH_TEXT else None,
+            'allow_new_wilayah': self.allow_new_wilayah.isChecked(),
+            'encoding': ENCODINGS[self.encoding_input.currentIndex()][1],
+        }
+
+
+class RunPage(QWizardPage):
+    """Halaman yang menjalankan satu request import (dry run atau sungguhan)"""
+
+    def __init__(self, dry_run, parent=None):
+        super().__init__(parent)
+        self.dry_run = dry_run
+        self.worker = None
+        self.report = None
+        self.success = False
+        if dry_run:
+            self.setTitle("Validasi")
+            self.setSubTitle("File diperiksa di server tanpa menyimpan data.")
+        else:
+            self.setTitle("Import")
+            self.setSubTitle("Data jemaat disimpan ke server.")
+
+        layout = QVBoxLayout(self)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        layout.addWidget(self.progress)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary_label)
+        self.table = _report_table()
+        layout.addWidget(self.table)
+
+        button_row = QHBoxLayout()
+        button_row.addStretch()
+        self.save_button = QPushButton("Simpan Laporan...")
+        self.save_button.clicked.connect(self.save_report)
+        self.save_button.setEnabled(False)
+        button_row.addWidget(self.save_button)
+        layout.addLayout(button_row)
+
+    def initializePage(self):
+        wizard = self.wizard()
+        self.report = None
+        self.success = False
+        self.table.setRowCount(0)
+        self.save_button.setEnabled(False)
+        self.progress.setVisible(True)
+        self.summary_label.setText("Memvalidasi file..." if self.dry_run else "Mengimport data...")
+        worker = ImportWorker(wizard.db_manager, self.field("file_path"), wizard.user_id, self.dry_run,
+                              wizard.file_page.import_options())
+        worker.done.connect(self.on_done)
+        worker.finished.connect(lambda: _running_workers.discard(worker))
+        _running_workers.add(worker)
+        self.worker = worker
+        worker.start()
+        self.completeChanged.emit()
+
+    def cleanupPage(self):
+        # Kembali ke halaman sebelumnya: hasil request yang masih berjalan diabaikan
+        self.abandon()
+
+    def abandon(self):
+        if self.worker is not None:
+            self.worker.done.disconnect(self.on_done)
+        self.worker = None
+
+    def on_done(self, success, data, report):
+        self.worker = None
+        self.progress.setVisible(False)
+        self.success = success
+        self.report = data if success else report
+        if not success:
+            self.summary_label.setText(f"<b>Gagal:</b> {data}")
+        else:
+            self.summary_label.setText(self._summary(data))
+        rows = (self.report or {}).get('rows') or []
+        _fill_report_table(self.table, rows)
+        self.save_button.setEnabled(bool(rows))
+        if success and not self.dry_run:
+            self.wizard().imported.emit(data)
+        self.completeChanged.emit()
+
+    def _summary(self, report):
+        lines = [
+            f"Total baris: <b>{report['total_rows']}</b> &nbsp; Valid: <b>{report['valid_rows']}</b> &nbsp; "
+            f"Error: <b>{report['failed']}</b> &nbsp; Dengan peringatan: <b>{report['warning_rows']}</b>"
+        ]
+        if not self.dry_run:
+            if report['committed']:
+                lines.append(f"<b>{report['inserted']}</b> jemaat tersimpan ({report['seconds']} detik).")
+            else:
+                lines.append("<b>Import dibatalkan</b>, tidak ada data yang disimpan.")
+        elif report['on_error'] == 'abort' and report['failed']:
+            lines.append("Mode 'batalkan jika ada error': perbaiki file dulu, import tidak bisa dilanjutkan.")
+        elif report['valid_rows']:
+            lines.append(f"Klik Next untuk menyimpan {report['valid_rows']} baris yang valid.")
+        if report.get('ignored_columns'):
+            lines.append(f"Kolom diabaikan: {', '.join(report['ignored_columns'])}")
+        if report.get('new_wilayah'):
+            lines.append(f"Wilayah rohani baru: {', '.join(report['new_wilayah'])}")
+        if report.get('rows_truncated'):
+            lines.append(f"Hanya {len(report['rows'])} baris pertama yang bermasalah ditampilkan.")
+        return "<br>".join(lines)
+
+    def isComplete(self):
+        if self.worker is not None or not self.success or not self.report:
+            return False
+        if self.dry_run:
+            if self.report['on_error'] == 'abort' and self.report['failed']:
+                return False
+            return self.report['valid_rows'] > 0
+        return True
+
+    def save_report(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Simpan Laporan Import", "laporan_import_jemaat.csv",
+                                                  "CSV Files (*.csv)")
+        if not filename:
+            return
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(["Baris", "Nama Lengkap", "Error", "Peringatan"])
+                for row in self.report.get('rows') or []:
+                    writer.writerow([row.get('row'), row.get('nama_lengkap') or '',
+                                     '; '.join(row.get('errors') or []), '; '.join(row.get('warnings') or [])])
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Gagal menyimpan laporan: {e}")
+
+
+class JemaatImportWizard(QWizard):
+    imported = pyqtSignal(object)  # laporan import yang berhasil disimpan
+
+    def __init__(self, db_manager, user_id, wilayah_list=None, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.user_id = user_id
+        self.setWindowTitle("Import Data Jemaat")
+        self.setWizardStyle(QWizard.ModernStyle)
+        self.setOption(QWizard.NoBackButtonOnLastPage, True)
+        self.setOption(QWizard.NoCancelButtonOnLastPage, True)
+        self.resize(900, 600)
+
+        self.file_page = FilePage(sorted(set(wilayah_list or [])))
+        self.validate_page = RunPage(dry_run=True)
+        self.import_page = RunPage(dry_run=False)
+        self.addPage(self.file_page)
+        self.addPage(self.validate_page)
+        self.addPage(self.import_page)
+        self.setButtonText(QWizard.NextButton, "Next >")
+        self.currentIdChanged.connect(self._update_buttons)
+
+    def _update_buttons(self, page_id):
+        # Tombol Next di halaman validasi berarti "simpan ke server"
+        if self.page(page_id) is self.validate_page:
+            self.setButtonText(QWizard.NextButton, "Import >")
+        else:
+            self.setButtonText(QWizard.NextButton, "Next >")
+
+    def reject(self):
+        if self.import_page.worker is not None:
+            QMessageBox.information(self, "Import", "Import sedang berjalan, tunggu sampai selesai.")
+            return
+        self.validate_page.abandon()
+        super().reject()
@@ -0,0 +1,220 @@
+# Path: server/components/jemaat_search.py
+# Indeks pencarian in-memory untuk data jemaat di aplikasi desktop.
+#
+# Dibangun sekali per load data lalu diperbarui incremental (add/update/remove).
+# Teks dinormalisasi (huruf kecil, tanpa diakritik) lalu dipecah menjadi token;
+# setiap token dipetakan ke dokumen yang memuatnya, dan setiap trigram ke token
+# yang memuatnya. Kata kunci >= 3 huruf dicari lewat trigram -> token ->
+# dokumen, kata kunci pendek (atau kandidat yang sudah sedikit) dicek langsung
+# ke teks ternormalisasi. Semantik tetap "substring" seperti filter lama:
+# setiap kata kunci harus muncul di salah satu field yang diindeks.
+#
+# Facet (wilayah_rohani, kategori) disimpan sebagai set id dokumen per nilai,
+# sehingga filter dropdown hanya berupa irisan set.
+#
+# Modul ini tanpa dependensi Qt; client/components/jemaat_search.py adalah
+# salinannya untuk build client.
+
+import re
+import unicodedata
+
+_TOKEN_RE = re.compile(r'\w+')
+
+DEFAULT_FACET_FIELDS = ('wilayah_rohani', 'kategori')
+
+# Di bawah jumlah kandidat ini, cek substring langsung lebih murah daripada indeks
+SCAN_THRESHOLD = 256
+
+
+def normalize(value):
+    """Huruf kecil tanpa diakritik ('Agustínus' -> 'agustinus')"""
+    if value is None:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    if not text.isascii():
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return text.casefold()
+
+
+def tokenize(value):
+    return _TOKEN_RE.findall(normalize(value))
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class JemaatSearchIndex:
+    """Indeks token/trigram + facet untuk list dict jemaat.
+
+    Setiap record mendapat id dokumen (int, tidak pernah dipakai ulang) yang
+    dikembalikan oleh build()/add(). search() mengembalikan set id dokumen.
+    """
+
+    def __init__(self, fields, facet_fields=DEFAULT_FACET_FIELDS):
+        self.fields = tuple(fields)
+        self.facet_fields = tuple(facet_fields)
+        self.clear()
+
+    def clear(self):
+        self._records = []  # doc -> record (None jika sudah dihapus)
+        self._texts = []  # doc -> teks ternormalisasi semua field
+        self._doc_tokens = []  # doc -> set token
+        self._doc_facets = []  # doc -> {field: nilai}
+        self._postings = {}  # token -> set doc
+        self._grams = None  # trigram -> set token, dibangun saat pertama dibutuhkan
+        self._facets = {field: {} for field in self.facet_fields}  # field -> nilai -> set doc
+        self._live = set()
+        self.version = 0  # naik setiap kali isi indeks berubah
+
+    def __len__(self):
+        return len(self._live)
+
+    def build(self, records):
+        """Bangun ulang indeks. Return list id dokumen sesuai urutan records."""
+        self.clear()
+        return [self.add(record) for record in records]
+
+    def add(self, record):
+        doc = len(self._records)
+        self._records.append(None)
+        self._texts.append('')
+        self._doc_tokens.append(set())
+        self._doc_facets.append({})
+        self._index(doc, record)
+        return doc
+
+    def update(self, doc, record):
+        self._unindex(doc)
+        self._index(doc, record)
+
+    def remove(self, doc):
+        self._unindex(doc)
+        self._records[doc] = None
+        self._texts[doc] = ''
+
+    def record(self, doc):
+        return self._records[doc]
+
+    def records(self, docs):
+        """Record untuk id dokumen, urut sesuai urutan data"""
+        return [self._records[doc] for doc in sorted(docs)]
+
+    def _index(self, doc, record):
+        # Satu kali normalisasi per record (bukan per field)
+        text = normalize('\x00'.join(
+            '' if value is None else str(value)
+            for value in (record.get(field) for field in self.fields)
+        ))
+        tokens = set(_TOKEN_RE.findall(text))
+
+        self._records[doc] = record
+        self._texts[doc] = text
+        self._doc_tokens[doc] = tokens
+        postings = self._postings
+        for token in tokens:
+            docs = postings.get(token)
+            if docs is None:
+                postings[token] = {doc}
+                if self._grams is not None:
+                    self._add_grams(token)
+            else:
+                docs.add(doc)
+
+        facets = {}
+        for field in self.facet_fields:
+            value = (record.get(field) or '').strip()
+            self._facets[field].setdefault(value, set()).add(doc)
+            facets[field] = value
+        self._doc_facets[doc] = facets
+
+        self._live.add(doc)
+        self.version += 1
+
+    def _unindex(self, doc):
+        if doc not in self._live:
+            return
+        for token in self._doc_tokens[doc]:
+            docs = self._postings[token]
+            docs.discard(doc)
+            if not docs:
+                del self._postings[token]
+                if self._grams is not None:
+                    self._remove_grams(token)
+        self._doc_tokens[doc] = set()
+
+        for field, value in self._doc_facets[doc].items():
+            docs = self._facets[field][value]
+            docs.discard(doc)
+            if not docs:
+                del self._facets[field][value]
+        self._doc_facets[doc] = {}
+
+        self._live.discard(doc)
+        self.version += 1
+
+    def _add_grams(self, token):
+        add_gram = self._grams.setdefault
+        for i in range(len(token) - 2):
+            add_gram(token[i:i + 3], set()).add(token)
+
+    def _remove_grams(self, token):
+        for gram in _trigrams(token):
+            tokens = self._grams[gram]
+            tokens.discard(token)
+            if not tokens:
+                del self._grams[gram]
+
+    def warm_up(self):
+        """Bangun indeks trigram sekarang (biasanya dijadwalkan setelah tabel tampil)"""
+        # Trigram hanya dibutuhkan kata kunci >= 3 huruf; tidak ikut memperlambat load
+        if self._grams is None:
+            self._grams = {}
+            for token in self._postings:
+                self._add_grams(token)
+
+    def facet_counts(self, field):
+        """{nilai: jumlah dokumen} untuk satu field facet"""
+        return {value: len(docs) for value, docs in self._facets[field].items()}
+
+    def search(self, text='', facets=None):
+        """Set id dokumen yang cocok dengan semua kata kunci dan facet.
+
+        facets: {field: nilai}; nilai kosong/None/'Semua' berarti tanpa filter.
+        """
+        candidates = None
+        for field, value in (facets or {}).items():
+            if not value or value == "Semua":
+                continue
+            docs = self._facets[field].get(value.strip(), set())
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return set()
+
+        # Kata kunci terpanjang biasanya paling selektif
+        for term in sorted(set(tokenize(text)), key=len, reverse=True):
+            candidates = self._match(term, candidates)
+            if not candidates:
+                return set()
+
+        return set(self._live) if candidates is None else set(candidates)
+
+    def _match(self, term, candidates):
+        if len(term) < 3 or (candidates is not None and len(candidates) <= SCAN_THRESHOLD):
+            pool = self._live if candidates is None else candidates
+            texts = self._texts
+            return {doc for doc in pool if term in texts[doc]}
+
+        self.warm_up()
+        tokens = None
+        for gram in _trigrams(term):
+            matched = self._grams.get(gram)
+            if not matched:
+                return set()
+            tokens = matched if tokens is None else tokens & matched
+
+        docs = set()
+        for token in tokens:
+            if term in token:
+                docs |= self._postings[token]
+        return docs if candidates is None else docs & candidates
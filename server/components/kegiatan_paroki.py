@@ -29,9 +29,7 @@ class ProgramKerjaKegiatanParokiWidget(QWidget):
     def set_database_manager(self, db_manager):
         """Set database manager"""
         self.db_manager = db_manager
-        # Load data segera setelah database manager di-set
-        if self.db_manager:
-            self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def setup_ui(self):
         """Setup UI untuk halaman jadwal"""
@@ -28,8 +28,7 @@ class KegiatanWRWidget(QWidget):
     def set_database_manager(self, db_manager):
         """Set database manager"""
         self.db_manager = db_manager
-        if db_manager:
-            self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def setup_ui(self):
         """Setup UI untuk kegiatan WR"""
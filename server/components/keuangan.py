@@ -183,7 +183,7 @@ class KeuanganWRWidget(QWidget):
         self.keuangan_data = []
         self.filtered_data = []
         self.setup_ui()
-        self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -594,7 +594,7 @@ class KeuanganKategorialWidget(QWidget):
         self.filtered_data = []
         self.sorted_data = []  # Data sorted untuk display
         self.setup_ui()
-        self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -1363,7 +1363,7 @@ Jumlah: Rp {jumlah:,.0f}
             QMessageBox.critical(self, "Error", f"Error menghapus transaksi: {str(e)}")
 
     def export_to_excel(self):
-        """Export keuangan kategorial data to Excel file"""
+        """Export keuangan kategorial ke Excel, di-stream langsung dari server"""
         if not self.filtered_data:
             QMessageBox.warning(self, "Warning", "Tidak ada data untuk diekspor")
             return
@@ -1380,191 +1380,29 @@ Jumlah: Rp {jumlah:,.0f}
             if not file_path:
                 return
 
-            # Try to import openpyxl
-            try:
-                from openpyxl import Workbook
-                from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-            except ImportError:
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    "Library openpyxl tidak ditemukan.\nInstall dengan: pip install openpyxl"
-                )
+            # Filter sama dengan tabel; urutan id dan saldo berjalan dihitung server
+            params = {
+                'columns': 'no,tanggal,jenis,kategori,keterangan,jumlah,saldo',
+                'labels': 'No,Tanggal,Jenis,Kategori,Keterangan,Jumlah (Rp),Saldo',
+                'summary': '1',
+            }
+            jenis = self.jenis_filter.currentText()
+            if jenis != "Semua":
+                params['jenis'] = jenis
+            search = self.search_input.text().strip()
+            if search:
+                params['keterangan__contains'] = search
+
+            success, result = self.db_manager.export_to_file('keuangan_kategorial', file_path, 'xlsx', params)
+            if not success:
+                QMessageBox.critical(self, "Error", f"Gagal mengekspor data:\n{result}")
+                self.log_message.emit(f"Error export data: {result}")
                 return
 
-            # Create workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Keuangan Kategorial"
-
-            # Define styles
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            header_fill = PatternFill(start_color="2c3e50", end_color="2c3e50", fill_type="solid")
-            header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-            border_style = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-
-            # Write headers
-            headers = ["No", "Tanggal", "Jenis", "Kategori", "Keterangan", "Jumlah (Rp)", "Saldo"]
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_idx)
-                cell.value = str(header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-                cell.border = border_style
-
-            # Set column widths
-            ws.column_dimensions['A'].width = 5  # type: ignore
-            ws.column_dimensions['B'].width = 12  # type: ignore
-            ws.column_dimensions['C'].width = 12  # type: ignore
-            ws.column_dimensions['D'].width = 20  # type: ignore
-            ws.column_dimensions['E'].width = 35  # type: ignore
-            ws.column_dimensions['F'].width = 15  # type: ignore
-            ws.column_dimensions['G'].width = 15  # type: ignore
-
-            # Sort data by ID for correct running balance
-            sorted_data = sorted(self.filtered_data, key=lambda x: x.get('id_keuangan_kategorial', 0) or x.get('id', 0), reverse=False)
-
-            # Calculate running balance and write data
-            running_balance = 0.0
-
-            for idx, item in enumerate(sorted_data, 1):
-                # Format tanggal
-                tanggal = item.get('tanggal', '')
-                if tanggal:
-                    try:
-                        if isinstance(tanggal, str):
-                            tanggal_str = tanggal.strip()
-                            if 'T' in tanggal_str or (' ' in tanggal_str and ':' in tanggal_str):
-                                dt = datetime.datetime.fromisoformat(tanggal_str.replace('Z', '+00:00'))
-                                tanggal = dt.strftime('%d/%m/%Y')
-                            elif '-' in tanggal_str:
-                                parts = tanggal_str.split(' ')[0]
-                                dt = datetime.datetime.strptime(parts, '%Y-%m-%d')
-                                tanggal = dt.strftime('%d/%m/%Y')
-                    except:
-                        pass
-
-                jenis = item.get('jenis', '')
-                kategori = item.get('kategori', '')
-                keterangan = item.get('keterangan', '')
-
-                try:
-                    jumlah_value = float(item.get('jumlah', 0))
-                    if jenis == 'Pemasukan':
-                        running_balance += jumlah_value
-                    else:
-                        running_balance -= jumlah_value
-                except:
-                    jumlah_value = 0
-
-                # Write row data
-                row_num = idx + 1
-
-                # Column 1: No
-                cell_no = ws.cell(row=row_num, column=1)
-                cell_no.value = idx
-                cell_no.border = border_style
-
-                # Column 2: Tanggal
-                cell_tanggal = ws.cell(row=row_num, column=2)
-                cell_tanggal.value = str(tanggal)
-                cell_tanggal.border = border_style
-
-                # Column 3: Jenis
-                jenis_cell = ws.cell(row=row_num, column=3)
-                jenis_cell.value = str(jenis)
-                jenis_cell.border = border_style
-                if jenis == 'Pemasukan':
-                    jenis_cell.fill = PatternFill(start_color="d5f4e6", end_color="d5f4e6", fill_type="solid")
-                    jenis_cell.font = Font(color="27ae60", bold=True)
-                elif jenis == 'Pengeluaran':
-                    jenis_cell.fill = PatternFill(start_color="fadbd8", end_color="fadbd8", fill_type="solid")
-                    jenis_cell.font = Font(color="c0392b", bold=True)
-
-                # Column 4: Kategori
-                cell_kategori = ws.cell(row=row_num, column=4)
-                cell_kategori.value = str(kategori)
-                cell_kategori.border = border_style
-
-                # Column 5: Keterangan
-                cell_keterangan = ws.cell(row=row_num, column=5)
-                cell_keterangan.value = str(keterangan)
-                cell_keterangan.border = border_style
-
-                # Column 6: Jumlah
-                jumlah_cell = ws.cell(row=row_num, column=6)
-                jumlah_cell.value = jumlah_value
-                jumlah_cell.border = border_style
-                jumlah_cell.number_format = '#,##0'
-                if jenis == 'Pemasukan':
-                    jumlah_cell.font = Font(color="27ae60")
-                else:
-                    jumlah_cell.font = Font(color="c0392b")
-
-                # Column 7: Saldo
-                saldo_cell = ws.cell(row=row_num, column=7)
-                saldo_cell.value = running_balance
-                saldo_cell.border = border_style
-                saldo_cell.number_format = '#,##0'
-                if running_balance >= 0:
-                    saldo_cell.font = Font(color="27ae60", bold=True)
-                else:
-                    saldo_cell.font = Font(color="c0392b", bold=True)
-
-            # Add summary at the bottom
-            summary_row = len(sorted_data) + 3
-
-            # Calculate totals
-            total_pemasukan = sum(float(item.get('jumlah', 0)) for item in sorted_data if item.get('jenis') == 'Pemasukan')
-            total_pengeluaran = sum(float(item.get('jumlah', 0)) for item in sorted_data if item.get('jenis') == 'Pengeluaran')
-            saldo_akhir = total_pemasukan - total_pengeluaran
-
-            # Summary header
-            summary_header = ws.cell(row=summary_row, column=4)
-            summary_header.value = "RINGKASAN:"
-            summary_header.font = Font(bold=True)
-
-            # Total Pemasukan
-            label_pemasukan = ws.cell(row=summary_row + 1, column=4)
-            label_pemasukan.value = "Total Pemasukan:"
-
-            pemasukan_cell = ws.cell(row=summary_row + 1, column=5)
-            pemasukan_cell.value = total_pemasukan
-            pemasukan_cell.number_format = '#,##0'
-            pemasukan_cell.font = Font(color="27ae60", bold=True)
-
-            # Total Pengeluaran
-            label_pengeluaran = ws.cell(row=summary_row + 2, column=4)
-            label_pengeluaran.value = "Total Pengeluaran:"
-
-            pengeluaran_cell = ws.cell(row=summary_row + 2, column=5)
-            pengeluaran_cell.value = total_pengeluaran
-            pengeluaran_cell.number_format = '#,##0'
-            pengeluaran_cell.font = Font(color="c0392b", bold=True)
-
-            # Saldo Akhir
-            label_saldo = ws.cell(row=summary_row + 3, column=4)
-            label_saldo.value = "Saldo Akhir:"
-
-            saldo_cell_summary = ws.cell(row=summary_row + 3, column=5)
-            saldo_cell_summary.value = saldo_akhir
-            saldo_cell_summary.number_format = '#,##0'
-            saldo_cell_summary.font = Font(color="27ae60" if saldo_akhir >= 0 else "c0392b", bold=True)
-
-            # Save workbook
-            wb.save(file_path)
-
             QMessageBox.information(
                 self,
                 "Export Berhasil",
-                f"Data berhasil diekspor ke:\n{file_path}\n\nTotal: {len(sorted_data)} transaksi"
+                f"Data berhasil diekspor ke:\n{file_path}"
             )
             self.log_message.emit(f"Data keuangan kategorial berhasil diekspor ke {file_path}")
 
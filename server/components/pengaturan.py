@@ -9,7 +9,6 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import pyqtSignal, Qt, QSize
 from PyQt5.QtGui import QColor, QIcon, QFont
 import requests
-from api_client import BASE_URL
 
 class PengaturanComponent(QWidget):
     """Komponen untuk pengaturan sistem dalam API Mode"""
@@ -477,10 +476,9 @@ hubungi administrator IT gereja.
             self.backup_path.setText(folder)
     
     def export_data(self):
-        """Export data dari API ke CSV"""
+        """Export data dari API ke CSV (di-stream server, tanpa batas jumlah baris)"""
         try:
             import os
-            import csv
             import datetime
             
             export_dir = self.backup_path.text()
@@ -493,37 +491,18 @@ hubungi administrator IT gereja.
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # Export Jemaat
-            success, jemaat_data = self.db_manager.get_jemaat_list(limit=10000)
-            if success:
-                jemaat_file = os.path.join(export_dir, f"jemaat_export_{timestamp}.csv")
-                with open(jemaat_file, 'w', newline='', encoding='utf-8') as f:
-                    if jemaat_data:
-                        writer = csv.DictWriter(f, fieldnames=jemaat_data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(jemaat_data)
+            failed = []
+            for entity in ('jemaat', 'kegiatan', 'keuangan', 'keuangan_kategorial'):
+                export_file = os.path.join(export_dir, f"{entity}_export_{timestamp}.csv")
+                success, result = self.db_manager.export_to_file(entity, export_file, 'csv', {'is_admin': 'true'})
+                if not success:
+                    failed.append(f"{entity}: {result}")
+                    self.log_message.emit(f"Error export {entity}: {result}")
             
-            # Export Kegiatan
-            success, kegiatan_data = self.db_manager.get_kegiatan_list(limit=10000)
-            if success:
-                kegiatan_file = os.path.join(export_dir, f"kegiatan_export_{timestamp}.csv")
-                with open(kegiatan_file, 'w', newline='', encoding='utf-8') as f:
-                    if kegiatan_data:
-                        writer = csv.DictWriter(f, fieldnames=kegiatan_data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(kegiatan_data)
-            
-            # Export Keuangan
-            success, keuangan_data = self.db_manager.get_keuangan_list(limit=10000)
-            if success:
-                keuangan_file = os.path.join(export_dir, f"keuangan_export_{timestamp}.csv")
-                with open(keuangan_file, 'w', newline='', encoding='utf-8') as f:
-                    if keuangan_data:
-                        writer = csv.DictWriter(f, fieldnames=keuangan_data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(keuangan_data)
-            
-            QMessageBox.information(self, "Sukses", f"Data berhasil diekspor ke {export_dir}")
+            if failed:
+                QMessageBox.warning(self, "Warning", "Sebagian data gagal diekspor:\n" + "\n".join(failed))
+            else:
+                QMessageBox.information(self, "Sukses", f"Data berhasil diekspor ke {export_dir}")
             self.log_message.emit(f"Data diekspor ke: {export_dir}")
             
         except Exception as e:
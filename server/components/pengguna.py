@@ -6,7 +6,7 @@ from PyQt5.QtCore import Qt, pyqtSignal, QSize, QRect, QTimer
 from PyQt5.QtGui import QFont, QIcon, QColor, QPainter
 import requests
 import os
-from api_client import BASE_URL
+from api_client import get_base_url
 
 class WordWrapHeaderView(QHeaderView):
     """Custom header view with word wrap and center alignment support"""
@@ -189,10 +189,10 @@ class PenggunaDialog(QDialog):
 
                 # Use 'id' field which works for both admin and pengguna tables
                 user_id = self.pengguna_data.get('id') or self.pengguna_data.get('id_pengguna') or self.pengguna_data.get('id_admin')
-                url = f"{BASE_URL}/pengguna/{user_id}"
+                url = f"{get_base_url()}/pengguna/{user_id}"
                 response = requests.put(url, json=data, timeout=10)
             else:
-                url = f"{BASE_URL}/pengguna"
+                url = f"{get_base_url()}/pengguna"
                 response = requests.post(url, json=data, timeout=10)
             
             if response.status_code == 200:
@@ -435,7 +435,7 @@ class PenggunaComponent(QWidget):
         """Load data pengguna dari API"""
         try:
             self.log_message.emit("Memuat data pengguna...")
-            response = requests.get(f"{BASE_URL}/pengguna", timeout=10)
+            response = requests.get(f"{get_base_url()}/pengguna", timeout=10)
             if response.status_code == 200:
                 result = response.json()
                 if result.get('status') == 'success':
@@ -638,7 +638,7 @@ class PenggunaComponent(QWidget):
             try:
                 # Use 'id' field which works for both admin and pengguna tables
                 user_id = pengguna_data.get('id') or pengguna_data.get('id_pengguna') or pengguna_data.get('id_admin')
-                url = f"{BASE_URL}/pengguna/{user_id}"
+                url = f"{get_base_url()}/pengguna/{user_id}"
                 response = requests.delete(url, timeout=10)
                 
                 if response.status_code == 200:
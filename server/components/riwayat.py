@@ -91,7 +91,7 @@ class RiwayatComponent(QWidget):
     
     def set_database_manager(self, database_manager):
         self.database_manager = database_manager
-        self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
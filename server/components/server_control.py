@@ -23,7 +23,9 @@ class ServerControlComponent(QWidget):
         # Timer untuk auto-refresh status API dan client
         self.status_timer = QTimer()
         self.status_timer.timeout.connect(self.auto_refresh_status)
-        self.status_timer.start(10000)  # Cek setiap 10 detik
+        # Perubahan client connect/disconnect datang lewat event stream (presence);
+        # timer ini hanya cadangan jika stream terputus
+        self.status_timer.start(60000)
 
     def closeEvent(self, event):
         """Handle close event to stop timer"""
@@ -58,12 +58,7 @@ class StrukturComponent(QWidget):
         self.wr_component.set_database_manager(db_manager)
         self.kategorial_component.set_database_manager(db_manager)
         self.binaan_component.set_database_manager(db_manager)
-
-        # Load data from all components
-        self.dpp_component.load_data()
-        self.wr_component.load_wr_data()
-        self.kategorial_component.load_kategorial_data()
-        self.binaan_component.load_binaan_data()
+        # Data semua tab dimuat oleh PageDataLoader saat halaman dibuka (load_data)
 
     def set_current_admin(self, admin_data):
         """Set the current admin data."""
@@ -414,11 +414,9 @@ class StrukturDPPComponent(BaseStrukturComponent):
         self.populate_views()
 
     def set_database_manager(self, db_manager):
-        """Set database manager dan load data otomatis"""
+        """Set database manager"""
         super().set_database_manager(db_manager)
-        # Load data otomatis setelah database manager di-set
-        if db_manager:
-            self.load_data()
+        # Data dimuat oleh PageDataLoader saat halaman dibuka
 
     def add_struktur(self):
         """Tambah pengurus baru"""
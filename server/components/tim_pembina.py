@@ -1077,11 +1077,9 @@ class TimPembinaComponent(BaseStrukturComponent):
             self.log_message.emit(f"Gagal mengekspor data: {str(e)}")
 
     def set_database_manager(self, db_manager):
-        """Set database manager dan load data otomatis"""
+        """Set database manager"""
         super().set_database_manager(db_manager)
-        # Load data otomatis setelah database manager di-set
-        if db_manager:
-            self.load_data()
+        # Data dimuat saat halaman dibuka (load_data), tidak saat startup
 
     def set_current_admin(self, admin_data):
         """Set current admin data"""
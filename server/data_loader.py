@@ -0,0 +1,124 @@
+# Path: server/data_loader.py
+# Pemuatan data halaman admin secara paralel di luar GUI thread.
+#
+# Setiap halaman didaftarkan dengan satu atau lebih fungsi prefetch (memanggil
+# DatabaseManager di worker thread) dan satu fungsi populate (biasanya
+# component.load_data) yang dijalankan di GUI thread setelah semua prefetch
+# halaman itu selesai. Karena prefetch berjalan di dalam
+# DatabaseManager.prefetching(), load_data() di GUI thread memakai hasil yang
+# sudah diambil tanpa round-trip ke API.
+
+import time
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class PrefetchTask(QRunnable):
+    """Jalankan satu fungsi prefetch di thread pool"""
+
+    def __init__(self, loader, name, generation, func):
+        super().__init__()
+        self.loader = loader
+        self.name = name
+        self.generation = generation
+        self.func = func
+
+    def run(self):
+        error = ''
+        try:
+            with self.loader.db_manager.prefetching():
+                self.func()
+        except Exception as e:
+            error = str(e)
+            traceback.print_exc()
+        # Signal di-queue ke GUI thread (loader hidup di GUI thread)
+        self.loader._prefetch_done.emit(self.name, self.generation, error)
+
+
+class PageDataLoader(QObject):
+    """Load data halaman secara paralel, tanpa duplikasi request yang sedang berjalan"""
+
+    page_loaded = pyqtSignal(str, float)  # nama halaman, durasi (detik)
+    all_finished = pyqtSignal(float)  # durasi batch (detik)
+    error_occurred = pyqtSignal(str, str)  # nama halaman, pesan error
+
+    _prefetch_done = pyqtSignal(str, int, str)  # nama halaman, generation, error
+
+    def __init__(self, db_manager, max_threads=6, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_threads)
+
+        self._pages = {}  # nama -> (populate, [prefetch])
+        self._pending = {}  # nama -> jumlah prefetch yang belum selesai
+        self._started = {}  # nama -> waktu mulai
+        self._generation = {}  # nama -> nomor load terakhir
+        self._batch_started = None
+        self._prefetch_done.connect(self._on_prefetch_done)
+
+    def register(self, name, populate, *prefetch):
+        """Daftarkan halaman. Tanpa fungsi prefetch, populate langsung dipanggil saat load."""
+        self._pages[name] = (populate, list(prefetch))
+
+    def is_loading(self, name=None):
+        if name is None:
+            return bool(self._pending)
+        return name in self._pending
+
+    def load(self, name):
+        """Muat ulang satu halaman. Diabaikan jika halaman tersebut masih dimuat."""
+        if name not in self._pages or name in self._pending:
+            return
+
+        populate, prefetch = self._pages[name]
+        if not self.db_manager or not prefetch:
+            self._populate(name, populate, 0.0)
+            return
+
+        if not self._pending:
+            self._batch_started = time.monotonic()
+        generation = self._generation.get(name, 0) + 1
+        self._generation[name] = generation
+        self._pending[name] = len(prefetch)
+        self._started[name] = time.monotonic()
+        for func in prefetch:
+            self.thread_pool.start(PrefetchTask(self, name, generation, func))
+
+    def load_many(self, names):
+        for name in dict.fromkeys(names):
+            self.load(name)
+
+    def _on_prefetch_done(self, name, generation, error):
+        if generation != self._generation.get(name) or name not in self._pending:
+            return
+        if error:
+            self.error_occurred.emit(name, error)
+
+        self._pending[name] -= 1
+        if self._pending[name] > 0:
+            return
+
+        del self._pending[name]
+        elapsed = time.monotonic() - self._started.pop(name, time.monotonic())
+        populate, _ = self._pages[name]
+        self._populate(name, populate, elapsed)
+
+        if not self._pending and self._batch_started is not None:
+            batch_elapsed = time.monotonic() - self._batch_started
+            self._batch_started = None
+            self.all_finished.emit(batch_elapsed)
+
+    def _populate(self, name, populate, elapsed):
+        try:
+            populate()
+        except Exception as e:
+            traceback.print_exc()
+            self.error_occurred.emit(name, str(e))
+        self.page_loaded.emit(name, elapsed)
+
+    def shutdown(self, timeout_ms=3000):
+        """Tunggu worker selesai saat aplikasi ditutup"""
+        self._pending.clear()
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone(timeout_ms)
@@ -18,6 +18,11 @@ class DatabaseManager:
 
         # Don't test connection during init - test lazily when needed
     
+    def prefetching(self):
+        """Context manager untuk worker thread: hasil GET disimpan agar pemanggilan
+        yang sama dari GUI thread tidak perlu round-trip (lihat ApiClient.prefetching)"""
+        return self.api_client.prefetching()
+
     def _test_connection(self):
         """Test API connection (lazy - called on demand)"""
         try:
@@ -294,6 +299,15 @@ class DatabaseManager:
             return True, result["data"]
         else:
             return False, result["data"]
+
+    def import_jemaat(self, file_path: str, user_id: int, dry_run: bool = True, **options) -> Tuple[bool, Any, Any]:
+        """Import massal jemaat dari CSV/XLSX/JSON lines. Return (success, laporan atau pesan error, laporan sementara)"""
+        try:
+            result = self.api_client.import_jemaat(file_path, user_id, dry_run=dry_run, **options)
+            return result["success"], result["data"], result.get("report")
+        except Exception as e:
+            self.logger.error(f"Error importing jemaat: {e}")
+            return False, str(e), None
     
     # ========== KEGIATAN METHODS ==========
     def get_kegiatan_list(self, start_date: Optional[datetime.date] = None, 
@@ -591,92 +605,55 @@ class DatabaseManager:
         """Save message"""
         return True, 1
     
+    def get_stats_summary(self, year: Optional[int] = None, month: Optional[int] = None,
+                          months: Optional[int] = None) -> Tuple[bool, Any]:
+        """Ringkasan dashboard dari endpoint /stats/summary (agregat SQL di server)"""
+        result = self.api_client.get_stats_summary(year, month, months)
+        if result["success"] and isinstance(result["data"], dict) and result["data"].get("status") == "success":
+            return True, result["data"].get("data", {})
+        if result["success"]:
+            return False, result["data"].get("message", "Gagal mengambil ringkasan statistik")
+        return False, result["data"]
+
+    def prefetch_dashboard(self, include_lists: bool = True) -> bool:
+        """Ambil data dashboard (dan list kegiatan/pengumuman-nya) dalam satu round-trip /batch.
+        Dipanggil dari worker PageDataLoader; hasilnya dipakai get_* berikutnya."""
+        return self.api_client.prefetch_dashboard(include_lists)
+
     def get_dashboard_statistics(self) -> Tuple[bool, Any]:
         """Get dashboard statistics"""
-        statistics = {
-            'total_jemaat': 0,
-            'total_kegiatan_bulan_ini': 0,
-            'total_pengumuman_aktif': 0,
-            'sesi_aktif': 0
-        }
-        
-        jemaat_result = self.get_jemaat_list()
-        if jemaat_result[0]:
-            statistics['total_jemaat'] = len(jemaat_result[1])
-        
-        kegiatan_result = self.get_kegiatan_list()
-        if kegiatan_result[0]:
-            statistics['total_kegiatan_bulan_ini'] = len(kegiatan_result[1])
-        
-        pengumuman_result = self.get_pengumuman_list()
-        if pengumuman_result[0]:
-            statistics['total_pengumuman_aktif'] = len(pengumuman_result[1])
-        
-        return True, statistics
+        success, summary = self.get_stats_summary()
+        if not success:
+            return False, summary
+        return True, summary.get('counts', {})
     
     def get_saldo_total(self) -> Tuple[bool, Any]:
-        """Calculate total saldo from keuangan data"""
-        try:
-            pemasukan_result = self.get_keuangan_list(category="Pemasukan")
-            pengeluaran_result = self.get_keuangan_list(category="Pengeluaran")
-            
-            total_pemasukan = 0
-            total_pengeluaran = 0
-            
-            if pemasukan_result[0]:
-                for item in pemasukan_result[1]:
-                    total_pemasukan += float(item.get('jumlah', 0))
-            
-            if pengeluaran_result[0]:
-                for item in pengeluaran_result[1]:
-                    total_pengeluaran += float(item.get('jumlah', 0))
-            
-            saldo = total_pemasukan - total_pengeluaran
-            
-            return True, {
-                'total_pemasukan': total_pemasukan,
-                'total_pengeluaran': total_pengeluaran, 
-                'saldo': saldo
-            }
-        except Exception as e:
-            self.logger.error(f"Error calculating saldo: {e}")
-            return False, str(e)
+        """Total saldo keuangan (dihitung di server)"""
+        success, summary = self.get_stats_summary(months=1)
+        if not success:
+            self.logger.error(f"Error calculating saldo: {summary}")
+            return False, summary
+
+        keuangan = summary.get('keuangan', {})
+        return True, {
+            'total_pemasukan': keuangan.get('total_pemasukan', 0),
+            'total_pengeluaran': keuangan.get('total_pengeluaran', 0),
+            'saldo': keuangan.get('saldo', 0)
+        }
     
     def get_saldo_keuangan_bulanan(self, year: int, month: int) -> Tuple[bool, Any]:
-        """Calculate monthly saldo from keuangan data"""
-        try:
-            result = self.get_keuangan_list()
-            if not result[0]:
-                return False, result[1]
-            
-            data = result[1]
-            total_pemasukan = 0
-            total_pengeluaran = 0
-            
-            for item in data:
-                tanggal_str = item.get('tanggal', '')
-                try:
-                    if isinstance(tanggal_str, str):
-                        tanggal = datetime.datetime.fromisoformat(tanggal_str.replace('Z', '+00:00'))
-                    else:
-                        tanggal = tanggal_str
-                    
-                    if tanggal.year == year and tanggal.month == month:
-                        if item.get('kategori') == 'Pemasukan':
-                            total_pemasukan += float(item.get('jumlah', 0))
-                        elif item.get('kategori') == 'Pengeluaran':
-                            total_pengeluaran += float(item.get('jumlah', 0))
-                except:
-                    continue
-            
-            return True, [{
-                'total_pemasukan': total_pemasukan,
-                'total_pengeluaran': total_pengeluaran,
-                'saldo_bulan': total_pemasukan - total_pengeluaran
-            }]
-        except Exception as e:
-            self.logger.error(f"Error calculating monthly saldo: {e}")
-            return False, str(e)
+        """Saldo keuangan satu bulan (dihitung di server)"""
+        success, summary = self.get_stats_summary(year, month, months=1)
+        if not success:
+            self.logger.error(f"Error calculating monthly saldo: {summary}")
+            return False, summary
+
+        bulan_ini = summary.get('keuangan', {}).get('bulan_ini', {})
+        return True, [{
+            'total_pemasukan': bulan_ini.get('total_pemasukan', 0),
+            'total_pengeluaran': bulan_ini.get('total_pengeluaran', 0),
+            'saldo_bulan': bulan_ini.get('saldo_bulan', 0)
+        }]
     
     # ========== LOG METHODS ==========
     def get_log_activities(self, limit: int = 100) -> Tuple[bool, Any]:
@@ -754,6 +731,26 @@ class DatabaseManager:
             self.logger.error(f"Error downloading file: {e}")
             return False, str(e)
     
+    def download_file_to_path(self, file_id: int, save_path: str, progress_callback=None) -> Tuple[bool, Any]:
+        """Download file dari API langsung ke disk (streaming)"""
+        try:
+            result = self.api_client.download_file_to(file_id, save_path, progress_callback)
+            return result["success"], result["data"]
+        except Exception as e:
+            self.logger.error(f"Error downloading file: {e}")
+            return False, str(e)
+
+    def export_to_file(self, entity: str, save_path: str, fmt: str = 'csv',
+                       params: Optional[Dict[str, Any]] = None, progress_callback=None,
+                       ids: Optional[List[int]] = None) -> Tuple[bool, Any]:
+        """Export satu entity dari server (streaming) langsung ke file CSV/XLSX"""
+        try:
+            result = self.api_client.download_export(entity, save_path, fmt, params, progress_callback, ids=ids)
+            return result["success"], result["data"]
+        except Exception as e:
+            self.logger.error(f"Error exporting {entity}: {e}")
+            return False, str(e)
+
     # ========== STRUKTUR METHODS ==========
     def get_struktur_list(self, search: Optional[str] = None) -> Tuple[bool, Any]:
         result = self.api_client.get_struktur()
@@ -0,0 +1,166 @@
+# Path: server/event_stream.py
+# Menerima event push dari API (/events) di thread terpisah.
+#
+# Pertama mencoba Server-Sent Events (GET /events/stream). Jika stream gagal
+# beberapa kali berturut-turut (mis. proxy/hosting membuffer respons), thread
+# beralih ke long-poll (GET /events/poll) dan sesekali mencoba SSE lagi.
+# Posisi terakhir (Last-Event-ID) disimpan sehingga event yang terjadi saat
+# reconnect tidak hilang; jika server sudah membuang event tersebut, signal
+# reset_required dipancarkan supaya UI memuat ulang datanya.
+
+import json
+import time
+import requests
+from PyQt5.QtCore import QThread, pyqtSignal
+
+SSE_READ_TIMEOUT = 45  # server mengirim ping setiap 15 detik
+POLL_TIMEOUT = 25
+SSE_FAILURES_BEFORE_POLL = 3
+SSE_RETRY_AFTER_POLLS = 20
+MAX_BACKOFF = 60
+
+
+class EventStreamThread(QThread):
+    """Baca event dari /events/stream (atau /events/poll) dan teruskan sebagai signal"""
+
+    event_received = pyqtSignal(str, dict)  # tipe event, data
+    reset_required = pyqtSignal()
+    status_changed = pyqtSignal(str)  # 'sse', 'poll', 'disconnected'
+
+    def __init__(self, base_url, types=None, parent=None):
+        super().__init__(parent)
+        self.base_url = base_url.rstrip('/')
+        self.types = ','.join(types) if types else None
+        self.last_event_id = None
+        self._running = False
+        self._response = None
+        self._status = None
+        self.session = requests.Session()
+        self.session.headers['Accept'] = 'text/event-stream'
+
+    def stop(self, timeout_ms=3000):
+        self._running = False
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+        self.wait(timeout_ms)
+
+    def run(self):
+        self._running = True
+        failures = 0
+        polls = 0
+        while self._running:
+            use_poll = failures >= SSE_FAILURES_BEFORE_POLL and polls < SSE_RETRY_AFTER_POLLS
+            try:
+                if use_poll:
+                    self._poll_once()
+                    polls += 1
+                else:
+                    polls = 0
+                    self._read_stream()
+                    # Server menutup stream secara berkala; itu bukan kegagalan
+                    failures = 0
+                    continue
+                failures = max(failures, SSE_FAILURES_BEFORE_POLL)
+            except Exception as e:
+                if not self._running:
+                    break
+                failures += 1
+                self._set_status('disconnected')
+                delay = min(2 ** min(failures, 6), MAX_BACKOFF)
+                print(f"[EVENTS] Koneksi event terputus ({e}), coba lagi dalam {delay} detik")
+                self._sleep(delay)
+        self.session.close()
+
+    def _sleep(self, seconds):
+        end = time.monotonic() + seconds
+        while self._running and time.monotonic() < end:
+            self.msleep(200)
+
+    def _set_status(self, status):
+        if status != self._status:
+            self._status = status
+            self.status_changed.emit(status)
+
+    def _params(self):
+        params = {}
+        if self.types:
+            params['types'] = self.types
+        return params
+
+    def _read_stream(self):
+        headers = {}
+        if self.last_event_id is not None:
+            headers['Last-Event-ID'] = str(self.last_event_id)
+        response = self.session.get(f"{self.base_url}/events/stream", params=self._params(),
+                                    headers=headers, stream=True, timeout=(10, SSE_READ_TIMEOUT))
+        self._response = response
+        try:
+            response.raise_for_status()
+            if not response.headers.get('Content-Type', '').startswith('text/event-stream'):
+                raise RuntimeError('respons bukan text/event-stream')
+            self._set_status('sse')
+
+            event_id, event_type, data = None, 'message', []
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not self._running:
+                    return
+                if line is None:
+                    continue
+                if line == '':
+                    if data:
+                        self._dispatch(event_id, event_type, '\n'.join(data))
+                    event_id, event_type, data = None, 'message', []
+                    continue
+                if line.startswith(':'):
+                    continue  # heartbeat
+                field, _, value = line.partition(':')
+                value = value[1:] if value.startswith(' ') else value
+                if field == 'id':
+                    event_id = value
+                elif field == 'event':
+                    event_type = value
+                elif field == 'data':
+                    data.append(value)
+        finally:
+            self._response = None
+            response.close()
+
+    def _poll_once(self):
+        params = self._params()
+        params['timeout'] = POLL_TIMEOUT
+        if self.last_event_id is not None:
+            params['after'] = self.last_event_id
+        response = self.session.get(f"{self.base_url}/events/poll", params=params,
+                                    headers={'Accept': 'application/json'},
+                                    timeout=(10, POLL_TIMEOUT + 15))
+        response.raise_for_status()
+        result = response.json()
+        self._set_status('poll')
+        if result.get('reset'):
+            self.reset_required.emit()
+        for event in result.get('data', []):
+            if self._running:
+                self.event_received.emit(event.get('type', ''), event.get('data') or {})
+        if result.get('last_event_id') is not None:
+            self.last_event_id = result['last_event_id']
+
+    def _dispatch(self, event_id, event_type, raw):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = {}
+        if event_id:
+            try:
+                self.last_event_id = int(event_id)
+            except ValueError:
+                pass
+        if event_type == 'ready':
+            return
+        if event_type == 'reset':
+            self.reset_required.emit()
+            return
+        self.event_received.emit(event_type, data if isinstance(data, dict) else {})
@@ -1,39 +1,25 @@
 # Path: server/main_http_refactored.py
 
+import startup_timing
 import sys
 import datetime
 import os
+import time
+import importlib
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QStackedWidget, QFrame, QStatusBar,
                             QAction, QMessageBox, QSplitter)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 
+# Hanya komponen yang tampil langsung setelah login; komponen halaman lain
+# (termasuk components.dialogs) diimport saat halaman pertama kali dibuka,
+# lihat PAGE_COMPONENTS
 try:
     from components.login_dialog import LoginDialog
     from components.sidebar import SidebarWidget
     from components.dashboard import DashboardComponent
-    from components.struktur import StrukturComponent
-    from components.jemaat import JemaatComponent
-    from components.aset import AsetComponent
-    from components.pengumuman import PengumumanComponent
-    from components.pengaturan import PengaturanComponent
     from components.server_control import ServerControlComponent
-    from components.riwayat import RiwayatComponent
-    from components.dokumen import DokumenComponent
-    from components.pengguna import PenggunaComponent
-    from components.keuangan import KeuanganComponent
-    from components.buku_kronik import BukuKronikComponent
-    from components.kegiatan_paroki_page import KegiatanParokiPageComponent
-    from components.kegiatan_wr_page import KegiatanWRPageComponent
-    from components.proker_dpp_page import ProkerDPPPageComponent
-    from components.proker_wr_page import ProkerWRPageComponent
-    from components.struktur_wr_page import StrukturWRPageComponent
-    from components.struktur_kategorial_page import StrukturKategorialPageComponent
-    from components.keuangan_wr_page import KeuanganWRPageComponent
-    from components.keuangan_kategorial_page import KeuanganKategorialPageComponent
-    from components.proker_kategorial_page import ProkerKategorialPageComponent
-    from components.tim_pembina import TimPembinaComponent
 except ImportError as e:
     print(f"Error importing components: {e}")
     app = QApplication(sys.argv)
@@ -43,6 +29,90 @@ except ImportError as e:
 
 from database import DatabaseManager
 from client_handler import ClientRegistrationServer
+from data_loader import PageDataLoader
+from event_stream import EventStreamThread
+
+startup_timing.mark('imports')
+
+# Index halaman di content_stack -> (atribut, modul, kelas). Halaman dibuat
+# saat pertama kali dibutuhkan (lihat page_component); sampai itu slotnya di
+# content_stack berisi placeholder kosong. Index 0 (dashboard) dibuat saat
+# startup, index 2 hanya placeholder.
+PAGE_COMPONENTS = {
+    1: ('struktur_component', 'components.struktur', 'StrukturComponent'),
+    3: ('jemaat_component', 'components.jemaat', 'JemaatComponent'),
+    4: ('aset_component', 'components.aset', 'AsetComponent'),
+    5: ('pengumuman_component', 'components.pengumuman', 'PengumumanComponent'),
+    6: ('dokumen_component', 'components.dokumen', 'DokumenComponent'),
+    7: ('keuangan_component', 'components.keuangan', 'KeuanganComponent'),
+    8: ('tim_pembina_component', 'components.tim_pembina', 'TimPembinaComponent'),
+    9: ('riwayat_component', 'components.riwayat', 'RiwayatComponent'),
+    10: ('pengaturan_component', 'components.pengaturan', 'PengaturanComponent'),
+    11: ('buku_kronik_component', 'components.buku_kronik', 'BukuKronikComponent'),
+    12: ('kegiatan_paroki_page', 'components.kegiatan_paroki_page', 'KegiatanParokiPageComponent'),
+    13: ('kegiatan_wr_page', 'components.kegiatan_wr_page', 'KegiatanWRPageComponent'),
+    14: ('proker_dpp_page', 'components.proker_dpp_page', 'ProkerDPPPageComponent'),
+    15: ('proker_wr_page', 'components.proker_wr_page', 'ProkerWRPageComponent'),
+    16: ('struktur_wr_page', 'components.struktur_wr_page', 'StrukturWRPageComponent'),
+    17: ('struktur_kategorial_page', 'components.struktur_kategorial_page', 'StrukturKategorialPageComponent'),
+    18: ('keuangan_wr_page', 'components.keuangan_wr_page', 'KeuanganWRPageComponent'),
+    19: ('keuangan_kategorial_page', 'components.keuangan_kategorial_page', 'KeuanganKategorialPageComponent'),
+    20: ('proker_kategorial_page', 'components.proker_kategorial_page', 'ProkerKategorialPageComponent'),
+}
+# KeuanganComponent menerima DatabaseManager di constructor, bukan lewat setter
+PAGES_WITH_DB_ARGUMENT = {7}
+
+# Index halaman di content_stack -> nama halaman di PageDataLoader
+PAGE_LOAD_NAMES = {
+    0: 'dashboard',
+    1: 'struktur',
+    3: 'jemaat',
+    4: 'aset',
+    5: 'pengumuman',
+    6: 'dokumen',
+    7: 'keuangan',
+    9: 'riwayat',
+    11: 'buku_kronik',
+    12: 'kegiatan_paroki',
+    13: 'kegiatan_wr',
+    14: 'proker_dpp',
+    15: 'proker_wr',
+    16: 'struktur_wr',
+    17: 'struktur_kategorial',
+    18: 'keuangan_wr',
+    19: 'keuangan_kategorial',
+    20: 'proker_kategorial',
+}
+
+# Index halaman yang datanya dibutuhkan dashboard (kegiatan paroki, kegiatan
+# WR, pengumuman). Saat startup datanya diambil bersama data dashboard dalam
+# satu request /batch (halaman 'startup' di PageDataLoader); halaman lain
+# dimuat saat pertama kali (dan setiap kali) dibuka
+STARTUP_PAGES = (12, 13, 5)
+
+# Entity pada event data_changed (lihat API/events.py) -> halaman yang memakai
+# datanya. Hanya halaman yang sedang tampil yang dimuat ulang; halaman lain
+# memuat data terbaru saat dibuka.
+EVENT_ENTITY_PAGES = {
+    'jemaat': ('jemaat',),
+    'kegiatan': ('kegiatan_paroki',),
+    'kegiatan_wr': ('kegiatan_wr',),
+    'keuangan': ('keuangan', 'keuangan_wr'),
+    'keuangan_kategorial': ('keuangan', 'keuangan_kategorial'),
+    'pengumuman': ('pengumuman',),
+    'dokumen': ('dokumen',),
+    'aset': ('aset',),
+    'struktur': ('struktur',),
+    'program_kerja': ('proker_dpp',),
+    'program_kerja_wr': ('proker_wr',),
+    'program_kerja_k_kategorial': ('proker_kategorial',),
+    'buku_kronik': ('buku_kronik',),
+    'kategorial': ('struktur', 'struktur_kategorial'),
+    'binaan': ('struktur',),
+    'wr': ('struktur', 'struktur_wr'),
+}
+# Entity yang ikut tampil di dashboard (statistik, jadwal, pengumuman)
+DASHBOARD_ENTITIES = {'jemaat', 'kegiatan', 'kegiatan_wr', 'pengumuman', 'keuangan', 'aset'}
 
 class ServerMainWindow(QMainWindow):
     
@@ -50,21 +120,27 @@ class ServerMainWindow(QMainWindow):
         super().__init__()
         self.current_admin = None
         self.client_server = None
+        self.event_stream = None
+        self.page_components = {}  # index -> komponen yang sudah dibuat
         
         # Setup database first
         self.setup_database()
+        startup_timing.mark('database_manager')
         
         # Setup client registration server
         self.setup_client_server()
+        startup_timing.mark('client_server')
         
         # Show login dialog before main window
         self.show_login()
+        startup_timing.mark('login_finished')
         
         # Setup main window after successful login
         self.setup_main_window()
         self.setup_ui()
         self.setup_menu()
         self.setup_connections()
+        startup_timing.mark('main_window')
         
         if self.db and self.db.connection:
             self.statusBar().showMessage("API Mode - Server Admin")
@@ -73,6 +149,7 @@ class ServerMainWindow(QMainWindow):
         
         if self.db and self.db.connection:
             self.load_all_data()
+            self.start_event_stream()
         else:
             self.show_offline_warning()
 
@@ -89,6 +166,9 @@ class ServerMainWindow(QMainWindow):
             self.server_control.add_log_message("Aplikasi dimulai dalam MODE OFFLINE.")
             self.server_control.add_log_message("PERINGATAN: Koneksi API shared hosting gagal. Periksa koneksi internet.")
             self.server_control.add_log_message("Mode offline terbatas - fitur penuh tidak tersedia.")
+
+        for line in startup_timing.report():
+            self.server_control.add_log_message(f"Startup - {line}")
     
     def setup_database(self):
         try:
@@ -132,6 +212,9 @@ class ServerMainWindow(QMainWindow):
 
         login_dialog = LoginDialog(self.db)
         login_dialog.login_successful.connect(self.on_login_successful)
+        if startup_timing.elapsed('login_window') is None:
+            # Dipanggil event loop dialog setelah dialog tampil
+            QTimer.singleShot(0, lambda: startup_timing.mark('login_window'))
 
         result = login_dialog.exec_()
 
@@ -204,6 +287,7 @@ class ServerMainWindow(QMainWindow):
         main_layout.setStretchFactor(content_widget, 1)
         
         self.setup_components()
+        self.setup_page_loader()
         self.show_page(0)
     
     def setup_components(self):
@@ -211,128 +295,189 @@ class ServerMainWindow(QMainWindow):
         self.dashboard_component = DashboardComponent()
         self.content_stack.addWidget(self.dashboard_component)
 
-        # Index 1: Struktur DPP
-        self.struktur_component = StrukturComponent()
-        self.struktur_component.set_database_manager(self.db)
-        self.struktur_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.struktur_component)
-
-        # Index 2: Program Kerja (moved to standalone pages, keeping slot for backward compatibility)
-        # NOTE: Program Kerja now uses standalone page components instead of tab interface
-        placeholder_widget = QWidget()  # Placeholder for index 2
-        self.content_stack.addWidget(placeholder_widget)
-
-        # Index 3: Database Umat
-        self.jemaat_component = JemaatComponent()
-        self.jemaat_component.set_database_manager(self.db)
-        self.jemaat_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.jemaat_component)
-
-        # Index 4: Aset (sebelumnya Inventaris)
-        self.aset_component = AsetComponent()
-        self.aset_component.set_database_manager(self.db)
-        self.aset_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.aset_component)
-
-        # Index 5: Pengumuman
-        self.pengumuman_component = PengumumanComponent()
-        self.pengumuman_component.set_database_manager(self.db)
-        self.pengumuman_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.pengumuman_component)
-
-        # Index 6: Dokumen
-        self.dokumen_component = DokumenComponent()
-        self.dokumen_component.set_database_manager(self.db)
-        self.dokumen_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.dokumen_component)
-
-        # Index 7: Keuangan
-        self.keuangan_component = KeuanganComponent(self.db)
-        self.keuangan_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.keuangan_component)
-
-        # Index 8: Tim Pembina
-        self.tim_pembina_component = TimPembinaComponent()
-        self.tim_pembina_component.set_database_manager(self.db)
-        self.tim_pembina_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.tim_pembina_component)
-
-        # Index 9: Riwayat
-        self.riwayat_component = RiwayatComponent()
-        self.riwayat_component.set_database_manager(self.db)
-        self.content_stack.addWidget(self.riwayat_component)
-
-        # Index 10: Pengaturan Sistem (termasuk Manajemen Pengguna)
-        self.pengaturan_component = PengaturanComponent()
-        self.pengaturan_component.set_database_manager(self.db)
-        self.content_stack.addWidget(self.pengaturan_component)
-
-        # Index 11: Buku Kronik
-        self.buku_kronik_component = BukuKronikComponent()
-        self.buku_kronik_component.set_database_manager(self.db)
-        self.buku_kronik_component.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.buku_kronik_component)
-
-        # Index 12: Kegiatan Paroki (standalone page)
-        self.kegiatan_paroki_page = KegiatanParokiPageComponent()
-        self.kegiatan_paroki_page.set_database_manager(self.db)
-        self.kegiatan_paroki_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.kegiatan_paroki_page)
-
-        # Index 13: Kegiatan WR (standalone page)
-        self.kegiatan_wr_page = KegiatanWRPageComponent()
-        self.kegiatan_wr_page.set_database_manager(self.db)
-        self.kegiatan_wr_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.kegiatan_wr_page)
-
-        # Index 14: Program Kerja DPP (standalone page)
-        self.proker_dpp_page = ProkerDPPPageComponent()
-        self.proker_dpp_page.set_database_manager(self.db)
-        self.proker_dpp_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.proker_dpp_page)
-
-        # Index 15: Program Kerja WR (standalone page)
-        self.proker_wr_page = ProkerWRPageComponent()
-        self.proker_wr_page.set_database_manager(self.db)
-        self.proker_wr_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.proker_wr_page)
-
-        # Index 16: Struktur WR (standalone page)
-        self.struktur_wr_page = StrukturWRPageComponent()
-        self.struktur_wr_page.set_database_manager(self.db)
-        self.struktur_wr_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.struktur_wr_page)
-
-        # Index 17: Struktur K. Kategorial (standalone page)
-        self.struktur_kategorial_page = StrukturKategorialPageComponent()
-        self.struktur_kategorial_page.set_database_manager(self.db)
-        self.struktur_kategorial_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.struktur_kategorial_page)
-
-        # Index 18: Keuangan WR (standalone page)
-        self.keuangan_wr_page = KeuanganWRPageComponent()
-        self.keuangan_wr_page.set_database_manager(self.db)
-        self.keuangan_wr_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.keuangan_wr_page)
-
-        # Index 19: Keuangan K. Kategorial (standalone page)
-        self.keuangan_kategorial_page = KeuanganKategorialPageComponent()
-        self.keuangan_kategorial_page.set_database_manager(self.db)
-        self.keuangan_kategorial_page.set_current_admin(self.current_admin)
-        admin_id = self.current_admin.get('id_admin')
-        if admin_id:
-            self.keuangan_kategorial_page.set_admin_id(admin_id)
-        self.content_stack.addWidget(self.keuangan_kategorial_page)
-
-        # Index 20: Program Kerja K. Kategorial (standalone page)
-        self.proker_kategorial_page = ProkerKategorialPageComponent()
-        self.proker_kategorial_page.set_database_manager(self.db)
-        self.proker_kategorial_page.set_current_admin(self.current_admin)
-        self.content_stack.addWidget(self.proker_kategorial_page)
-
+        # Index 1-20: placeholder sampai halaman dibuka (lihat page_component).
+        # Index 2 (Program Kerja) tetap placeholder untuk backward compatibility;
+        # Program Kerja sekarang memakai halaman standalone (index 14, 15, 20).
         # Note: PenggunaComponent bisa diakses melalui PengaturanComponent
+        for index in range(1, max(PAGE_COMPONENTS) + 1):
+            self.content_stack.addWidget(QWidget())
 
         self.server_control.set_database_manager(self.db)
+
+    def page_component(self, index):
+        """Komponen halaman index, dibuat (import modul + wiring) saat pertama dipanggil"""
+        component = self.page_components.get(index)
+        if component is not None:
+            return component
+
+        attr, module_name, class_name = PAGE_COMPONENTS[index]
+        started = time.perf_counter()
+        component_class = getattr(importlib.import_module(module_name), class_name)
+        if index in PAGES_WITH_DB_ARGUMENT:
+            component = component_class(self.db)
+        else:
+            component = component_class()
+        if hasattr(component, 'set_database_manager'):
+            component.set_database_manager(self.db)
+        if self.current_admin and hasattr(component, 'set_current_admin'):
+            component.set_current_admin(self.current_admin)
+        if self.current_admin and hasattr(component, 'set_admin_id') and self.current_admin.get('id_admin'):
+            component.set_admin_id(self.current_admin.get('id_admin'))
+
+        if hasattr(component, 'log_message'):
+            component.log_message.connect(self.server_control.add_log_message)
+        if hasattr(component, 'data_updated'):
+            component.data_updated.connect(self.dashboard_refresh_timer.start)
+
+        placeholder = self.content_stack.widget(index)
+        was_current = self.content_stack.currentIndex() == index
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.content_stack.insertWidget(index, component)
+        if was_current:
+            self.content_stack.setCurrentIndex(index)
+
+        self.page_components[index] = component
+        setattr(self, attr, component)
+        print(f"[STARTUP] Halaman {class_name} dibuat dalam {(time.perf_counter() - started) * 1000:.0f} ms")
+        return component
+
+    def built_components(self):
+        """Komponen halaman yang sudah dibuat"""
+        return list(self.page_components.values())
+
+    def setup_page_loader(self):
+        """Daftarkan fungsi prefetch (worker thread) dan populate (GUI thread) tiap halaman"""
+        self.page_loader = PageDataLoader(self.db, parent=self)
+        self.page_loader.all_finished.connect(self.on_page_loads_finished)
+        self.page_loader.page_loaded.connect(self.on_page_loaded)
+        self.page_loader.error_occurred.connect(
+            lambda name, error: self.server_control.add_log_message(f"Gagal memuat data {name}: {error}")
+        )
+
+        # Dashboard di-refresh sekali saja walaupun beberapa komponen selesai
+        # dimuat berdekatan (data_updated)
+        self.dashboard_refresh_timer = QTimer(self)
+        self.dashboard_refresh_timer.setSingleShot(True)
+        self.dashboard_refresh_timer.setInterval(300)
+        self.dashboard_refresh_timer.timeout.connect(lambda: self.page_loader.load('dashboard'))
+
+        db = self.db
+        if not db:
+            return
+
+        def populate(index):
+            # Halaman dibuat saat datanya pertama kali tiba
+            return lambda: self.page_component(index).load_data()
+
+        loader = self.page_loader
+        loader.register('startup', self.populate_startup_pages,
+                        db.prefetch_dashboard)
+        loader.register('dashboard', self.update_dashboard_data,
+                        lambda: db.prefetch_dashboard(include_lists=False))
+        loader.register('struktur', populate(1),
+                        lambda: db.get_struktur_list(search=None),
+                        db.get_wr_list,
+                        lambda: db.get_kategorial_list(search=None),
+                        db.get_binaan_list)
+        loader.register('jemaat', populate(3),
+                        lambda: db.get_jemaat_list(limit=1000, search=None))
+        loader.register('aset', populate(4),
+                        lambda: db.get_aset_list(search=None))
+        loader.register('pengumuman', populate(5),
+                        lambda: db.get_pengumuman_list(active_only=False, limit=1000))
+        loader.register('dokumen', populate(6),
+                        db.get_files_list)
+        loader.register('keuangan', populate(7),
+                        db.get_keuangan_list,
+                        db.get_keuangan_kategorial_list)
+        loader.register('riwayat', populate(9),
+                        lambda: db.get_log_activities(limit=100),
+                        lambda: db.get_client_connections_history(limit=200))
+        loader.register('buku_kronik', populate(11),
+                        db.get_buku_kronik_list)
+        loader.register('kegiatan_paroki', populate(12),
+                        lambda: db.get_kegiatan_list(limit=1000))
+        loader.register('kegiatan_wr', populate(13),
+                        db.get_kegiatan_wr_list)
+        loader.register('proker_dpp', populate(14),
+                        db.get_program_kerja_list)
+        loader.register('proker_wr', populate(15),
+                        db.get_program_kerja_wr_list)
+        loader.register('struktur_wr', populate(16),
+                        db.get_wr_list)
+        loader.register('struktur_kategorial', populate(17),
+                        lambda: db.get_kategorial_list(search=None))
+        loader.register('keuangan_wr', populate(18),
+                        db.get_keuangan_list)
+        loader.register('keuangan_kategorial', populate(19),
+                        db.get_keuangan_kategorial_list)
+        loader.register('proker_kategorial', populate(20),
+                        db.get_program_kerja_kategorial_list)
+
+    def start_event_stream(self):
+        """Terima event push dari API supaya data diperbarui tanpa polling"""
+        if not self.db or self.event_stream:
+            return
+        self.event_changed_pages = set()
+        self.event_refresh_timer = QTimer(self)
+        self.event_refresh_timer.setSingleShot(True)
+        self.event_refresh_timer.setInterval(1000)
+        self.event_refresh_timer.timeout.connect(self.reload_changed_pages)
+        self.presence_refresh_timer = QTimer(self)
+        self.presence_refresh_timer.setSingleShot(True)
+        self.presence_refresh_timer.setInterval(500)
+        self.presence_refresh_timer.timeout.connect(self.server_control.load_connected_clients)
+
+        self.event_stream = EventStreamThread(self.db.api_client.base_url, parent=self)
+        self.event_stream.event_received.connect(self.on_server_event)
+        self.event_stream.reset_required.connect(self.load_all_data)
+        self.event_stream.status_changed.connect(self.on_event_stream_status)
+        self.event_stream.start()
+
+    def stop_event_stream(self):
+        if self.event_stream:
+            self.event_stream.stop()
+            self.event_stream = None
+
+    def on_event_stream_status(self, status):
+        messages = {
+            'sse': "Terhubung ke event stream API (push).",
+            'poll': "Event stream tidak tersedia, memakai long-poll.",
+            'disconnected': "Event stream terputus, mencoba menyambung ulang...",
+        }
+        if status in messages:
+            self.server_control.add_log_message(messages[status])
+
+    def on_server_event(self, event_type, data):
+        if event_type == 'presence':
+            self.presence_refresh_timer.start()
+        elif event_type == 'broadcast':
+            self.dashboard_refresh_timer.start()
+        elif event_type == 'data_changed':
+            entity = data.get('entity')
+            # Beberapa perubahan berdekatan (mis. import) cukup satu reload
+            self.event_changed_pages.update(EVENT_ENTITY_PAGES.get(entity, ()))
+            if entity in DASHBOARD_ENTITIES:
+                self.event_changed_pages.add('dashboard')
+            if self.event_changed_pages:
+                self.event_refresh_timer.start()
+
+    def reload_changed_pages(self):
+        pages, self.event_changed_pages = self.event_changed_pages, set()
+        current = PAGE_LOAD_NAMES.get(self.content_stack.currentIndex())
+        if current in pages:
+            self.page_loader.load(current)
+        if 'dashboard' in pages and current != 'dashboard':
+            self.dashboard_refresh_timer.start()
+
+    def on_page_loaded(self, name, elapsed):
+        # Jadwal dan pengumuman di dashboard diambil dari data komponen ini
+        if name in ('kegiatan_paroki', 'kegiatan_wr', 'pengumuman'):
+            self.dashboard_refresh_timer.start()
+
+    def on_page_loads_finished(self, elapsed):
+        self.server_control.add_log_message(f"Data halaman selesai dimuat dari API ({elapsed:.1f} detik).")
     
     def setup_connections(self):
         # Main menu connections
@@ -355,32 +500,8 @@ class ServerMainWindow(QMainWindow):
 
         self.server_control.log_message.connect(self.server_control.add_log_message)
 
-        components = [
-            self.struktur_component,
-            self.jemaat_component,
-            self.aset_component,
-            self.pengumuman_component,
-            self.dokumen_component,
-            self.keuangan_component,
-            self.riwayat_component,
-            self.pengaturan_component,
-            self.buku_kronik_component,
-            self.kegiatan_paroki_page,
-            self.kegiatan_wr_page,
-            self.proker_dpp_page,
-            self.proker_wr_page,
-            self.struktur_wr_page,
-            self.struktur_kategorial_page,
-            self.keuangan_wr_page,
-            self.keuangan_kategorial_page,
-            self.proker_kategorial_page
-        ]
-
-        for component in components:
-            if hasattr(component, 'log_message'):
-                component.log_message.connect(self.server_control.add_log_message)
-            if hasattr(component, 'data_updated'):
-                component.data_updated.connect(self.update_dashboard_data)
+        # Signal log_message / data_updated komponen halaman dihubungkan saat
+        # komponen dibuat (page_component)
     
     def setup_menu(self):
         menubar = self.menuBar()
@@ -398,11 +519,11 @@ class ServerMainWindow(QMainWindow):
         file_menu.addSeparator()
         
         backup_action = QAction("Backup Database", self)
-        backup_action.triggered.connect(self.pengaturan_component.backup_database)
+        backup_action.triggered.connect(lambda: self.page_component(10).backup_database())
         file_menu.addAction(backup_action)
         
         restore_action = QAction("Restore Database", self)
-        restore_action.triggered.connect(self.pengaturan_component.restore_database)
+        restore_action.triggered.connect(lambda: self.page_component(10).restore_database())
         file_menu.addAction(restore_action)
         
         file_menu.addSeparator()
@@ -527,11 +648,9 @@ class ServerMainWindow(QMainWindow):
 
         if index == 0:
             self.sidebar.menu_dashboard.setChecked(True)
-            self.update_dashboard_data()
         elif index == 1:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.struktur_component.load_data()
         elif index == 2:
             # Index 2 is now a placeholder - Program Kerja uses individual page components
             # Redirect to ProkerDPPPageComponent (index 14) as default
@@ -541,74 +660,65 @@ class ServerMainWindow(QMainWindow):
         elif index == 3:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.jemaat_component.load_data()
         elif index == 4:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.aset_component.load_data()
         elif index == 5:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.pengumuman_component.load_data()
         elif index == 6:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.dokumen_component.load_data()
         elif index == 7:
             self.sidebar.menu_wilayah_rohani.setChecked(True)
             self.sidebar.submenu_wilayah_rohani.show_submenu()
-            self.keuangan_component.load_data()
         elif index == 8:
             # Index 8 is now a placeholder (Tim Pembina removed)
             # Redirect to dashboard
             self.show_page(0)
         elif index == 9:
             self.sidebar.menu_riwayat.setChecked(True)
-            self.riwayat_component.load_data()
         elif index == 10:
             self.sidebar.menu_pengaturan.setChecked(True)
         elif index == 11:
             self.sidebar.menu_buku_kronik.setChecked(True)
-            self.buku_kronik_component.load_data()
         elif index == 12:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.kegiatan_paroki_page.load_data()
         elif index == 13:
             self.sidebar.menu_wilayah_rohani.setChecked(True)
             self.sidebar.submenu_wilayah_rohani.show_submenu()
-            self.kegiatan_wr_page.load_data()
         elif index == 14:
             self.sidebar.menu_pusat_paroki.setChecked(True)
             self.sidebar.submenu_pusat_paroki.show_submenu()
-            self.proker_dpp_page.load_data()
         elif index == 15:
             self.sidebar.menu_wilayah_rohani.setChecked(True)
             self.sidebar.submenu_wilayah_rohani.show_submenu()
-            self.proker_wr_page.load_data()
         elif index == 16:
             self.sidebar.menu_wilayah_rohani.setChecked(True)
             self.sidebar.submenu_wilayah_rohani.show_submenu()
-            self.struktur_wr_page.load_data()
         elif index == 17:
             self.sidebar.menu_kelompok_kategorial.setChecked(True)
             self.sidebar.submenu_kelompok_kategorial.show_submenu()
-            self.struktur_kategorial_page.load_data()
 
         elif index == 18:  # Keuangan WR
             self.sidebar.menu_wilayah_rohani.setChecked(True)
             self.sidebar.submenu_wilayah_rohani.show_submenu()
-            self.keuangan_wr_page.load_data()
 
         elif index == 19:  # Keuangan K. Kategorial
             self.sidebar.menu_kelompok_kategorial.setChecked(True)
             self.sidebar.submenu_kelompok_kategorial.show_submenu()
-            self.keuangan_kategorial_page.load_data()
 
         elif index == 20:  # Program Kerja K. Kategorial
             self.sidebar.menu_kelompok_kategorial.setChecked(True)
             self.sidebar.submenu_kelompok_kategorial.show_submenu()
-            self.proker_kategorial_page.load_data()
+
+        if index in PAGE_COMPONENTS:
+            self.page_component(index)
+
+        # Data halaman dimuat di background lalu ditampilkan saat tiba
+        if index in PAGE_LOAD_NAMES:
+            self.page_loader.load(PAGE_LOAD_NAMES[index])
 
         self.content_stack.setCurrentIndex(index)
 
@@ -663,59 +773,42 @@ class ServerMainWindow(QMainWindow):
             self.server_control.add_log_message("Tidak bisa memuat data, API shared hosting tidak terhubung.")
             return
 
-        self.struktur_component.load_data()
-        self.jemaat_component.load_data()
-
-        # Load program kerja pages (DPP, WR) and kegiatan pages (Paroki, WR)
-        self.proker_dpp_page.load_data()
-        self.proker_wr_page.load_data()
-        self.kegiatan_paroki_page.load_data()
-        self.kegiatan_wr_page.load_data()
-
-        self.pengumuman_component.load_data()
-        self.aset_component.load_data()
-        self.dokumen_component.load_data()
-        self.keuangan_component.load_data()
-        self.riwayat_component.load_data()
-        self.buku_kronik_component.load_data()
-
-        # Load standalone kegiatan pages
-        self.kegiatan_paroki_page.load_data()
-        self.kegiatan_wr_page.load_data()
-
-        # Load standalone program kerja pages
-        self.proker_dpp_page.load_data()
-        self.proker_wr_page.load_data()
-
-        # Load standalone struktur pages
-        self.struktur_wr_page.load_data()
-        self.struktur_kategorial_page.load_data()
-
-        # Load standalone keuangan pages
-        self.keuangan_wr_page.load_data()
-        self.keuangan_kategorial_page.load_data()
-
-        # Load standalone proker kategorial page
-        self.proker_kategorial_page.load_data()
-
-        self.update_dashboard_data()
+        # Hanya halaman yang dibutuhkan dashboard dan halaman yang sedang tampil;
+        # halaman lain dimuat saat dibuka (lihat show_page)
+        pages = ['startup']
+        current_index = self.content_stack.currentIndex()
+        if current_index in PAGE_LOAD_NAMES and current_index not in STARTUP_PAGES + (0,):
+            pages.append(PAGE_LOAD_NAMES[current_index])
+        self.page_loader.load_many(pages)
 
         # Update sidebar status setelah load data
         if hasattr(self.sidebar, 'update_api_status'):
             self.sidebar.update_api_status()
 
-        self.server_control.add_log_message("Semua data berhasil dimuat ulang dari API shared hosting.")
+        self.server_control.add_log_message("Memuat ulang data dari API shared hosting...")
     
+    def populate_startup_pages(self):
+        """Isi halaman yang dibutuhkan dashboard lalu dashboard itu sendiri,
+        dari data yang sudah diambil prefetch_dashboard"""
+        for index in STARTUP_PAGES:
+            self.page_component(index).load_data()
+        self.update_dashboard_data()
+        # data_updated dari halaman di atas sudah tercakup update barusan
+        self.dashboard_refresh_timer.stop()
+
     def update_dashboard_data(self):
         if not self.db:
             return
 
-        jemaat_data = self.jemaat_component.get_data()
+        def page_data(index):
+            # Halaman yang belum dibuat belum punya data
+            component = self.page_components.get(index)
+            return component.get_data() if hasattr(component, 'get_data') else []
+
+        jemaat_data = page_data(3)
         # Get kegiatan data from individual page components
-        kegiatan_paroki_data = self.kegiatan_paroki_page.get_data() if hasattr(self.kegiatan_paroki_page, 'get_data') else []
-        kegiatan_wr_data = self.kegiatan_wr_page.get_data() if hasattr(self.kegiatan_wr_page, 'get_data') else []
-        kegiatan_data = kegiatan_paroki_data + kegiatan_wr_data
-        pengumuman_data = self.pengumuman_component.get_data()
+        kegiatan_data = page_data(12) + page_data(13)
+        pengumuman_data = page_data(5)
 
         self.dashboard_component.update_statistics(
             jemaat_data,
@@ -819,6 +912,8 @@ class ServerMainWindow(QMainWindow):
                     if hasattr(component, 'status_timer') and component.status_timer:
                         component.status_timer.stop()
 
+            self.stop_event_stream()
+
             # Reset current admin
             self.current_admin = None
 
@@ -832,22 +927,9 @@ class ServerMainWindow(QMainWindow):
             if self.current_admin:
                 # Update admin info di semua komponen
                 self.dashboard_component.set_current_admin(self.current_admin)
-                self.struktur_component.set_current_admin(self.current_admin)
-                self.proker_dpp_page.set_current_admin(self.current_admin)
-                self.kegiatan_paroki_page.set_current_admin(self.current_admin)
-                self.aset_component.set_current_admin(self.current_admin)
-                self.pengumuman_component.set_current_admin(self.current_admin)
-                self.dokumen_component.set_current_admin(self.current_admin)
-                self.keuangan_component.set_current_admin(self.current_admin)
-                self.tim_pembina_component.set_current_admin(self.current_admin)
-                self.buku_kronik_component.set_current_admin(self.current_admin)
-                self.kegiatan_wr_page.set_current_admin(self.current_admin)
-                self.proker_wr_page.set_current_admin(self.current_admin)
-                self.struktur_wr_page.set_current_admin(self.current_admin)
-                self.keuangan_wr_page.set_current_admin(self.current_admin)
-                self.struktur_kategorial_page.set_current_admin(self.current_admin)
-                self.keuangan_kategorial_page.set_current_admin(self.current_admin)
-                self.proker_kategorial_page.set_current_admin(self.current_admin)
+                for component in self.built_components():
+                    if hasattr(component, 'set_current_admin'):
+                        component.set_current_admin(self.current_admin)
 
                 # Update window title
                 admin_name = self.current_admin.get('nama_lengkap', 'Administrator')
@@ -860,6 +942,7 @@ class ServerMainWindow(QMainWindow):
                 # Reload data
                 if self.db and self.db.connection:
                     self.load_all_data()
+                    self.start_event_stream()
 
                 # Show main window again
                 self.show()
@@ -879,6 +962,11 @@ class ServerMainWindow(QMainWindow):
         try:
             current_index = self.content_stack.currentIndex()
 
+            if current_index in PAGE_LOAD_NAMES:
+                self.page_loader.load(PAGE_LOAD_NAMES[current_index])
+                self.server_control.add_log_message(f"Memuat ulang data {PAGE_LOAD_NAMES[current_index]}...")
+                return
+
             # Mapping index ke komponen
             component_map = {
                 0: ('dashboard_component', 'Dashboard'),
@@ -941,6 +1029,11 @@ class ServerMainWindow(QMainWindow):
                         component.status_timer.stop()
                         component.status_timer.deleteLater()
 
+            self.stop_event_stream()
+
+            if hasattr(self, 'page_loader'):
+                self.page_loader.shutdown()
+
             # Stop client registration server
             if self.client_server:
                 self.client_server.stop()
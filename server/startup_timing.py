@@ -0,0 +1,51 @@
+# Path: server/startup_timing.py
+# Catatan waktu startup aplikasi admin.
+#
+# main_http_refactored memanggil mark() di setiap tahap startup (import,
+# DatabaseManager, client server, login dialog tampil, main window siap) dan
+# report() setelah main window selesai dibangun. Laporan dicetak ke console
+# dan ditampilkan di log panel kontrol server, sehingga regresi (mis. import
+# berat atau request jaringan sebelum login) langsung terlihat.
+#
+# Waktu dihitung sejak modul ini diimport (import pertama di
+# main_http_refactored), bukan sejak interpreter Python dimulai.
+
+import time
+
+# Target waktu sampai login dialog tampil (detik)
+LOGIN_WINDOW_BUDGET = 1.0
+
+_started = time.perf_counter()
+_marks = []  # (label, detik sejak start)
+
+
+def mark(label):
+    """Catat tahap startup, return detik sejak start"""
+    elapsed = time.perf_counter() - _started
+    _marks.append((label, elapsed))
+    return elapsed
+
+
+def elapsed(label):
+    """Detik sejak start saat tahap label dicatat, None jika belum"""
+    for name, seconds in _marks:
+        if name == label:
+            return seconds
+    return None
+
+
+def report():
+    """Baris laporan: waktu kumulatif dan durasi per tahap"""
+    lines = []
+    previous = 0.0
+    for label, seconds in _marks:
+        lines.append(f"{label}: {seconds * 1000:.0f} ms (+{(seconds - previous) * 1000:.0f} ms)")
+        previous = seconds
+
+    login_window = elapsed('login_window')
+    if login_window is not None and login_window > LOGIN_WINDOW_BUDGET:
+        lines.append(f"PERINGATAN: login dialog tampil setelah {login_window:.2f} detik "
+                     f"(target {LOGIN_WINDOW_BUDGET:.1f} detik)")
+    for line in lines:
+        print(f"[STARTUP] {line}")
+    return lines
@@ -0,0 +1,9 @@
+-- Migration 61: Index untuk keyset (cursor) pagination
+-- Purpose: Endpoint list dengan parameter `cursor` mengurutkan berdasarkan
+--          (kolom sort, primary key). InnoDB sudah menyertakan primary key di
+--          setiap secondary index, jadi cukup kolom sort yang di-index.
+--          jemaat (idx_jemaat_nama), keuangan (idx_keuangan_tanggal) dan
+--          log_aktivitas (idx_log_timestamp) sudah punya index; dokumen belum.
+
+ALTER TABLE dokumen
+ADD INDEX IF NOT EXISTS idx_dokumen_upload_date (upload_date);
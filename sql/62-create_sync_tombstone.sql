@@ -0,0 +1,102 @@
+-- Migration 62: Tombstone untuk sync incremental (updated_since)
+-- Purpose: Endpoint list dengan parameter `updated_since` mengirim id baris
+--          yang dihapus sejak watermark client. Trigger AFTER DELETE mencatat
+--          setiap penghapusan ke sync_tombstone, sehingga route DELETE tidak
+--          perlu diubah. Tombstone lebih dari 30 hari boleh dihapus lewat
+--          POST /sync/purge-tombstones.
+
+CREATE TABLE IF NOT EXISTS sync_tombstone (
+    id_tombstone BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    record_id INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_tombstone_table_deleted (table_name, deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Index updated_at untuk query "changed since"
+ALTER TABLE jemaat ADD INDEX IF NOT EXISTS idx_jemaat_updated_at (updated_at);
+ALTER TABLE kegiatan ADD INDEX IF NOT EXISTS idx_kegiatan_updated_at (updated_at);
+ALTER TABLE kegiatan_wr ADD INDEX IF NOT EXISTS idx_kegiatan_wr_updated_at (updated_at);
+ALTER TABLE keuangan ADD INDEX IF NOT EXISTS idx_keuangan_updated_at (updated_at);
+ALTER TABLE keuangan_kategorial ADD INDEX IF NOT EXISTS idx_keuangan_kategorial_updated_at (updated_at);
+ALTER TABLE pengumuman ADD INDEX IF NOT EXISTS idx_pengumuman_updated_at (updated_at);
+ALTER TABLE dokumen ADD INDEX IF NOT EXISTS idx_dokumen_updated_at (updated_at);
+ALTER TABLE aset ADD INDEX IF NOT EXISTS idx_aset_updated_at (updated_at);
+ALTER TABLE struktur ADD INDEX IF NOT EXISTS idx_struktur_updated_at (updated_at);
+ALTER TABLE program_kerja ADD INDEX IF NOT EXISTS idx_program_kerja_updated_at (updated_at);
+ALTER TABLE program_kerja_wr ADD INDEX IF NOT EXISTS idx_program_kerja_wr_updated_at (updated_at);
+ALTER TABLE program_kerja_k_kategorial ADD INDEX IF NOT EXISTS idx_program_kerja_k_kategorial_updated_at (updated_at);
+ALTER TABLE buku_kronik ADD INDEX IF NOT EXISTS idx_buku_kronik_updated_at (updated_at);
+ALTER TABLE kategorial ADD INDEX IF NOT EXISTS idx_kategorial_updated_at (updated_at);
+ALTER TABLE k_binaan ADD INDEX IF NOT EXISTS idx_k_binaan_updated_at (updated_at);
+ALTER TABLE wilayah_rohani ADD INDEX IF NOT EXISTS idx_wilayah_rohani_updated_at (updated_at);
+ALTER TABLE tim_pembina_peserta ADD INDEX IF NOT EXISTS idx_tim_pembina_peserta_updated_at (updated_at);
+
+-- Trigger tombstone per tabel
+DROP TRIGGER IF EXISTS trg_jemaat_tombstone;
+CREATE TRIGGER trg_jemaat_tombstone AFTER DELETE ON jemaat
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('jemaat', OLD.id_jemaat);
+
+DROP TRIGGER IF EXISTS trg_kegiatan_tombstone;
+CREATE TRIGGER trg_kegiatan_tombstone AFTER DELETE ON kegiatan
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('kegiatan', OLD.id_kegiatan);
+
+DROP TRIGGER IF EXISTS trg_kegiatan_wr_tombstone;
+CREATE TRIGGER trg_kegiatan_wr_tombstone AFTER DELETE ON kegiatan_wr
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('kegiatan_wr', OLD.id_kegiatan_wr);
+
+DROP TRIGGER IF EXISTS trg_keuangan_tombstone;
+CREATE TRIGGER trg_keuangan_tombstone AFTER DELETE ON keuangan
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('keuangan', OLD.id_keuangan);
+
+DROP TRIGGER IF EXISTS trg_keuangan_kategorial_tombstone;
+CREATE TRIGGER trg_keuangan_kategorial_tombstone AFTER DELETE ON keuangan_kategorial
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('keuangan_kategorial', OLD.id_keuangan_kategorial);
+
+DROP TRIGGER IF EXISTS trg_pengumuman_tombstone;
+CREATE TRIGGER trg_pengumuman_tombstone AFTER DELETE ON pengumuman
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('pengumuman', OLD.id_pengumuman);
+
+DROP TRIGGER IF EXISTS trg_dokumen_tombstone;
+CREATE TRIGGER trg_dokumen_tombstone AFTER DELETE ON dokumen
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('dokumen', OLD.id_dokumen);
+
+DROP TRIGGER IF EXISTS trg_aset_tombstone;
+CREATE TRIGGER trg_aset_tombstone AFTER DELETE ON aset
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('aset', OLD.id_aset);
+
+DROP TRIGGER IF EXISTS trg_struktur_tombstone;
+CREATE TRIGGER trg_struktur_tombstone AFTER DELETE ON struktur
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('struktur', OLD.id_struktur);
+
+DROP TRIGGER IF EXISTS trg_program_kerja_tombstone;
+CREATE TRIGGER trg_program_kerja_tombstone AFTER DELETE ON program_kerja
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('program_kerja', OLD.id_program_kerja);
+
+DROP TRIGGER IF EXISTS trg_program_kerja_wr_tombstone;
+CREATE TRIGGER trg_program_kerja_wr_tombstone AFTER DELETE ON program_kerja_wr
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('program_kerja_wr', OLD.id_program_kerja_wr);
+
+DROP TRIGGER IF EXISTS trg_program_kerja_k_kategorial_tombstone;
+CREATE TRIGGER trg_program_kerja_k_kategorial_tombstone AFTER DELETE ON program_kerja_k_kategorial
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('program_kerja_k_kategorial', OLD.id_program_kerja_k_kategorial);
+
+DROP TRIGGER IF EXISTS trg_buku_kronik_tombstone;
+CREATE TRIGGER trg_buku_kronik_tombstone AFTER DELETE ON buku_kronik
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('buku_kronik', OLD.id_kronik);
+
+DROP TRIGGER IF EXISTS trg_kategorial_tombstone;
+CREATE TRIGGER trg_kategorial_tombstone AFTER DELETE ON kategorial
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('kategorial', OLD.id_kategorial);
+
+DROP TRIGGER IF EXISTS trg_k_binaan_tombstone;
+CREATE TRIGGER trg_k_binaan_tombstone AFTER DELETE ON k_binaan
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('k_binaan', OLD.id_binaan);
+
+DROP TRIGGER IF EXISTS trg_wilayah_rohani_tombstone;
+CREATE TRIGGER trg_wilayah_rohani_tombstone AFTER DELETE ON wilayah_rohani
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('wilayah_rohani', OLD.id_wilayah);
+
+DROP TRIGGER IF EXISTS trg_tim_pembina_peserta_tombstone;
+CREATE TRIGGER trg_tim_pembina_peserta_tombstone AFTER DELETE ON tim_pembina_peserta
+FOR EACH ROW INSERT INTO sync_tombstone (table_name, record_id) VALUES ('tim_pembina_peserta', OLD.id_tim_pembina);
@@ -0,0 +1,13 @@
+-- Migration 63: Kolom hash untuk blob store (content-addressed)
+-- Purpose: File dokumen dan foto struktur disimpan sekali per isi di
+--          uploads/blobs/<ab>/<cd>/<sha256>. Kolom hash menjadi referensi ke
+--          blob; blob dihapus saat tidak ada lagi row yang mereferensikannya.
+--          Row lama (hash NULL) tetap memakai file_path/foto_path seperti biasa.
+
+ALTER TABLE dokumen
+ADD COLUMN IF NOT EXISTS file_hash CHAR(64) NULL AFTER file_path,
+ADD INDEX IF NOT EXISTS idx_dokumen_file_hash (file_hash);
+
+ALTER TABLE struktur
+ADD COLUMN IF NOT EXISTS foto_hash CHAR(64) NULL AFTER foto_path,
+ADD INDEX IF NOT EXISTS idx_struktur_foto_hash (foto_hash);
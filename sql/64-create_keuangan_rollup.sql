@@ -0,0 +1,47 @@
+-- Migration 64: Rollup bulanan keuangan
+-- Purpose: /keuangan/saldo, /keuangan/laporan-bulanan dan padanannya di
+--          /keuangan-kategorial membaca total per bulan dari tabel ini,
+--          bukan SUM(jumlah) atas seluruh tabel. Rollup dipelihara oleh route
+--          (lihat API/finance_rollup.py) dalam transaksi yang sama dengan
+--          perubahan row. Untuk keuangan: jenis = kategori, sub_kategori =
+--          sub_kategori, owner_id = created_by_pengguna. Untuk
+--          keuangan_kategorial: jenis = jenis, sub_kategori = kategori,
+--          owner_id = created_by_admin.
+--          Backfill ulang kapan saja: POST /admin/keuangan-rollup/rebuild.
+
+CREATE TABLE IF NOT EXISTS keuangan_rollup (
+    sumber ENUM('keuangan', 'keuangan_kategorial') NOT NULL,
+    tahun SMALLINT NOT NULL,
+    bulan TINYINT NOT NULL,
+    jenis ENUM('Pemasukan', 'Pengeluaran') NOT NULL,
+    sub_kategori VARCHAR(100) NOT NULL DEFAULT '',
+    owner_id INT NOT NULL DEFAULT 0,
+    total DECIMAL(17,2) NOT NULL DEFAULT 0,
+    jumlah_transaksi INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (sumber, tahun, bulan, jenis, sub_kategori, owner_id),
+    INDEX idx_rollup_owner (sumber, owner_id, tahun, bulan)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill awal
+DELETE FROM keuangan_rollup;
+
+INSERT INTO keuangan_rollup
+    (sumber, tahun, bulan, jenis, sub_kategori, owner_id, total, jumlah_transaksi)
+SELECT 'keuangan', YEAR(tanggal), MONTH(tanggal), kategori,
+       COALESCE(sub_kategori, ''), COALESCE(created_by_pengguna, 0),
+       SUM(jumlah), COUNT(*)
+FROM keuangan
+WHERE tanggal IS NOT NULL AND jumlah IS NOT NULL
+GROUP BY YEAR(tanggal), MONTH(tanggal), kategori,
+         COALESCE(sub_kategori, ''), COALESCE(created_by_pengguna, 0);
+
+INSERT INTO keuangan_rollup
+    (sumber, tahun, bulan, jenis, sub_kategori, owner_id, total, jumlah_transaksi)
+SELECT 'keuangan_kategorial', YEAR(tanggal), MONTH(tanggal), jenis,
+       COALESCE(kategori, ''), COALESCE(created_by_admin, 0),
+       SUM(jumlah), COUNT(*)
+FROM keuangan_kategorial
+WHERE tanggal IS NOT NULL AND jumlah IS NOT NULL
+GROUP BY YEAR(tanggal), MONTH(tanggal), jenis,
+         COALESCE(kategori, ''), COALESCE(created_by_admin, 0);
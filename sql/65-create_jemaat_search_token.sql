@@ -0,0 +1,22 @@
+-- Migration 65: Indeks pencarian jemaat
+-- Purpose: GET /jemaat?search=, /jemaat/autocomplete dan
+--          /tim-pembina/search-jemaat mencari lewat tabel token ini, bukan
+--          LIKE '%x%' (full scan) atas tabel jemaat. Setiap kata dari
+--          nama_lengkap, nama_keluarga, alamat, email dan no_telepon disimpan
+--          dalam bentuk ternormalisasi beserta semua akhirannya (>= 2 huruf),
+--          sehingga pencarian di tengah kata tetap berupa range scan
+--          `suffix LIKE 'kata%'` di primary key. posisi = 0 berarti awal kata.
+--          Kolom: 1 nama_lengkap, 2 nama_keluarga, 3 alamat, 4 email,
+--          5 no_telepon (lihat API/jemaat_search.py).
+--          Tokenisasi dilakukan di Python, jadi tabel diisi setelah migrasi
+--          dengan POST /admin/jemaat-search/rebuild atau
+--          `python jemaat_search.py rebuild` dari folder API.
+
+CREATE TABLE IF NOT EXISTS jemaat_search_token (
+    suffix VARCHAR(64) NOT NULL,
+    id_jemaat INT NOT NULL,
+    kolom TINYINT NOT NULL,
+    posisi TINYINT UNSIGNED NOT NULL,
+    PRIMARY KEY (suffix, id_jemaat, kolom, posisi),
+    INDEX idx_search_token_jemaat (id_jemaat)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_bin;
@@ -0,0 +1,17 @@
+-- Migration 66: Log event untuk push channel
+-- Purpose: /events/stream (SSE) dan /events/poll (long-poll) membaca event
+--          broadcast, presence dan data_changed dari tabel ini. id_event
+--          dipakai client sebagai Last-Event-ID untuk melanjutkan stream.
+--          Event lebih lama dari 24 jam dibersihkan oleh API (lihat
+--          API/events.py); client yang tertinggal lebih jauh menerima
+--          event `reset` dan memuat ulang datanya.
+
+CREATE TABLE IF NOT EXISTS event_log (
+    id_event BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    tipe VARCHAR(32) NOT NULL,
+    entity VARCHAR(64) DEFAULT NULL,
+    payload TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id_event),
+    INDEX idx_event_log_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
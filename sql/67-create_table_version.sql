@@ -0,0 +1,37 @@
+-- Migration 67: Counter versi per tabel untuk ETag endpoint list
+-- Purpose: API/conditional.py menghitung ETag GET list dari versi tabel
+--          yang dibaca response-nya. Versi dinaikkan API satu kali per
+--          request tulis setelah commit (bump_table_versions), dan baris
+--          jemaat_search_token oleh API/jemaat_search.py setelah indeks
+--          pencarian diperbarui. Perubahan langsung di database (di luar
+--          API) perlu menaikkan versi sendiri, mis.:
+--            UPDATE table_version SET version = version + 1 WHERE table_name = 'jemaat';
+--          Tanpa tabel ini API tetap berjalan, hanya tanpa 304.
+
+CREATE TABLE IF NOT EXISTS table_version (
+    table_name VARCHAR(64) NOT NULL,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO table_version (table_name) VALUES
+    ('aset'),
+    ('k_binaan'),
+    ('buku_kronik'),
+    ('dokumen'),
+    ('admin'),
+    ('jemaat'),
+    ('kategorial'),
+    ('kegiatan'),
+    ('pengguna'),
+    ('kegiatan_wr'),
+    ('keuangan'),
+    ('keuangan_kategorial'),
+    ('pengumuman'),
+    ('program_kerja'),
+    ('program_kerja_wr'),
+    ('program_kerja_k_kategorial'),
+    ('struktur'),
+    ('tim_pembina_peserta'),
+    ('wilayah_rohani'),
+    ('jemaat_search_token');